@@ -6,6 +6,25 @@ from smoke_test_ai.utils.config import load_settings, load_device_config, load_t
 console = Console()
 
 
+def _load_suite(path: Path) -> dict:
+    """Load a suite through the validating on-disk cache; schema errors abort before any device work."""
+    from smoke_test_ai.core.suite_compiler import SuiteValidationError, default_cache_dir
+    try:
+        return load_test_suite(path, cache_dir=default_cache_dir())
+    except SuiteValidationError as e:
+        raise click.ClickException(str(e))
+
+
+def _parse_time_budget(ctx, param, value):
+    if value is None:
+        return None
+    from smoke_test_ai.core.selection import parse_duration
+    try:
+        return parse_duration(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
 @click.group()
 def main():
     """smoke-test-ai: Android OS smoke test automation"""
@@ -23,14 +42,16 @@ def main():
 @click.option("--keep-data", is_flag=True, help="Skip userdata flash (preserve existing data)")
 @click.option("--build-info", default=None, type=click.Path(exists=True), help="Build info JSON from CI (expected values)")
 @click.option("--config-dir", default="config", help="Config directory path")
-def run(device, suite, build, serial, skip_flash, skip_setup, build_type, keep_data, build_info, config_dir):
+@click.option("--time-budget", default=None, callback=_parse_time_budget, help="Run the most valuable subset that fits, e.g. 5m, 1h30m, 300")
+@click.option("--impact", is_flag=True, help="Run only categories impacted by components changed since the previous run on this DUT")
+def run(device, suite, build, serial, skip_flash, skip_setup, build_type, keep_data, build_info, config_dir, time_budget, impact):
     """Run full smoke test pipeline."""
     from smoke_test_ai.core.orchestrator import Orchestrator
 
     config_path = Path(config_dir)
     settings = load_settings(config_path / "settings.yaml")
     device_config = load_device_config(config_path / "devices" / f"{device}.yaml")
-    suite_config = load_test_suite(config_path / "test_suites" / f"{suite}.yaml")
+    suite_config = _load_suite(config_path / "test_suites" / f"{suite}.yaml")
 
     orch = Orchestrator(settings=settings, device_config=device_config)
     # Load build info JSON if provided
@@ -50,6 +71,60 @@ def run(device, suite, build, serial, skip_flash, skip_setup, build_type, keep_d
         keep_data=keep_data,
         build_info=build_info_data,
         config_dir=str(config_path),
+        time_budget=time_budget,
+        impact=impact,
+    )
+
+    passed = sum(1 for r in results if r.passed)
+    total = len(results)
+    if passed == total and total > 0:
+        console.print(f"\n[bold green]ALL {total} TESTS PASSED[/]")
+    else:
+        console.print(f"\n[bold red]{total - passed}/{total} TESTS FAILED[/]")
+        raise SystemExit(1)
+
+
+@main.command()
+@click.option("--device", required=True, help="Device config name (e.g. product_a)")
+@click.option("--suite", "suites", required=True, multiple=True, help="Test suite name (repeatable, merged into one logical suite)")
+@click.option("--serial", "serials", required=True, multiple=True, help="DUT serial number (repeat once per DUT)")
+@click.option("--build", default=None, help="Build directory with images")
+@click.option("--skip-flash", is_flag=True, help="Skip flashing stage")
+@click.option("--skip-setup", is_flag=True, help="Skip Setup Wizard stage")
+@click.option("--build-type", type=click.Choice(["user", "userdebug"]), default=None, help="Build type (overrides YAML)")
+@click.option("--keep-data", is_flag=True, help="Skip userdata flash (preserve existing data)")
+@click.option("--build-info", default=None, type=click.Path(exists=True), help="Build info JSON from CI (expected values)")
+@click.option("--config-dir", default="config", help="Config directory path")
+def shard(device, suites, serials, build, skip_flash, skip_setup, build_type, keep_data, build_info, config_dir):
+    """Split suites across identical DUTs and merge into one report."""
+    from smoke_test_ai.core.sharding import merge_suites, run_sharded
+
+    config_path = Path(config_dir)
+    settings = load_settings(config_path / "settings.yaml")
+    device_config = load_device_config(config_path / "devices" / f"{device}.yaml")
+    suite_config = merge_suites([
+        _load_suite(config_path / "test_suites" / f"{s}.yaml") for s in suites
+    ])
+
+    build_info_data = None
+    if build_info:
+        import json
+        build_info_data = json.loads(Path(build_info).read_text())
+        console.print(f"[cyan]Build info loaded: {build_info}[/]")
+
+    console.print(f"[cyan]Sharding {len(suite_config['test_suite']['tests'])} tests across {len(serials)} DUT(s)[/]")
+    results = run_sharded(
+        settings,
+        device_config,
+        suite_config,
+        list(serials),
+        build_dir=build,
+        skip_flash=skip_flash,
+        skip_setup=skip_setup,
+        build_type=build_type,
+        keep_data=keep_data,
+        build_info=build_info_data,
+        config_dir=str(config_path),
     )
 
     passed = sum(1 for r in results if r.passed)
@@ -65,14 +140,15 @@ def run(device, suite, build, serial, skip_flash, skip_setup, build_type, keep_d
 @click.option("--suite", required=True, help="Test suite name")
 @click.option("--serial", default=None, help="Device serial number")
 @click.option("--config-dir", default="config", help="Config directory path")
-def test(suite, serial, config_dir):
+@click.option("--time-budget", default=None, callback=_parse_time_budget, help="Run the most valuable subset that fits, e.g. 5m, 1h30m, 300")
+def test(suite, serial, config_dir, time_budget):
     """Run tests only (assumes ADB is available)."""
     from smoke_test_ai.core.orchestrator import Orchestrator
 
     config_path = Path(config_dir)
     settings = load_settings(config_path / "settings.yaml")
     device_config = {"device": {"name": "direct", "screen_capture": {"method": "adb"}}}
-    suite_config = load_test_suite(config_path / "test_suites" / f"{suite}.yaml")
+    suite_config = _load_suite(config_path / "test_suites" / f"{suite}.yaml")
 
     orch = Orchestrator(settings=settings, device_config=device_config)
     results = orch.run(
@@ -80,6 +156,7 @@ def test(suite, serial, config_dir):
         suite_config=suite_config,
         skip_flash=True,
         skip_setup=True,
+        time_budget=time_budget,
     )
 
     passed = sum(1 for r in results if r.passed)
@@ -107,7 +184,7 @@ def reset_test(device, suite, serial, config_dir, boot_timeout, reset_delay, bui
         device_config = load_device_config(config_path / "devices" / f"{device}.yaml")
     else:
         device_config = {"device": {"name": "direct", "screen_capture": {"method": "adb"}}}
-    suite_config = load_test_suite(config_path / "test_suites" / f"{suite}.yaml")
+    suite_config = _load_suite(config_path / "test_suites" / f"{suite}.yaml")
 
     adb = AdbController(serial=serial)
 
@@ -217,8 +294,13 @@ def suites_list(config_dir):
     if not config_path.exists():
         console.print("[yellow]No test suites found[/]")
         return
+    from smoke_test_ai.core.suite_compiler import SuiteValidationError
     for f in sorted(config_path.glob("*.yaml")):
-        config = load_test_suite(f)
+        try:
+            config = load_test_suite(f)
+        except SuiteValidationError as e:
+            console.print(f"  [red]{f.stem}: INVALID ({len(e.errors)} errors)[/]")
+            continue
         name = config.get("test_suite", {}).get("name", f.stem)
         count = len(config.get("test_suite", {}).get("tests", []))
         console.print(f"  {f.stem}: {name} ({count} tests)")
@@ -7,13 +7,14 @@ from smoke_test_ai.utils.logger import get_logger
 logger = get_logger(__name__)
 
 class LlmClient:
-    def __init__(self, provider: str = "ollama", base_url: str = "http://localhost:11434", vision_model: str | None = None, text_model: str | None = None, api_key: str | None = None, timeout: int = 30):
+    def __init__(self, provider: str = "ollama", base_url: str = "http://localhost:11434", vision_model: str | None = None, text_model: str | None = None, api_key: str | None = None, timeout: int = 30, jpeg_quality: int = 95):
         self.provider = provider
         self.base_url = base_url.rstrip("/")
         self.vision_model = vision_model
         self.text_model = text_model
         self.api_key = api_key
         self.timeout = timeout
+        self.jpeg_quality = jpeg_quality
 
     def _get_client(self) -> httpx.Client:
         headers = {}
@@ -22,7 +23,7 @@ class LlmClient:
         return httpx.Client(base_url=self.base_url, headers=headers, timeout=self.timeout)
 
     def _image_to_base64(self, image: np.ndarray) -> str:
-        _, buffer = cv2.imencode(".jpg", image)
+        _, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
         return base64.b64encode(buffer).decode("utf-8")
 
     def chat(self, prompt: str, model: str | None = None) -> str:
@@ -0,0 +1,146 @@
+import json
+import statistics
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from smoke_test_ai.core.test_runner import TestResult
+from smoke_test_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Shards of one sharded run share a history file — serialize read-modify-write
+_LOCK = threading.Lock()
+
+
+class RunHistory:
+    """Per-product history of test runs, stored as one JSON file.
+
+    Layout of ``<history_dir>/<device_name>.json``::
+
+        {"runs": [{"timestamp": ..., "serial": ..., "suite": ...,
+                   "tests": {"<test_id>": {"status": "PASS", "duration": 1.2}}}]}
+
+    Runs are appended oldest-first and trimmed to ``max_runs``.
+    """
+
+    def __init__(self, history_dir: Path | str, device_name: str, max_runs: int = 50):
+        self.path = Path(history_dir) / f"{device_name}.json"
+        self.max_runs = max_runs
+
+    def load(self) -> list[dict]:
+        if not self.path.exists():
+            return []
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable history {self.path}: {e}")
+            return []
+        return data.get("runs", [])
+
+    def record_run(
+        self,
+        results: list[TestResult],
+        serial: str | None = None,
+        suite_name: str = "",
+        extra: dict | None = None,
+    ) -> dict:
+        """Append one run to the history file and return the stored entry."""
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "serial": serial,
+            "suite": suite_name,
+            "tests": {r.id: self._test_entry(r) for r in results},
+        }
+        if extra:
+            entry.update(extra)
+        with _LOCK:
+            runs = self.load()
+            runs.append(entry)
+            runs = runs[-self.max_runs:]
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps({"runs": runs}, indent=2, ensure_ascii=False))
+        return entry
+
+    @staticmethod
+    def _test_entry(result: TestResult) -> dict:
+        entry = {"status": result.status.value, "duration": round(result.duration, 3)}
+        if result.attempts > 1:
+            entry["attempts"] = result.attempts
+        if result.metrics:
+            entry["metrics"] = result.metrics
+        return entry
+
+    def flaky_counts(self, window: int = 20) -> dict[str, int]:
+        """How often each test was FLAKY over the last ``window`` runs."""
+        counts: dict[str, int] = {}
+        for run in self.load()[-window:]:
+            for test_id, rec in run.get("tests", {}).items():
+                if rec.get("status") == "FLAKY":
+                    counts[test_id] = counts.get(test_id, 0) + 1
+        return counts
+
+    def failure_rates(self, window: int = 20) -> dict[str, float]:
+        """Fraction of executed runs (last ``window``) in which each test did not pass.
+
+        FAIL/ERROR count fully, FLAKY counts half; SKIP runs are ignored.
+        """
+        weights = {"FAIL": 1.0, "ERROR": 1.0, "FLAKY": 0.5}
+        samples: dict[str, list[float]] = {}
+        for run in reversed(self.load()):
+            for test_id, rec in run.get("tests", {}).items():
+                if rec.get("status") == "SKIP":
+                    continue
+                bucket = samples.setdefault(test_id, [])
+                if len(bucket) < window:
+                    bucket.append(weights.get(rec.get("status"), 0.0))
+        return {tid: sum(vals) / len(vals) for tid, vals in samples.items() if vals}
+
+    def test_durations(self, window: int = 10) -> dict[str, float]:
+        """Median duration per test id over its last ``window`` executed runs.
+
+        SKIP results are ignored — they take ~0s and would skew the estimate.
+        """
+        samples: dict[str, list[float]] = {}
+        for run in reversed(self.load()):
+            for test_id, rec in run.get("tests", {}).items():
+                if rec.get("status") == "SKIP":
+                    continue
+                bucket = samples.setdefault(test_id, [])
+                if len(bucket) < window:
+                    bucket.append(float(rec.get("duration", 0.0)))
+        return {tid: statistics.median(vals) for tid, vals in samples.items() if vals}
+
+    def metric_history(self, test_id: str, window: int = 10) -> list[dict]:
+        """``metrics`` of the last ``window`` runs of a test that recorded any, oldest first."""
+        found = []
+        for run in reversed(self.load()):
+            metrics = run.get("tests", {}).get(test_id, {}).get("metrics")
+            if metrics:
+                found.append(metrics)
+                if len(found) >= window:
+                    break
+        return found[::-1]
+
+    def metric_baseline(self, test_id: str, metric: str, stat: str = "p50",
+                        window: int = 10) -> float | None:
+        """Median of ``metrics[metric][stat]`` over recent runs, or None without history.
+
+        ``metric`` may be a dotted path into nested metrics (``"phases.kernel"``).
+        """
+        values = []
+        for metrics in self.metric_history(test_id, window):
+            node = metrics
+            for key in metric.split("."):
+                node = node.get(key) if isinstance(node, dict) else None
+            value = node.get(stat) if isinstance(node, dict) else None
+            if isinstance(value, (int, float)):
+                values.append(value)
+        return statistics.median(values) if values else None
+
+    def last_run(self, serial: str | None = None) -> dict | None:
+        """Most recent run, optionally restricted to one device serial."""
+        for run in reversed(self.load()):
+            if serial is None or run.get("serial") == serial:
+                return run
+        return None
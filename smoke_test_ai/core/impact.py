@@ -0,0 +1,118 @@
+import re
+
+from smoke_test_ai.core.selection import _ancestors
+from smoke_test_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FULL_SUITE = "*"
+
+# Component name (regex, case-insensitive) -> impacted test categories.
+# First matching rule wins; FULL_SUITE means the change can affect anything.
+DEFAULT_RULES: list[tuple[str, list[str]]] = [
+    (r"modem|baseband|wwan|radio|(?<![a-z])ril(?![a-z])", ["Telephony", "Network"]),
+    (r"camera", ["Camera"]),
+    (r"touch", ["Touchscreen", "Display"]),
+    (r"wlan|wifi", ["WiFi", "Network"]),
+    (r"(?<![a-z])bt(?![a-z])|bluetooth", ["Bluetooth"]),
+    (r"audio|adsp", ["Audio"]),
+    (r"gnss|gps", ["GPS"]),
+    (r"nfc", ["NFC"]),
+    (r"sensor|slpi", ["Sensor"]),
+    (r"display|panel|dtbo|gpu", ["Display"]),
+    (r"keypad", ["System"]),
+    (r"battery|charger|pmic", ["Power"]),
+    (r"kernel|boot|vbmeta|super|system|vendor|android version|security patch", [FULL_SUITE]),
+]
+
+# Values that change on every build and say nothing about what changed
+DEFAULT_IGNORE = [r"fingerprint", r"build id", r"display\.id", r"date"]
+
+
+def collect_components(
+    device_info: dict,
+    build_info: dict | None = None,
+    build_validation: list[dict] | None = None,
+) -> dict[str, str]:
+    """Version/hash of every identifiable build component.
+
+    Sources: firmware versions read from the device (``fw_*``), actual
+    values of ``--build-info`` validations, and optional partition image
+    hashes from CI (``build_info["partitions"] = {"modem": "<sha256>"}``).
+    """
+    components = {k: str(v) for k, v in device_info.items() if k.startswith("fw_") and v}
+    for v in build_validation or []:
+        if v.get("actual"):
+            components[v["property"]] = v["actual"]
+    for name, digest in (build_info or {}).get("partitions", {}).items():
+        components[f"partition:{name}"] = str(digest)
+    return components
+
+
+def changed_components(current: dict[str, str], previous: dict[str, str]) -> list[str]:
+    """Components whose version differs from (or is new since) the previous run."""
+    return [name for name, value in current.items() if previous.get(name) != value]
+
+
+def impacted_categories(
+    changed: list[str],
+    rules: list[tuple[str, list[str]]] | None = None,
+    ignore: list[str] | None = None,
+) -> set[str] | None:
+    """Map changed components to test categories.
+
+    Returns ``None`` when the full suite is needed — a component maps to
+    FULL_SUITE or matches no rule (unknown changes are not trusted).
+    """
+    rules = DEFAULT_RULES if rules is None else rules
+    ignore = DEFAULT_IGNORE if ignore is None else ignore
+    categories: set[str] = set()
+    for name in changed:
+        if any(re.search(p, name, re.IGNORECASE) for p in ignore):
+            continue
+        cats = next((c for p, c in rules if re.search(p, name, re.IGNORECASE)), None)
+        if cats is None:
+            logger.info(f"Impact: unmapped component '{name}' changed, running full suite")
+            return None
+        if FULL_SUITE in cats:
+            logger.info(f"Impact: '{name}' changed, running full suite")
+            return None
+        logger.info(f"Impact: '{name}' changed -> {', '.join(cats)}")
+        categories.update(cats)
+    return categories
+
+
+def select_impacted(
+    suite_config: dict,
+    categories: set[str],
+    core_categories: list[str] | None = None,
+) -> tuple[dict, dict]:
+    """Keep tests in the impacted categories plus a minimal core.
+
+    The core is ``core_categories`` plus every ``mandatory: true`` test;
+    ``depends_on`` chains of kept tests are kept too.
+    """
+    tests = suite_config.get("test_suite", {}).get("tests", [])
+    wanted = set(categories) | set(core_categories or [])
+    by_id = {tc["id"]: tc for tc in tests}
+
+    keep: set[str] = set()
+    for tc in tests:
+        if tc.get("mandatory") or tc.get("category", "Other") in wanted:
+            keep.add(tc["id"])
+            keep.update(_ancestors(tc["id"], by_id))
+
+    kept = [tc for tc in tests if tc["id"] in keep]
+    logger.info(f"Impact selection: {len(kept)}/{len(tests)} tests "
+                f"(categories: {', '.join(sorted(wanted)) or 'core only'})")
+
+    cfg = dict(suite_config)
+    cfg["test_suite"] = dict(suite_config["test_suite"])
+    cfg["test_suite"]["tests"] = kept
+    summary = {
+        "categories": sorted(categories),
+        "core": list(core_categories or []),
+        "selected": len(kept),
+        "dropped": [tc["id"] for tc in tests if tc["id"] not in keep],
+    }
+    return cfg, summary
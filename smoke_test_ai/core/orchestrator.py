@@ -14,6 +14,11 @@ from smoke_test_ai.drivers.screen_capture.adb_screencap import AdbScreenCapture
 from smoke_test_ai.ai.llm_client import LlmClient
 from smoke_test_ai.ai.visual_analyzer import VisualAnalyzer
 from smoke_test_ai.core.test_runner import TestRunner, TestResult
+from smoke_test_ai.core.history import RunHistory
+from smoke_test_ai.core.selection import select_for_budget
+from smoke_test_ai.core.impact import (
+    DEFAULT_RULES, collect_components, changed_components, impacted_categories, select_impacted,
+)
 from smoke_test_ai.reporting.cli_reporter import CliReporter
 from smoke_test_ai.reporting.json_reporter import JsonReporter
 from smoke_test_ai.reporting.html_reporter import HtmlReporter
@@ -27,9 +32,12 @@ from smoke_test_ai.plugins.audio import AudioPlugin
 from smoke_test_ai.plugins.network import NetworkPlugin
 from smoke_test_ai.plugins.charging import ChargingPlugin
 from smoke_test_ai.plugins.suspend import SuspendPlugin
+from smoke_test_ai.plugins.perf import PerfPlugin
 
 logger = get_logger(__name__)
 
+_VAR_RE = re.compile(r"\$\{(\w+)\}")
+
 
 class Orchestrator:
     def __init__(self, settings: dict, device_config: dict):
@@ -106,6 +114,7 @@ class Orchestrator:
             text_model=llm_cfg.get("text_model"),
             api_key=llm_cfg.get("api_key"),
             timeout=llm_cfg.get("timeout", 30),
+            jpeg_quality=llm_cfg.get("jpeg_quality", 95),
         )
 
     # Mobly Bundled Snippets constants
@@ -293,11 +302,12 @@ class Orchestrator:
             "PHONE_NUMBER": self.device_config.get("phone_number", ""),
         }
 
+        def _replacer(m):
+            return var_map.get(m.group(1), m.group(0))
+
         def _substitute(obj):
             if isinstance(obj, str):
-                def _replacer(m):
-                    return var_map.get(m.group(1), m.group(0))
-                return re.sub(r"\$\{(\w+)\}", _replacer, obj)
+                return _VAR_RE.sub(_replacer, obj) if "${" in obj else obj
             if isinstance(obj, dict):
                 return {k: _substitute(v) for k, v in obj.items()}
             if isinstance(obj, list):
@@ -306,6 +316,73 @@ class Orchestrator:
 
         return _substitute(suite_config)
 
+    def _device_capabilities(self) -> dict:
+        """Capabilities used by `requires`: boolean device keys + usb_power presence."""
+        caps = {k: v for k, v in self.device_config.items() if isinstance(v, bool)}
+        caps["usb_power"] = bool(self.device_config.get("usb_power"))
+        return caps
+
+    def _get_history(self) -> RunHistory:
+        history_cfg = self.settings.get("history", {})
+        return RunHistory(
+            history_cfg.get("dir", "results/history"),
+            self.device_name,
+            max_runs=history_cfg.get("max_runs", 50),
+        )
+
+    def _record_history(
+        self,
+        results: list[TestResult],
+        serial: str | None,
+        suite_config: dict | None,
+        extra: dict | None = None,
+    ) -> None:
+        """Append this run's per-test status/duration to the device history."""
+        if not results or not self.settings.get("history", {}).get("enabled", True):
+            return
+        suite_name = (suite_config or {}).get("test_suite", {}).get("name", "")
+        try:
+            self._get_history().record_run(results, serial=serial, suite_name=suite_name, extra=extra)
+        except Exception as e:
+            logger.warning(f"Failed to record run history: {e}")
+
+    def _apply_time_budget(self, suite_config: dict, budget: float, capabilities: dict) -> tuple[dict, dict]:
+        """Shrink the suite to the most valuable tests that fit ``budget`` seconds."""
+        sel_cfg = self.settings.get("selection", {})
+        history = self._get_history()
+        kwargs = {k: sel_cfg[k] for k in ("base_value", "new_test_rate") if k in sel_cfg}
+        return select_for_budget(
+            suite_config,
+            budget,
+            durations=history.test_durations(),
+            failure_rates=history.failure_rates(window=sel_cfg.get("history_window", 20)),
+            capabilities=capabilities,
+            category_weights=sel_cfg.get("category_weights", {}),
+            **kwargs,
+        )
+
+    def _apply_build_impact(self, suite_config: dict, serial: str | None, components: dict) -> tuple[dict, dict]:
+        """Restrict the suite to categories impacted since the previous run on this DUT."""
+        impact_cfg = self.settings.get("impact", {})
+        info = {"components": components}
+        previous = self._get_history().last_run(serial) or {}
+        if not previous.get("components"):
+            logger.info("Impact: no previous build on this device, running full suite")
+            return suite_config, {**info, "full_suite": True, "reason": "no previous run"}
+
+        changed = changed_components(components, previous["components"])
+        info["changed"] = changed
+        # Rules from settings take precedence over the built-in component map
+        rules = list(impact_cfg.get("rules", {}).items()) + DEFAULT_RULES
+        categories = impacted_categories(changed, rules=rules, ignore=impact_cfg.get("ignore"))
+        if categories is None:
+            return suite_config, {**info, "full_suite": True}
+
+        suite_config, summary = select_impacted(
+            suite_config, categories, impact_cfg.get("core_categories", ["Boot"])
+        )
+        return suite_config, {**info, **summary, "full_suite": False}
+
     @staticmethod
     def _has_snippet_tests(suite_config: dict) -> bool:
         """Check if any test in the suite requires Mobly snippet."""
@@ -346,6 +423,7 @@ class Orchestrator:
             "network": NetworkPlugin(),
             "charging": ChargingPlugin(),
             "suspend": SuspendPlugin(),
+            "perf": PerfPlugin(),
         }
 
         return plugins, snippet, peer_snippet
@@ -362,6 +440,9 @@ class Orchestrator:
         keep_data: bool = False,
         is_factory_reset: bool = False,
         build_info: dict | None = None,
+        report: bool = True,
+        time_budget: float | None = None,
+        impact: bool = False,
     ) -> list[TestResult]:
         adb = AdbController(serial=serial)
 
@@ -525,8 +606,22 @@ class Orchestrator:
         if suite_config:
             suite_config = self._resolve_variables(suite_config)
 
-        # Store suite_config for report generation
+        # Build-impact selection (--impact): compare components with the previous run
+        components = collect_components(device_info, build_info, device_info.get("build_validation"))
+        if suite_config and impact:
+            suite_config, impact_info = self._apply_build_impact(suite_config, adb.serial, components)
+            device_info["impact"] = impact_info
+
+        # Time-budgeted selection (--time-budget)
+        if suite_config and time_budget:
+            capabilities = self._device_capabilities()
+            capabilities["usb_power"] = usb_power is not None
+            suite_config, selection = self._apply_time_budget(suite_config, time_budget, capabilities)
+            device_info["selection"] = selection
+
+        # Store suite_config / device_info for report generation
         self._suite_config = suite_config
+        self._device_info = device_info
 
         # Preflight Check
         preflight = self._preflight_check(adb, suite_config, usb_power)
@@ -545,10 +640,7 @@ class Orchestrator:
             webcam_capture = self._get_webcam_capture()
             llm = self._get_llm_client()
             analyzer = VisualAnalyzer(llm)
-            device_capabilities = {
-                k: v for k, v in self.device_config.items()
-                if isinstance(v, bool)
-            }
+            device_capabilities = self._device_capabilities()
             device_capabilities["usb_power"] = usb_power is not None
 
             plugins, snippet, peer_snippet = self._init_plugins(
@@ -566,8 +658,11 @@ class Orchestrator:
             # Inject snippet handles into runner for plugin context
             runner._snippet = snippet
             runner._peer_snippet = peer_snippet
-            runner._settings = self.settings
+            # Plugins read device-specific config (phone numbers, camera thresholds) via settings["device"]
+            runner._settings = {**self.settings, "device": self.device_config}
             runner._usb_power = usb_power
+            if self.settings.get("history", {}).get("enabled", True):
+                runner._history = self._get_history()
             runner._mobly_dut = getattr(self, '_mobly_dut', None)
 
             # Run all tests EXCEPT adb_reboot (which clears logcat)
@@ -618,9 +713,12 @@ class Orchestrator:
         else:
             results = []
 
-        # Stage 4: Report
-        logger.info("=== Stage 4: Report ===")
-        self._generate_reports(results, device_info=device_info, suite_config=suite_config)
+        self._record_history(results, adb.serial, suite_config, extra={"components": components})
+
+        # Stage 4: Report (skipped for shards — the sharded run writes one merged report)
+        if report:
+            logger.info("=== Stage 4: Report ===")
+            self._generate_reports(results, device_info=device_info, suite_config=suite_config)
 
         return results
 
@@ -681,8 +779,12 @@ class Orchestrator:
         output_dir = Path(self.settings.get("output_dir", "results"))
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # 1. Capture bugreport
-        bugreport_path = output_dir / f"{self.device_name}_bugreport"
+        # 1. Capture bugreport — per serial, so parallel shards of one device config don't collide
+        serial = getattr(adb, "serial", None)
+        stem = self.device_name
+        if isinstance(serial, str) and serial:
+            stem += "_" + re.sub(r"[^\w.-]", "_", serial)  # "host:port" serials over TCP
+        bugreport_path = output_dir / f"{stem}_bugreport"
         zip_path = None
         try:
             logger.info("Capturing bugreport (this may take 1-2 minutes)...")
@@ -691,7 +793,7 @@ class Orchestrator:
             # adb bugreport creates a .zip file
             zip_path = bugreport_path.with_suffix(".zip")
             if not zip_path.exists():
-                zips = list(output_dir.glob(f"{self.device_name}_bugreport*.zip"))
+                zips = list(output_dir.glob(f"{stem}_bugreport*.zip"))
                 zip_path = zips[0] if zips else None
 
             if zip_path and zip_path.exists():
@@ -0,0 +1,90 @@
+import random
+from dataclasses import dataclass, fields
+
+# Error messages that indicate a transient transport problem (USB/ADB/snippet),
+# not a real product failure. Matched case-insensitively against ERROR messages.
+TRANSIENT_ERROR_PATTERNS = (
+    "device offline",
+    "device not found",
+    "no devices/emulators found",
+    "device unauthorized",
+    "connection reset",
+    "connection refused",
+    "broken pipe",
+    "timed out",
+    "timeoutexpired",
+    "protocol fault",
+    "snippet",
+    "jsonrpc",
+)
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long to wait before re-running a test.
+
+    Attempt ``n`` (0-based retry index) waits
+    ``min(max_delay, base_delay * multiplier ** n)``, reduced by up to
+    ``jitter`` (fraction) so DUTs sharing a hub don't retry in lockstep.
+    """
+
+    max_attempts: int = 1
+    base_delay: float = 0.0
+    multiplier: float = 1.0
+    max_delay: float = 60.0
+    jitter: float = 0.0
+    retry_on: tuple[str, ...] = ("FAIL",)
+    transient_errors: tuple[str, ...] = TRANSIENT_ERROR_PATTERNS
+    health_check: bool = False
+    health_timeout: int = 30
+
+    # Defaults for an explicit `retry_policy:` block (legacy `retry:` keeps fixed delay)
+    POLICY_DEFAULTS = {
+        "max_attempts": 3,
+        "base_delay": 1.0,
+        "multiplier": 2.0,
+        "max_delay": 30.0,
+        "jitter": 0.5,
+        "retry_on": ["FAIL", "ERROR"],
+        "health_check": True,
+    }
+
+    @classmethod
+    def from_test_case(cls, tc: dict, suite_default: dict | None = None) -> "RetryPolicy":
+        """Build a policy from a test case.
+
+        Precedence: test ``retry_policy`` > suite ``retry_policy`` > legacy
+        ``retry`` / ``retry_delay`` (fixed delay, FAIL only — the original behavior).
+        """
+        block = tc.get("retry_policy")
+        if block is None and ("retry" in tc or suite_default is None):
+            return cls(max_attempts=tc.get("retry", 1), base_delay=tc.get("retry_delay", 0))
+
+        cfg = dict(cls.POLICY_DEFAULTS)
+        cfg.update(suite_default or {})
+        cfg.update(block or {})
+        names = {f.name for f in fields(cls)}
+        kwargs = {k: v for k, v in cfg.items() if k in names}
+        for key in ("retry_on", "transient_errors"):
+            if key in kwargs:
+                kwargs[key] = tuple(kwargs[key])
+        return cls(**kwargs)
+
+    def delay(self, retry_index: int) -> float:
+        """Seconds to wait before retry number ``retry_index`` (0-based)."""
+        delay = min(self.max_delay, self.base_delay * (self.multiplier ** retry_index))
+        if self.jitter > 0 and delay > 0:
+            delay *= random.uniform(1.0 - self.jitter, 1.0)
+        return delay
+
+    def is_transient(self, message: str) -> bool:
+        msg = (message or "").lower()
+        return any(p in msg for p in self.transient_errors)
+
+    def should_retry(self, status: str, message: str, attempt: int) -> bool:
+        """Whether to run another attempt after ``attempt`` (0-based) ended with ``status``."""
+        if attempt >= self.max_attempts - 1 or status not in self.retry_on:
+            return False
+        if status == "ERROR":
+            return self.is_transient(message)
+        return True
@@ -0,0 +1,135 @@
+import re
+
+from smoke_test_ai.core.sharding import estimate_duration
+from smoke_test_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)([hms]?)")
+_UNIT_SECONDS = {"h": 3600, "m": 60, "s": 1, "": 1}
+
+# Value model defaults — overridable via settings.yaml `selection:`
+DEFAULT_BASE_VALUE = 0.1       # every test has some value even if it never failed
+DEFAULT_NEW_TEST_RATE = 0.5    # assumed failure rate for tests without history
+
+
+def parse_duration(text: str | int | float) -> float:
+    """Parse a budget like ``"5m"``, ``"1h30m"``, ``"90s"`` or ``"300"`` into seconds."""
+    if isinstance(text, (int, float)):
+        return float(text)
+    s = str(text).lower().replace(" ", "")
+    if not s:
+        raise ValueError(f"Invalid duration: {text!r}")
+    pos, total = 0, 0.0
+    while pos < len(s):
+        m = _DURATION_RE.match(s, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Invalid duration: {text!r}")
+        total += float(m.group(1)) * _UNIT_SECONDS[m.group(2)]
+        pos = m.end()
+    return total
+
+
+def _ancestors(tc_id: str, by_id: dict[str, dict]) -> list[str]:
+    """depends_on chain of a test (nearest first), excluding the test itself."""
+    chain, seen = [], {tc_id}
+    dep = by_id[tc_id].get("depends_on")
+    while dep in by_id and dep not in seen:
+        chain.append(dep)
+        seen.add(dep)
+        dep = by_id[dep].get("depends_on")
+    return chain
+
+
+def select_for_budget(
+    suite_config: dict,
+    budget: float,
+    durations: dict[str, float] | None = None,
+    failure_rates: dict[str, float] | None = None,
+    capabilities: dict | None = None,
+    category_weights: dict[str, float] | None = None,
+    base_value: float = DEFAULT_BASE_VALUE,
+    new_test_rate: float = DEFAULT_NEW_TEST_RATE,
+) -> tuple[dict, dict]:
+    """Pick the most valuable subset of a suite that fits ``budget`` seconds.
+
+    A test's value is ``category_weight * (base_value + failure_rate)``;
+    tests are added greedily by value per second, always together with
+    their ``depends_on`` chain. Tests marked ``mandatory: true`` are always
+    selected, even past the budget. Tests whose ``requires`` capability the
+    device lacks are dropped up front (they would only SKIP).
+
+    Returns ``(suite_config, summary)`` where the suite keeps the original
+    test order and ``summary`` describes what was dropped.
+    """
+    durations = durations or {}
+    failure_rates = failure_rates or {}
+    category_weights = category_weights or {}
+    tests = suite_config.get("test_suite", {}).get("tests", [])
+
+    unsupported = []
+    candidates = []
+    for tc in tests:
+        cap = tc.get("requires", {}).get("device_capability")
+        if cap and capabilities is not None and not capabilities.get(cap, False):
+            unsupported.append(tc["id"])
+        else:
+            candidates.append(tc)
+    by_id = {tc["id"]: tc for tc in candidates}
+
+    cost = {tid: estimate_duration(tc, durations) for tid, tc in by_id.items()}
+    value = {
+        tid: category_weights.get(tc.get("category", "Other"), 1.0)
+        * (base_value + failure_rates.get(tid, new_test_rate))
+        for tid, tc in by_id.items()
+    }
+
+    selected: set[str] = set()
+    used = 0.0
+
+    def _take(tid: str) -> None:
+        nonlocal used
+        for t in [tid, *_ancestors(tid, by_id)]:
+            if t not in selected:
+                selected.add(t)
+                used += cost[t]
+
+    for tid, tc in by_id.items():
+        if tc.get("mandatory"):
+            _take(tid)
+    if used > budget:
+        logger.warning(f"Mandatory tests need ~{used:.0f}s, over the {budget:.0f}s budget")
+
+    # Greedy by density; a test's price includes its not-yet-selected ancestors
+    remaining = [tid for tid in by_id if tid not in selected]
+    while remaining:
+        best, best_density = None, -1.0
+        for tid in remaining:
+            group = [t for t in [tid, *_ancestors(tid, by_id)] if t not in selected]
+            g_cost = sum(cost[t] for t in group)
+            if used + g_cost > budget:
+                continue
+            density = sum(value[t] for t in group) / max(g_cost, 0.1)
+            if density > best_density:
+                best, best_density = tid, density
+        if best is None:
+            break
+        _take(best)
+        remaining = [tid for tid in remaining if tid not in selected]
+
+    kept = [tc for tc in candidates if tc["id"] in selected]
+    dropped = [tc["id"] for tc in candidates if tc["id"] not in selected]
+    logger.info(f"Time budget {budget:.0f}s: selected {len(kept)}/{len(tests)} tests "
+                f"(~{used:.0f}s), dropped {len(dropped)}, unsupported {len(unsupported)}")
+
+    cfg = dict(suite_config)
+    cfg["test_suite"] = dict(suite_config["test_suite"])
+    cfg["test_suite"]["tests"] = kept
+    summary = {
+        "budget": budget,
+        "estimated": round(used, 1),
+        "selected": len(kept),
+        "dropped": dropped,
+        "unsupported": unsupported,
+    }
+    return cfg, summary
@@ -0,0 +1,225 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from smoke_test_ai.core.test_runner import TestResult, TestStatus
+from smoke_test_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Fallback estimates (seconds) for tests with no history yet
+_TYPE_DURATIONS = {
+    "adb_check": 1.0,
+    "adb_shell": 1.0,
+    "screenshot_llm": 10.0,
+    "apk_instrumentation": 60.0,
+}
+_PLUGIN_DURATION = 10.0
+# Params that translate directly into wall-clock sleeps inside plugins
+_SLEEP_PARAMS = (
+    "suspend_duration", "stress_duration", "call_duration", "scan_duration",
+    "record_duration", "play_duration", "off_duration", "settle_time",
+    "wait_seconds", "duration",
+)
+
+
+@dataclass
+class Shard:
+    index: int
+    serial: str
+    capabilities: dict = field(default_factory=dict)
+    tests: list[dict] = field(default_factory=list)
+    estimated: float = 0.0
+
+
+def estimate_duration(tc: dict, durations: dict[str, float] | None = None) -> float:
+    """Expected duration of one test: history median, else a type/params heuristic."""
+    if durations and tc.get("id") in durations:
+        return durations[tc["id"]]
+    base = _TYPE_DURATIONS.get(tc.get("type", ""), _PLUGIN_DURATION)
+    params = tc.get("params", {}) or {}
+    slept = sum(float(params[k]) for k in _SLEEP_PARAMS if isinstance(params.get(k), (int, float)))
+    return base + slept
+
+
+def merge_suites(suite_configs: list[dict]) -> dict:
+    """Concatenate several suites into one logical suite (first occurrence of an id wins)."""
+    names, tests, seen = [], [], set()
+    timeout = 0
+    for cfg in suite_configs:
+        suite = cfg.get("test_suite", {})
+        names.append(suite.get("name", ""))
+        timeout += suite.get("timeout", 0)
+        for tc in suite.get("tests", []):
+            if tc["id"] in seen:
+                logger.warning(f"Duplicate test id '{tc['id']}' in '{suite.get('name', '')}', keeping first")
+                continue
+            seen.add(tc["id"])
+            tests.append(tc)
+    return {"test_suite": {"name": " + ".join(n for n in names if n), "timeout": timeout, "tests": tests}}
+
+
+def _dependency_groups(tests: list[dict]) -> list[list[int]]:
+    """Group test indices so every depends_on chain stays in a single group."""
+    index_of = {tc["id"]: i for i, tc in enumerate(tests)}
+    parent = list(range(len(tests)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, tc in enumerate(tests):
+        dep = tc.get("depends_on")
+        if dep in index_of:
+            parent[find(i)] = find(index_of[dep])
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(tests)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def plan_shards(
+    suite_config: dict,
+    serials: list[str],
+    capabilities: dict[str, dict] | None = None,
+    durations: dict[str, float] | None = None,
+) -> list[Shard]:
+    """Split a suite across DUTs, balanced by expected duration.
+
+    Dependency chains are kept together on one shard, and a group that
+    ``requires`` a device capability only goes to shards that have it
+    (if no shard has it, the group is placed anyway and will SKIP there).
+    Within each shard the original suite order is preserved.
+    """
+    capabilities = capabilities or {}
+    tests = suite_config.get("test_suite", {}).get("tests", [])
+    shards = [Shard(index=i, serial=s, capabilities=capabilities.get(s, {}))
+              for i, s in enumerate(serials)]
+    if not shards:
+        raise ValueError("plan_shards needs at least one serial")
+
+    groups = []
+    for members in _dependency_groups(tests):
+        cost = sum(estimate_duration(tests[i], durations) for i in members)
+        needs = {tests[i].get("requires", {}).get("device_capability") for i in members} - {None}
+        groups.append((cost, members, needs))
+
+    # Longest-processing-time-first: biggest groups go to the least loaded eligible shard
+    assigned: dict[int, list[int]] = {s.index: [] for s in shards}
+    for cost, members, needs in sorted(groups, key=lambda g: (-g[0], g[1][0])):
+        eligible = [s for s in shards if all(s.capabilities.get(c, False) for c in needs)] or shards
+        target = min(eligible, key=lambda s: (s.estimated, s.index))
+        target.estimated += cost
+        assigned[target.index].extend(members)
+
+    for shard in shards:
+        shard.tests = [tests[i] for i in sorted(assigned[shard.index])]
+        logger.info(f"Shard {shard.index} ({shard.serial}): {len(shard.tests)} tests, "
+                    f"~{shard.estimated:.0f}s estimated")
+    return shards
+
+
+def shard_suite(suite_config: dict, shard: Shard) -> dict:
+    """Suite config restricted to one shard's tests."""
+    cfg = dict(suite_config)
+    cfg["test_suite"] = dict(suite_config["test_suite"])
+    cfg["test_suite"]["tests"] = shard.tests
+    return cfg
+
+
+def merge_shard_results(suite_config: dict, shard_results: list[list[TestResult]]) -> list[TestResult]:
+    """Merge per-shard results back into original suite order.
+
+    Tests whose shard produced no result (e.g. DUT lost before Stage 3)
+    are reported as ERROR so the merged report always covers the full suite.
+    """
+    by_id = {r.id: r for results in shard_results for r in results}
+    merged = []
+    for tc in suite_config.get("test_suite", {}).get("tests", []):
+        result = by_id.get(tc["id"])
+        if result is None:
+            result = TestResult(id=tc["id"], name=tc["name"], status=TestStatus.ERROR,
+                                message="No result from shard (device unavailable)")
+        merged.append(result)
+    return merged
+
+
+def run_sharded(
+    settings: dict,
+    device_config: dict,
+    suite_config: dict,
+    serials: list[str],
+    max_workers: int | None = None,
+    **run_kwargs,
+) -> list[TestResult]:
+    """Run one logical suite across several identical DUTs and emit one merged report.
+
+    ``device.rack`` in the device config may list per-DUT overrides keyed by
+    serial (e.g. each DUT's ``usb_power.port`` or ``has_sim``)::
+
+        rack:
+          - serial: "SN1"
+            usb_power: {device_serial: "UHB-07", port: 3}
+          - serial: "SN2"
+            has_sim: false
+    """
+    from smoke_test_ai.core.orchestrator import Orchestrator
+
+    if not serials:
+        raise ValueError("run_sharded needs at least one serial")
+    base = device_config["device"]
+    rack = {entry["serial"]: entry for entry in base.get("rack", [])}
+
+    orchestrators: dict[str, Orchestrator] = {}
+    capabilities: dict[str, dict] = {}
+    for serial in serials:
+        dut_cfg = copy.deepcopy(base)
+        dut_cfg.pop("rack", None)
+        dut_cfg.update({k: v for k, v in rack.get(serial, {}).items() if k != "serial"})
+        orch = Orchestrator(settings=settings, device_config={"device": dut_cfg})
+        orchestrators[serial] = orch
+        capabilities[serial] = orch._device_capabilities()
+
+    durations = orchestrators[serials[0]]._get_history().test_durations()
+    shards = plan_shards(suite_config, list(serials), capabilities, durations)
+
+    def _run(shard: Shard) -> list[TestResult]:
+        if not shard.tests:
+            return []
+        try:
+            return orchestrators[shard.serial].run(
+                serial=shard.serial,
+                suite_config=shard_suite(suite_config, shard),
+                report=False,
+                **run_kwargs,
+            )
+        except Exception as e:
+            logger.error(f"Shard {shard.index} ({shard.serial}) failed: {e}")
+            return []
+
+    workers = max_workers or settings.get("parallel", {}).get("max_devices", len(shards))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(shards)))) as pool:
+        shard_results = list(pool.map(_run, shards))
+
+    results = merge_shard_results(suite_config, shard_results)
+
+    # One report for the whole rack, using the first DUT that reached Stage 2
+    lead = next((orchestrators[s.serial] for s in shards
+                 if getattr(orchestrators[s.serial], "_device_info", None)),
+                orchestrators[shards[0].serial])
+    device_info = dict(getattr(lead, "_device_info", None) or {})
+    device_info["shards"] = [
+        {
+            "serial": s.serial,
+            "tests": len(s.tests),
+            "estimated": round(s.estimated, 1),
+            "duration": round(sum(r.duration for r in res), 1),
+        }
+        for s, res in zip(shards, shard_results)
+    ]
+    lead._suite_config = suite_config
+    lead._generate_reports(results, device_info=device_info, suite_config=suite_config)
+    return results
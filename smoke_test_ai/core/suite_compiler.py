@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+import yaml
+
+from smoke_test_ai.core.retry import RetryPolicy
+from smoke_test_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when validation/normalization changes so stale cache entries are ignored
+COMPILER_VERSION = 1
+
+BUILTIN_TYPES = ("adb_check", "adb_shell", "screenshot_llm", "apk_instrumentation")
+PLUGIN_TYPES = ("telephony", "camera", "wifi", "bluetooth", "audio", "network", "charging", "suspend", "perf")
+
+# Keys a test of each type cannot run without (plugins always need `action`)
+_REQUIRED_KEYS = {
+    "adb_check": ("command", "expected"),
+    "adb_shell": ("command",),
+    "screenshot_llm": ("prompt",),
+    "apk_instrumentation": ("package",),
+}
+_RETRY_POLICY_KEYS = set(RetryPolicy.__dataclass_fields__)
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class SuiteValidationError(ValueError):
+    """A test suite failed schema validation; ``errors`` lists every problem found."""
+
+    def __init__(self, source: str, errors: list[str]):
+        self.source = source
+        self.errors = errors
+        lines = "\n".join(f"  - {e}" for e in errors)
+        super().__init__(f"Invalid test suite {source}:\n{lines}")
+
+
+def validate_suite(suite_config: dict, source: str = "<suite>", known_types=None) -> None:
+    """Check suite structure up front so a typo fails at load time, not at test 40.
+
+    Raises SuiteValidationError listing all problems found.
+    """
+    known_types = set(known_types or (*BUILTIN_TYPES, *PLUGIN_TYPES))
+    errors: list[str] = []
+
+    suite = suite_config.get("test_suite") if isinstance(suite_config, dict) else None
+    if not isinstance(suite, dict):
+        raise SuiteValidationError(source, ["missing top-level 'test_suite' mapping"])
+    if not suite.get("name"):
+        errors.append("test_suite.name is required")
+    tests = suite.get("tests")
+    if not isinstance(tests, list):
+        raise SuiteValidationError(source, errors + ["test_suite.tests must be a list"])
+    _check_retry_policy(suite.get("retry_policy"), "test_suite", errors)
+
+    seen: set[str] = set()
+    for i, tc in enumerate(tests):
+        where = f"tests[{i}]"
+        if not isinstance(tc, dict):
+            errors.append(f"{where}: must be a mapping")
+            continue
+        tid = tc.get("id")
+        if not tid:
+            errors.append(f"{where}: 'id' is required")
+        else:
+            where = f"tests[{i}] '{tid}'"
+            if tid in seen:
+                errors.append(f"{where}: duplicate id")
+        if not tc.get("name"):
+            errors.append(f"{where}: 'name' is required")
+
+        test_type = tc.get("type")
+        if test_type not in known_types:
+            errors.append(f"{where}: unknown type '{test_type}'")
+        else:
+            required = _REQUIRED_KEYS.get(test_type, ("action",))
+            for key in required:
+                if key not in tc:
+                    errors.append(f"{where}: type '{test_type}' requires '{key}'")
+
+        if "expected_pattern" in tc:
+            try:
+                re.compile(str(tc["expected_pattern"]))
+            except re.error as e:
+                errors.append(f"{where}: invalid expected_pattern: {e}")
+
+        dep = tc.get("depends_on")
+        if dep is not None and dep not in seen:
+            errors.append(f"{where}: depends_on '{dep}' must be an earlier test id")
+
+        requires = tc.get("requires")
+        if requires is not None and not isinstance(requires, dict):
+            errors.append(f"{where}: 'requires' must be a mapping")
+        if "params" in tc and not isinstance(tc["params"], dict):
+            errors.append(f"{where}: 'params' must be a mapping")
+        _check_retry_policy(tc.get("retry_policy"), where, errors)
+
+        if tid:
+            seen.add(tid)
+
+    if errors:
+        raise SuiteValidationError(source, errors)
+
+
+def _check_retry_policy(policy, where: str, errors: list[str]) -> None:
+    if policy is None:
+        return
+    if not isinstance(policy, dict):
+        errors.append(f"{where}: 'retry_policy' must be a mapping")
+        return
+    unknown = set(policy) - _RETRY_POLICY_KEYS
+    if unknown:
+        errors.append(f"{where}: unknown retry_policy keys: {', '.join(sorted(unknown))}")
+
+
+def _cache_key(content: bytes) -> str:
+    h = hashlib.sha256()
+    h.update(content)
+    h.update(f"|v{COMPILER_VERSION}|{','.join(BUILTIN_TYPES + PLUGIN_TYPES)}".encode())
+    return h.hexdigest()[:16]
+
+
+def load_suite_file(path: Path, cache_dir: Path | str | None = None) -> dict:
+    """Parse and validate a suite YAML, reusing a cached copy when the file is unchanged.
+
+    The cache stores the validated suite *before* ``${VAR}`` expansion, keyed
+    by a hash of the file content and the compiler version, so secrets from
+    the environment never land on disk and env changes need no invalidation.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Config file not found: {path}")
+    content = path.read_bytes()
+
+    cache_file = None
+    if cache_dir:
+        cache_file = Path(cache_dir) / f"{path.stem}-{_cache_key(content)}.json"
+        if cache_file.exists():
+            try:
+                return json.loads(cache_file.read_text())
+            except (OSError, json.JSONDecodeError):
+                logger.warning(f"Ignoring corrupt suite cache {cache_file}")
+
+    data = yaml.load(content, Loader=_YAML_LOADER) or {}
+    validate_suite(data, source=str(path))
+
+    if cache_file:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            payload = json.dumps(data, ensure_ascii=False)
+            tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(payload)
+            tmp.replace(cache_file)
+        except TypeError:
+            pass  # YAML-only types (dates, ...) would not round-trip through JSON
+        except OSError as e:
+            logger.warning(f"Could not write suite cache {cache_file}: {e}")
+    return data
+
+
+def default_cache_dir() -> Path:
+    """``$SMOKE_TEST_CACHE_DIR/suites`` or ``~/.cache/smoke-test-ai/suites``."""
+    base = os.environ.get("SMOKE_TEST_CACHE_DIR") or Path.home() / ".cache" / "smoke-test-ai"
+    return Path(base) / "suites"
@@ -1,7 +1,8 @@
 import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from smoke_test_ai.core.retry import RetryPolicy
 from smoke_test_ai.drivers.adb_controller import AdbController
 from smoke_test_ai.utils.logger import get_logger
 
@@ -12,6 +13,7 @@ class TestStatus(Enum):
     FAIL = "FAIL"
     SKIP = "SKIP"
     ERROR = "ERROR"
+    FLAKY = "FLAKY"  # passed, but only after one or more retries
 
 @dataclass
 class TestResult:
@@ -21,13 +23,15 @@ class TestResult:
     message: str = ""
     duration: float = 0.0
     screenshot_path: str | None = None
+    attempts: int = 1
+    metrics: dict = field(default_factory=dict)  # structured measurements (timings, percentiles, ...)
 
     @property
     def passed(self) -> bool:
-        return self.status == TestStatus.PASS
+        return self.status in (TestStatus.PASS, TestStatus.FLAKY)
 
     def to_dict(self) -> dict:
-        return {"id": self.id, "name": self.name, "status": self.status.value, "message": self.message, "duration": self.duration, "screenshot_path": self.screenshot_path}
+        return {"id": self.id, "name": self.name, "status": self.status.value, "message": self.message, "duration": self.duration, "screenshot_path": self.screenshot_path, "attempts": self.attempts, "metrics": self.metrics}
 
 class TestRunner:
     def __init__(self, adb: AdbController, visual_analyzer=None, screen_capture=None, webcam_capture=None, device_capabilities: dict | None = None, plugins: dict | None = None):
@@ -37,16 +41,29 @@ class TestRunner:
         self.webcam_capture = webcam_capture
         self.device_capabilities = device_capabilities or {}
         self._plugins = plugins or {}
+        self._suite_retry_policy: dict | None = None
+        self._patterns: dict[str, re.Pattern] = {}
+        self._builtin = {
+            "adb_check": self._run_adb_check,
+            "adb_shell": self._run_adb_shell,
+            "screenshot_llm": self._run_screenshot_llm,
+            "apk_instrumentation": self._run_apk_instrumentation,
+        }
 
     def run_suite(self, suite_config: dict) -> list[TestResult]:
         suite = suite_config["test_suite"]
         logger.info(f"Running test suite: {suite['name']}")
+        self._suite_retry_policy = suite.get("retry_policy")
+        # Compile every expected_pattern once, before the first test runs
+        for tc in suite["tests"]:
+            if "expected_pattern" in tc:
+                self._pattern(tc["expected_pattern"])
         results = []
         completed: dict[str, TestStatus] = {}
         for test_case in suite["tests"]:
             # depends_on: skip if dependency failed
             dep = test_case.get("depends_on")
-            if dep and completed.get(dep) not in (TestStatus.PASS, None):
+            if dep and completed.get(dep) not in (TestStatus.PASS, TestStatus.FLAKY, None):
                 result = TestResult(
                     id=test_case["id"],
                     name=test_case["name"],
@@ -69,7 +86,6 @@ class TestRunner:
     def run_test(self, test_case: dict) -> TestResult:
         test_id = test_case["id"]
         test_name = test_case["name"]
-        test_type = test_case["type"]
 
         # requires: check device capabilities
         requires = test_case.get("requires", {})
@@ -77,48 +93,80 @@ class TestRunner:
         if cap_key and not self.device_capabilities.get(cap_key, False):
             return TestResult(id=test_id, name=test_name, status=TestStatus.SKIP, message=f"Skipped: device lacks '{cap_key}'")
 
-        max_attempts = test_case.get("retry", 1)
-        retry_delay = test_case.get("retry_delay", 0)
+        policy = RetryPolicy.from_test_case(test_case, self._suite_retry_policy)
 
         start_time = time.time()
         result = None
-        for attempt in range(max_attempts):
+        attempt = 0
+        while True:
             try:
-                if test_type == "adb_check":
-                    result = self._run_adb_check(test_case)
-                elif test_type == "adb_shell":
-                    result = self._run_adb_shell(test_case)
-                elif test_type == "screenshot_llm":
-                    result = self._run_screenshot_llm(test_case)
-                elif test_type == "apk_instrumentation":
-                    result = self._run_apk_instrumentation(test_case)
-                elif test_type in self._plugins:
-                    from smoke_test_ai.plugins.base import PluginContext
-                    ctx = PluginContext(
-                        adb=self.adb,
-                        settings=getattr(self, '_settings', {}),
-                        device_capabilities=self.device_capabilities,
-                        snippet=getattr(self, '_snippet', None),
-                        peer_snippet=getattr(self, '_peer_snippet', None),
-                        visual_analyzer=self.visual_analyzer,
-                        usb_power=getattr(self, '_usb_power', None),
-                    )
-                    result = self._plugins[test_type].execute(test_case, ctx)
-                else:
-                    result = TestResult(id=test_id, name=test_name, status=TestStatus.ERROR, message=f"Unknown test type: {test_type}")
+                result = self._execute_once(test_case)
             except Exception as e:
                 result = TestResult(id=test_id, name=test_name, status=TestStatus.ERROR, message=str(e))
 
-            # Only retry on FAIL (not ERROR or PASS)
-            if result.status != TestStatus.FAIL or attempt >= max_attempts - 1:
+            if not policy.should_retry(result.status.value, result.message, attempt):
+                break
+            delay = policy.delay(attempt)
+            logger.info(f"  Retry {attempt + 1}/{policy.max_attempts - 1} for '{test_name}' "
+                        f"({result.status.value}) after {delay:.1f}s")
+            if delay > 0:
+                time.sleep(delay)
+            if policy.health_check and not self._recover_device(test_case, policy):
+                result.message = f"{result.message} | device unhealthy, retries aborted"
                 break
-            logger.info(f"  Retry {attempt + 1}/{max_attempts - 1} for '{test_name}' after {retry_delay}s")
-            if retry_delay > 0:
-                time.sleep(retry_delay)
+            attempt += 1
 
+        result.attempts = attempt + 1
+        if result.status == TestStatus.PASS and attempt > 0:
+            result.status = TestStatus.FLAKY
+            result.message = f"[passed on attempt {attempt + 1}/{policy.max_attempts}] {result.message}".rstrip()
         result.duration = time.time() - start_time
         return result
 
+    def _execute_once(self, test_case: dict) -> TestResult:
+        test_type = test_case["type"]
+        handler = self._builtin.get(test_type)
+        if handler:
+            return handler(test_case)
+        if test_type in self._plugins:
+            from smoke_test_ai.plugins.base import PluginContext
+            ctx = PluginContext(
+                adb=self.adb,
+                settings=getattr(self, '_settings', {}),
+                device_capabilities=self.device_capabilities,
+                snippet=getattr(self, '_snippet', None),
+                peer_snippet=getattr(self, '_peer_snippet', None),
+                visual_analyzer=self.visual_analyzer,
+                usb_power=getattr(self, '_usb_power', None),
+                history=getattr(self, '_history', None),
+            )
+            return self._plugins[test_type].execute(test_case, ctx)
+        return TestResult(id=test_case["id"], name=test_case["name"], status=TestStatus.ERROR, message=f"Unknown test type: {test_type}")
+
+    def _recover_device(self, test_case: dict, policy: RetryPolicy) -> bool:
+        """Health probe between attempts: wait for ADB + boot, re-establish snippet session.
+
+        Returns False if the device did not come back within ``policy.health_timeout``.
+        """
+        try:
+            if not self.adb.is_connected():
+                logger.warning("  Device not connected, waiting before retry...")
+                if not self.adb.wait_for_device(timeout=policy.health_timeout):
+                    return False
+            boot = self.adb.shell("getprop sys.boot_completed")
+            if boot.stdout.strip() != "1":
+                logger.warning("  Device not boot-completed, waiting before retry...")
+                if not self.adb.wait_for_boot(timeout=policy.health_timeout):
+                    return False
+        except Exception as e:
+            logger.warning(f"  Device health probe failed: {e}")
+            return False
+
+        # Snippet session dies with USB hiccups — reload it for plugin tests
+        if test_case.get("type") in self._plugins and getattr(self, '_snippet', None) is not None:
+            self._reconnect_snippet()
+        return True
+
     def _reconnect_snippet(self):
         """Reconnect Mobly snippet after USB power cycle."""
         old_dut = getattr(self, '_mobly_dut', None)
@@ -142,6 +190,12 @@ class TestRunner:
         except Exception as e:
             logger.warning(f"Failed to reconnect Mobly snippet: {e}")
 
+    def _pattern(self, pattern: str) -> re.Pattern:
+        compiled = self._patterns.get(pattern)
+        if compiled is None:
+            compiled = self._patterns[pattern] = re.compile(pattern)
+        return compiled
+
     def _run_adb_check(self, tc: dict) -> TestResult:
         proc = self.adb.shell(tc["command"])
         actual = proc.stdout.strip()
@@ -163,7 +217,7 @@ class TestRunner:
                 return TestResult(id=tc["id"], name=tc["name"], status=TestStatus.PASS)
             return TestResult(id=tc["id"], name=tc["name"], status=TestStatus.FAIL, message=f"Output contains '{tc['expected_not_contains']}' | actual: {actual_snippet}")
         if "expected_pattern" in tc:
-            if re.search(tc["expected_pattern"], output):
+            if self._pattern(tc["expected_pattern"]).search(output):
                 return TestResult(id=tc["id"], name=tc["name"], status=TestStatus.PASS)
             return TestResult(id=tc["id"], name=tc["name"], status=TestStatus.FAIL, message=f"Output does not match pattern '{tc['expected_pattern']}' | actual: {actual_snippet}")
         if proc.returncode == 0:
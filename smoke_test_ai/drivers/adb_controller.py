@@ -1,3 +1,4 @@
+import hashlib
 import subprocess
 import time
 from pathlib import Path
@@ -5,6 +6,8 @@ from smoke_test_ai.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+WIFI_MILESTONES = ("associated", "ip", "validated")
+
 
 class AdbController:
     def __init__(self, serial: str | None = None, adb_path: str = "adb"):
@@ -84,6 +87,13 @@ class AdbController:
     def screencap(self, output_path: Path) -> None:
         self._run("exec-out", "screencap", "-p", timeout=10)
 
+    def exec_out(self, command: str, timeout: int = 30) -> bytes:
+        """Run a device command and return its raw stdout (binary-safe, no pty); b"" on failure."""
+        cmd = self._build_cmd("exec-out", command)
+        logger.debug(f"ADB: {' '.join(cmd)}")
+        result = subprocess.run(cmd, capture_output=True, timeout=timeout)
+        return result.stdout if result.returncode == 0 else b""
+
     def install(self, apk_path: str) -> subprocess.CompletedProcess:
         return self._run("install", "-r", apk_path, timeout=120)
 
@@ -91,6 +101,34 @@ class AdbController:
         """Pull a file from device to local filesystem."""
         return self._run("pull", remote_path, local_path, timeout=30)
 
+    def push(self, local_path: str, remote_path: str) -> subprocess.CompletedProcess:
+        """Push a local file to the device."""
+        return self._run("push", local_path, remote_path, timeout=60)
+
+    def push_cached(self, local_path: Path | str, remote_path: str, executable: bool = True) -> bool:
+        """Push a tool binary unless the device copy already has the same SHA-256.
+
+        Returns True when ``remote_path`` holds the local file afterwards.
+        """
+        digest = hashlib.sha256(Path(local_path).read_bytes()).hexdigest()
+        result = self.shell(f"sha256sum {remote_path} 2>/dev/null")
+        if result.stdout.split()[:1] == [digest]:
+            return True
+        if self.push(str(local_path), remote_path).returncode != 0:
+            logger.warning(f"Failed to push {local_path} to {remote_path}")
+            return False
+        if executable:
+            self.shell(f"chmod 755 {remote_path}")
+        logger.info(f"Pushed {Path(local_path).name} to {remote_path}")
+        return True
+
+    def reverse(self, device_port: int, host_port: int) -> subprocess.CompletedProcess:
+        """Forward device ``localhost:device_port`` to host ``localhost:host_port`` over USB."""
+        return self._run("reverse", f"tcp:{device_port}", f"tcp:{host_port}", timeout=10)
+
+    def reverse_remove(self, device_port: int) -> subprocess.CompletedProcess:
+        return self._run("reverse", "--remove", f"tcp:{device_port}", timeout=10)
+
     def _wait_wifi_subsystem(self, timeout: int = 30) -> bool:
         """Wait for WiFi subsystem (WifiService) to be ready after boot/reset."""
         logger.info("Waiting for WiFi subsystem to be ready...")
@@ -123,7 +161,7 @@ class AdbController:
         return False
 
     def connect_wifi(self, ssid: str, password: str, security: str = "wpa2",
-                     retries: int = 3, wifi_timeout: int = 15) -> bool:
+                     retries: int = 3, wifi_timeout: int = 15, connect_timeout: int = 15) -> bool:
         """Enable WiFi, connect to network, and verify connection. Returns True if connected."""
         # Wait for WiFi subsystem to be ready (critical after factory reset)
         self._wait_wifi_subsystem(timeout=wifi_timeout)
@@ -132,21 +170,64 @@ class AdbController:
             logger.error("Cannot connect WiFi: failed to enable WiFi adapter")
             return False
 
+        if password:
+            connect_cmd = f'cmd wifi connect-network "{ssid}" {security} "{password}"'
+        else:
+            connect_cmd = f'cmd wifi connect-network "{ssid}" open'
         for attempt in range(1, retries + 1):
             logger.info(f"Connecting to WiFi '{ssid}' (attempt {attempt}/{retries})...")
-            if password:
-                self.shell(f'cmd wifi connect-network "{ssid}" {security} "{password}"', timeout=30)
-            else:
-                self.shell(f'cmd wifi connect-network "{ssid}" open', timeout=30)
-            # Wait for connection
-            time.sleep(5)
-            if self.is_wifi_connected():
-                logger.info(f"WiFi connected to '{ssid}'")
+            milestones = self.wait_wifi_milestones(connect_cmd, until="ip", timeout=connect_timeout)
+            if "ip" in milestones:
+                logger.info(f"WiFi connected to '{ssid}' in {milestones['ip']:.1f}s")
                 return True
-            logger.warning(f"WiFi not connected after attempt {attempt}")
+            logger.warning(f"WiFi not connected after attempt {attempt} "
+                           f"(reached: {', '.join(milestones) or 'nothing'})")
         logger.error(f"Failed to connect to WiFi '{ssid}' after {retries} attempts")
         return False
 
+    def wait_wifi_milestones(self, start_cmd: str = "", until: str = "ip",
+                             timeout: float = 15, poll: float = 0.1) -> dict[str, float]:
+        """Run ``start_cmd`` on the DUT and time WiFi connection milestones from it.
+
+        Milestones: ``associated`` (supplicant COMPLETED), ``ip`` (WifiInfo has
+        an address) and ``validated`` (connectivity marks the WiFi network
+        VALIDATED). Polling runs in one device shell every ``poll`` seconds,
+        stamped with /proc/uptime, so results have sub-second resolution
+        without ADB round-trips. Returns seconds since ``start_cmd`` for each
+        milestone reached before ``until`` was reached or ``timeout`` expired.
+        """
+        stop = {"associated": "$a", "ip": "$i", "validated": "$v"}[until]
+        check_validated = ('  if [ -n "$i" ] && [ -z "$v" ] && dumpsys connectivity 2>/dev/null '
+                           '| grep -q "Transports: WIFI.*VALIDATED"; then v=1; echo "validated $now"; fi'
+                           if until == "validated" else "")
+        script = "\n".join([
+            "read t0 _ < /proc/uptime",
+            f"{start_cmd} >/dev/null 2>&1" if start_cmd else ":",
+            f"end=$(( ${{t0%.*}} + {int(timeout) + 1} )); a=; i=; v=",
+            "while :; do",
+            "  read now _ < /proc/uptime; st=$(cmd wifi status 2>/dev/null)",
+            '  if [ -z "$a" ]; then case "$st" in *"Supplicant state: COMPLETED"*) a=1; echo "associated $now";; esac; fi',
+            '  if [ -n "$a" ] && [ -z "$i" ]; then case "$st" in *"IP: /"[0-9]*) i=1; echo "ip $now";; esac; fi',
+            check_validated,
+            f'  [ -n "{stop}" ] && break; [ "${{now%.*}}" -ge "$end" ] && break',
+            f"  sleep {poll}",
+            "done",
+            'echo "start $t0"',
+        ])
+        result = self.shell(script, timeout=int(timeout) + 30)
+        stamps = {}
+        for line in (result.stdout or "").splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[0] in (*WIFI_MILESTONES, "start"):
+                try:
+                    stamps[parts[0]] = float(parts[1])
+                except ValueError:
+                    pass
+        t0 = stamps.pop("start", None)
+        if t0 is None:
+            return {}
+        return {k: round(stamps[k] - t0, 2) for k in WIFI_MILESTONES if k in stamps}
+
     def is_wifi_connected(self) -> bool:
         """Check if WiFi is connected with an IP address."""
         result = self.shell("dumpsys wifi | grep 'Wi-Fi is'")
@@ -6,6 +6,7 @@ from smoke_test_ai.plugins.bluetooth import BluetoothPlugin
 from smoke_test_ai.plugins.audio import AudioPlugin
 from smoke_test_ai.plugins.network import NetworkPlugin
 from smoke_test_ai.plugins.charging import ChargingPlugin
+from smoke_test_ai.plugins.perf import PerfPlugin
 
 __all__ = [
     "TestPlugin",
@@ -17,4 +18,5 @@ __all__ = [
     "AudioPlugin",
     "NetworkPlugin",
     "ChargingPlugin",
+    "PerfPlugin",
 ]
@@ -1,9 +1,22 @@
+import math
+import os
+import shlex
+import tempfile
 import time
 
 from smoke_test_ai.core.test_runner import TestResult, TestStatus
 from smoke_test_ai.plugins.base import TestPlugin, PluginContext
+from smoke_test_ai.utils.audio_analysis import (
+    DEFAULT_TONES, analyze_loopback, make_stimulus, read_wav, write_wav,
+)
 
 AUDIO_REMOTE_PATH = "/sdcard/smoke_test_audio.ogg"
+LOOPBACK_PLAY_PATH = "/data/local/tmp/smoke_test_loopback_play.wav"
+LOOPBACK_REC_PATH = "/data/local/tmp/smoke_test_loopback_rec.wav"
+# tinyalsa tools ship on userdebug/eng builds; override per device when the
+# speaker/mic need a specific card/device (-D/-d) or a different recorder.
+LOOPBACK_RECORD_CMD = "tinycap {path} -r {rate} -c 1 -b 16 -T {seconds}"
+LOOPBACK_PLAY_CMD = "tinyplay {path}"
 
 # Minimal valid OGG/Vorbis silent tone (~1 second) encoded as hex.
 # Generated from: ffmpeg -f lavfi -i "sine=frequency=440:duration=1" -c:a libvorbis -q:a 0 out.ogg
@@ -33,6 +46,8 @@ class AudioPlugin(TestPlugin):
             return self._list_devices(test_case, context)
         if action == "audio_route":
             return self._audio_route(test_case, context)
+        if action == "loopback":
+            return self._loopback(test_case, context)
         return TestResult(
             id=test_case["id"], name=test_case["name"],
             status=TestStatus.ERROR,
@@ -182,3 +197,80 @@ class AudioPlugin(TestPlugin):
 
         return TestResult(id=tid, name=tname, status=TestStatus.PASS,
                           message=f"Audio route: {route_name} (type: {route_type})")
+
+    def _loopback(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Play a generated multi-tone WAV on the speaker while recording the mic.
+
+        The recording is pulled into memory and analysed on the host: a chirp
+        marker located by cross-correlation gives the round-trip latency and
+        aligns the tone block, whose spectrum gives tone presence, SNR and THD.
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        sample_rate = params.get("sample_rate", 48000)
+        play_delay = params.get("play_delay", 0.5)
+        record_cmd = params.get("record_cmd", LOOPBACK_RECORD_CMD)
+        play_cmd = params.get("play_cmd", LOOPBACK_PLAY_CMD)
+        adb = ctx.adb
+
+        tools = {record_cmd.split()[0], play_cmd.split()[0]}
+        result = adb.shell(" ; ".join(f"command -v {t} >/dev/null || echo missing:{t}" for t in sorted(tools)))
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        missing = [line.split(":", 1)[1] for line in out.splitlines() if line.startswith("missing:")]
+        if missing:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message=f"Loopback tools not on device: {', '.join(missing)}")
+
+        stimulus = make_stimulus(
+            tones=params.get("tones", DEFAULT_TONES),
+            duration=params.get("tone_duration", 1.0),
+            sample_rate=sample_rate,
+            amplitude=params.get("amplitude", 0.5),
+        )
+        seconds = math.ceil(play_delay + len(stimulus.samples) / sample_rate + 1)
+        fd, local = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            write_wav(local, stimulus.samples, sample_rate)
+            adb.push(local, LOOPBACK_PLAY_PATH)
+        finally:
+            os.unlink(local)
+
+        rec = record_cmd.format(path=LOOPBACK_REC_PATH, rate=sample_rate, seconds=seconds)
+        play = play_cmd.format(path=LOOPBACK_PLAY_PATH, rate=sample_rate)
+        # Both sides run in one device shell so the play offset is not skewed by ADB latency
+        script = (f"rm -f {LOOPBACK_REC_PATH}; {rec} >/dev/null 2>&1 & "
+                  f"sleep {play_delay}; {play} >/dev/null 2>&1; wait")
+        try:
+            adb.shell(f"sh -c {shlex.quote(script)}", timeout=seconds + 15)
+            data = adb.exec_out(f"cat {LOOPBACK_REC_PATH}", timeout=30)
+        finally:
+            adb.shell(f"rm -f {LOOPBACK_PLAY_PATH} {LOOPBACK_REC_PATH}")
+
+        if not data:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message="No recording produced by the device")
+        try:
+            recording, rec_rate = read_wav(data)
+        except (ValueError, EOFError) as e:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Unreadable recording: {e}")
+
+        report = analyze_loopback(recording, rec_rate, stimulus,
+                                  thresholds=params.get("thresholds"), play_offset=play_delay)
+        metrics = report.metrics
+        if report.passed:
+            return TestResult(
+                id=tid, name=tname, status=TestStatus.PASS,
+                message=(f"Loopback OK: {len(stimulus.tones)} tones, SNR {metrics['snr_db']} dB, "
+                         f"max THD {max(t['thd_pct'] for t in metrics['tones'])}%, "
+                         f"latency {metrics['latency_ms']} ms"),
+                metrics=metrics,
+            )
+        path = ctx.artifact_path(f"{tid}_loopback.wav")
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            metrics["artifacts"] = [str(path)]
+        return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                          message=f"Loopback failed: {'; '.join(report.reasons)}", metrics=metrics)
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from pathlib import Path
 
 from smoke_test_ai.core.test_runner import TestResult
 from smoke_test_ai.drivers.adb_controller import AdbController
@@ -14,6 +15,17 @@ class PluginContext:
     peer_snippet: object | None = None
     visual_analyzer: object | None = None
     usb_power: object | None = None
+    history: object | None = None  # RunHistory of this product, for baselines
+
+    def artifact_path(self, filename: str) -> Path | None:
+        """Path under ``<reporting.output_dir>/artifacts/`` for files kept with the run report.
+
+        Returns None when reporting is not configured (e.g. ad-hoc plugin use).
+        """
+        report_cfg = self.settings.get("reporting")
+        if not report_cfg:
+            return None
+        return Path(report_cfg.get("output_dir", "results/")) / "artifacts" / filename
 
 
 class TestPlugin(ABC):
@@ -1,7 +1,69 @@
 import time
+from dataclasses import dataclass
 
 from smoke_test_ai.core.test_runner import TestResult, TestStatus
 from smoke_test_ai.plugins.base import TestPlugin, PluginContext
+from smoke_test_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class BleDeviceStats:
+    """Running per-address aggregates; O(1) memory however many adverts arrive."""
+
+    address: str
+    name: str = ""
+    count: int = 0
+    rssi_min: int = 0
+    rssi_max: int = 0
+    rssi_sum: int = 0
+    first_ns: int | None = None
+    last_ns: int | None = None
+
+    def add(self, rssi: int | None, timestamp_ns: int | None, name: str = "") -> None:
+        if name:
+            self.name = name
+        if rssi is not None:
+            if self.count == 0:
+                self.rssi_min = self.rssi_max = rssi
+            self.rssi_min = min(self.rssi_min, rssi)
+            self.rssi_max = max(self.rssi_max, rssi)
+            self.rssi_sum += rssi
+        self.count += 1
+        if timestamp_ns is not None:
+            if self.first_ns is None:
+                self.first_ns = timestamp_ns
+            self.last_ns = timestamp_ns
+
+    def to_dict(self) -> dict:
+        interval = None
+        if self.count > 1 and self.first_ns is not None and self.last_ns != self.first_ns:
+            interval = round((self.last_ns - self.first_ns) / (self.count - 1) / 1e6, 1)
+        return {
+            "address": self.address,
+            "name": self.name,
+            "adverts": self.count,
+            "rssi_min": self.rssi_min,
+            "rssi_mean": round(self.rssi_sum / self.count, 1) if self.count else None,
+            "rssi_max": self.rssi_max,
+            "adv_interval_ms": interval,
+        }
+
+
+def parse_scan_event(data: dict) -> tuple[str, str, int | None, int | None]:
+    """(address, name, rssi, timestamp_ns) from an ``onScanResult`` event.
+
+    Accepts the bundled snippet layout (``result.Device.Address``,
+    ``result.Rssi``, ``result.TimestampNanos``) and flat dicts.
+    """
+    result = data.get("result", data) if isinstance(data, dict) else {}
+    device = result.get("Device") or result.get("device") or result
+    address = device.get("Address") or device.get("address") or ""
+    name = device.get("Name") or device.get("name") or ""
+    rssi = result.get("Rssi", result.get("rssi"))
+    ts = result.get("TimestampNanos", result.get("timestampNanos"))
+    return address.upper(), name, rssi, ts
 
 
 class BluetoothPlugin(TestPlugin):
@@ -34,6 +96,9 @@ class BluetoothPlugin(TestPlugin):
                               message="Snippet not available")
         params = tc.get("params", {})
         scan_duration = params.get("scan_duration", 5)
+        if params.get("stream") or params.get("target_address") or params.get("target_name") \
+                or params.get("min_devices"):
+            return self._ble_scan_stream(tc, ctx)
 
         # bleStartScan is @AsyncRpc — Mobly handles the callbackId internally.
         # Required args: scanFilters (JSONArray), scanSettings (JSONObject).
@@ -68,6 +133,96 @@ class BluetoothPlugin(TestPlugin):
         return TestResult(id=tid, name=tname, status=TestStatus.PASS,
                           message=f"BLE scan completed, found {count} devices")
 
+    def _ble_scan_stream(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Consume scan callbacks as they arrive, aggregating per address.
+
+        Ends at ``scan_duration`` or as soon as ``target_address`` /
+        ``target_name`` is seen or ``min_devices`` distinct devices were found.
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        scan_duration = params.get("scan_duration", 5)
+        target_address = (params.get("target_address") or "").upper()
+        target_name = params.get("target_name")
+        min_devices = params.get("min_devices")
+        top_n = params.get("report_devices", 20)
+
+        devices: dict[str, BleDeviceStats] = {}
+        events = 0
+        stop_reason = ""
+        target = None
+        handler = None
+        start = time.monotonic()
+        try:
+            handler = ctx.snippet.bleStartScan([], {})
+            deadline = start + scan_duration
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    event = handler.waitAndGet("onScanResult", timeout=min(remaining, 1.0))
+                except Exception as e:
+                    # Mobly's callback timeout classes differ by version; all are *Timeout*
+                    if "Timeout" in type(e).__name__:
+                        continue
+                    raise
+                address, name, rssi, ts = parse_scan_event(event.data)
+                if not address:
+                    continue
+                events += 1
+                stats = devices.get(address)
+                if stats is None:
+                    stats = devices[address] = BleDeviceStats(address)
+                stats.add(rssi, ts, name)
+                if (target_address and address == target_address) or \
+                        (target_name and stats.name == target_name):
+                    target, stop_reason = stats, "target found"
+                    break
+                if min_devices and len(devices) >= min_devices:
+                    stop_reason = f"{min_devices} devices found"
+                    break
+        except Exception as e:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"BLE scan failed: {e}")
+        finally:
+            try:
+                callback_id = handler.callback_id if handler else None
+                if callback_id:
+                    ctx.snippet.bleStopScan(callback_id)
+            except Exception:
+                pass
+
+        elapsed = round(time.monotonic() - start, 2)
+        ranked = sorted(devices.values(), key=lambda d: d.rssi_max, reverse=True)
+        metrics = {
+            "devices": len(devices),
+            "adverts": events,
+            "elapsed_s": elapsed,
+            "early_exit": bool(stop_reason),
+            "top_devices": [d.to_dict() for d in ranked[:top_n]],
+        }
+        if target is not None:
+            metrics["target"] = target.to_dict()
+        logger.info(f"BLE scan: {len(devices)} devices, {events} adverts in {elapsed}s"
+                    + (f" ({stop_reason})" if stop_reason else ""))
+
+        wanted = target_address or target_name
+        if wanted and target is None:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Target {wanted} not seen in {elapsed}s "
+                                      f"({len(devices)} other devices)", metrics=metrics)
+        if min_devices and len(devices) < min_devices:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Only {len(devices)}/{min_devices} BLE devices in {elapsed}s",
+                              metrics=metrics)
+        if target is not None:
+            t = metrics["target"]
+            return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                              message=f"Target {wanted} found in {elapsed}s "
+                                      f"(RSSI {t['rssi_mean']} dBm, {t['adverts']} adverts)",
+                              metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"BLE scan found {len(devices)} devices ({events} adverts) in {elapsed}s",
+                          metrics=metrics)
+
     def _toggle(self, tc: dict, ctx: PluginContext) -> TestResult:
         tid, tname = tc["id"], tc["name"]
         if not ctx.snippet:
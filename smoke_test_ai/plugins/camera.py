@@ -1,8 +1,10 @@
 import re
-import tempfile
+import shlex
 import time
 from pathlib import Path
 
+import numpy as np
+
 try:
     import cv2
 except ImportError:
@@ -10,8 +12,23 @@ except ImportError:
 
 from smoke_test_ai.core.test_runner import TestResult, TestStatus
 from smoke_test_ai.plugins.base import TestPlugin, PluginContext
+from smoke_test_ai.utils.image_quality import AMBIGUOUS, PASS, assess_image, downscale
+from smoke_test_ai.utils.logger import get_logger
+from smoke_test_ai.utils.stats import exceeded_thresholds, history_regressions, summarize
+
+logger = get_logger(__name__)
 
 DCIM_PATH = "/sdcard/DCIM/Camera"
+PHOTO_DIRS = (DCIM_PATH, "/sdcard/DCIM", "/sdcard/Pictures")
+VIDEO_DIRS = (DCIM_PATH, "/sdcard/DCIM", "/sdcard/Movies")
+PHOTO_EXTENSIONS = ("jpg", "jpeg", "png")
+VIDEO_EXTENSIONS = ("mp4", "3gp")
+CAMERA_LAUNCHERS = (
+    "org.codeaurora.snapcam/com.android.camera.CameraLauncher",
+    "com.android.camera2/com.android.camera.CameraLauncher",
+)
+DEFAULT_VERIFY_PROMPT = "Is the photo clear, not black, not white?"
+VERIFY_MAX_DIM = 1024  # longest side of the copy analysed / sent to the vision model
 
 
 class CameraPlugin(TestPlugin):
@@ -26,6 +43,8 @@ class CameraPlugin(TestPlugin):
             return self._verify_latest_photo(test_case, context)
         if action == "record_video":
             return self._record_video(test_case, context)
+        if action == "camera_latency":
+            return self._camera_latency(test_case, context)
         return TestResult(
             id=test_case["id"], name=test_case["name"],
             status=TestStatus.ERROR,
@@ -38,6 +57,7 @@ class CameraPlugin(TestPlugin):
         params = tc.get("params", {})
         camera = params.get("camera", "back")
         wait_seconds = params.get("wait_seconds", 5)
+        shutter_timeout = params.get("shutter_timeout", 3)
         adb = ctx.adb
 
         # Skip front camera test if device has fewer than 2 cameras
@@ -78,65 +98,91 @@ class CameraPlugin(TestPlugin):
                            f"--ei android.intent.extras.CAMERA_FACING {camera_id}")
             time.sleep(5)
 
-            # 3. Trigger shutter — try dedicated camera key first, then volume
-            shutter_keys = ["KEYCODE_CAMERA", "KEYCODE_VOLUME_DOWN"]
-            for key in shutter_keys:
+            # 3. Trigger shutter — dedicated camera key first, volume key only if
+            #    no photo lands; each waits on the device for the finished file
+            media = None
+            for key, timeout in (("KEYCODE_CAMERA", shutter_timeout),
+                                 ("KEYCODE_VOLUME_DOWN", wait_seconds + 5)):
                 adb.shell(f"input keyevent {key}")
-                time.sleep(1)
-
-            if wait_seconds > 0:
-                time.sleep(wait_seconds)
-
-            # 4. Find new photo files created after the marker
-            found = self._find_new_photo(adb, marker)
-
-            # 5. Retry once if not found — wait longer and check again
-            if not found:
-                time.sleep(5)
-                found = self._find_new_photo(adb, marker)
+                media = self._wait_for_new_media(adb, marker, PHOTO_DIRS,
+                                                 PHOTO_EXTENSIONS, timeout)
+                if media and media["size"]:
+                    break
 
             # Clean up marker
             adb.shell(f"rm -f {marker}")
 
-            if not found:
+            if not media:
                 return TestResult(
                     id=tid, name=tname, status=TestStatus.FAIL,
                     message="No new photo after capture attempt",
                 ), ""
 
-            # 6. Check file size > 0
-            size_out = adb.shell(f"stat -c %s '{found}'").stdout.strip()
-            try:
-                size = int(size_out)
-            except ValueError:
-                size = 0
+            found, size = media["path"], media["size"]
             if size == 0:
                 return TestResult(
                     id=tid, name=tname, status=TestStatus.FAIL,
                     message=f"Photo {found} has zero bytes",
                 ), ""
-
             filename = Path(found).name
             return TestResult(
                 id=tid, name=tname, status=TestStatus.PASS,
                 message=f"Captured {filename} ({size} bytes, {camera} camera)",
+                metrics={"file_written_s": media["appeared_s"]},
             ), found
         finally:
             adb.shell("am force-stop org.codeaurora.snapcam 2>/dev/null; "
                        "am force-stop com.android.camera2 2>/dev/null")
 
-    def _find_new_photo(self, adb, marker: str) -> str:
-        """Find the newest photo file created after the marker timestamp."""
-        search_dirs = [DCIM_PATH, "/sdcard/DCIM", "/sdcard/Pictures"]
-        for dp in search_dirs:
-            out = adb.shell(
-                f"find '{dp}' -maxdepth 1 -newer {marker} "
-                f"\\( -name '*.jpg' -o -name '*.jpeg' -o -name '*.png' \\) "
-                f"-type f 2>/dev/null | head -1"
-            ).stdout.strip()
-            if out:
-                return out
-        return ""
+    @staticmethod
+    def _wait_for_new_media(adb, marker: str, dirs, extensions, timeout: float,
+                            maxdepth: int = 1, poll_interval: float = 0.25,
+                            trigger: str | None = None, exclude=()) -> dict | None:
+        """Wait on the device for a new, fully written media file newer than ``marker``.
+
+        A single shell loop polls ``dirs`` and returns once a matching file
+        (hidden ``.pending-*`` files and ``exclude`` paths skipped) keeps the
+        same non-zero size for one poll interval. ``trigger`` (e.g. a shutter
+        keyevent) runs on the device right after the clock starts. Returns
+        ``{path, size, mtime, appeared_s, stable_s, appeared_at}`` — seconds
+        since the wait began, and device uptime when the file appeared — or
+        None on timeout. A file that appeared but was still empty at timeout
+        is returned with ``size`` 0 so callers can report it as such.
+        """
+        names = " -o ".join(f"-name '*.{ext}'" for ext in extensions)
+        paths = " ".join(f"'{d}'" for d in dirs)
+        skip = "".join(f" ! -path {shlex.quote(p)}" for p in exclude)
+        polls = max(1, int(timeout / poll_interval + 0.5))
+        script = (
+            "read t0 _ < /proc/uptime; pf=; ps=; i=0; "
+            + (f"{trigger}; " if trigger else "")
+            + f"while [ $i -lt {polls} ]; do "
+            f"f=$(find {paths} -maxdepth {maxdepth} -newer {marker} -type f ! -name '.*'{skip} "
+            f"\\( {names} \\) 2>/dev/null | head -1); "
+            'if [ -n "$f" ]; then '
+            's=$(stat -c %s "$f" 2>/dev/null); '
+            '[ "$f" != "$pf" ] && read ta _ < /proc/uptime; '
+            'if [ "$f" = "$pf" ] && [ "$s" = "$ps" ] && [ "${s:-0}" -gt 0 ]; then '
+            'read t1 _ < /proc/uptime; echo "$f|$s|$(stat -c %Y "$f")|$t0|$ta|$t1"; exit 0; fi; '
+            'pf=$f; ps=$s; fi; '
+            f"sleep {poll_interval}; i=$((i+1)); done; "
+            'if [ -n "$pf" ] && [ "${ps:-0}" -eq 0 ]; then '
+            'echo "$pf|0|$(stat -c %Y "$pf")|$t0|$ta|$ta"; fi'
+        )
+        result = adb.shell(script, timeout=int(timeout) + 15)
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        line = out.strip().splitlines()[-1] if out.strip() else ""
+        parts = line.rsplit("|", 5)
+        if len(parts) != 6:
+            return None
+        try:
+            size, mtime = int(parts[1]), int(parts[2])
+            t0, appeared, stable = (float(v) for v in parts[3:])
+        except ValueError:
+            return None
+        return {"path": parts[0], "size": size, "mtime": mtime,
+                "appeared_s": round(appeared - t0, 2), "stable_s": round(stable - t0, 2),
+                "appeared_at": appeared}
 
     def _capture_and_verify(self, tc: dict, ctx: PluginContext) -> TestResult:
         result, remote_path = self._do_capture(tc, ctx)
@@ -146,43 +192,16 @@ class CameraPlugin(TestPlugin):
         if not ctx.visual_analyzer:
             return result
 
-        prompt = tc.get("params", {}).get(
-            "verify_prompt", "Is the photo clear, not black, not white?"
-        )
-        adb = ctx.adb
-
-        # Pull photo to temp path and verify with LLM
-        filename = Path(remote_path).name if remote_path else ""
-        with tempfile.TemporaryDirectory() as tmp:
-            local_path = Path(tmp) / filename if filename else Path(tmp) / "photo.jpg"
-            image = None
-            if hasattr(adb, "pull") and remote_path:
-                adb.pull(remote_path, str(local_path))
-                if local_path.exists() and cv2 is not None:
-                    image = cv2.imread(str(local_path))
-
-            if image is None:
-                return result  # can't pull, return capture-only result
-
-            analysis = ctx.visual_analyzer.analyze_test_screenshot(image, prompt)
-
-        if analysis.get("pass", False):
-            return TestResult(
-                id=tc["id"], name=tc["name"], status=TestStatus.PASS,
-                message=f"Verified: {analysis.get('reason', '')}",
-            )
-        return TestResult(
-            id=tc["id"], name=tc["name"], status=TestStatus.FAIL,
-            message=f"LLM rejected: {analysis.get('reason', '')}",
-        )
+        image, data = self._fetch_photo(ctx.adb, remote_path, self._verify_max_dim(tc))
+        if image is None:
+            return result  # can't pull, return capture-only result
+        return self._keep_original_on_failure(self._verify_image(tc, ctx, image), ctx,
+                                              remote_path, data)
 
     def _verify_latest_photo(self, tc: dict, ctx: PluginContext) -> TestResult:
         """Verify the latest photo on device without taking a new one."""
         tid, tname = tc["id"], tc["name"]
         adb = ctx.adb
-        prompt = tc.get("params", {}).get(
-            "verify_prompt", "Is the photo clear, not black, not white?"
-        )
 
         # Find the newest photo across DCIM paths
         dcim_paths = [DCIM_PATH, "/sdcard/DCIM", "/sdcard/Pictures"]
@@ -201,32 +220,224 @@ class CameraPlugin(TestPlugin):
             return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
                               message="Visual analyzer not available")
 
-        filename = Path(remote_path).name
-        with tempfile.TemporaryDirectory() as tmp:
-            local_path = Path(tmp) / filename
-            image = None
-            if hasattr(adb, "pull"):
-                adb.pull(remote_path, str(local_path))
-                if local_path.exists() and cv2 is not None:
-                    image = cv2.imread(str(local_path))
-
-            if image is None:
-                return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
-                                  message=f"Cannot pull/read {remote_path}")
-
-            analysis = ctx.visual_analyzer.analyze_test_screenshot(image, prompt)
+        image, data = self._fetch_photo(adb, remote_path, self._verify_max_dim(tc))
+        if image is None:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message=f"Cannot pull/read {remote_path}")
+        return self._keep_original_on_failure(self._verify_image(tc, ctx, image), ctx,
+                                              remote_path, data)
+
+    @staticmethod
+    def _verify_max_dim(tc: dict) -> int:
+        return tc.get("params", {}).get("verify_max_dim", VERIFY_MAX_DIM)
+
+    @staticmethod
+    def _fetch_photo(adb, remote_path: str, max_dim: int = VERIFY_MAX_DIM):
+        """Stream a photo into memory and decode it straight to a reduced size.
+
+        Uses ``exec-out cat`` (no temp file) and libjpeg's scaled decode
+        (1/4, else 1/2, else full) so a 12 MP photo is never decoded at full
+        size. Returns ``(image, raw_bytes)``; image is None if unavailable.
+        """
+        if not remote_path or cv2 is None:
+            return None, b""
+        data = adb.exec_out(f"cat {shlex.quote(remote_path)}", timeout=60)
+        if not isinstance(data, (bytes, bytearray)) or not data:
+            return None, b""
+        buf = np.frombuffer(data, dtype=np.uint8)
+        image = None
+        for flag, factor in ((cv2.IMREAD_REDUCED_COLOR_4, 4), (cv2.IMREAD_REDUCED_COLOR_2, 2),
+                             (cv2.IMREAD_COLOR, 1)):
+            image = cv2.imdecode(buf, flag)
+            # Small originals: retry with less reduction so the analysed copy keeps detail
+            if image is None or factor == 1 or max(image.shape[:2]) >= max_dim // 2:
+                break
+        if image is None:
+            return None, data
+        return downscale(image, max_dim), data
+
+    @staticmethod
+    def _keep_original_on_failure(result: TestResult, ctx: PluginContext,
+                                  remote_path: str, data: bytes) -> TestResult:
+        """Save the full-resolution original as an artifact when verification failed."""
+        if result.status != TestStatus.FAIL or not data:
+            return result
+        path = ctx.artifact_path(f"{result.id}_{Path(remote_path).name}")
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            result.metrics.setdefault("artifacts", []).append(str(path))
+        return result
+
+    @staticmethod
+    def _quality_thresholds(tc: dict, ctx: PluginContext) -> dict | None:
+        """Prefilter thresholds: device YAML ``camera.quality`` overridden by test ``params.quality``.
+
+        ``quality: false`` in either place disables the prefilter (always ask the LLM).
+        """
+        device_cfg = ctx.settings.get("device", {}).get("camera", {}).get("quality", {})
+        test_cfg = tc.get("params", {}).get("quality", {})
+        if device_cfg is False or test_cfg is False:
+            return None
+        return {**(device_cfg or {}), **(test_cfg or {})}
+
+    def _verify_image(self, tc: dict, ctx: PluginContext, image) -> TestResult:
+        """Judge a photo on the host first; only ambiguous photos go to the vision LLM."""
+        tid, tname = tc["id"], tc["name"]
+        thresholds = self._quality_thresholds(tc, ctx)
+        metrics = {}
+        if thresholds is not None:
+            quality = assess_image(image, thresholds)
+            metrics["quality"] = quality.metrics
+            if quality.verdict != AMBIGUOUS:
+                m = quality.metrics
+                logger.info(f"Photo quality {quality.verdict} on host: mean={m['mean']}, "
+                            f"sharpness={m['sharpness']}, range={m['dynamic_range']}")
+                if quality.verdict == PASS:
+                    return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                                      message=f"Verified (host quality check): mean {m['mean']:.0f}, "
+                                              f"sharpness {m['sharpness']:.0f}, "
+                                              f"range {m['dynamic_range']:.0f}",
+                                      metrics=metrics)
+                return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                                  message=f"Quality check failed: {'; '.join(quality.reasons)}",
+                                  metrics=metrics)
+            logger.info(f"Photo quality ambiguous ({'; '.join(quality.reasons)}), asking LLM")
 
+        prompt = tc.get("params", {}).get("verify_prompt", DEFAULT_VERIFY_PROMPT)
+        analysis = ctx.visual_analyzer.analyze_test_screenshot(image, prompt)
         if analysis.get("pass", False):
             return TestResult(id=tid, name=tname, status=TestStatus.PASS,
-                              message=f"Verified: {analysis.get('reason', '')}")
+                              message=f"Verified: {analysis.get('reason', '')}",
+                              metrics=metrics)
         return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
-                          message=f"LLM rejected: {analysis.get('reason', '')}")
+                          message=f"LLM rejected: {analysis.get('reason', '')}",
+                          metrics=metrics)
+
+    def _camera_latency(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Cold launch, shutter-to-file and shot-to-shot latency of the camera app.
+
+        Each of ``iterations`` rounds force-stops the app, launches it with
+        ``am start -W`` (TotalTime) and takes one photo, timing the shutter
+        keyevent to the photo appearing on the device. Then ``shots`` photos
+        are taken back to back for the shot-to-shot interval. Percentiles are
+        checked against ``thresholds`` (ms, at ``threshold_stat``) and against
+        the median p50 of previous runs (``history_tolerance``).
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        iterations = params.get("iterations", 5)
+        shots = params.get("shots", 5)
+        launch_settle = params.get("launch_settle", 2)
+        shutter_timeout = params.get("shutter_timeout", 5)
+        thresholds = params.get("thresholds", {})
+        stat = params.get("threshold_stat", "p95")
+        tolerance = params.get("history_tolerance", 0.2)
+        adb = ctx.adb
+
+        marker = "/sdcard/.smoke_test_cam_latency_marker"
+        shutter = "input keyevent KEYCODE_CAMERA"
+        stop_apps = ("am force-stop org.codeaurora.snapcam 2>/dev/null; "
+                     "am force-stop com.android.camera2 2>/dev/null")
+        launch_ms, shutter_ms, seen = [], [], []
+        appeared_at = []
+        component = None
+        try:
+            adb.shell(f"mkdir -p '{DCIM_PATH}'")
+            adb.shell(f"touch {marker}")
+            adb.shell("input keyevent KEYCODE_WAKEUP")
+            adb.shell("wm dismiss-keyguard")
+            adb.shell("am broadcast -a android.intent.action.CLOSE_SYSTEM_DIALOGS")
+            time.sleep(0.5)  # photos must be strictly newer than the marker
+
+            for i in range(iterations):
+                adb.shell(stop_apps)
+                total = None
+                for comp in ([component] if component else CAMERA_LAUNCHERS):
+                    total = self._am_start_total_time(adb, comp)
+                    if total is not None:
+                        component = comp
+                        break
+                if component is None:
+                    return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                                      message="No camera launcher found "
+                                              f"({', '.join(CAMERA_LAUNCHERS)})")
+                if total is not None:
+                    launch_ms.append(total)
+                time.sleep(launch_settle)  # preview up before the shutter
+
+                media = self._wait_for_new_media(adb, marker, PHOTO_DIRS, PHOTO_EXTENSIONS,
+                                                 shutter_timeout, trigger=shutter, exclude=seen)
+                if media:
+                    seen.append(media["path"])
+                    if not media["size"]:
+                        logger.warning(f"  Round {i + 1}/{iterations}: {media['path']} has zero bytes")
+                        media = None
+                    else:
+                        shutter_ms.append(media["appeared_s"] * 1000)
+                logger.info(f"  Round {i + 1}/{iterations}: launch {total} ms, "
+                            f"shutter→file {media['appeared_s'] * 1000 if media else '-'} ms")
+
+            # Shot-to-shot: fire the next shutter as soon as the previous photo lands
+            for _ in range(shots):
+                media = self._wait_for_new_media(adb, marker, PHOTO_DIRS, PHOTO_EXTENSIONS,
+                                                 shutter_timeout, trigger=shutter, exclude=seen)
+                if not media:
+                    break
+                seen.append(media["path"])
+                if not media["size"]:
+                    break
+                appeared_at.append(media["appeared_at"])
+        finally:
+            paths = " ".join(shlex.quote(p) for p in seen)
+            adb.shell(f"rm -f {marker} {paths}".rstrip())
+            adb.shell(stop_apps)
+
+        intervals = [round((b - a) * 1000, 1) for a, b in zip(appeared_at, appeared_at[1:])]
+        summary = {
+            "launch_ms": summarize(launch_ms),
+            "shutter_to_file_ms": summarize(shutter_ms),
+            "shot_to_shot_ms": summarize(intervals),
+        }
+        summary = {k: v for k, v in summary.items() if v["n"]}
+        if "shutter_to_file_ms" not in summary:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"No photo written after shutter ({component})",
+                              metrics={"component": component, **summary})
+
+        regressions, baselines = history_regressions(summary, ctx.history, tid, tolerance,
+                                                     unit=" ms", fmt=".0f")
+        metrics = {"component": component, **summary,
+                   "samples": {"launch_ms": launch_ms, "shutter_to_file_ms": shutter_ms,
+                               "shot_to_shot_ms": intervals}}
+        if baselines:
+            metrics["baseline_p50"] = baselines
+
+        brief = ", ".join(f"{k} p50/p95 {v['p50']:.0f}/{v['p95']:.0f}" for k, v in summary.items())
+        problems = exceeded_thresholds(summary, thresholds, stat, unit=" ms", fmt=".0f") + regressions
+        if problems:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Camera latency regression: {'; '.join(problems)} ({brief})",
+                              metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"Camera latency: {brief}", metrics=metrics)
+
+    @staticmethod
+    def _am_start_total_time(adb, component: str) -> int | None:
+        """Launch ``component`` with ``am start -W``; TotalTime in ms, None if it did not start."""
+        result = adb.shell(f"am start -W -n {component} 2>&1")
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        if "Error" in out or "does not exist" in out:
+            return None
+        m = re.search(r"TotalTime:\s*(\d+)", out)
+        return int(m.group(1)) if m else None
 
     def _record_video(self, tc: dict, ctx: PluginContext) -> TestResult:
         """Record a short video and verify a video file was created."""
         tid, tname = tc["id"], tc["name"]
         params = tc.get("params", {})
         record_duration = params.get("record_duration", 5)
+        finalize_timeout = params.get("finalize_timeout", 10)
         adb = ctx.adb
 
         try:
@@ -252,38 +463,21 @@ class CameraPlugin(TestPlugin):
 
             # 4. Stop recording (press shutter again)
             adb.shell("input keyevent KEYCODE_CAMERA")
-            time.sleep(3)
 
-            # 5. Find new video file
-            search_dirs = [DCIM_PATH, "/sdcard/DCIM", "/sdcard/Movies"]
-            found = ""
-            for dp in search_dirs:
-                out = adb.shell(
-                    f"find '{dp}' -maxdepth 2 -newer {marker} "
-                    f"\\( -name '*.mp4' -o -name '*.3gp' \\) "
-                    f"-type f 2>/dev/null | head -1"
-                ).stdout.strip()
-                if out:
-                    found = out
-                    break
+            # 5. Wait for the muxer to finish — file stops growing
+            media = self._wait_for_new_media(adb, marker, VIDEO_DIRS, VIDEO_EXTENSIONS,
+                                             finalize_timeout, maxdepth=2)
 
             adb.shell(f"rm -f {marker}")
 
-            if not found:
+            if not media:
                 return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
                                   message="No new video file after recording attempt")
 
-            # 6. Check file size > 0
-            size_out = adb.shell(f"stat -c %s '{found}'").stdout.strip()
-            try:
-                size = int(size_out)
-            except ValueError:
-                size = 0
-
+            found, size = media["path"], media["size"]
             if size == 0:
                 return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
                                   message=f"Video {found} has zero bytes")
-
             filename = Path(found).name
             return TestResult(id=tid, name=tname, status=TestStatus.PASS,
                               message=f"Recorded {filename} ({size} bytes, {record_duration}s)")
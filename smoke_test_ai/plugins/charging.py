@@ -1,18 +1,55 @@
 import re
 import time
 
+import numpy as np
+
 from smoke_test_ai.core.test_runner import TestResult, TestStatus
 from smoke_test_ai.plugins.base import TestPlugin, PluginContext
+from smoke_test_ai.utils.device_sampler import DeviceSampler, SampleSet, sysfs_labels, sysfs_values
 from smoke_test_ai.utils.logger import get_logger
+from smoke_test_ai.utils.stats import exceeded_thresholds, history_regressions, linear_trend, mean_ci, summarize
 
 logger = get_logger(__name__)
 
+BATTERY_SYSFS = "/sys/class/power_supply/battery"
+SUPPLY_GLOB = "/sys/class/power_supply/*"
+# sysfs status text → BatteryManager status code (same codes as `dumpsys battery`)
+STATUS_SNIPPET = (
+    f's=x; read s 2>/dev/null < {BATTERY_SYSFS}/status; '
+    'case "$s" in Charging) printf 2;; Discharging) printf 3;; '
+    '"Not charging") printf 4;; Full) printf 5;; *) printf 1;; esac'
+)
+CHARGING_STATUS = (2, 5)
+
+# Built-in drain scenarios; a suite may pass its own dicts with the same keys.
+# ``screen_on`` scenarios raise screen_off_timeout for the run and restore it after.
+DRAIN_SCENARIOS = {
+    "screen_off_idle": {
+        "setup": ["input keyevent KEYCODE_SLEEP"],
+    },
+    "screen_on_idle": {
+        "screen_on": True,
+        "setup": ["input keyevent KEYCODE_WAKEUP", "wm dismiss-keyguard", "input keyevent KEYCODE_HOME"],
+    },
+    "video_loop": {
+        "screen_on": True,
+        "setup": ["input keyevent KEYCODE_WAKEUP", "wm dismiss-keyguard",
+                  "am start -W -a android.intent.action.VIEW -d file://{video} -t video/*"],
+        "teardown": ["input keyevent KEYCODE_HOME"],
+    },
+}
+DEFAULT_DRAIN_VIDEO = "/sdcard/Movies/drain_loop.mp4"
+
 
 class ChargingPlugin(TestPlugin):
     def execute(self, test_case: dict, context: PluginContext) -> TestResult:
         action = test_case.get("action", "")
         if action == "detect":
             return self._detect(test_case, context)
+        if action == "charge_ramp":
+            return self._charge_ramp(test_case, context)
+        if action == "drain":
+            return self._drain(test_case, context)
         return TestResult(
             id=test_case["id"], name=test_case["name"],
             status=TestStatus.ERROR,
@@ -75,6 +112,335 @@ class ChargingPlugin(TestPlugin):
                     f"status={recovered['status']}, "
                     f"current={current:.0f}mA")
 
+    def _charge_ramp(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """USB power cycle with a device-side current/voltage/status sampler running throughout.
+
+        Pass/fail comes from the measured ramp — time from USB power-on to
+        charging detected and to steady charge current — instead of a fixed
+        settle sleep.
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        off_duration = params.get("off_duration", 5)
+        observe = params.get("observe", 20)
+        sample_hz = min(max(float(params.get("sample_hz", 20)), 10.0), 50.0)
+        max_detect_s = params.get("max_detect_s", 5)
+        max_steady_s = params.get("max_steady_s", 15)
+        min_current_ma = params.get("min_current_ma", 0)
+
+        if ctx.usb_power is None:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message="usb_power not configured, skipping charging test")
+
+        adb = ctx.adb
+        initial = self._get_battery_info(adb)
+        if not initial["powered"]:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Initial state not charging: {initial['raw']}")
+
+        # Sampler outlives the disconnect: its own deadline covers the whole cycle
+        sampler = self._ramp_sampler(adb, 1 / sample_hz, off_duration + 60 + observe + 10)
+        sampler.start()
+        start = time.monotonic()
+        reconnected = False
+        try:
+            time.sleep(params.get("baseline", 1))
+            off_at = time.monotonic() - start
+            ctx.usb_power.power_off()
+            time.sleep(off_duration)
+            ctx.usb_power.power_on()
+            on_at = time.monotonic() - start
+            reconnected = adb.wait_for_device(timeout=60)
+            remaining = on_at + observe - (time.monotonic() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+        finally:
+            # Without ADB the file cannot be pulled; the sampler stops at its own deadline
+            samples = sampler.collect() if reconnected else SampleSet(t=np.array([]))
+
+        if not reconnected:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message="ADB did not reconnect after USB power on")
+
+        metrics = self._ramp_metrics(samples, off_at, on_at,
+                                     steady_window=params.get("steady_window", 2.0),
+                                     tolerance_pct=params.get("steady_tolerance_pct", 10),
+                                     tolerance_ma=params.get("steady_tolerance_ma", 50))
+        logger.info(f"Charge ramp: {metrics}")
+
+        problems = []
+        if metrics["detect_s"] is None:
+            problems.append("charging not detected after power on")
+        elif max_detect_s is not None and metrics["detect_s"] > max_detect_s:
+            problems.append(f"charging detected after {metrics['detect_s']}s > {max_detect_s}s")
+        if metrics["steady_s"] is None:
+            if metrics["detect_s"] is not None:
+                problems.append(f"current not steady within {observe}s")
+        elif max_steady_s is not None and metrics["steady_s"] > max_steady_s:
+            problems.append(f"steady current after {metrics['steady_s']}s > {max_steady_s}s")
+        if metrics["steady_ma"] is not None and metrics["steady_ma"] < min_current_ma:
+            problems.append(f"steady current {metrics['steady_ma']}mA < {min_current_ma}mA")
+
+        brief = (f"detect={metrics['detect_s']}s, steady={metrics['steady_s']}s "
+                 f"@ {metrics['steady_ma']}mA ({metrics['samples']} samples, "
+                 f"{metrics['sample_hz']} Hz)")
+        if problems:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Charge ramp FAIL — {'; '.join(problems)} ({brief})",
+                              metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"Charge ramp OK — {brief}", metrics=metrics)
+
+    @staticmethod
+    def _ramp_sampler(adb, interval: float, duration: float) -> DeviceSampler:
+        return DeviceSampler(
+            adb, "charge_ramp",
+            columns={
+                "current": sysfs_values(BATTERY_SYSFS, "current_now"),
+                "voltage": sysfs_values(BATTERY_SYSFS, "voltage_now"),
+                "status": STATUS_SNIPPET,
+                "online": sysfs_values(SUPPLY_GLOB, "online"),
+            },
+            header={"supplies": sysfs_labels(SUPPLY_GLOB)},
+            interval=interval,
+            duration=duration,
+        )
+
+    @staticmethod
+    def _ramp_metrics(
+        samples: SampleSet,
+        off_at: float,
+        on_at: float,
+        steady_window: float = 2.0,
+        tolerance_pct: float = 10,
+        tolerance_ma: float = 50,
+    ) -> dict:
+        """Time to charging detected and to steady current, relative to USB power-on.
+
+        ``off_at``/``on_at`` are host-side offsets from sampler start. When the
+        trace shows the unplug edge, power-on is re-anchored to it so host/DUT
+        clock skew only enters through the (host-timed) off interval.
+        """
+        t = samples.t
+        metrics: dict = {
+            "samples": len(samples),
+            "sample_hz": round((len(t) - 1) / t[-1], 1) if len(t) > 1 and t[-1] > 0 else 0.0,
+            "online_s": None, "detect_s": None, "steady_s": None,
+            "steady_ma": None, "peak_ma": None, "steady_mv": None,
+        }
+        if not len(samples):
+            return metrics
+
+        with np.errstate(all="ignore"):
+            current = np.nanmean(samples.column("current"), axis=1) / 1000  # uA → mA
+            voltage = np.nanmean(samples.column("voltage"), axis=1) / 1000  # uV → mV
+        online_cols = samples.column("online")
+        online = (np.nan_to_num(online_cols, nan=0.0) > 0).any(axis=1) if online_cols.size \
+            else np.ones(len(t), dtype=bool)
+        status = samples.column("status")[:, 0] if samples.column("status").size \
+            else np.full(len(t), np.nan)
+        charging = np.isin(status, CHARGING_STATUS) & online
+
+        unplugged = np.flatnonzero((t >= off_at - 1) & ~online)
+        power_on = t[unplugged[0]] + (on_at - off_at) if unplugged.size else on_at
+        metrics["power_on_s"] = round(float(power_on), 2)
+
+        after = t >= power_on
+        first_online = np.flatnonzero(after & online)
+        if first_online.size:
+            metrics["online_s"] = round(float(t[first_online[0]] - power_on), 2)
+        detected = np.flatnonzero(after & charging)
+        if not detected.size:
+            return metrics
+        start = detected[0]
+        metrics["detect_s"] = round(float(t[start] - power_on), 2)
+
+        ramp_t, ramp_i = t[start:], current[start:]
+        metrics["peak_ma"] = round(float(np.nanmax(ramp_i)), 1) if np.isfinite(ramp_i).any() else None
+        tail = ramp_t >= ramp_t[-1] - steady_window
+        if not np.isfinite(ramp_i[tail]).any():
+            return metrics
+        level = float(np.nanmedian(ramp_i[tail]))
+        metrics["steady_ma"] = round(level, 1)
+        metrics["steady_mv"] = round(float(np.nanmedian(voltage[start:][tail])), 0) \
+            if np.isfinite(voltage[start:][tail]).any() else None
+
+        # First sample from which a full window stays within tolerance of the final level
+        tol = max(abs(level) * tolerance_pct / 100, tolerance_ma)
+        outside = np.concatenate([[0], np.cumsum(~(np.abs(ramp_i - level) <= tol))])
+        ends = np.searchsorted(ramp_t, ramp_t + steady_window, side="right")
+        covered = ramp_t[-1] - ramp_t >= steady_window - 1e-9
+        steady = np.flatnonzero(covered & (outside[ends] == outside[:-1]))
+        if steady.size:
+            metrics["steady_s"] = round(float(ramp_t[steady[0]] - power_on), 2)
+        return metrics
+
+    def _drain(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Battery drain rate per scenario with USB power held off.
+
+        Each scenario is set up over ADB, then a device-side sampler logs
+        charge counter, current, temperature and level while USB is off for
+        ``duration`` seconds; the log is pulled after reconnect. The rate is
+        the charge-counter slope (falling back to mean current when the fuel
+        gauge has no counter), with a 95% confidence interval, and is checked
+        against ``max_mah_per_h`` and previous runs of this test.
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        duration = params.get("duration", 600)
+        interval = params.get("sample_interval", 5)
+        settle = params.get("settle", 30)
+        limits = params.get("max_mah_per_h", {})
+        tolerance = params.get("history_tolerance", 0.2)
+        video = params.get("video", DEFAULT_DRAIN_VIDEO)
+
+        if ctx.usb_power is None:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message="usb_power not configured, skipping drain test")
+
+        scenarios = []
+        for entry in params.get("scenarios", ["screen_off_idle"]):
+            spec = dict(entry) if isinstance(entry, dict) else {"name": entry}
+            builtin = DRAIN_SCENARIOS.get(spec["name"])
+            if builtin is None and "setup" not in spec:
+                return TestResult(id=tid, name=tname, status=TestStatus.ERROR,
+                                  message=f"Unknown drain scenario: {spec['name']}")
+            scenarios.append({**(builtin or {}), **spec})
+
+        adb = ctx.adb
+        results: dict = {}
+        problems: list[str] = []
+        for spec in scenarios:
+            name = spec["name"]
+            if any("{video}" in cmd for cmd in spec.get("setup", [])):
+                check = adb.shell(f"ls {video}")
+                out = check.stdout if hasattr(check, "stdout") else str(check)
+                if "No such file" in out or not out.strip():
+                    problems.append(f"{name}: video {video} not found on device")
+                    continue
+            scenario = self._drain_scenario(ctx, spec, spec.get("duration", duration),
+                                            interval, spec.get("settle", settle), video)
+            if scenario is None:
+                return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                                  message=f"ADB did not reconnect after drain scenario '{name}'",
+                                  metrics={"scenarios": results})
+            results[name] = scenario
+            logger.info(f"Drain {name}: {scenario['mah_per_h']} ± {scenario['ci95_mah_per_h']} mAh/h "
+                        f"({scenario['method']})")
+
+        metrics: dict = {"scenarios": results}
+        rates = {n: r for n, r in results.items() if r["mah_per_h"] is not None}
+        for name, r in results.items():
+            if r["mah_per_h"] is None:
+                problems.append(f"{name}: no usable samples")
+        regressions, baselines = history_regressions(rates, ctx.history, tid, tolerance,
+                                                     stat="mah_per_h", prefix="scenarios.",
+                                                     unit=" mAh/h", fmt=".1f")
+        if baselines:
+            metrics["baseline_mah_per_h"] = baselines
+        problems += exceeded_thresholds(rates, limits, stat="mah_per_h", unit=" mAh/h", fmt=".1f")
+        problems += regressions
+
+        brief = ", ".join(f"{n} {r['mah_per_h']:.1f}±{r['ci95_mah_per_h']:.1f} mAh/h"
+                          for n, r in rates.items()) or "no scenario measured"
+        if problems:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Battery drain: {'; '.join(problems)} ({brief})", metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"Battery drain OK — {brief}", metrics=metrics)
+
+    def _drain_scenario(self, ctx: PluginContext, spec: dict, duration: float,
+                        interval: float, settle: float, video: str) -> dict | None:
+        """Run one scenario through a USB-off window; None if ADB does not come back."""
+        adb = ctx.adb
+        timeout = None
+        if spec.get("screen_on"):
+            result = adb.shell("settings get system screen_off_timeout")
+            timeout = (result.stdout if hasattr(result, "stdout") else str(result)).strip()
+            adb.shell(f"settings put system screen_off_timeout {int((duration + 120) * 1000)}")
+        for cmd in spec.get("setup", []):
+            adb.shell(cmd.format(video=video))
+
+        sampler = self._drain_sampler(adb, spec["name"], interval, duration)
+        sampler.start()
+        try:
+            ctx.usb_power.power_off()
+            time.sleep(duration)
+        finally:
+            ctx.usb_power.power_on()
+            reconnected = adb.wait_for_device(timeout=60)
+        if not reconnected:
+            return None
+        samples = sampler.collect()
+        for cmd in spec.get("teardown", []):
+            adb.shell(cmd.format(video=video))
+        if timeout and timeout.isdigit():
+            adb.shell(f"settings put system screen_off_timeout {timeout}")
+        return self._drain_metrics(samples, settle, duration)
+
+    @staticmethod
+    def _drain_sampler(adb, name: str, interval: float, duration: float) -> DeviceSampler:
+        return DeviceSampler(
+            adb, f"drain_{name}",
+            columns={
+                "charge": sysfs_values(BATTERY_SYSFS, "charge_counter"),
+                "current": sysfs_values(BATTERY_SYSFS, "current_now"),
+                "temp": sysfs_values(BATTERY_SYSFS, "temp"),
+                "level": sysfs_values(BATTERY_SYSFS, "capacity"),
+                "online": sysfs_values(SUPPLY_GLOB, "online"),
+            },
+            interval=interval,
+            duration=duration,
+        )
+
+    @staticmethod
+    def _drain_metrics(samples: SampleSet, settle: float = 30, end: float | None = None) -> dict:
+        """Drain rate (mAh/h, positive = discharging) with a 95% confidence half-width.
+
+        Only the USB-off window counts: samples after ``end`` seconds or with
+        any power supply online (charging after reconnect) are dropped, as are
+        those in the first ``settle`` seconds (screen transition, USB detach).
+        /proc/uptime includes suspend, so sparse samples from a sleeping DUT
+        still sit at the right time.
+        """
+        metrics: dict = {"samples": len(samples), "duration_s": 0.0, "method": None,
+                         "mah_per_h": None, "ci95_mah_per_h": None}
+        t = samples.t
+        online_cols = samples.column("online")
+        unplugged = ~(np.nan_to_num(online_cols, nan=0.0) > 0).any(axis=1) if online_cols.size \
+            else np.ones(len(t), dtype=bool)
+        if end is not None:
+            unplugged &= t <= end
+        keep = unplugged & (t >= settle)
+        if keep.sum() < 3:
+            keep = unplugged
+        if not keep.any():
+            return metrics
+        t = t[keep]
+        metrics["duration_s"] = round(float(t[-1] - t[0]), 1)
+
+        def first(name: str) -> np.ndarray:
+            col = samples.column(name)
+            return col[keep, 0] if col.size else np.full(len(t), np.nan)
+
+        charge_mah = first("charge") / 1000            # uAh → mAh
+        drain_ma = -first("current") / 1000            # uA → mA, discharge positive
+        temp_c, level = first("temp") / 10, first("level")
+
+        slope, ci = linear_trend(t / 3600, charge_mah)
+        counter_moves = np.isfinite(charge_mah).sum() >= 3 and np.nanmax(charge_mah) > np.nanmin(charge_mah)
+        if counter_moves and np.isfinite(slope):
+            metrics.update(method="charge_counter", mah_per_h=round(-slope, 2), ci95_mah_per_h=round(ci, 2))
+        elif np.isfinite(drain_ma).any():
+            mean, ci = mean_ci(drain_ma)
+            metrics.update(method="current_now", mah_per_h=round(mean, 2), ci95_mah_per_h=round(ci, 2))
+
+        metrics["current_ma"] = summarize(drain_ma[np.isfinite(drain_ma)])
+        metrics["temp_c"] = summarize(temp_c[np.isfinite(temp_c)])
+        finite_level = level[np.isfinite(level)]
+        metrics["level_drop"] = int(finite_level[0] - finite_level[-1]) if finite_level.size else None
+        return metrics
+
     @staticmethod
     def _get_battery_info(adb) -> dict:
         result = adb.shell("dumpsys battery")
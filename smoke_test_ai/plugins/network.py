@@ -2,6 +2,10 @@ import time
 
 from smoke_test_ai.core.test_runner import TestResult, TestStatus
 from smoke_test_ai.plugins.base import TestPlugin, PluginContext
+from smoke_test_ai.utils.bench_server import ThroughputServer
+from smoke_test_ai.utils.stats import exceeded_thresholds, summarize
+
+THROUGHPUT_DOWNLOAD_BYTES = 1 << 40  # effectively endless; curl --max-time ends the stream
 
 
 class NetworkPlugin(TestPlugin):
@@ -11,6 +15,8 @@ class NetworkPlugin(TestPlugin):
             return self._http_download(test_case, context)
         if action == "tcp_connect":
             return self._tcp_connect(test_case, context)
+        if action == "throughput":
+            return self._throughput(test_case, context)
         return TestResult(
             id=test_case["id"], name=test_case["name"],
             status=TestStatus.ERROR,
@@ -78,3 +84,111 @@ class NetworkPlugin(TestPlugin):
                               message=f"TCP connection to {host}:{port} succeeded")
         return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
                           message=f"TCP connection to {host}:{port} failed")
+
+    def _throughput(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Timed parallel download/upload and repeated small-request RTT against a host server.
+
+        ``mode: reverse`` tunnels through ``adb reverse`` (USB, no network
+        needed); ``mode: lan`` binds the server on ``0.0.0.0`` and the device
+        connects to ``server_host`` over the radio under test.
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        mode = params.get("mode", "reverse")
+        duration = params.get("duration", 10)
+        streams = params.get("streams", 4)
+        probes = params.get("latency_probes", 50)
+        thresholds = params.get("thresholds", {})
+        adb = ctx.adb
+
+        if mode == "lan" and not params.get("server_host"):
+            return TestResult(id=tid, name=tname, status=TestStatus.ERROR,
+                              message="mode 'lan' requires params.server_host (host IP reachable from the DUT)")
+        result = adb.shell("command -v curl")
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        if not out.strip():
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message="curl not available on device")
+
+        server = ThroughputServer(host="127.0.0.1" if mode == "reverse" else "0.0.0.0",
+                                  port=params.get("port", 0))
+        server.start()
+        device_port = params.get("device_port", server.port)
+        try:
+            if mode == "reverse":
+                adb.reverse(device_port, server.port)
+                base = f"http://127.0.0.1:{device_port}"
+            else:
+                base = f"http://{params['server_host']}:{server.port}"
+
+            download = self._curl_streams(
+                adb, "dl", streams, duration,
+                f"curl -s -o /dev/null --max-time {duration} -w 'dl %{{size_download}} %{{time_total}}\\n' "
+                f"'{base}/download?bytes={THROUGHPUT_DOWNLOAD_BYTES}'")
+            upload = self._curl_streams(
+                adb, "ul", streams, duration,
+                f"dd if=/dev/zero bs=65536 count=1000000 2>/dev/null | "
+                f"curl -s -o /dev/null --max-time {duration} -T - -w 'ul %{{size_upload}} %{{time_total}}\\n' "
+                f"'{base}/upload'")
+            result = adb.shell(
+                f"curl -s -w 'rtt %{{time_total}}\\n' '{base}/ping?i=[1-{probes}]'",
+                timeout=probes + 30)
+            out = result.stdout if hasattr(result, "stdout") else str(result)
+            rtts = [float(v) * 1000 for v in self._tagged_values(out, "rtt")]
+        finally:
+            if mode == "reverse":
+                try:
+                    adb.reverse_remove(device_port)
+                except Exception:
+                    pass
+            server.stop()
+
+        metrics = {
+            "mode": mode,
+            "streams": streams,
+            "duration_s": duration,
+            "download_mbps": download,
+            "upload_mbps": upload,
+            "latency_ms": summarize(rtts, percentiles=(50, 99)),
+        }
+        if download is None and upload is None and not rtts:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Device could not reach the throughput server at {base}",
+                              metrics=metrics)
+
+        failures = []
+        for key, label in (("download_mbps", "download"), ("upload_mbps", "upload")):
+            limit = thresholds.get(f"min_{key}")
+            if limit is not None and (metrics[key] or 0) < limit:
+                failures.append(f"{label} {metrics[key] or 0:.1f} Mbps < {limit} Mbps")
+        for stat in ("p50", "p99"):
+            limit = thresholds.get(f"max_latency_{stat}_ms")
+            if limit is not None:
+                failures += exceeded_thresholds({"latency": metrics["latency_ms"]}, {"latency": limit},
+                                                stat, unit=" ms", fmt=".1f")
+
+        lat = metrics["latency_ms"]
+        summary = (f"down {download or 0:.1f} Mbps, up {upload or 0:.1f} Mbps ({streams} streams, {mode}), "
+                   f"RTT p50 {lat.get('p50', 0):.1f} ms / p99 {lat.get('p99', 0):.1f} ms")
+        if failures:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"{summary}; {'; '.join(failures)}", metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS, message=summary, metrics=metrics)
+
+    def _curl_streams(self, adb, tag: str, streams: int, duration: float, command: str) -> float | None:
+        """Run ``streams`` copies of ``command`` in parallel; aggregate Mbps or None if none ran."""
+        script = " ".join(f"({command}) &" for _ in range(streams)) + " wait"
+        result = adb.shell(script, timeout=duration + 30)
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        rows = [line.split()[1:3] for line in out.splitlines() if line.startswith(f"{tag} ")]
+        samples = [(float(b), float(t)) for b, t in rows if float(t) > 0]
+        if not samples:
+            return None
+        total_bytes = sum(b for b, _ in samples)
+        elapsed = max(t for _, t in samples)
+        return round(total_bytes * 8 / elapsed / 1e6, 2)
+
+    @staticmethod
+    def _tagged_values(output: str, tag: str) -> list[str]:
+        return [line.split()[1] for line in output.splitlines()
+                if line.startswith(f"{tag} ") and len(line.split()) > 1]
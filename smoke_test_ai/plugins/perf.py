@@ -0,0 +1,589 @@
+import json
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+from smoke_test_ai.core.test_runner import TestResult, TestStatus
+from smoke_test_ai.plugins.base import TestPlugin, PluginContext
+from smoke_test_ai.utils.framestats import FrameTable, frame_metrics, parse_framestats
+from smoke_test_ai.utils.logger import get_logger
+from smoke_test_ai.utils.meminfo import MemorySnapshot
+from smoke_test_ai.utils.stats import exceeded_thresholds, history_regressions, summarize
+
+logger = get_logger(__name__)
+
+LAUNCH_MODES = ("cold", "warm")
+# ``am start -W`` LaunchState each mode must report for a sample to count
+LAUNCH_STATES = {"cold": "COLD", "warm": "WARM"}
+DROP_CACHES = "sync; echo 3 > /proc/sys/vm/drop_caches"
+# input swipe duration (ms): a short flick flings the list, a slow drag scrolls it
+GESTURE_MS = {"fling": 100, "scroll": 600}
+# fio jobs: name → (rw mode, block size). Sequential write runs first and lays out the file.
+IO_JOBS = {
+    "seq_write": ("write", "1m"),
+    "seq_read": ("read", "1m"),
+    "rand_read": ("randread", "4k"),
+    "rand_write": ("randwrite", "4k"),
+}
+FIO_LOCAL = Path(__file__).parent.parent.parent / "tools" / "fio-arm64"
+FIO_REMOTE = "/data/local/tmp/fio"
+IO_TEST_FILE = "/data/local/tmp/smoke_io.bin"
+
+# Tracked processes: label → candidate process names in ``dumpsys meminfo``.
+# The launcher is resolved from the HOME intent at run time.
+MEMORY_PROCESSES = {
+    "system_server": ("system", "system_server"),
+    "systemui": ("com.android.systemui",),
+    "zygote": ("zygote64", "zygote"),
+}
+
+
+class PerfPlugin(TestPlugin):
+    def __init__(self):
+        # test id → (id(adb), snapshot), for leak checks later in the same run
+        self._memory_snapshots: dict[str, tuple[int, MemorySnapshot]] = {}
+
+    def execute(self, test_case: dict, context: PluginContext) -> TestResult:
+        action = test_case.get("action", "")
+        if action == "app_launch":
+            return self._app_launch(test_case, context)
+        if action == "jank":
+            return self._jank(test_case, context)
+        if action == "memory":
+            return self._memory(test_case, context)
+        if action == "storage_io":
+            return self._storage_io(test_case, context)
+        return TestResult(
+            id=test_case["id"], name=test_case["name"],
+            status=TestStatus.ERROR,
+            message=f"Unknown perf action: {action}",
+        )
+
+    def _app_launch(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Cold/warm ``am start -W`` latency per package.
+
+        Each round force-stops the app (and drops the page cache when root is
+        available) for a cold start, then sends it home and relaunches it for
+        a warm start. "Don't keep activities" is enabled for the run so going
+        home destroys the activity but keeps the process; otherwise the
+        relaunch would be a hot start. Launches whose LaunchState does not
+        match the mode are excluded from the statistics and fail the test.
+        The first ``warmup`` rounds are discarded. TotalTime and WaitTime
+        summaries (p50/p90/stddev) are checked per app against ``thresholds``
+        (ms, at ``threshold_stat``) and previous runs.
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        iterations = params.get("iterations", 10)
+        warmup = params.get("warmup", 1)
+        modes = [m for m in params.get("modes", LAUNCH_MODES) if m in LAUNCH_MODES]
+        settle = params.get("settle", 1)
+        stat = params.get("threshold_stat", "p90")
+        tolerance = params.get("history_tolerance", 0.2)
+        adb = ctx.adb
+
+        apps = [dict(a) if isinstance(a, dict) else {"package": a} for a in params.get("packages", [])]
+        if not apps:
+            return TestResult(id=tid, name=tname, status=TestStatus.ERROR,
+                              message="app_launch needs params.packages")
+
+        root = self._root_prefix(adb) if "cold" in modes else None
+        adb.shell("input keyevent KEYCODE_WAKEUP")
+        adb.shell("wm dismiss-keyguard")
+        finish_activities = None
+        if "warm" in modes:
+            result = adb.shell("settings get global always_finish_activities")
+            finish_activities = (result.stdout if hasattr(result, "stdout") else str(result)).strip()
+            adb.shell("settings put global always_finish_activities 1")
+
+        results: dict = {}
+        problems: list[str] = []
+        missing: list[str] = []
+        try:
+            for app in apps:
+                pkg = app["package"]
+                component = app.get("component") or self._launcher_component(adb, pkg)
+                if component is None:
+                    missing.append(pkg)
+                    continue
+                label = app.get("name") or pkg.replace(".", "_")
+                samples = {f"{m}_{k}": [] for m in modes for k in ("total_ms", "wait_ms")}
+                states: dict[str, int] = {}
+                mismatched: dict[str, int] = {}
+                failed = 0
+                for i in range(warmup + iterations):
+                    for mode in modes:
+                        if mode == "cold":
+                            adb.shell(f"am force-stop {pkg}")
+                            if root is not None:
+                                adb.shell(f"{root}'{DROP_CACHES}'")
+                        else:
+                            adb.shell("input keyevent KEYCODE_HOME")
+                        time.sleep(settle)
+                        launch = self._am_start(adb, component)
+                        if launch is None:
+                            failed += 1
+                            continue
+                        if i < warmup:
+                            continue
+                        if launch["state"]:
+                            key = f"{mode}:{launch['state']}"
+                            states[key] = states.get(key, 0) + 1
+                            # No LaunchState before Android 10: nothing to check against
+                            if launch["state"] != LAUNCH_STATES[mode]:
+                                mismatched[key] = mismatched.get(key, 0) + 1
+                                continue
+                        samples[f"{mode}_total_ms"].append(launch["total_ms"])
+                        samples[f"{mode}_wait_ms"].append(launch["wait_ms"])
+                adb.shell("input keyevent KEYCODE_HOME")
+                adb.shell(f"am force-stop {pkg}")
+
+                summary = {k: self._summary(v, stat) for k, v in samples.items()
+                           if any(x is not None for x in v)}
+                results[label] = {"package": pkg, "component": component, **summary,
+                                  "launch_states": states, "failed_launches": failed, "samples": samples}
+                problems += [f"{pkg}: {n} {key.split(':')[0]} launch(es) reported {key.split(':')[1]}"
+                             for key, n in mismatched.items()]
+                logger.info(f"  {pkg}: " + ", ".join(
+                    f"{k} p50 {v['p50']:.0f}" for k, v in summary.items() if k.endswith("total_ms")))
+
+                if not summary:
+                    problems.append(f"{pkg}: no successful launch ({component})")
+                    continue
+                limits = app.get("thresholds", params.get("thresholds", {}).get(pkg, {}))
+                regressions, baselines = history_regressions(summary, ctx.history, tid, tolerance,
+                                                             prefix=f"apps.{label}.", unit=" ms", fmt=".0f")
+                if baselines:
+                    results[label]["baseline_p50"] = baselines
+                problems += [f"{pkg} {p}" for p in
+                             exceeded_thresholds(summary, limits, stat, unit=" ms", fmt=".0f") + regressions]
+        finally:
+            adb.shell("input keyevent KEYCODE_HOME")
+            if finish_activities is not None:
+                restore = finish_activities if finish_activities in ("0", "1") else "0"
+                adb.shell(f"settings put global always_finish_activities {restore}")
+
+        metrics = {"apps": results, "iterations": iterations, "warmup": warmup,
+                   "drop_caches": root is not None}
+        if missing:
+            metrics["missing"] = missing
+        if not results:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message=f"No launchable package ({', '.join(missing)})", metrics=metrics)
+
+        brief = "; ".join(
+            f"{r['package']} " + ", ".join(f"{m} p50/p90 {r[f'{m}_total_ms']['p50']:.0f}/"
+                                           f"{r[f'{m}_total_ms']['p90']:.0f}"
+                                           for m in modes if f"{m}_total_ms" in r)
+            for r in results.values())
+        if missing:
+            brief += f"; not installed: {', '.join(missing)}"
+        if problems:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"App launch: {'; '.join(problems)} ({brief})", metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"App launch (ms): {brief}", metrics=metrics)
+
+    def _jank(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Frame-time and jank of a scripted scroll/fling, from ``gfxinfo framestats``.
+
+        The app is launched, its gfxinfo counters reset, and ``swipes``
+        ``input swipe`` gestures are played (first half up, second half down).
+        framestats is dumped after every gesture and merged, since the
+        framework only keeps the last ~120 frames. The frame table is kept as
+        ``<test_id>_framestats.csv`` in the run artifacts.
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        package = params.get("package")
+        swipes = params.get("swipes", 10)
+        gesture = params.get("gesture", "fling")
+        swipe_ms = params.get("swipe_ms", GESTURE_MS.get(gesture, 100))
+        gap = params.get("gesture_gap", 1.0)
+        min_frames = params.get("min_frames", 30)
+        max_jank_pct = params.get("max_jank_pct")
+        max_missed = params.get("max_missed_vsync")
+        thresholds = params.get("thresholds", {})
+        stat = params.get("threshold_stat", "p90")
+        tolerance = params.get("history_tolerance", 0.2)
+        adb = ctx.adb
+
+        if not package:
+            return TestResult(id=tid, name=tname, status=TestStatus.ERROR,
+                              message="jank needs params.package")
+        component = params.get("component") or self._launcher_component(adb, package)
+        if component is None:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message=f"{package} has no launcher activity on this image")
+
+        width, height = self._screen_size(adb)
+        x = width // 2
+        low, high = int(height * 0.75), int(height * 0.25)
+        table = FrameTable()
+        try:
+            adb.shell("input keyevent KEYCODE_WAKEUP")
+            adb.shell("wm dismiss-keyguard")
+            if self._am_start(adb, component) is None:
+                return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                                  message=f"Failed to launch {component}")
+            time.sleep(params.get("launch_settle", 2))
+            adb.shell(f"dumpsys gfxinfo {package} reset")
+            for i in range(swipes):
+                y1, y2 = (low, high) if i < (swipes + 1) // 2 else (high, low)
+                adb.shell(f"input swipe {x} {y1} {x} {y2} {swipe_ms}")
+                time.sleep(gap)
+                result = adb.shell(f"dumpsys gfxinfo {package} framestats")
+                out = result.stdout if hasattr(result, "stdout") else str(result)
+                table = table.merge(parse_framestats(out))
+        finally:
+            adb.shell("input keyevent KEYCODE_HOME")
+
+        metrics = {"package": package, "gesture": gesture, "swipes": swipes,
+                   **frame_metrics(table, params.get("refresh_hz"))}
+        path = ctx.artifact_path(f"{tid}_framestats.csv")
+        if path is not None and len(table):
+            metrics["artifacts"] = [str(table.save(path))]
+        if metrics["frames"] < min_frames:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Only {metrics['frames']} frames rendered during {swipes} "
+                                      f"swipes (< {min_frames}); is {package} scrollable?",
+                              metrics=metrics)
+
+        summary = {"frame_ms": metrics["frame_ms"]}
+        regressions, baselines = history_regressions(summary, ctx.history, tid, tolerance,
+                                                     unit=" ms", fmt=".1f")
+        if baselines:
+            metrics["baseline_p50"] = baselines
+        problems = exceeded_thresholds(summary, thresholds, stat, unit=" ms", fmt=".1f") + regressions
+        if max_jank_pct is not None and metrics["jank_pct"] > max_jank_pct:
+            problems.insert(0, f"jank {metrics['jank_pct']}% > {max_jank_pct}%")
+        if max_missed is not None and metrics["missed_vsync"] > max_missed:
+            problems.append(f"missed vsync {metrics['missed_vsync']} > {max_missed}")
+
+        fm = metrics["frame_ms"]
+        brief = (f"{metrics['frames']} frames @ {metrics['refresh_hz']} Hz, jank {metrics['jank_pct']}%, "
+                 f"p50/p90/p99 {fm['p50']:.1f}/{fm['p90']:.1f}/{fm['p99']:.1f} ms, "
+                 f"missed vsync {metrics['missed_vsync']}")
+        if problems:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"UI jank: {'; '.join(problems)} ({brief})", metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"UI smoothness OK — {brief}", metrics=metrics)
+
+    def _memory(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """System RAM and per-process PSS/RSS snapshot with baseline and leak checks.
+
+        Captures ``dumpsys meminfo`` and ``/proc/meminfo`` after ``settle``
+        seconds and compares used RAM and each tracked process's PSS with the
+        median of previous runs (``history_tolerance``) and ``max_pss_mb`` /
+        ``max_used_ram_mb``. With ``leak_check: <test id>`` (a memory test
+        earlier in the same run, typically right after boot) PSS growth since
+        that snapshot is checked against ``max_growth_mb``; without that
+        snapshot on the same device the test SKIPs rather than passing, so
+        the suite should also declare ``depends_on`` on the reference test.
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        tolerance = params.get("history_tolerance", 0.1)
+        max_pss = params.get("max_pss_mb", {})
+        max_used = params.get("max_used_ram_mb")
+        leak_ref = params.get("leak_check")
+        max_growth = params.get("max_growth_mb", 50)
+        adb = ctx.adb
+
+        processes = {**MEMORY_PROCESSES, **params.get("processes", {})}
+        if "launcher" not in processes:
+            home = self._home_package(adb)
+            if home:
+                processes["launcher"] = (home,)
+
+        time.sleep(params.get("settle", 0))
+        snapshot = MemorySnapshot.capture(adb)
+        if not snapshot.totals and not snapshot.pss:
+            return TestResult(id=tid, name=tname, status=TestStatus.ERROR,
+                              message="Could not parse dumpsys meminfo output")
+        self._memory_snapshots[tid] = (id(adb), snapshot)
+        table = snapshot.table(processes)
+        ram, rows = table["ram"], table["processes"]
+        metrics: dict = {**table, "proc_meminfo_kb": snapshot.proc}
+
+        problems: list[str] = []
+        missing = [label for label in processes if label not in rows]
+        if missing:
+            metrics["missing"] = missing
+        if max_used is not None and ram.get("used_mb") is not None and ram["used_mb"] > max_used:
+            problems.append(f"used RAM {ram['used_mb']:.0f} MB > {max_used} MB")
+        problems += exceeded_thresholds(rows, max_pss, stat="pss_mb", unit=" MB", fmt=".0f")
+
+        baselines = {}
+        for group, data, stat in (("ram", {"ram": ram}, "used_mb"), ("processes", rows, "pss_mb")):
+            regressions, base = history_regressions(data, ctx.history, tid, tolerance, stat=stat,
+                                                    prefix="" if group == "ram" else "processes.",
+                                                    unit=" MB", fmt=".0f")
+            problems += regressions
+            baselines.update({f"{k}.{stat}": v for k, v in base.items()})
+        if baselines:
+            metrics["baseline"] = baselines
+
+        leak_skipped = None
+        if leak_ref:
+            earlier = self._memory_snapshots.get(leak_ref)
+            if earlier is None or earlier[0] != id(adb):
+                leak_skipped = f"no snapshot from '{leak_ref}' on this device in this run"
+                metrics["leak_check"] = leak_skipped
+            else:
+                before = earlier[1].table(processes)["processes"]
+                growth = {label: round(row["pss_mb"] - before[label]["pss_mb"], 1)
+                          for label, row in rows.items()
+                          if row["pss_mb"] is not None and before.get(label, {}).get("pss_mb") is not None}
+                metrics["pss_growth_mb"] = growth
+                for label, g in growth.items():
+                    limit = max_growth.get(label) if isinstance(max_growth, dict) else max_growth
+                    if limit is not None and g > limit:
+                        problems.append(f"{label} PSS grew {g:.0f} MB since '{leak_ref}' (> {limit} MB)")
+
+        brief = f"used RAM {ram.get('used_mb') or 0:.0f} MB; PSS " + ", ".join(
+            f"{label} {row['pss_mb']:.0f}" for label, row in rows.items() if row["pss_mb"] is not None) + " MB"
+        if "pss_growth_mb" in metrics:
+            brief += "; growth " + ", ".join(f"{k} {v:+.0f}" for k, v in metrics["pss_growth_mb"].items()) + " MB"
+        if problems:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Memory: {'; '.join(problems)} ({brief})", metrics=metrics)
+        if leak_skipped:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message=f"Leak check skipped: {leak_skipped} ({brief})", metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"Memory OK — {brief}", metrics=metrics)
+
+    def _storage_io(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Sequential/random throughput, IOPS and latency of ``/data``.
+
+        Uses fio (``tools/fio-arm64``, pushed only when its SHA-256 differs
+        from the device copy) with direct I/O for the four ``IO_JOBS``.
+        Without fio it falls back to ``dd`` sequential write and read with
+        ``oflag``/``iflag=direct`` when the device's dd supports it, else
+        write with fsync and read after drop_caches as root; with neither,
+        the read would only measure page cache and is left unmeasured (no
+        threshold or history check). Runs are repeated ``iterations`` times;
+        random I/O and per-I/O latency need fio. Results are checked
+        against ``min_mb_s`` / ``min_iops`` / ``max_lat_p99_ms`` and the
+        history median (``history_tolerance``).
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        size_mb = params.get("size_mb", 256)
+        tolerance = params.get("history_tolerance", 0.2)
+        fio_local = Path(params.get("fio", FIO_LOCAL))
+        adb = ctx.adb
+
+        free = self._free_mb(adb, "/data")
+        if free is not None and free < size_mb * 2:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message=f"Only {free} MB free on /data (need {size_mb * 2} MB)")
+
+        use_fio = fio_local.exists() and adb.push_cached(fio_local, FIO_REMOTE)
+        try:
+            if use_fio:
+                jobs = self._fio_jobs(adb, size_mb, params.get("runtime", 10), params.get("jobs", list(IO_JOBS)))
+            else:
+                jobs = self._dd_jobs(adb, size_mb, params.get("iterations", 3))
+        finally:
+            adb.shell(f"rm -f {IO_TEST_FILE}")
+
+        metrics: dict = {"engine": "fio" if use_fio else "dd", "size_mb": size_mb, "jobs": jobs}
+        problems = [f"{name}: {job['error']}" for name, job in jobs.items() if "error" in job]
+        measured = {name: job for name, job in jobs.items() if "error" not in job and "unmeasured" not in job}
+        if not measured:
+            return TestResult(id=tid, name=tname, status=TestStatus.ERROR,
+                              message=f"Storage benchmark failed: {'; '.join(problems)}", metrics=metrics)
+
+        for limits, key, fmt in ((params.get("min_mb_s", {}), "mb_s", ".1f"),
+                                 (params.get("min_iops", {}), "iops", ".0f")):
+            for name, limit in limits.items():
+                value = measured.get(name, {}).get(key)
+                if value is not None and value < limit:
+                    problems.append(f"{name} {key} {value:{fmt}} < {limit}")
+        lat = {name: job["lat_ms"] for name, job in measured.items() if "lat_ms" in job}
+        problems += exceeded_thresholds(lat, params.get("max_lat_p99_ms", {}), stat="p99", unit=" ms")
+
+        # Throughput regressions are drops, latency regressions are rises
+        baselines = {}
+        if ctx.history is not None:
+            for name, job in measured.items():
+                for key in ("mb_s", "iops"):
+                    base = ctx.history.metric_baseline(tid, f"jobs.{name}", key)
+                    if base is None or job.get(key) is None:
+                        continue
+                    baselines[f"{name}.{key}"] = base
+                    if job[key] < base * (1 - tolerance):
+                        problems.append(f"{name} {key} {job[key]:.1f} vs baseline {base:.1f} "
+                                        f"({job[key] / base - 1:.0%})")
+        regressions, lat_base = history_regressions(lat, ctx.history, tid, tolerance, stat="p99",
+                                                    prefix="latency.", unit=" ms")
+        problems += regressions
+        baselines.update({f"{name}.lat_p99_ms": v for name, v in lat_base.items()})
+        if lat:
+            metrics["latency"] = lat
+        if baselines:
+            metrics["baseline"] = baselines
+
+        brief = ", ".join(
+            f"{name} {job['mb_s']:.1f} MB/s"
+            + (f" {job['iops']:.0f} IOPS" if name.startswith("rand") else "")
+            + (f" p99 {job['lat_ms']['p99']:.2f} ms" if "lat_ms" in job else "")
+            for name, job in measured.items())
+        brief += "".join(f", {name} unmeasured" for name, job in jobs.items() if "unmeasured" in job)
+        if problems:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Storage I/O: {'; '.join(problems)} ({brief})", metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"Storage I/O ({metrics['engine']}): {brief}", metrics=metrics)
+
+    @staticmethod
+    def _fio_jobs(adb, size_mb: int, runtime: int, names: list[str]) -> dict:
+        jobs = {}
+        for name in names:
+            rw, bs = IO_JOBS[name]
+            result = adb.shell(
+                f"{FIO_REMOTE} --name={name} --filename={IO_TEST_FILE} --size={size_mb}m --rw={rw} "
+                f"--bs={bs} --direct=1 --ioengine=psync --runtime={runtime} --time_based "
+                f"--output-format=json 2>/dev/null", timeout=runtime + 120)
+            out = result.stdout if hasattr(result, "stdout") else str(result)
+            jobs[name] = parse_fio_json(out, "read" if "read" in rw else "write")
+        return jobs
+
+    def _dd_jobs(self, adb, size_mb: int, iterations: int) -> dict:
+        direct = self._dd_direct(adb)
+        root = None if direct else self._root_prefix(adb)
+        wflag, rflag = (" oflag=direct", " iflag=direct") if direct else ("", "")
+        cached = not direct and root is None
+        write, read = [], []
+        for _ in range(iterations):
+            write.append(self._dd_mb_s(adb, f"dd if=/dev/zero of={IO_TEST_FILE} bs=1048576 "
+                                            f"count={size_mb}{wflag} conv=fsync 2>&1"))
+            if cached:
+                continue  # the read would come back from page cache, i.e. RAM speed
+            if root is not None:
+                adb.shell(f"{root}'{DROP_CACHES}'")
+            read.append(self._dd_mb_s(adb, f"dd if={IO_TEST_FILE} of=/dev/null bs=1048576{rflag} 2>&1"))
+        jobs = {}
+        for name, values in (("seq_write", write), ("seq_read", read)):
+            values = [v for v in values if v is not None]
+            if name == "seq_read" and cached:
+                jobs[name] = {"unmeasured": "no direct I/O in dd and no root to drop caches"}
+            elif not values:
+                jobs[name] = {"error": "dd output not parsed"}
+            else:
+                jobs[name] = {"mb_s": round(float(np.median(values)), 1), "runs_mb_s": values, "direct": direct}
+        return jobs
+
+    @staticmethod
+    def _dd_direct(adb) -> bool:
+        """Whether the device's dd accepts ``oflag=direct`` on /data (toybox builds differ)."""
+        result = adb.shell(f"dd if=/dev/zero of={IO_TEST_FILE} bs=1048576 count=1 oflag=direct 2>&1")
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        return bool(re.search(r"\d+ bytes.*copied", out))
+
+    @staticmethod
+    def _dd_mb_s(adb, cmd: str) -> float | None:
+        """MB/s from dd's ``<bytes> bytes ... copied, <seconds> s`` summary."""
+        result = adb.shell(cmd, timeout=300)
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        m = re.search(r"(\d+) bytes.*?copied,\s*([\d.]+)\s*s", out)
+        if not m or float(m.group(2)) <= 0:
+            return None
+        return round(int(m.group(1)) / float(m.group(2)) / 1e6, 1)
+
+    @staticmethod
+    def _free_mb(adb, path: str) -> int | None:
+        result = adb.shell(f"df -k {path}")
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        lines = out.strip().splitlines()
+        fields = lines[-1].split() if len(lines) > 1 else []
+        try:
+            return int(fields[3]) // 1024
+        except (IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def _screen_size(adb) -> tuple[int, int]:
+        """``wm size`` in pixels (override size wins), 1080x2400 if unreadable."""
+        result = adb.shell("wm size")
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        sizes = re.findall(r"(\d+)x(\d+)", out)
+        if not sizes:
+            return 1080, 2400
+        w, h = sizes[-1]
+        return int(w), int(h)
+
+    @staticmethod
+    def _summary(values: list, stat: str = "p90") -> dict:
+        """p50/p90 (and the threshold percentile) summary plus sample standard deviation."""
+        extra = {int(stat[1:])} if stat[:1] == "p" and stat[1:].isdigit() else set()
+        summary = summarize(values, percentiles=tuple(sorted({50, 90} | extra)))
+        arr = np.asarray([v for v in values if v is not None], dtype=float)
+        summary["stddev"] = round(float(arr.std(ddof=1)), 3) if arr.size > 1 else 0.0
+        return summary
+
+    @staticmethod
+    def _root_prefix(adb) -> str | None:
+        """Shell prefix running a quoted command as root: ``sh -c`` (adb root), ``su 0 sh -c`` or None."""
+        for prefix in ("sh -c ", "su 0 sh -c "):
+            result = adb.shell(f"{prefix}'id -u' 2>/dev/null")
+            out = result.stdout if hasattr(result, "stdout") else str(result)
+            if out.strip() == "0":
+                return prefix
+        return None
+
+    @staticmethod
+    def _home_package(adb) -> str | None:
+        """Package of the default HOME activity (the launcher)."""
+        result = adb.shell("cmd package resolve-activity --brief "
+                           "-a android.intent.action.MAIN -c android.intent.category.HOME")
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        lines = [line.strip() for line in out.strip().splitlines()]
+        return lines[-1].split("/")[0] if lines and "/" in lines[-1] else None
+
+    @staticmethod
+    def _launcher_component(adb, package: str) -> str | None:
+        result = adb.shell(f"cmd package resolve-activity --brief -c android.intent.category.LAUNCHER {package}")
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        lines = [line.strip() for line in out.strip().splitlines()]
+        return lines[-1] if lines and "/" in lines[-1] else None
+
+    @staticmethod
+    def _am_start(adb, component: str) -> dict | None:
+        """``am start -W`` result: TotalTime / WaitTime (ms) and LaunchState, None if it did not start."""
+        result = adb.shell(f"am start -W -n {component} 2>&1")
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        if "Error" in out or "does not exist" in out:
+            return None
+        total = re.search(r"TotalTime:\s*(\d+)", out)
+        if not total:
+            return None
+        wait = re.search(r"WaitTime:\s*(\d+)", out)
+        state = re.search(r"LaunchState:\s*(\w+)", out)
+        return {
+            "total_ms": int(total.group(1)),
+            "wait_ms": int(wait.group(1)) if wait else None,
+            "state": state.group(1) if state else None,
+        }
+
+
+def parse_fio_json(text: str, direction: str) -> dict:
+    """MB/s, IOPS and completion-latency percentiles (ms) of the first job in fio JSON output."""
+    start = text.find("{")
+    try:
+        data = json.loads(text[start:]) if start >= 0 else None
+        stats = data["jobs"][0][direction]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return {"error": "fio output not parsed"}
+    job = {"mb_s": round(stats.get("bw", 0) * 1024 / 1e6, 1), "iops": round(stats.get("iops", 0), 1)}
+    percentiles = stats.get("clat_ns", {}).get("percentile", {})
+    lat = {f"p{float(k):g}": round(v / 1e6, 3) for k, v in percentiles.items()
+           if float(k) in (50.0, 90.0, 99.0, 99.9)}
+    if lat:
+        job["lat_ms"] = lat
+    return job
@@ -2,9 +2,14 @@ import re
 import time
 from pathlib import Path
 
+import numpy as np
+
 from smoke_test_ai.core.test_runner import TestResult, TestStatus
 from smoke_test_ai.plugins.base import TestPlugin, PluginContext
+from smoke_test_ai.utils.device_sampler import DeviceSampler, SampleSet, sysfs_labels, sysfs_values
 from smoke_test_ai.utils.logger import get_logger
+from smoke_test_ai.utils.stats import exceeded_thresholds, summarize
+from smoke_test_ai.utils.wakeup_sources import WakeupSnapshot, format_delta
 
 logger = get_logger(__name__)
 
@@ -20,6 +25,8 @@ class SuspendPlugin(TestPlugin):
             return self._thermal_check(test_case, context)
         if action == "reboot":
             return self._reboot(test_case, context)
+        if action == "boot_benchmark":
+            return self._boot_benchmark(test_case, context)
         return TestResult(
             id=test_case["id"], name=test_case["name"],
             status=TestStatus.ERROR,
@@ -79,6 +86,168 @@ class SuspendPlugin(TestPlugin):
         return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
                           message="Boot not completed after reboot (timeout)")
 
+    # Boot phases reported by boot_benchmark, in boot order
+    BOOT_PHASES = ("bootloader", "kernel", "init", "zygote", "system_server", "boot_completed", "total")
+
+    # One shell round-trip collects every boot timing source after boot_completed
+    _BOOT_TIMING_CMD = (
+        "echo '==events=='; logcat -b events -d 2>/dev/null | grep boot_progress_; "
+        "echo '==boottime=='; getprop | grep -E 'ro\\.boottime\\.'; "
+        "echo '==bootloader=='; getprop ro.boot.boottime; "
+        "echo '==dmesg=='; dmesg 2>/dev/null | grep -E 'init (first|second) stage started'; "
+        "echo '==bootstat=='; bootstat -p 2>/dev/null"
+    )
+
+    def _boot_benchmark(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Reboot N times and break each boot into phases with sub-second precision.
+
+        Phase boundaries come from device-side timestamps (``ro.boottime.*``,
+        ``boot_progress_*`` events, dmesg, bootstat), not host wall-clock, so
+        they are independent of ADB reconnect latency. ``thresholds`` maps a
+        phase to a limit in seconds, checked against ``threshold_stat`` (p95).
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        iterations = params.get("iterations", 3)
+        boot_timeout = params.get("boot_timeout", 120)
+        poll_interval = params.get("poll_interval", 0.5)
+        thresholds = params.get("thresholds", {})
+        stat = params.get("threshold_stat", "p95")
+
+        adb = ctx.adb
+        samples: list[dict] = []
+        for i in range(iterations):
+            logger.info(f"Boot benchmark {i + 1}/{iterations}: rebooting...")
+            adb.shell("reboot")
+            for _ in range(30):
+                time.sleep(1)
+                if not adb.is_connected():
+                    break
+            if not adb.wait_for_device(timeout=boot_timeout):
+                return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                                  message=f"Iteration {i + 1}: device not found via ADB after reboot "
+                                          f"(timeout: {boot_timeout}s)",
+                                  metrics={"samples": samples})
+            completed_at = self._wait_boot_completed(adb, boot_timeout, poll_interval)
+            if completed_at is None:
+                return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                                  message=f"Iteration {i + 1}: boot not completed (timeout)",
+                                  metrics={"samples": samples})
+
+            result = adb.shell(self._BOOT_TIMING_CMD)
+            out = result.stdout if hasattr(result, "stdout") else str(result)
+            phases = self._boot_phases(self._parse_boot_timing(out), completed_at)
+            samples.append(phases)
+            logger.info("  " + ", ".join(f"{k}={v:.2f}s" for k, v in phases.items()))
+
+        summary = {
+            phase: summarize([s.get(phase) for s in samples])
+            for phase in self.BOOT_PHASES
+            if any(phase in s for s in samples)
+        }
+        metrics = {"iterations": iterations, "phases": summary, "samples": samples}
+
+        exceeded = exceeded_thresholds(summary, thresholds, stat, unit="s")
+        missing = [p for p in thresholds if p not in summary]
+
+        brief = ", ".join(
+            f"{p} {v['p50']:.2f}/{v['p95']:.2f}/{v['max']:.2f}s" for p, v in summary.items()
+        )
+        if exceeded:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Boot phase regression: {'; '.join(exceeded)} "
+                                      f"(p50/p95/max over {iterations} boots: {brief})",
+                              metrics=metrics)
+        note = f" (no data for: {', '.join(missing)})" if missing else ""
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"{iterations} boots, p50/p95/max: {brief}{note}",
+                          metrics=metrics)
+
+    @staticmethod
+    def _wait_boot_completed(adb, timeout: float, interval: float = 0.5) -> float | None:
+        """Poll sys.boot_completed; return device uptime (s) when first seen, else None."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                result = adb.shell("getprop sys.boot_completed; cat /proc/uptime")
+                out = (result.stdout if hasattr(result, "stdout") else str(result)).split()
+                if len(out) >= 2 and out[0] == "1":
+                    return float(out[1])
+            except Exception:
+                pass
+            time.sleep(interval)
+        return None
+
+    @staticmethod
+    def _parse_boot_timing(output: str) -> dict:
+        """Split _BOOT_TIMING_CMD output into events (ms), boottime (ns), bootloader, dmesg, bootstat."""
+        data = {"events": {}, "boottime": {}, "bootloader": {}, "dmesg": {}, "bootstat": {}}
+        section = None
+        for line in output.splitlines():
+            line = line.strip()
+            m = re.fullmatch(r"==(\w+)==", line)
+            if m:
+                section = m.group(1)
+                continue
+            if not line or section not in data:
+                continue
+            if section == "events":
+                m = re.search(r"(boot_progress_\w+)\s*:\s*\[?(\d+)", line)
+                if m:
+                    data["events"].setdefault(m.group(1), int(m.group(2)))
+            elif section == "boottime":
+                m = re.search(r"\[ro\.boottime\.([\w.]+)\]:\s*\[(\d+)\]", line)
+                if m:
+                    data["boottime"][m.group(1)] = int(m.group(2))
+            elif section == "bootloader":
+                # e.g. "1BLL:85,1BLE:1011,2BLL:0,2BLE:1306,SW:8001,KL:0,KD:13"
+                for part in line.split(","):
+                    key, _, val = part.partition(":")
+                    if val.strip().isdigit():
+                        data["bootloader"][key.strip()] = int(val)
+            elif section == "dmesg":
+                m = re.search(r"\[\s*(\d+\.\d+)\].*init (first|second) stage started", line)
+                if m:
+                    data["dmesg"].setdefault(f"init_{m.group(2)}_stage", float(m.group(1)))
+            elif section == "bootstat":
+                m = re.match(r"([\w.]+)\s+(\d+)$", line)
+                if m:
+                    data["bootstat"][m.group(1)] = int(m.group(2))
+        return data
+
+    @staticmethod
+    def _boot_phases(data: dict, completed_at: float) -> dict[str, float]:
+        """Per-phase durations (s). Phases whose boundaries are missing are omitted."""
+        events, boottime = data["events"], data["boottime"]
+        phases: dict[str, float] = {}
+
+        # Bootloader: ro.boot.boottime stages excluding SW (time waiting on user input)
+        bl = data["bootloader"]
+        if bl:
+            phases["bootloader"] = sum(v for k, v in bl.items() if k != "SW") / 1000
+        elif "boottime.bootloader.total" in data["bootstat"]:
+            phases["bootloader"] = data["bootstat"]["boottime.bootloader.total"] / 1000
+
+        init_start = (boottime["init"] / 1e9 if "init" in boottime
+                      else data["dmesg"].get("init_first_stage"))
+        zygote_ns = boottime.get("zygote", boottime.get("zygote64"))
+        zygote_start = (zygote_ns / 1e9 if zygote_ns is not None
+                        else events.get("boot_progress_start", 0) / 1000 or None)
+        system_run = events.get("boot_progress_system_run", 0) / 1000 or None
+        screen_ms = events.get("boot_progress_enable_screen") or events.get("boot_progress_ams_ready")
+        screen = screen_ms / 1000 if screen_ms else None
+
+        bounds = [("kernel", 0.0, init_start), ("init", init_start, zygote_start),
+                  ("zygote", zygote_start, system_run), ("system_server", system_run, screen),
+                  ("boot_completed", screen, completed_at)]
+        for name, start, end in bounds:
+            if start is not None and end is not None and end >= start:
+                phases[name] = round(end - start, 3)
+        phases["total"] = round(completed_at + phases.get("bootloader", 0.0), 3)
+        if "bootloader" in phases:
+            phases["bootloader"] = round(phases["bootloader"], 3)
+        return phases
+
     def _deep_sleep(self, tc: dict, ctx: PluginContext) -> TestResult:
         tid, tname = tc["id"], tc["name"]
         params = tc.get("params", {})
@@ -111,6 +280,12 @@ class SuspendPlugin(TestPlugin):
         logger.info("Screen off (KEYCODE_POWER)")
         time.sleep(2)
 
+        # Wakeup source baseline, diffed after resume to name suspend blockers
+        wakeup_before = WakeupSnapshot.capture(adb)
+
+        if params.get("adaptive", False):
+            return self._adaptive_deep_sleep(tc, ctx, initial_stats, wakeup_before)
+
         # 4. USB power off — ADB disconnects, device can enter deep sleep
         logger.info(f"USB power off, waiting {suspend_duration}s for deep sleep...")
         ctx.usb_power.power_off()
@@ -142,6 +317,8 @@ class SuspendPlugin(TestPlugin):
                               message="Cannot read soc_sleep stats after resume")
 
         logger.info(f"Final sleep stats: {final_stats}")
+        wakeup_after = WakeupSnapshot.capture(adb)
+        metrics, diag = self._wakeup_report(ctx, tid, wakeup_before, wakeup_after)
 
         # 7. Restore airplane mode + NFC
         adb.shell("cmd connectivity airplane-mode disable")
@@ -153,22 +330,133 @@ class SuspendPlugin(TestPlugin):
 
         if not screen_awake:
             return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
-                              message=f"Screen did not wake after resume: {screen_out.strip()}")
+                              message=f"Screen did not wake after resume: {screen_out.strip()}",
+                              metrics=metrics)
 
         if not entered_deep_sleep:
-            # Diagnose: collect wakelock info to identify blockers
-            diag = self._diagnose_wakelocks(adb)
             return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
                               message=f"Deep sleep not entered during {suspend_duration}s suspend. "
                                       f"Before: {initial_stats}, After: {final_stats}\n"
-                                      f"--- Wakelock Diagnosis ---\n{diag}")
+                                      f"--- Wakelock Diagnosis ---\n{diag}",
+                              metrics=metrics)
 
         return TestResult(
             id=tid, name=tname, status=TestStatus.PASS,
             message=f"Suspend/Resume OK + Deep sleep verified "
                     f"(aosd: {initial_stats['aosd']}→{final_stats['aosd']}, "
                     f"cxsd: {initial_stats['cxsd']}→{final_stats['cxsd']}, "
-                    f"ddr: {initial_stats['ddr']}→{final_stats['ddr']})"
+                    f"ddr: {initial_stats['ddr']}→{final_stats['ddr']})",
+            metrics=metrics,
+        )
+
+    @staticmethod
+    def _wakeup_report(ctx: PluginContext, tid: str, before: WakeupSnapshot,
+                       after: WakeupSnapshot) -> tuple[dict, str]:
+        """Diff two wakeup-source snapshots and keep both as run artifacts.
+
+        Returns ``(metrics, diagnosis)``: top blockers by active time and
+        wakeup count over the window, and the same as readable text.
+        """
+        delta = after.diff(before)
+        metrics = {"wakeup_sources": delta.summary()}
+        artifacts = []
+        for label, snap in (("before", before), ("after", after)):
+            path = ctx.artifact_path(f"{tid}_wakeup_sources_{label}.json")
+            if path is not None:
+                artifacts.append(str(snap.save(path)))
+        if artifacts:
+            metrics["artifacts"] = artifacts
+        return metrics, format_delta(delta)
+
+    def _adaptive_deep_sleep(self, tc: dict, ctx: PluginContext, initial_stats: dict,
+                             wakeup_before: WakeupSnapshot) -> TestResult:
+        """Suspend in growing windows and stop at the first one where deep sleep counters advance.
+
+        Starts with ``initial_window`` seconds and doubles up to
+        ``suspend_duration``; healthy builds pass after the first short
+        window. Each failed probe records a wakelock diagnosis.
+        Called with airplane mode on and the screen already off.
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        max_window = params.get("suspend_duration", 120)
+        window = min(params.get("initial_window", 10), max_window)
+        adb_timeout = params.get("adb_timeout", 60)
+        settle_time = params.get("settle_time", 5)
+
+        adb = ctx.adb
+        probes = []
+        before = initial_stats
+        wakeup_probe_start = wakeup_before
+        entered = False
+        while True:
+            logger.info(f"USB power off, probing deep sleep for {window}s...")
+            ctx.usb_power.power_off()
+            time.sleep(window)
+            ctx.usb_power.power_on()
+            if not adb.wait_for_device(timeout=adb_timeout):
+                return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                                  message=f"Device not found via ADB after {window}s suspend",
+                                  metrics={"probes": probes})
+            time.sleep(settle_time)
+
+            after = self._read_sleep_stats(adb)
+            if after is None:
+                return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                                  message="Cannot read soc_sleep stats after resume",
+                                  metrics={"probes": probes})
+            wakeup_after = WakeupSnapshot.capture(adb)
+            entered = self._verify_deep_sleep(before, after)
+            probe = {"window_s": window, "entered": entered, "before": before, "after": after}
+            probes.append(probe)
+            logger.info(f"  Probe {len(probes)} ({window}s): "
+                        f"{'deep sleep OK' if entered else 'no deep sleep'} {before} → {after}")
+            if entered or window >= max_window:
+                break
+            delta = wakeup_after.diff(wakeup_probe_start)
+            probe["wakeup_sources"] = delta.summary()
+            probe["diagnosis"] = format_delta(delta)
+            before, wakeup_probe_start = after, wakeup_after
+            window = min(window * 2, max_window)
+            # KEYCODE_SLEEP (not POWER): only turns the screen off, never on
+            adb.shell("input keyevent KEYCODE_SLEEP")
+            time.sleep(2)
+
+        # Wake screen, verify resume, restore radios
+        adb.shell("input keyevent KEYCODE_WAKEUP")
+        time.sleep(1)
+        screen_state = adb.shell("dumpsys display | grep 'mScreenState'")
+        screen_out = screen_state.stdout if hasattr(screen_state, "stdout") else str(screen_state)
+        adb.shell("cmd connectivity airplane-mode disable")
+        adb.shell("svc nfc enable 2>/dev/null")
+
+        suspended = sum(p["window_s"] for p in probes)
+        metrics, _ = self._wakeup_report(ctx, tid, wakeup_before, wakeup_after)
+        metrics.update({"probes": probes, "suspended_s": suspended})
+        if "ON" not in screen_out.upper():
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Screen did not wake after resume: {screen_out.strip()}",
+                              metrics=metrics)
+        if not entered:
+            if "diagnosis" not in probes[-1]:
+                delta = wakeup_after.diff(wakeup_probe_start)
+                probes[-1]["wakeup_sources"] = delta.summary()
+                probes[-1]["diagnosis"] = format_delta(delta)
+            windows = ", ".join(f"{p['window_s']}s" for p in probes)
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"Deep sleep not entered in any probe ({windows}). "
+                                      f"Before: {initial_stats}, After: {probes[-1]['after']}\n"
+                                      f"--- Wakelock Diagnosis ---\n{probes[-1]['diagnosis']}",
+                              metrics=metrics)
+        last = probes[-1]
+        return TestResult(
+            id=tid, name=tname, status=TestStatus.PASS,
+            message=f"Suspend/Resume OK + Deep sleep verified after {len(probes)} probe(s), "
+                    f"{suspended}s suspended "
+                    f"(aosd: {last['before']['aosd']}→{last['after']['aosd']}, "
+                    f"cxsd: {last['before']['cxsd']}→{last['after']['cxsd']}, "
+                    f"ddr: {last['before']['ddr']}→{last['after']['ddr']})",
+            metrics=metrics,
         )
 
     def _thermal_check(self, tc: dict, ctx: PluginContext) -> TestResult:
@@ -256,8 +544,10 @@ class SuspendPlugin(TestPlugin):
         before_temps = {z: zones[z] for z in verify_zones if z in zones}
 
         stress_duration = params.get("stress_duration", 120)
+        sample_rate = params.get("sample_rate_hz", 2)  # 0 = no time-series sampling
         stale_zones = []
         active_zones = []
+        metrics: dict = {}
 
         if before_temps:
             logger.info(f"  Before stress: {', '.join(f'{z}={t/1000:.1f}°C' for z, t in before_temps.items())}")
@@ -303,6 +593,16 @@ class SuspendPlugin(TestPlugin):
             adb.shell("echo 200 > /sys/class/leds/led:torch_0/brightness 2>/dev/null; "
                        "echo 200 > /sys/class/leds/led:torch_1/brightness 2>/dev/null")
 
+            # Device-side sampler: temps / CPU freq / cooling / current during the whole run
+            sampler = None
+            if sample_rate > 0:
+                sampler = self._thermal_sampler(adb, dur, 1 / sample_rate)
+                try:
+                    sampler.start()
+                except Exception as e:
+                    logger.warning(f"  Thermal sampler failed to start: {e}")
+                    sampler = None
+
             if has_sat:
                 logger.info(f"  Running stressapptest for {dur}s "
                             f"({stress_threads} threads, {stress_mem}MB RAM + Display + Flash)...")
@@ -330,6 +630,15 @@ class SuspendPlugin(TestPlugin):
                 logger.warning("  ADB disconnected after stress, waiting for reconnect...")
                 adb.wait_for_device(timeout=120)
 
+            if sampler:
+                try:
+                    metrics = self._thermal_timeseries_metrics(sampler.collect())
+                    logger.info(f"  Sampled {metrics['samples']} points: "
+                                f"throttling onset={metrics['throttling_onset_s']}s, "
+                                f"peaks={metrics['peak_temps_c']}")
+                except Exception as e:
+                    logger.warning(f"  Thermal sampler collection failed: {e}")
+
             adb.shell("killall stressapptest screenrecord 2>/dev/null; "
                        "pkill -f 'while true' 2>/dev/null; "
                        "echo 0 > /sys/class/leds/led:torch_0/brightness 2>/dev/null; "
@@ -413,7 +722,8 @@ class SuspendPlugin(TestPlugin):
 
         if errors:
             return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
-                              message=f"Thermal check failed: {'; '.join(errors)}")
+                              message=f"Thermal check failed: {'; '.join(errors)}",
+                              metrics=metrics)
 
         key_temps = ", ".join(
             f"{kz}={zones[kz]/1000:.1f}°C" for kz in key_zones if kz in zones
@@ -421,11 +731,110 @@ class SuspendPlugin(TestPlugin):
         reactivity_parts = [f"{a['name']}+{a['delta']/1000:.1f}°C" for a in active_zones]
         reactivity = f", verified: {', '.join(reactivity_parts)}" if reactivity_parts else ""
         stale_note = f", stale: {', '.join(stale_zones)}" if stale_zones else ""
+        throttle_note = ""
+        if metrics.get("samples"):
+            onset = metrics["throttling_onset_s"]
+            throttle_note = (f", throttling at {onset:.1f}s" if onset is not None
+                             else ", no throttling")
         return TestResult(
             id=tid, name=tname, status=TestStatus.PASS,
             message=f"Thermal OK — {zone_count} zones, {cool_count} cooling devices, "
                     f"hottest: {hottest_name}={hottest_temp:.1f}°C. "
-                    f"Key: {key_temps}{reactivity}{stale_note}")
+                    f"Key: {key_temps}{reactivity}{stale_note}{throttle_note}",
+            metrics=metrics)
+
+    @staticmethod
+    def _thermal_sampler(adb, duration: float, interval: float) -> DeviceSampler:
+        zones = "/sys/class/thermal/thermal_zone*"
+        policies = "/sys/devices/system/cpu/cpufreq/policy*"
+        cooling = "/sys/class/thermal/cooling_device*"
+        return DeviceSampler(
+            adb, "thermal",
+            columns={
+                "temp": sysfs_values(zones, "temp"),
+                "freq": sysfs_values(policies, "scaling_cur_freq"),
+                "cooling": sysfs_values(cooling, "cur_state"),
+                "current": sysfs_values("/sys/class/power_supply/battery", "current_now"),
+            },
+            header={
+                "zones": sysfs_labels(zones, "type"),
+                "policies": sysfs_labels(policies),
+                "cooling": sysfs_labels(cooling, "type"),
+            },
+            interval=interval,
+            duration=duration,
+        )
+
+    @staticmethod
+    def _thermal_timeseries_metrics(samples: SampleSet, top_n: int = 5) -> dict:
+        """Throttling onset, peak temperatures and CPU frequency residency from sampler data."""
+        t = samples.t
+        metrics: dict = {
+            "samples": len(samples),
+            "duration_s": round(float(t[-1]), 1) if len(t) else 0.0,
+            "throttling_onset_s": None,
+            "throttling_devices": [],
+            "peak_temps_c": {},
+            "freq_residency": {},
+        }
+        if not len(samples):
+            return metrics
+
+        # Peak temperature per zone (plausible range only — BCL zones report levels, not °C)
+        temps = samples.column("temp") / 1000
+        zones = samples.header.get("zones", [])
+        with np.errstate(all="ignore"):
+            plausible = np.where((temps > -40) & (temps < 150), temps, np.nan)
+        # Reduce only zones with a plausible sample; nanmax warns on all-NaN columns
+        peaks = np.full(plausible.shape[1] if plausible.ndim == 2 else 0, np.nan)
+        seen = np.isfinite(plausible).any(axis=0) if plausible.size else np.zeros(len(peaks), dtype=bool)
+        if seen.any():
+            peaks[seen] = np.nanmax(plausible[:, seen], axis=0)
+        ranked = sorted(
+            ((zones[i] if i < len(zones) else f"zone{i}", float(p))
+             for i, p in enumerate(peaks) if not np.isnan(p)),
+            key=lambda x: x[1], reverse=True,
+        )
+        metrics["peak_temps_c"] = {name: round(p, 1) for name, p in ranked[:top_n]}
+
+        # Throttling onset: first sample where any cooling device state rises above its start value
+        cooling = samples.column("cooling")
+        if cooling.size:
+            raised = np.nan_to_num(cooling - cooling[0], nan=0.0) > 0
+            rows = np.flatnonzero(raised.any(axis=1))
+            if rows.size:
+                first = rows[0]
+                labels = samples.header.get("cooling", [])
+                metrics["throttling_onset_s"] = round(float(t[first]), 1)
+                metrics["throttling_devices"] = [
+                    labels[i] if i < len(labels) else f"cooling_device{i}"
+                    for i in np.flatnonzero(raised[first])
+                ]
+
+        # CPU frequency residency per cluster: share of samples at each frequency
+        freqs = samples.column("freq") / 1000  # kHz -> MHz
+        policies = samples.header.get("policies", [])
+        for i in range(freqs.shape[1]):
+            col = freqs[:, i][~np.isnan(freqs[:, i])]
+            if not col.size:
+                continue
+            values, counts = np.unique(col, return_counts=True)
+            order = np.argsort(counts)[::-1][:top_n]
+            metrics["freq_residency"][policies[i] if i < len(policies) else f"policy{i}"] = {
+                "mean_mhz": round(float(col.mean()), 1),
+                "max_mhz": round(float(col.max()), 1),
+                "residency": {f"{values[j]:.0f}": round(float(counts[j] / col.size), 3) for j in order},
+            }
+
+        current = samples.column("current")
+        if current.size and not np.isnan(current).all():
+            ma = current[:, 0] / 1000  # µA -> mA
+            metrics["battery_current_ma"] = {
+                "min": round(float(np.nanmin(ma)), 1),
+                "mean": round(float(np.nanmean(ma)), 1),
+                "max": round(float(np.nanmax(ma)), 1),
+            }
+        return metrics
 
     def _wakelock_check(self, tc: dict, ctx: PluginContext) -> TestResult:
         """Check for abnormal wakelocks that would block suspend."""
@@ -435,10 +844,10 @@ class SuspendPlugin(TestPlugin):
 
         adb = ctx.adb
 
-        # 1. Get Android framework wakelocks
-        framework_wl = self._get_framework_wakelocks(adb)
-        # 2. Get kernel wakeup sources with prevent_suspend_time > 0
-        kernel_blockers = self._get_kernel_wakeup_blockers(adb)
+        # Framework partial wakelocks + busiest kernel wakeup sources, one round-trip
+        snapshot = WakeupSnapshot.capture(adb)
+        framework_wl = [wl for wl in snapshot.wakelocks if wl["type"] == "PARTIAL"]
+        kernel_blockers = self._kernel_wakeup_blockers(snapshot)
 
         partial_count = len(framework_wl)
         blocker_count = len(kernel_blockers)
@@ -472,98 +881,21 @@ class SuspendPlugin(TestPlugin):
                                   + "; ".join(details) if details else "")
 
     @staticmethod
-    def _get_framework_wakelocks(adb) -> list[dict]:
-        """Get active partial wakelocks from Android framework."""
-        result = adb.shell("dumpsys power | grep 'PARTIAL_WAKE_LOCK'")
-        stdout = result.stdout if hasattr(result, "stdout") else str(result)
-        wakelocks = []
-        for line in stdout.splitlines():
-            line = line.strip()
-            if not line or "PARTIAL_WAKE_LOCK" not in line:
-                continue
-            # Format: PARTIAL_WAKE_LOCK  'tag' ACQ=... (uid=... pid=...)
-            tag_m = re.search(r"'([^']+)'", line)
-            uid_m = re.search(r"uid=(\d+)", line)
-            wakelocks.append({
-                "type": "PARTIAL",
-                "tag": tag_m.group(1) if tag_m else line[:50],
-                "uid": uid_m.group(1) if uid_m else "?",
-                "raw": line,
-            })
-        return wakelocks
-
-    @staticmethod
-    def _get_kernel_wakeup_blockers(adb) -> list[dict]:
-        """Get kernel wakeup sources that actively prevent suspend."""
-        result = adb.shell("cat /d/wakeup_sources 2>/dev/null || "
-                          "cat /sys/kernel/debug/wakeup_sources 2>/dev/null")
-        stdout = result.stdout if hasattr(result, "stdout") else str(result)
-        blockers = []
-        for line in stdout.splitlines():
-            if line.startswith("name") or not line.strip():
-                continue
-            parts = line.split("\t")
-            if len(parts) < 9:
-                continue
-            name = parts[0].strip()
-            if not name:
-                continue
-            try:
-                active_count = int(parts[1].strip())
-                total_time = int(parts[6].strip())
-                prevent_time = int(parts[8].strip())
-            except (ValueError, IndexError):
-                continue
-            # Only include sources with significant activity
-            if active_count > 10 and total_time > 1000:
-                blockers.append({
-                    "name": name,
-                    "active_count": active_count,
-                    "total_time": total_time,
-                    "prevent_suspend_time": prevent_time,
-                })
-        # Sort by total_time descending
-        blockers.sort(key=lambda x: x["total_time"], reverse=True)
-        return blockers[:10]
-
-    @staticmethod
-    def _diagnose_wakelocks(adb) -> str:
-        """Collect wakelock diagnostics for deep sleep failure analysis."""
-        lines = []
-
-        # Framework wakelocks
-        result = adb.shell("dumpsys power | grep -E 'WAKE_LOCK|Suspend Blockers' -A5")
-        stdout = result.stdout if hasattr(result, "stdout") else str(result)
-        fw_locks = [l.strip() for l in stdout.splitlines() if l.strip()]
-        if fw_locks:
-            lines.append("Framework wakelocks:")
-            for l in fw_locks[:10]:
-                lines.append(f"  {l}")
-
-        # Kernel wakeup sources (top by total_time)
-        result = adb.shell("cat /d/wakeup_sources 2>/dev/null || "
-                          "cat /sys/kernel/debug/wakeup_sources 2>/dev/null")
-        stdout = result.stdout if hasattr(result, "stdout") else str(result)
-        sources = []
-        for line in stdout.splitlines():
-            if line.startswith("name") or not line.strip():
-                continue
-            parts = line.split("\t")
-            if len(parts) >= 7:
-                name = parts[0].strip()
-                try:
-                    total = int(parts[6].strip())
-                except (ValueError, IndexError):
-                    total = 0
-                if name and total > 1000:
-                    sources.append((name, total))
-        sources.sort(key=lambda x: x[1], reverse=True)
-        if sources:
-            lines.append("Top kernel wakeup sources (by total_time ms):")
-            for name, total in sources[:10]:
-                lines.append(f"  {name}: {total}ms")
-
-        return "\n".join(lines) if lines else "No wakelock data available"
+    def _kernel_wakeup_blockers(snapshot: WakeupSnapshot, limit: int = 10) -> list[dict]:
+        """Kernel wakeup sources with significant activity, by total active time."""
+        active = snapshot.column("active_count")
+        total = snapshot.column("total_time")
+        busy = np.flatnonzero((active > 10) & (total > 1000))
+        busy = busy[np.argsort(-total[busy], kind="stable")][:limit]
+        return [
+            {
+                "name": snapshot.names[i],
+                "active_count": int(active[i]),
+                "total_time": int(total[i]),
+                "prevent_suspend_time": int(snapshot.column("prevent_suspend_time")[i]),
+            }
+            for i in busy
+        ]
 
     @staticmethod
     def _read_sleep_stats(adb) -> dict | None:
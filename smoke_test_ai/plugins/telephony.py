@@ -3,6 +3,10 @@ import time
 
 from smoke_test_ai.core.test_runner import TestResult, TestStatus
 from smoke_test_ai.plugins.base import TestPlugin, PluginContext
+from smoke_test_ai.utils.logger import get_logger
+from smoke_test_ai.utils.stats import exceeded_thresholds, history_regressions, summarize
+
+logger = get_logger(__name__)
 
 # Android data network type constants (TelephonyManager.NETWORK_TYPE_*)
 NETWORK_TYPE_NAMES = {
@@ -13,6 +17,10 @@ NETWORK_TYPE_NAMES = {
     20: "NR",
 }
 
+# TelephonyManager.CALL_STATE_*
+CALL_STATE_IDLE, CALL_STATE_RINGING, CALL_STATE_OFFHOOK = 0, 1, 2
+STATE_POLL_INTERVAL = 0.2
+
 
 class TelephonyPlugin(TestPlugin):
     def execute(self, test_case: dict, context: PluginContext) -> TestResult:
@@ -29,6 +37,10 @@ class TelephonyPlugin(TestPlugin):
             return self._check_voice_type(test_case, context)
         if action == "sim_info":
             return self._sim_info(test_case, context)
+        if action == "sms_latency":
+            return self._sms_latency(test_case, context)
+        if action == "call_setup_latency":
+            return self._call_setup_latency(test_case, context)
         return TestResult(
             id=test_case["id"], name=test_case["name"],
             status=TestStatus.ERROR,
@@ -194,6 +206,195 @@ class TelephonyPlugin(TestPlugin):
         return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
                           message="SIM info unavailable (no number, no IMSI)")
 
+    def _sms_latency(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Send ``count`` uniquely tagged SMS between DUT and peer and time each delivery.
+
+        Latency is host time from the ``sendSms`` call to the receiver's
+        ``waitForSms`` returning the tagged message; unreceived messages
+        within ``timeout`` count as lost.
+        """
+        tid, tname = tc["id"], tc["name"]
+        if not ctx.snippet:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message="Snippet not available on DUT")
+        if not ctx.peer_snippet:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message="Peer device snippet not available")
+        params = tc.get("params", {})
+        count = params.get("count", 5)
+        timeout = params.get("timeout", 30)
+        gap = params.get("interval", 1)
+        direction = params.get("direction", "peer_to_dut")
+        device_cfg = ctx.settings.get("device", {})
+        if direction == "dut_to_peer":
+            sender, receiver = ctx.snippet, ctx.peer_snippet
+            number = params.get("to_number") or device_cfg.get("peer_phone_number", "")
+            missing = "peer number not configured (set params.to_number or device.peer_phone_number)"
+        else:
+            sender, receiver = ctx.peer_snippet, ctx.snippet
+            number = device_cfg.get("phone_number", "")
+            missing = "DUT phone number not configured (set device.phone_number in settings)"
+        if not number:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP, message=missing)
+
+        body = self._render_body(params.get("body", "smoke-latency {timestamp}"))
+        latencies: list[float] = []
+        lost: list[int] = []
+        for i in range(1, count + 1):
+            tag = f"{body} #{i}/{count}"
+            try:
+                receiver.asyncWaitForSms(f"sms_latency_{i}")
+                start = time.monotonic()
+                sender.sendSms(number, tag)
+                latency = self._wait_for_tagged_sms(receiver, tag, start, timeout, i)
+            except Exception as e:
+                logger.warning(f"SMS {i}/{count} failed: {e}")
+                latency = None
+            if latency is None:
+                lost.append(i)
+            else:
+                latencies.append(latency)
+                logger.info(f"SMS {i}/{count} delivered in {latency:.2f}s")
+            if i < count:
+                time.sleep(gap)
+
+        summary = {"latency_s": summarize(latencies)} if latencies else {}
+        metrics = {"direction": direction, "sent": count, "received": len(latencies),
+                   "loss": round(len(lost) / count, 3) if count else 0.0, **summary,
+                   "samples": latencies}
+        if lost:
+            metrics["lost"] = lost
+        return self._latency_result(tc, ctx, f"SMS {direction}", summary, metrics,
+                                    lost_msg=f"{len(lost)}/{count} SMS lost" if lost else "",
+                                    max_loss=params.get("max_loss", 0.0))
+
+    @staticmethod
+    def _wait_for_tagged_sms(receiver, tag: str, start: float, timeout: float, index: int) -> float | None:
+        """Seconds from ``start`` until ``tag`` arrives; other messages re-arm the wait."""
+        deadline = start + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            received = receiver.waitForSms(int(remaining * 1000))
+            if tag in (received or {}).get("MessageBody", ""):
+                return round(time.monotonic() - start, 3)
+            receiver.asyncWaitForSms(f"sms_latency_{index}")
+        return None
+
+    def _call_setup_latency(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Place ``count`` calls DUT -> peer and time dial, peer ringing and (optionally) answer.
+
+        Each call is hung up as soon as the ``until`` state is confirmed:
+        ``ringing`` (peer CALL_STATE_RINGING) or ``active`` (peer went
+        OFFHOOK after ringing, i.e. answered — needs auto-answer on the peer).
+        ``ringing`` is the default because the harness cannot answer on the
+        peer (its snippet only reads call state); without auto-answer every
+        ``active`` call would time out.
+        """
+        tid, tname = tc["id"], tc["name"]
+        if not ctx.snippet:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message="Snippet not available on DUT")
+        if not ctx.peer_snippet:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message="Peer device snippet not available")
+        params = tc.get("params", {})
+        number = params.get("to_number") or ctx.settings.get("device", {}).get("peer_phone_number", "")
+        if not number:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message="Peer number not configured (set params.to_number or device.peer_phone_number)")
+        count = params.get("count", 3)
+        timeout = params.get("timeout", 30)
+        until = params.get("until", "ringing")
+        gap = params.get("interval", 3)
+        if until not in ("ringing", "active"):
+            return TestResult(id=tid, name=tname, status=TestStatus.ERROR,
+                              message=f"Unknown until '{until}' (expected ringing or active)")
+
+        samples: dict[str, list[float]] = {"dial_s": [], "ringing_s": [], "active_s": []}
+        failed: list[int] = []
+        dut_state = ctx.snippet.getTelephonyCallState
+        peer_state = ctx.peer_snippet.getTelephonyCallState
+        for i in range(1, count + 1):
+            reached = {}
+            try:
+                start = time.monotonic()
+                deadline = start + timeout
+                ctx.adb.shell(f"am start -a android.intent.action.CALL -d tel:{number}")
+                steps = [("dial_s", dut_state, CALL_STATE_OFFHOOK),
+                         ("ringing_s", peer_state, CALL_STATE_RINGING)]
+                if until == "active":
+                    steps.append(("active_s", peer_state, CALL_STATE_OFFHOOK))
+                for name, read_state, wanted in steps:
+                    if not self._poll_state(read_state, wanted, deadline):
+                        break
+                    reached[name] = round(time.monotonic() - start, 3)
+            except Exception as e:
+                logger.warning(f"Call {i}/{count} failed: {e}")
+            finally:
+                self._hang_up(ctx, min(timeout, 10))
+            for name, value in reached.items():
+                samples[name].append(value)
+            target = "active_s" if until == "active" else "ringing_s"
+            if target not in reached:
+                failed.append(i)
+            logger.info(f"Call {i}/{count}: "
+                        + (", ".join(f"{k} {v:.2f}" for k, v in reached.items()) or "no state change"))
+            if i < count:
+                time.sleep(gap)
+
+        summary = {k: summarize(v) for k, v in samples.items() if v}
+        metrics = {"until": until, "calls": count, "failed_calls": len(failed),
+                   "loss": round(len(failed) / count, 3) if count else 0.0, **summary, "samples": samples}
+        if failed:
+            metrics["failed"] = failed
+        return self._latency_result(tc, ctx, "Call setup", summary, metrics,
+                                    lost_msg=f"{len(failed)}/{count} calls never reached {until.upper()}"
+                                    if failed else "",
+                                    max_loss=params.get("max_loss", 0.0))
+
+    @staticmethod
+    def _poll_state(read_state, wanted: int, deadline: float) -> bool:
+        while time.monotonic() < deadline:
+            if read_state() == wanted:
+                return True
+            time.sleep(STATE_POLL_INTERVAL)
+        return False
+
+    def _hang_up(self, ctx: PluginContext, timeout: float) -> None:
+        """End the call on the DUT and wait (bounded) for both sides to return to IDLE."""
+        try:
+            ctx.adb.shell("input keyevent KEYCODE_ENDCALL")
+            deadline = time.monotonic() + timeout
+            self._poll_state(ctx.snippet.getTelephonyCallState, CALL_STATE_IDLE, deadline)
+            if ctx.peer_snippet:
+                self._poll_state(ctx.peer_snippet.getTelephonyCallState, CALL_STATE_IDLE, deadline)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _latency_result(tc: dict, ctx: PluginContext, label: str, summary: dict, metrics: dict,
+                        lost_msg: str, max_loss: float) -> TestResult:
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        if not summary:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"{label}: nothing measured ({lost_msg or 'no samples'})",
+                              metrics=metrics)
+        regressions, baselines = history_regressions(summary, ctx.history, tid,
+                                                     params.get("history_tolerance", 0.2), unit=" s")
+        if baselines:
+            metrics["baseline_p50"] = baselines
+        problems = exceeded_thresholds(summary, params.get("thresholds", {}),
+                                       params.get("threshold_stat", "p95"), unit=" s") + regressions
+        if lost_msg and metrics["loss"] > max_loss:
+            problems.insert(0, lost_msg)
+        brief = ", ".join(f"{k} p50/p95 {v['p50']:.2f}/{v['p95']:.2f}" for k, v in summary.items())
+        if problems:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"{label}: {'; '.join(problems)} ({brief})", metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"{label}: {brief}" + (f" ({lost_msg})" if lost_msg else ""),
+                          metrics=metrics)
+
     @staticmethod
     def _render_body(template: str) -> str:
         return template.replace("{timestamp}", str(int(time.time())))
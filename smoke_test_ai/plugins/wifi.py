@@ -1,16 +1,99 @@
 import time
+from dataclasses import dataclass, field
+
+import numpy as np
 
 from smoke_test_ai.core.test_runner import TestResult, TestStatus
 from smoke_test_ai.plugins.base import TestPlugin, PluginContext
+from smoke_test_ai.drivers.adb_controller import WIFI_MILESTONES
+from smoke_test_ai.utils.logger import get_logger
+from smoke_test_ai.utils.stats import exceeded_thresholds, history_regressions, summarize
+
+logger = get_logger(__name__)
+
+SCAN_MAX_AGE = 30.0  # seconds a scan stays fresh for later actions in the same run
+BANDS = {"2.4GHz": (2400, 2500), "5GHz": (4900, 5900), "6GHz": (5925, 7125)}
+
+
+@dataclass
+class ScanTable:
+    """Parsed scan results as columns, one row per BSSID."""
+
+    ssid: list[str] = field(default_factory=list)
+    bssid: list[str] = field(default_factory=list)
+    rssi: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int16))
+    freq: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int16))
+    capabilities: list[str] = field(default_factory=list)
+    taken_at: float = 0.0  # time.monotonic() of the scan
+
+    def __len__(self) -> int:
+        return len(self.bssid)
+
+    @classmethod
+    def from_results(cls, results, taken_at: float) -> "ScanTable":
+        """Build from snippet ScanResult dicts (``level`` or ``rssi``; missing values -> -127 / 0)."""
+        aps = [ap for ap in results if isinstance(ap, dict)] if isinstance(results, list) else []
+        return cls(
+            ssid=[ap.get("SSID", "") or "" for ap in aps],
+            bssid=[ap.get("BSSID", "") or "" for ap in aps],
+            rssi=np.array([ap.get("level", ap.get("rssi", -127)) for ap in aps], dtype=np.int16),
+            freq=np.array([ap.get("frequency", 0) for ap in aps], dtype=np.int16),
+            capabilities=[ap.get("capabilities", "") or "" for ap in aps],
+            taken_at=taken_at,
+        )
+
+    def age(self) -> float:
+        return time.monotonic() - self.taken_at
+
+    def ssids(self) -> list[str]:
+        """Distinct non-hidden SSIDs, strongest first."""
+        seen: dict[str, None] = {}
+        for i in np.argsort(-self.rssi, kind="stable"):
+            if self.ssid[i]:
+                seen.setdefault(self.ssid[i])
+        return list(seen)
+
+    def mask(self, ssid: str | None = None, band: str | None = None) -> np.ndarray:
+        m = np.ones(len(self), dtype=bool)
+        if ssid is not None:
+            m &= np.array([s == ssid for s in self.ssid], dtype=bool)
+        if band is not None:
+            lo, hi = BANDS[band]
+            m &= (self.freq >= lo) & (self.freq <= hi)
+        return m
+
+    def row(self, i: int) -> dict:
+        return {"ssid": self.ssid[i], "bssid": self.bssid[i], "rssi": int(self.rssi[i]),
+                "frequency": int(self.freq[i]), "capabilities": self.capabilities[i]}
+
+    def strongest(self, ssid: str | None = None, band: str | None = None) -> dict | None:
+        """Row of the strongest BSSID matching ``ssid`` / ``band``, or None."""
+        idx = np.flatnonzero(self.mask(ssid, band))
+        if idx.size == 0:
+            return None
+        return self.row(int(idx[np.argmax(self.rssi[idx])]))
 
 
 class WifiPlugin(TestPlugin):
+    """WiFi tests over the Mobly snippet.
+
+    Scan results are cached per plugin instance (one instance per run) so
+    back-to-back scan, SSID, RSSI and band checks share a single radio scan.
+    """
+
+    def __init__(self):
+        self._scan_cache: tuple[int, ScanTable] | None = None  # (id(snippet), table)
+
     def execute(self, test_case: dict, context: PluginContext) -> TestResult:
         action = test_case.get("action", "")
         if action == "scan":
             return self._scan(test_case, context)
         if action == "scan_for_ssid":
             return self._scan_for_ssid(test_case, context)
+        if action == "ap_rssi":
+            return self._ap_rssi(test_case, context)
+        if action == "band_check":
+            return self._band_check(test_case, context)
         if action == "toggle":
             return self._toggle(test_case, context)
         if action == "connection_info":
@@ -25,6 +108,8 @@ class WifiPlugin(TestPlugin):
             return self._capability_check(test_case, context, "wifiAwareIsAvailable", "WiFi Aware")
         if action == "hotspot":
             return self._hotspot(test_case, context)
+        if action == "connect_benchmark":
+            return self._connect_benchmark(test_case, context)
         return TestResult(
             id=test_case["id"], name=test_case["name"],
             status=TestStatus.ERROR,
@@ -40,23 +125,43 @@ class WifiPlugin(TestPlugin):
         ctx.snippet.wifiStartScan()
         return ctx.snippet.wifiGetCachedScanResults()
 
+    def _get_scan(self, tc: dict, ctx: PluginContext) -> ScanTable:
+        """Cached scan table, rescanning when older than ``scan_max_age`` or on ``force_rescan``."""
+        params = tc.get("params", {})
+        max_age = params.get("scan_max_age", SCAN_MAX_AGE)
+        if self._scan_cache and self._scan_cache[0] == id(ctx.snippet) and not params.get("force_rescan"):
+            table = self._scan_cache[1]
+            if table.age() <= max_age:
+                logger.info(f"Using cached WiFi scan ({len(table)} APs, {table.age():.1f}s old)")
+                return table
+        table = ScanTable.from_results(self._do_scan(ctx), time.monotonic())
+        self._scan_cache = (id(ctx.snippet), table)
+        return table
+
+    def _invalidate_scan(self) -> None:
+        self._scan_cache = None
+
+    @staticmethod
+    def _scan_metrics(table: ScanTable) -> dict:
+        return {"ap_count": len(table), "scan_age_s": round(table.age(), 1)}
+
     def _scan(self, tc: dict, ctx: PluginContext) -> TestResult:
         tid, tname = tc["id"], tc["name"]
         if not ctx.snippet:
             return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
                               message="Snippet not available")
         try:
-            results = self._do_scan(ctx)
+            table = self._get_scan(tc, ctx)
         except Exception as e:
             return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
                               message=f"WiFi scan failed: {e}")
 
-        count = len(results) if isinstance(results, list) else 0
+        count = len(table)
         if count > 0:
             return TestResult(id=tid, name=tname, status=TestStatus.PASS,
-                              message=f"Found {count} WiFi networks")
+                              message=f"Found {count} WiFi networks", metrics=self._scan_metrics(table))
         return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
-                          message="No WiFi networks found")
+                          message="No WiFi networks found", metrics=self._scan_metrics(table))
 
     def _scan_for_ssid(self, tc: dict, ctx: PluginContext) -> TestResult:
         tid, tname = tc["id"], tc["name"]
@@ -67,29 +172,82 @@ class WifiPlugin(TestPlugin):
         expected_ssid = params.get("expected_ssid", "")
 
         try:
-            results = self._do_scan(ctx)
+            table = self._get_scan(tc, ctx)
         except Exception as e:
             return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
                               message=f"WiFi scan failed: {e}")
 
-        ssid_list = []
-        if isinstance(results, list):
-            for ap in results:
-                ssid = ap.get("SSID", "") if isinstance(ap, dict) else ""
-                if ssid:
-                    ssid_list.append(ssid)
-
+        ssid_list = table.ssids()
         if expected_ssid in ssid_list:
             return TestResult(id=tid, name=tname, status=TestStatus.PASS,
-                              message=f"Found SSID '{expected_ssid}' among {len(ssid_list)} networks")
+                              message=f"Found SSID '{expected_ssid}' among {len(ssid_list)} networks",
+                              metrics=self._scan_metrics(table))
         return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
-                          message=f"SSID '{expected_ssid}' not found (scanned: {ssid_list[:10]})")
+                          message=f"SSID '{expected_ssid}' not found (scanned: {ssid_list[:10]})",
+                          metrics=self._scan_metrics(table))
+
+    def _ap_rssi(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Strongest BSSID of ``ssid`` in the (cached) scan must reach ``min_rssi``."""
+        tid, tname = tc["id"], tc["name"]
+        if not ctx.snippet:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message="Snippet not available")
+        params = tc.get("params", {})
+        ssid = params.get("ssid", "")
+        min_rssi = params.get("min_rssi", -75)
+        try:
+            table = self._get_scan(tc, ctx)
+        except Exception as e:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"WiFi scan failed: {e}")
+
+        ap = table.strongest(ssid=ssid)
+        metrics = {**self._scan_metrics(table), "ap": ap}
+        if ap is None:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"SSID '{ssid}' not in scan results", metrics=metrics)
+        desc = f"'{ssid}' {ap['bssid']} {ap['rssi']} dBm @ {ap['frequency']} MHz"
+        if ap["rssi"] < min_rssi:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"{desc} below {min_rssi} dBm", metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS, message=desc, metrics=metrics)
+
+    def _band_check(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """At least one AP (optionally of ``ssid``) is visible on ``band`` (2.4GHz / 5GHz / 6GHz)."""
+        tid, tname = tc["id"], tc["name"]
+        if not ctx.snippet:
+            return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
+                              message="Snippet not available")
+        params = tc.get("params", {})
+        band = params.get("band", "5GHz")
+        ssid = params.get("ssid")
+        if band not in BANDS:
+            return TestResult(id=tid, name=tname, status=TestStatus.ERROR,
+                              message=f"Unknown band '{band}' (expected one of {', '.join(BANDS)})")
+        try:
+            table = self._get_scan(tc, ctx)
+        except Exception as e:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"WiFi scan failed: {e}")
+
+        count = int(table.mask(ssid, band).sum())
+        ap = table.strongest(ssid, band)
+        metrics = {**self._scan_metrics(table), "band_ap_count": count, "ap": ap}
+        target = f"'{ssid}' " if ssid else ""
+        if ap is None:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"No {target}AP seen on {band}", metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"{count} {target}AP(s) on {band}, strongest {ap['ssid'] or '<hidden>'} "
+                                  f"{ap['rssi']} dBm @ {ap['frequency']} MHz",
+                          metrics=metrics)
 
     def _toggle(self, tc: dict, ctx: PluginContext) -> TestResult:
         tid, tname = tc["id"], tc["name"]
         if not ctx.snippet:
             return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
                               message="Snippet not available")
+        self._invalidate_scan()  # a radio restart drops the scan results
         try:
             ctx.snippet.wifiDisable()
             time.sleep(3)
@@ -201,6 +359,7 @@ class WifiPlugin(TestPlugin):
         if not ctx.snippet:
             return TestResult(id=tid, name=tname, status=TestStatus.SKIP,
                               message="Snippet not available")
+        self._invalidate_scan()  # STA scans stop while the soft AP is up
         try:
             ctx.snippet.wifiEnableSoftAp(None)
             time.sleep(3)
@@ -223,3 +382,65 @@ class WifiPlugin(TestPlugin):
                               message="Hotspot enabled and disabled successfully")
         return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
                           message="Hotspot did not enable")
+
+    def _connect_benchmark(self, tc: dict, ctx: PluginContext) -> TestResult:
+        """Disconnect/reconnect ``iterations`` times and time each connection milestone.
+
+        Milestones (association, DHCP address, validated internet) are polled
+        on the device from the moment ``reconnect_cmd`` runs; summaries in
+        seconds are checked against ``thresholds`` at ``threshold_stat`` and
+        against previous runs (``history_tolerance``).
+        """
+        tid, tname = tc["id"], tc["name"]
+        params = tc.get("params", {})
+        iterations = params.get("iterations", 5)
+        timeout = params.get("timeout", 30)
+        until = params.get("until", "validated")
+        disconnect_cmd = params.get("disconnect_cmd", "svc wifi disable")
+        reconnect_cmd = params.get("reconnect_cmd", "svc wifi enable")
+        thresholds = params.get("thresholds", {})
+        stat = params.get("threshold_stat", "p95")
+        tolerance = params.get("history_tolerance", 0.2)
+        adb = ctx.adb
+        if until not in WIFI_MILESTONES:
+            return TestResult(id=tid, name=tname, status=TestStatus.ERROR,
+                              message=f"Unknown milestone '{until}' (expected one of {', '.join(WIFI_MILESTONES)})")
+
+        self._invalidate_scan()
+        samples: dict[str, list[float]] = {f"{m}_s": [] for m in WIFI_MILESTONES}
+        missed = []
+        try:
+            for i in range(1, iterations + 1):
+                adb.shell(f"{disconnect_cmd}; for n in $(seq 50); do "
+                          f"cmd wifi status 2>/dev/null | grep -q 'Supplicant state: COMPLETED' || break; "
+                          f"sleep 0.2; done", timeout=30)
+                reached = adb.wait_wifi_milestones(reconnect_cmd, until=until, timeout=timeout)
+                logger.info(f"WiFi reconnect {i}/{iterations}: "
+                            + (", ".join(f"{k} {v:.2f}s" for k, v in reached.items()) or "no milestone"))
+                for name, value in reached.items():
+                    samples[f"{name}_s"].append(value)
+                if until not in reached:
+                    missed.append(i)
+        finally:
+            adb.shell("svc wifi enable")  # never leave the radio off if an iteration blew up
+
+        summary = {k: summarize(v) for k, v in samples.items() if v}
+        metrics = {"iterations": iterations, "until": until, **summary, "samples": samples}
+        if missed:
+            metrics["missed_iterations"] = missed
+        if f"{until}_s" not in summary:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"WiFi never reached '{until}' within {timeout}s", metrics=metrics)
+
+        regressions, baselines = history_regressions(summary, ctx.history, tid, tolerance, unit=" s")
+        if baselines:
+            metrics["baseline_p50"] = baselines
+        brief = ", ".join(f"{k} p50/p95 {v['p50']:.2f}/{v['p95']:.2f}s" for k, v in summary.items())
+        problems = exceeded_thresholds(summary, thresholds, stat, unit=" s") + regressions
+        if missed:
+            problems.insert(0, f"'{until}' not reached in iteration(s) {missed}")
+        if problems:
+            return TestResult(id=tid, name=tname, status=TestStatus.FAIL,
+                              message=f"WiFi connect KPI: {'; '.join(problems)} ({brief})", metrics=metrics)
+        return TestResult(id=tid, name=tname, status=TestStatus.PASS,
+                          message=f"WiFi connect ({iterations}x): {brief}", metrics=metrics)
@@ -61,6 +61,7 @@ class CliReporter:
                 TestStatus.FAIL: "[bold red]FAIL[/]",
                 TestStatus.SKIP: "[bold yellow]SKIP[/]",
                 TestStatus.ERROR: "[bold red]ERROR[/]",
+                TestStatus.FLAKY: "[bold yellow]FLAKY[/]",
             }.get(r.status, r.status.value)
             table.add_row(
                 r.id, r.name, status_style, f"{r.duration:.2f}s", r.message
@@ -68,13 +69,15 @@ class CliReporter:
 
         console.print(table)
 
-        passed = sum(1 for r in results if r.status == TestStatus.PASS)
+        passed = sum(1 for r in results if r.passed)
+        flaky = sum(1 for r in results if r.status == TestStatus.FLAKY)
         failed = sum(1 for r in results if r.status == TestStatus.FAIL)
         error = sum(1 for r in results if r.status == TestStatus.ERROR)
         skipped = sum(1 for r in results if r.status == TestStatus.SKIP)
         total = len(results)
         all_ok = failed == 0 and error == 0
+        flaky_note = f" ({flaky} flaky)" if flaky else ""
         console.print(
-            f"\n[bold]Summary:[/] {passed} passed, {failed} failed, {error} error, {skipped} skipped / {total} total "
+            f"\n[bold]Summary:[/] {passed} passed{flaky_note}, {failed} failed, {error} error, {skipped} skipped / {total} total "
             f"({'[green]ALL PASS[/]' if all_ok else '[red]HAS FAILURES[/]'})"
         )
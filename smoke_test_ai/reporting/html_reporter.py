@@ -23,7 +23,8 @@ class HtmlReporter:
         category_map: dict | None = None,
         test_config_map: dict | None = None,
     ) -> None:
-        passed = sum(1 for r in results if r.status == TestStatus.PASS)
+        passed = sum(1 for r in results if r.passed)
+        flaky = sum(1 for r in results if r.status == TestStatus.FLAKY)
         failed = sum(1 for r in results if r.status == TestStatus.FAIL)
         error = sum(1 for r in results if r.status == TestStatus.ERROR)
         skipped = sum(1 for r in results if r.status == TestStatus.SKIP)
@@ -41,6 +42,7 @@ class HtmlReporter:
             timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             total=len(results),
             passed=passed,
+            flaky=flaky,
             failed=failed,
             error=error,
             skipped=skipped,
@@ -119,7 +121,7 @@ class HtmlReporter:
         categories = []
         for cat, items in groups.items():
             total = len(items)
-            p = sum(1 for i in items if i["status"] == "PASS")
+            p = sum(1 for i in items if i["status"] in ("PASS", "FLAKY"))
             f = sum(1 for i in items if i["status"] == "FAIL")
             e = sum(1 for i in items if i["status"] == "ERROR")
             s = sum(1 for i in items if i["status"] == "SKIP")
@@ -14,7 +14,8 @@ class JsonReporter:
         output_path: Path,
         device_info: dict | None = None,
     ) -> None:
-        passed = sum(1 for r in results if r.status == TestStatus.PASS)
+        passed = sum(1 for r in results if r.passed)
+        flaky = sum(1 for r in results if r.status == TestStatus.FLAKY)
         failed = sum(1 for r in results if r.status == TestStatus.FAIL)
         error = sum(1 for r in results if r.status == TestStatus.ERROR)
         skipped = sum(1 for r in results if r.status == TestStatus.SKIP)
@@ -26,6 +27,7 @@ class JsonReporter:
             "summary": {
                 "total": len(results),
                 "passed": passed,
+                "flaky": flaky,
                 "failed": failed,
                 "error": error,
                 "skipped": skipped,
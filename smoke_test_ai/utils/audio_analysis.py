@@ -0,0 +1,237 @@
+import io
+import wave
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_TONES = (440.0, 1000.0, 3150.0)
+
+# Loopback pass/fail limits; tone "prominence" is the tone band power over
+# the median noise floor of an equally wide band.
+DEFAULT_THRESHOLDS = {
+    "min_prominence_db": 20.0,
+    "min_snr_db": 20.0,
+    "max_thd_pct": 10.0,
+    "min_correlation": 0.3,   # normalized marker cross-correlation peak
+    "min_rms_dbfs": -60.0,    # below this the mic recorded silence
+    "max_latency_ms": None,
+}
+
+_MARKER = (500.0, 4000.0, 0.1)  # start/end frequency and length of the alignment chirp
+
+
+@dataclass
+class LoopbackStimulus:
+    """Generated playback signal: silence, alignment chirp, gap, multi-tone block, tail."""
+
+    samples: np.ndarray
+    marker: np.ndarray
+    marker_start: int
+    tone_start: int
+    tone_length: int
+    sample_rate: int
+    tones: tuple[float, ...]
+
+
+@dataclass
+class LoopbackReport:
+    passed: bool
+    reasons: list[str] = field(default_factory=list)
+    metrics: dict = field(default_factory=dict)
+
+
+def chirp(f0: float, f1: float, duration: float, sample_rate: int) -> np.ndarray:
+    """Exponential sine sweep from ``f0`` to ``f1`` Hz with 5 ms fades."""
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    k = np.log(f1 / f0)
+    sweep = np.sin(2 * np.pi * f0 * duration / k * (np.exp(t * k / duration) - 1))
+    return _fade(sweep, int(0.005 * sample_rate))
+
+
+def make_stimulus(
+    tones=DEFAULT_TONES,
+    duration: float = 1.0,
+    sample_rate: int = 48000,
+    amplitude: float = 0.5,
+    lead_in: float = 0.1,
+) -> LoopbackStimulus:
+    tones = tuple(float(f) for f in tones)
+    lead = np.zeros(int(lead_in * sample_rate))
+    marker = amplitude * chirp(*_MARKER[:2], _MARKER[2], sample_rate)
+    gap = np.zeros(int(0.05 * sample_rate))
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    block = np.sin(2 * np.pi * np.outer(tones, t)).sum(axis=0) * (amplitude / len(tones))
+    block = _fade(block, int(0.01 * sample_rate))
+    tail = np.zeros(int(0.2 * sample_rate))
+    samples = np.concatenate([lead, marker, gap, block, tail]).astype(np.float32)
+    return LoopbackStimulus(
+        samples=samples, marker=marker.astype(np.float32),
+        marker_start=len(lead), tone_start=len(lead) + len(marker) + len(gap),
+        tone_length=len(block), sample_rate=sample_rate, tones=tones,
+    )
+
+
+def write_wav(path: Path | str, samples: np.ndarray, sample_rate: int) -> Path:
+    """Write mono float samples in -1..1 as 16-bit PCM."""
+    path = Path(path)
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm.tobytes())
+    return path
+
+
+def read_wav(data: bytes) -> tuple[np.ndarray, int]:
+    """Decode 16/32-bit PCM WAV bytes to mono float64 in -1..1 (channels averaged)."""
+    with wave.open(io.BytesIO(data), "rb") as w:
+        width, channels, rate = w.getsampwidth(), w.getnchannels(), w.getframerate()
+        frames = w.readframes(w.getnframes())
+    dtype = {2: "<i2", 4: "<i4"}.get(width)
+    if dtype is None:
+        raise ValueError(f"Unsupported WAV sample width: {width * 8} bit")
+    pcm = np.frombuffer(frames, dtype=dtype).astype(np.float64) / float(2 ** (8 * width - 1))
+    usable = len(pcm) - len(pcm) % channels
+    return pcm[:usable].reshape(-1, channels).mean(axis=1), rate
+
+
+def find_marker(recording: np.ndarray, marker: np.ndarray) -> tuple[int, float]:
+    """Sample offset of ``marker`` in ``recording`` and its normalized correlation (0..1).
+
+    Cross-correlation is computed with one FFT product; the score divides the
+    peak by the marker energy and the energy of the matching recording window.
+    """
+    if len(recording) < len(marker):
+        return 0, 0.0
+    n = 1 << int(np.ceil(np.log2(len(recording) + len(marker))))
+    corr = np.fft.irfft(np.fft.rfft(recording, n) * np.conj(np.fft.rfft(marker, n)), n)
+    corr = corr[: len(recording) - len(marker) + 1]
+    energy = np.concatenate([[0.0], np.cumsum(recording.astype(np.float64) ** 2)])
+    window = energy[len(marker):] - energy[: -len(marker)]
+    # Near-silent windows would turn FFT round-off into huge scores
+    quiet = window < 1e-6 * max(float(window.max()), 1e-20)
+    norm = np.sqrt(np.maximum(window, 1e-20) * float(np.dot(marker, marker)))
+    score = np.where(quiet, 0.0, np.abs(corr) / norm)
+    lag = int(np.argmax(score))
+    return lag, float(score[lag])
+
+
+def analyze_tones(
+    segment: np.ndarray,
+    sample_rate: int,
+    tones,
+    harmonics: int = 5,
+    bandwidth_hz: float | None = None,
+) -> dict:
+    """Per-tone prominence and THD plus overall SNR of a steady multi-tone segment.
+
+    All tones and harmonics are evaluated at once with a (targets x bins)
+    mask over the Hann-windowed power spectrum. Harmonics that land on
+    another test tone are not counted as distortion.
+    """
+    tones = np.asarray(tones, dtype=float)
+    spectrum = np.abs(np.fft.rfft(segment * np.hanning(len(segment)))) ** 2
+    freqs = np.fft.rfftfreq(len(segment), 1.0 / sample_rate)
+    resolution = freqs[1] if len(freqs) > 1 else 1.0
+    half = bandwidth_hz if bandwidth_hz is not None else max(4 * resolution, 10.0)
+    nyquist = sample_rate / 2
+
+    orders = np.arange(1, harmonics + 2)
+    targets = tones[:, None] * orders[None, :]                       # (tones, orders)
+    masks = np.abs(freqs[None, None, :] - targets[..., None]) <= half  # (tones, orders, bins)
+    valid = targets < nyquist * 0.95
+    collides = (np.abs(targets[..., None] - tones[None, None, :]) <= half).any(axis=-1)
+    valid[:, 1:] &= ~collides[:, 1:]
+    masks &= valid[..., None]
+    power = masks @ spectrum                                          # (tones, orders)
+
+    fundamental = power[:, 0]
+    harmonic = power[:, 1:].sum(axis=1)
+    audible = (freqs >= 20) & (freqs <= nyquist * 0.95)
+    noise_bins = audible & ~masks.any(axis=(0, 1))
+    floor = float(np.median(spectrum[noise_bins])) if noise_bins.any() else 0.0
+    band_bins = np.maximum(masks[:, 0].sum(axis=1), 1)
+    noise_power = float(spectrum[noise_bins].sum())
+
+    return {
+        "tones": [
+            {
+                "freq": float(f),
+                "prominence_db": round(_db(p / max(floor * n, 1e-30)), 1),
+                "thd_pct": round(100 * float(np.sqrt(h / p)) if p > 0 else 100.0, 2),
+            }
+            for f, p, h, n in zip(tones, fundamental, harmonic, band_bins)
+        ],
+        "snr_db": round(_db(float(fundamental.sum()) / max(noise_power, 1e-30)), 1),
+    }
+
+
+def analyze_loopback(
+    recording: np.ndarray,
+    sample_rate: int,
+    stimulus: LoopbackStimulus,
+    thresholds: dict | None = None,
+    play_offset: float = 0.0,
+) -> LoopbackReport:
+    """Locate the stimulus in a mic recording and check tones, SNR, THD and latency.
+
+    ``play_offset`` is how long after the recording started playback was
+    launched; latency is the marker arrival time minus that offset.
+    """
+    t = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    rms = float(np.sqrt(np.mean(recording ** 2))) if len(recording) else 0.0
+    metrics: dict = {"rms_dbfs": round(_db(rms ** 2), 1), "duration_s": round(len(recording) / sample_rate, 2)}
+    if metrics["rms_dbfs"] < t["min_rms_dbfs"]:
+        return LoopbackReport(False, [f"silent recording ({metrics['rms_dbfs']} dBFS)"], metrics)
+
+    marker = stimulus.marker
+    if sample_rate != stimulus.sample_rate:
+        src = np.arange(len(marker)) / stimulus.sample_rate
+        marker = np.interp(np.arange(int(len(marker) * sample_rate / stimulus.sample_rate)) / sample_rate,
+                           src, marker)
+    scale = sample_rate / stimulus.sample_rate
+    lag, score = find_marker(recording, marker)
+    metrics["correlation"] = round(score, 3)
+    if score < t["min_correlation"]:
+        return LoopbackReport(False, [f"stimulus not found in recording (correlation {score:.2f})"], metrics)
+
+    arrival = lag / sample_rate - stimulus.marker_start / stimulus.sample_rate
+    metrics["latency_ms"] = round((arrival - play_offset) * 1000, 1)
+
+    start = lag + int((stimulus.tone_start - stimulus.marker_start) * scale)
+    length = int(stimulus.tone_length * scale)
+    trim = length // 10  # skip fade-in/out and speaker settling
+    segment = recording[start + trim: start + length - trim]
+    if len(segment) < length // 2:
+        return LoopbackReport(False, ["recording ends before the tone block"], metrics)
+
+    analysis = analyze_tones(segment, sample_rate, stimulus.tones)
+    metrics.update(analysis)
+
+    reasons = []
+    for tone in analysis["tones"]:
+        if tone["prominence_db"] < t["min_prominence_db"]:
+            reasons.append(f"{tone['freq']:.0f} Hz tone missing ({tone['prominence_db']} dB above floor)")
+        elif t["max_thd_pct"] is not None and tone["thd_pct"] > t["max_thd_pct"]:
+            reasons.append(f"{tone['freq']:.0f} Hz THD {tone['thd_pct']}% > {t['max_thd_pct']}%")
+    if analysis["snr_db"] < t["min_snr_db"]:
+        reasons.append(f"SNR {analysis['snr_db']} dB < {t['min_snr_db']} dB")
+    if t["max_latency_ms"] is not None and metrics["latency_ms"] > t["max_latency_ms"]:
+        reasons.append(f"latency {metrics['latency_ms']} ms > {t['max_latency_ms']} ms")
+    return LoopbackReport(not reasons, reasons, metrics)
+
+
+def _fade(signal: np.ndarray, n: int) -> np.ndarray:
+    n = min(n, len(signal) // 2)
+    if n:
+        ramp = np.linspace(0.0, 1.0, n)
+        signal = signal.copy()
+        signal[:n] *= ramp
+        signal[-n:] *= ramp[::-1]
+    return signal
+
+
+def _db(ratio: float) -> float:
+    return 10 * float(np.log10(max(ratio, 1e-30)))
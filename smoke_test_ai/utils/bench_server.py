@@ -0,0 +1,123 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from smoke_test_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_CHUNK = b"\0" * 65536
+
+
+class _BenchHandler(BaseHTTPRequestHandler):
+    """``/ping`` (204), ``/download?bytes=N`` (N zero bytes) and ``/upload`` (discard body)."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so repeated pings measure request RTT
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/ping":
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if url.path != "/download":
+            self.send_error(404)
+            return
+        remaining = int(parse_qs(url.query).get("bytes", ["0"])[0])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(remaining))
+        self.end_headers()
+        try:
+            while remaining > 0:
+                n = min(remaining, len(_CHUNK))
+                self.wfile.write(_CHUNK[:n])
+                remaining -= n
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # client hit its --max-time
+
+    def do_PUT(self):
+        if urlparse(self.path).path != "/upload":
+            self.send_error(404)
+            return
+        try:
+            self._drain_body()
+        except (BrokenPipeError, ConnectionResetError, ValueError):
+            self.close_connection = True  # client hit its --max-time mid-body
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_POST = do_PUT
+
+    def _drain_body(self) -> None:
+        """Read and discard the request body (``curl -T -`` sends it chunked)."""
+        if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+            self._discard(int(self.headers.get("Content-Length", 0)))
+            return
+        while True:
+            size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                self.rfile.readline()  # trailing CRLF
+                return
+            self._discard(size)
+            self.rfile.readline()
+
+    def _discard(self, n: int) -> None:
+        while n > 0:
+            data = self.rfile.read(min(n, 65536))
+            if not data:
+                raise ConnectionResetError("body truncated")
+            n -= len(data)
+            self.server.bytes_received += len(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThroughputServer:
+    """Host-side HTTP endpoint for device throughput/latency benchmarks.
+
+    Runs on a daemon thread; reach it from the DUT via ``adb reverse`` (bind
+    127.0.0.1, traffic goes over USB) or over the test LAN (bind 0.0.0.0,
+    traffic goes over the radio under test).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.requested_port = port
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1] if self._server else self.requested_port
+
+    @property
+    def bytes_received(self) -> int:
+        """Upload payload bytes received so far (including aborted uploads)."""
+        return self._server.bytes_received if self._server else 0
+
+    def start(self) -> "ThroughputServer":
+        self._server = ThreadingHTTPServer((self.host, self.requested_port), _BenchHandler)
+        self._server.daemon_threads = True
+        self._server.bytes_received = 0
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True,
+                                        name="throughput-server")
+        self._thread.start()
+        logger.info(f"Throughput server listening on {self.host}:{self.port}")
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "ThroughputServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
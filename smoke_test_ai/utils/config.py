@@ -1,15 +1,17 @@
 import os
+import re
 import yaml
 from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+_ENV_VAR_RE = re.compile(r"\$\{(\w+)\}")
+
 def _expand_env_vars(data):
     if isinstance(data, str):
         if "${" in data:
-            for key, value in os.environ.items():
-                data = data.replace(f"${{{key}}}", value)
+            return _ENV_VAR_RE.sub(lambda m: os.environ.get(m.group(1), m.group(0)), data)
         return data
     elif isinstance(data, dict):
         return {k: _expand_env_vars(v) for k, v in data.items()}
@@ -21,7 +23,7 @@ def _load_yaml(path: Path) -> dict:
     if not path.exists():
         raise FileNotFoundError(f"Config file not found: {path}")
     with open(path, "r") as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
     return _expand_env_vars(data) if data else {}
 
 def load_settings(path: Path) -> dict:
@@ -30,5 +32,7 @@ def load_settings(path: Path) -> dict:
 def load_device_config(path: Path) -> dict:
     return _load_yaml(path)
 
-def load_test_suite(path: Path) -> dict:
-    return _load_yaml(path)
+def load_test_suite(path: Path, cache_dir: Path | str | None = None) -> dict:
+    """Load and validate a suite (raises SuiteValidationError); see load_suite_file for caching."""
+    from smoke_test_ai.core.suite_compiler import load_suite_file
+    return _expand_env_vars(load_suite_file(path, cache_dir=cache_dir))
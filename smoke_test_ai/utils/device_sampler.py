@@ -0,0 +1,156 @@
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from smoke_test_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def sysfs_values(glob: str, attr: str) -> str:
+    """Shell snippet printing ``attr`` of every ``glob`` match on one line ("x" if unreadable).
+
+    Uses the ``read`` builtin instead of ``cat`` so a 2 Hz sample of ~80
+    thermal zones does not fork ~160 processes per second on the DUT.
+    """
+    return (f'for f in {glob}; do v=x; read v 2>/dev/null < "$f/{attr}"; '
+            f'printf "%s " "$v"; done')
+
+
+def sysfs_labels(glob: str, attr: str | None = None) -> str:
+    """Shell snippet printing one label per ``glob`` match (``attr`` content or basename)."""
+    if attr is None:
+        return f'for f in {glob}; do printf "%s " "${{f##*/}}"; done'
+    return (f'for f in {glob}; do v=?; read v 2>/dev/null < "$f/{attr}"; '
+            f'printf "%s" "$v" | tr " " "_"; printf " "; done')
+
+
+@dataclass
+class SampleSet:
+    """Samples pulled from the DUT: ``t`` is seconds since the first sample."""
+
+    t: np.ndarray
+    columns: dict[str, np.ndarray] = field(default_factory=dict)
+    header: dict[str, list[str]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def column(self, name: str) -> np.ndarray:
+        """2-D float array (samples x values) for one column; NaN where unreadable."""
+        return self.columns.get(name, np.empty((len(self.t), 0)))
+
+
+class DeviceSampler:
+    """Background shell loop on the DUT appending one line per tick to a file.
+
+    Each line is ``<uptime>|<col1 values>|<col2 values>...``; header lines
+    (``#name|labels``) are written once at start. The file is pulled once
+    with :meth:`collect`, so sampling costs no ADB round-trips and keeps
+    running while USB is busy or the host is sleeping.
+    """
+
+    REMOTE_DIR = "/data/local/tmp"
+
+    def __init__(
+        self,
+        adb,
+        name: str,
+        columns: dict[str, str],
+        interval: float = 0.5,
+        duration: float | None = None,
+        header: dict[str, str] | None = None,
+    ):
+        self.adb = adb
+        self.name = name
+        self.columns = columns
+        self.interval = interval
+        self.duration = duration
+        self.header = header or {}
+        self.data_path = f"{self.REMOTE_DIR}/{name}.samples"
+        self.script_path = f"{self.REMOTE_DIR}/{name}.sh"
+        self.pid: str | None = None
+
+    def script(self) -> str:
+        lines = [f"exec > {self.data_path} 2>/dev/null"]
+        for key, snippet in self.header.items():
+            lines.append(f'printf "#{key}|"; {snippet}; echo')
+        lines.append("read up _ < /proc/uptime")
+        if self.duration is not None:
+            lines.append(f"end=$(( ${{up%.*}} + {int(math.ceil(self.duration))} ))")
+            lines.append('while [ "${up%.*}" -lt "$end" ]; do')
+        else:
+            lines.append("while true; do")
+        row = ['printf "%s" "$up"']
+        for snippet in self.columns.values():
+            row.append('printf "|"')
+            row.append(snippet)
+        lines.append("  " + "; ".join(row) + "; echo")
+        lines.append(f"  sleep {self.interval}")
+        lines.append("  read up _ < /proc/uptime")
+        lines.append("done")
+        return "\n".join(lines)
+
+    def start(self) -> None:
+        """Write the sampler script to the DUT and start it in the background."""
+        self.adb.shell(f"cat > {self.script_path} <<'EOF'\n{self.script()}\nEOF")
+        result = self.adb.shell(f"nohup sh {self.script_path} > /dev/null 2>&1 & echo $!")
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        self.pid = out.strip().splitlines()[-1] if out.strip() else None
+        logger.info(f"Device sampler '{self.name}' started "
+                    f"({1 / self.interval:.1f} Hz, pid={self.pid})")
+
+    def stop(self) -> None:
+        if self.pid:
+            self.adb.shell(f"kill {self.pid} 2>/dev/null")
+            self.pid = None
+
+    def collect(self, cleanup: bool = True) -> SampleSet:
+        """Stop the sampler, pull its file in one read and parse it."""
+        self.stop()
+        result = self.adb.shell(f"cat {self.data_path} 2>/dev/null")
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        if cleanup:
+            self.adb.shell(f"rm -f {self.data_path} {self.script_path}")
+        return self.parse(out, list(self.columns))
+
+    @staticmethod
+    def parse(text: str, names: list[str]) -> SampleSet:
+        header: dict[str, list[str]] = {}
+        times: list[float] = []
+        rows: dict[str, list[list[float]]] = {n: [] for n in names}
+        for line in text.splitlines():
+            if line.startswith("#"):
+                key, _, labels = line[1:].partition("|")
+                header[key] = labels.split()
+                continue
+            parts = line.split("|")
+            if len(parts) != len(names) + 1:
+                continue  # partial last line if the loop was killed mid-write
+            try:
+                t = float(parts[0])
+            except ValueError:
+                continue
+            times.append(t)
+            for name, values in zip(names, parts[1:]):
+                rows[name].append([_to_float(v) for v in values.split()])
+
+        t = np.asarray(times, dtype=float)
+        if t.size:
+            t = t - t[0]
+        columns = {}
+        for name, data in rows.items():
+            width = max((len(r) for r in data), default=0)
+            arr = np.full((len(data), width), np.nan)
+            for i, r in enumerate(data):
+                arr[i, :len(r)] = r
+            columns[name] = arr
+        return SampleSet(t=t, columns=columns, header=header)
+
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
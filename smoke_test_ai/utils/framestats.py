@@ -0,0 +1,113 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from smoke_test_ai.utils.stats import summarize
+
+PROFILE_MARKER = "---PROFILEDATA---"
+DEFAULT_VSYNC_NS = 1e9 / 60
+
+
+@dataclass
+class FrameTable:
+    """Rows of ``dumpsys gfxinfo <pkg> framestats``: one frame per row, nanosecond timestamps."""
+
+    columns: list[str] = field(default_factory=list)
+    data: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.data[:, self.columns.index(name)] if name in self.columns else np.empty(0, dtype=np.int64)
+
+    def merge(self, other: "FrameTable") -> "FrameTable":
+        """Union of two dumps keyed on IntendedVsync.
+
+        framestats only keeps the last ~120 frames, so long interactions are
+        dumped repeatedly and merged; frames seen twice are kept once.
+        """
+        if not len(self):
+            return other
+        if not len(other) or other.columns != self.columns:
+            return self
+        data = np.concatenate([self.data, other.data])
+        _, first = np.unique(data[:, self.columns.index("IntendedVsync")], return_index=True)
+        return FrameTable(columns=list(self.columns), data=data[np.sort(first)])
+
+    def save(self, path: Path | str) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savetxt(path, self.data, fmt="%d", delimiter=",", header=",".join(self.columns), comments="")
+        return path
+
+
+def parse_framestats(text: str) -> FrameTable:
+    """Frame rows of every PROFILEDATA block (one per window) under the first header seen."""
+    columns: list[str] = []
+    rows: list[list[int]] = []
+    inside = False
+    for line in text.splitlines():
+        line = line.strip()
+        if line == PROFILE_MARKER:
+            inside = not inside
+            continue
+        if not inside or not line:
+            continue
+        values = [v for v in line.split(",") if v != ""]  # rows end with a trailing comma
+        if values and values[0] == "Flags":
+            columns = columns or values
+            continue
+        if not columns or len(values) != len(columns):
+            continue
+        try:
+            rows.append([int(v) for v in values])
+        except ValueError:
+            continue
+    data = np.array(rows, dtype=np.int64).reshape(len(rows), len(columns))
+    if len(data) and "IntendedVsync" in columns:
+        data = data[np.argsort(data[:, columns.index("IntendedVsync")], kind="stable")]
+    return FrameTable(columns=columns, data=data)
+
+
+def frame_metrics(table: FrameTable, refresh_hz: float | None = None) -> dict:
+    """Jank percentage, frame-time percentiles and missed vsyncs of regular frames.
+
+    Frame time is IntendedVsync → FrameCompleted. A frame is janky when it
+    completes after its FrameDeadline (Android 12+) or, on older dumps,
+    takes longer than one vsync period. The period comes from ``refresh_hz``
+    or, when not given, the median spacing of consecutive IntendedVsync
+    stamps. Frames with non-zero Flags (first frame, resize, ...) are skipped.
+    """
+    flags = table.column("Flags")
+    regular = flags == 0 if flags.size else np.zeros(0, dtype=bool)
+    intended = table.column("IntendedVsync")[regular].astype(np.float64)
+    metrics: dict = {"frames": int(regular.sum()), "jank_frames": 0, "jank_pct": 0.0,
+                     "missed_vsync": 0, "frame_ms": {"n": 0}}
+    if not intended.size:
+        return metrics
+
+    if refresh_hz:
+        period = 1e9 / refresh_hz
+    else:
+        gaps = np.diff(np.unique(intended))
+        gaps = gaps[(gaps > 4e6) & (gaps < 50e6)]
+        period = float(np.median(gaps)) if gaps.size else DEFAULT_VSYNC_NS
+    metrics["refresh_hz"] = round(1e9 / period, 1)
+
+    duration = table.column("FrameCompleted")[regular] - intended
+    deadline = table.column("FrameDeadline")
+    if deadline.size:
+        janky = table.column("FrameCompleted")[regular] > deadline[regular]
+    else:
+        janky = duration > period
+    missed = np.floor((table.column("Vsync")[regular] - intended) / period).clip(min=0)
+
+    metrics.update(
+        jank_frames=int(janky.sum()),
+        jank_pct=round(100.0 * float(janky.mean()), 2),
+        missed_vsync=int(missed.sum()),
+        frame_ms=summarize(duration / 1e6, percentiles=(50, 90, 99)),
+    )
+    return metrics
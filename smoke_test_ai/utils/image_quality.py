@@ -0,0 +1,113 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+# Luminance in 0-255; sharpness is Laplacian variance on the downscaled copy.
+# "fail_*" limits reject outright, "pass_*" limits accept outright; anything
+# in between is ambiguous and left to the vision LLM.
+DEFAULT_THRESHOLDS = {
+    "max_dim": 512,                  # longest side of the analysed copy
+    "fail_mean_low": 15,             # black frame
+    "fail_mean_high": 240,           # white frame
+    "fail_clip_fraction": 0.6,       # share of pixels at 0-2 or 253-255
+    "fail_dynamic_range": 12,        # p99 - p1: uniform frame (lens cap, solid colour)
+    "fail_sharpness": 3.0,
+    "fail_channel_imbalance": 0.8,   # (max - min channel mean) / luminance mean
+    "pass_mean_low": 40,
+    "pass_mean_high": 200,
+    "pass_clip_fraction": 0.1,
+    "pass_dynamic_range": 80,
+    "pass_sharpness": 60.0,
+    "pass_channel_imbalance": 0.35,
+}
+
+PASS, FAIL, AMBIGUOUS = "pass", "fail", "ambiguous"
+
+
+@dataclass
+class QualityReport:
+    verdict: str
+    reasons: list[str] = field(default_factory=list)
+    metrics: dict = field(default_factory=dict)
+
+
+def downscale(image: np.ndarray, max_dim: int) -> np.ndarray:
+    h, w = image.shape[:2]
+    scale = max_dim / max(h, w)
+    if scale >= 1:
+        return image
+    return cv2.resize(image, (max(1, round(w * scale)), max(1, round(h * scale))),
+                      interpolation=cv2.INTER_AREA)
+
+
+def image_metrics(image: np.ndarray, max_dim: int = DEFAULT_THRESHOLDS["max_dim"]) -> dict:
+    """Luminance percentiles, sharpness, clipping and channel balance of a BGR image."""
+    small = downscale(image, max_dim)
+    if small.ndim == 2:
+        gray, channels = small, small[..., None]
+    else:
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        channels = small
+    p1, p50, p99 = np.percentile(gray, (1, 50, 99))
+    mean = float(gray.mean())
+    channel_means = channels.reshape(-1, channels.shape[-1]).mean(axis=0)
+    return {
+        "width": int(small.shape[1]),
+        "height": int(small.shape[0]),
+        "mean": round(mean, 1),
+        "p1": float(p1),
+        "p50": float(p50),
+        "p99": float(p99),
+        "dynamic_range": float(p99 - p1),
+        "clip_low": round(float(np.count_nonzero(gray <= 2)) / gray.size, 3),
+        "clip_high": round(float(np.count_nonzero(gray >= 253)) / gray.size, 3),
+        "sharpness": round(float(cv2.Laplacian(gray, cv2.CV_64F).var()), 1),
+        "channel_imbalance": round(float(np.ptp(channel_means)) / max(mean, 1.0), 3),
+    }
+
+
+def assess_image(image: np.ndarray, thresholds: dict | None = None) -> QualityReport:
+    """Classify a photo as clearly good, clearly broken, or ambiguous.
+
+    Returns AMBIGUOUS without analysis when OpenCV is missing, so callers
+    fall back to the LLM.
+    """
+    if cv2 is None:
+        return QualityReport(AMBIGUOUS, ["OpenCV not available"])
+    t = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    m = image_metrics(image, t["max_dim"])
+
+    failures = []
+    if m["mean"] < t["fail_mean_low"]:
+        failures.append(f"too dark (mean {m['mean']:.0f} < {t['fail_mean_low']})")
+    if m["mean"] > t["fail_mean_high"]:
+        failures.append(f"too bright (mean {m['mean']:.0f} > {t['fail_mean_high']})")
+    clipped = max(m["clip_low"], m["clip_high"])
+    if clipped > t["fail_clip_fraction"]:
+        failures.append(f"{clipped:.0%} of pixels clipped")
+    if m["dynamic_range"] < t["fail_dynamic_range"]:
+        failures.append(f"uniform frame (p1-p99 range {m['dynamic_range']:.0f})")
+    if m["sharpness"] < t["fail_sharpness"]:
+        failures.append(f"no detail (sharpness {m['sharpness']:.1f} < {t['fail_sharpness']})")
+    if m["channel_imbalance"] > t["fail_channel_imbalance"]:
+        failures.append(f"colour cast (channel imbalance {m['channel_imbalance']:.2f})")
+    if failures:
+        return QualityReport(FAIL, failures, m)
+
+    doubts = []
+    if not t["pass_mean_low"] <= m["mean"] <= t["pass_mean_high"]:
+        doubts.append(f"exposure (mean {m['mean']:.0f})")
+    if clipped > t["pass_clip_fraction"]:
+        doubts.append(f"clipping ({clipped:.0%})")
+    if m["dynamic_range"] < t["pass_dynamic_range"]:
+        doubts.append(f"low contrast (range {m['dynamic_range']:.0f})")
+    if m["sharpness"] < t["pass_sharpness"]:
+        doubts.append(f"soft (sharpness {m['sharpness']:.1f})")
+    if m["channel_imbalance"] > t["pass_channel_imbalance"]:
+        doubts.append(f"colour balance ({m['channel_imbalance']:.2f})")
+    return QualityReport(AMBIGUOUS if doubts else PASS, doubts, m)
@@ -0,0 +1,75 @@
+import re
+from dataclasses import dataclass, field
+
+# One round-trip: framework memory summary and kernel counters
+SNAPSHOT_CMD = "dumpsys meminfo; echo '==proc_meminfo=='; cat /proc/meminfo"
+
+# ``dumpsys meminfo`` summary lines (values in K, with thousands separators)
+_TOTALS = {"total_ram": "Total RAM", "free_ram": "Free RAM", "used_ram": "Used RAM", "lost_ram": "Lost RAM"}
+
+
+@dataclass
+class MemorySnapshot:
+    """``dumpsys meminfo`` totals, per-process PSS/RSS and ``/proc/meminfo``, all in kB."""
+
+    totals: dict[str, int] = field(default_factory=dict)
+    pss: dict[str, int] = field(default_factory=dict)
+    rss: dict[str, int] = field(default_factory=dict)
+    proc: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def capture(cls, adb) -> "MemorySnapshot":
+        result = adb.shell(SNAPSHOT_CMD)
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        dumpsys, _, proc = out.partition("==proc_meminfo==")
+        return cls.parse(dumpsys, proc)
+
+    @classmethod
+    def parse(cls, dumpsys_text: str, proc_text: str = "") -> "MemorySnapshot":
+        totals = {}
+        for key, label in _TOTALS.items():
+            m = re.search(rf"^\s*{label}:\s*([\d,]+)K", dumpsys_text, re.MULTILINE)
+            if m:
+                totals[key] = int(m.group(1).replace(",", ""))
+        proc = {}
+        for m in re.finditer(r"^(\w+(?:\(\w+\))?):\s+(\d+)\s*kB", proc_text, re.MULTILINE):
+            proc[m.group(1)] = int(m.group(2))
+        return cls(totals=totals, pss=_by_process(dumpsys_text, "PSS"),
+                   rss=_by_process(dumpsys_text, "RSS"), proc=proc)
+
+    def process(self, names) -> tuple[str | None, int | None, int | None]:
+        """First of ``names`` present in the snapshot with its PSS and RSS (kB)."""
+        for name in ([names] if isinstance(names, str) else names):
+            if name in self.pss or name in self.rss:
+                return name, self.pss.get(name), self.rss.get(name)
+        return None, None, None
+
+    def table(self, processes: dict) -> dict:
+        """Structured MB view: system RAM totals and one row per tracked process label."""
+        ram = {f"{k.removesuffix('_ram')}_mb": _mb(v) for k, v in self.totals.items()}
+        if "MemAvailable" in self.proc:
+            ram["available_mb"] = _mb(self.proc["MemAvailable"])
+        rows = {}
+        for label, names in processes.items():
+            name, pss, rss = self.process(names)
+            if name is not None:
+                rows[label] = {"process": name, "pss_mb": _mb(pss), "rss_mb": _mb(rss)}
+        return {"ram": ram, "processes": rows}
+
+
+def _by_process(text: str, kind: str) -> dict[str, int]:
+    """``Total <kind> by process:`` section as {process name: kB} (largest entry per name)."""
+    values: dict[str, int] = {}
+    m = re.search(rf"Total {kind} by process:\n(.*?)(?:\n\s*\n|\Z)", text, re.DOTALL)
+    if not m:
+        return values
+    for line in m.group(1).splitlines():
+        entry = re.match(r"\s*([\d,]+)K:\s+(\S+)(?:\s+\(pid|\s*$)", line)
+        if entry:
+            name, kb = entry.group(2), int(entry.group(1).replace(",", ""))
+            values[name] = max(kb, values.get(name, 0))
+    return values
+
+
+def _mb(kb: int | None) -> float | None:
+    return round(kb / 1024, 1) if kb is not None else None
@@ -0,0 +1,92 @@
+import numpy as np
+
+# Two-sided 95% Student t critical values for 1..30 degrees of freedom
+_T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+def t95(df: int) -> float:
+    """Two-sided 95% t critical value (normal approximation above 30 dof)."""
+    return _T95[df - 1] if 1 <= df <= len(_T95) else 1.96
+
+
+def summarize(values, percentiles=(50, 95)) -> dict:
+    """n / min / mean / pN / max of a sample, rounded for reports. Empty input → ``{"n": 0}``."""
+    arr = np.asarray([v for v in values if v is not None], dtype=float)
+    if arr.size == 0:
+        return {"n": 0}
+    out = {"n": int(arr.size), "min": round(float(arr.min()), 3), "mean": round(float(arr.mean()), 3)}
+    for p, v in zip(percentiles, np.percentile(arr, percentiles)):
+        out[f"p{p}"] = round(float(v), 3)
+    out["max"] = round(float(arr.max()), 3)
+    return out
+
+
+def exceeded_thresholds(summary: dict, thresholds: dict, stat: str = "p95",
+                        unit: str = "", fmt: str = ".2f") -> list[str]:
+    """``"<name> <stat> <value> > <limit>"`` for every summarized metric over its limit."""
+    exceeded = []
+    for name, limit in thresholds.items():
+        value = summary.get(name, {}).get(stat)
+        if value is not None and value > limit:
+            exceeded.append(f"{name} {stat} {value:{fmt}}{unit} > {limit}{unit}")
+    return exceeded
+
+
+def history_regressions(summary: dict, history, test_id: str, tolerance: float = 0.2,
+                        stat: str = "p50", window: int = 10, prefix: str = "",
+                        unit: str = "", fmt: str = ".2f") -> tuple[list[str], dict]:
+    """Compare each metric's ``stat`` with its median over recent runs of ``test_id``.
+
+    Returns ``(regressions, baselines)``; a regression is a rise of more
+    than ``tolerance`` (fraction) over the baseline. ``history`` is a
+    RunHistory or None (no comparison).
+    """
+    if history is None:
+        return [], {}
+    regressions, baselines = [], {}
+    for name, s in summary.items():
+        value = s.get(stat) if isinstance(s, dict) else None
+        if value is None:
+            continue
+        base = history.metric_baseline(test_id, prefix + name, stat, window)
+        if base is None:
+            continue
+        baselines[name] = base
+        if base > 0 and value > base * (1 + tolerance):
+            regressions.append(f"{name} {stat} {value:{fmt}}{unit} vs baseline "
+                               f"{base:{fmt}}{unit} (+{value / base - 1:.0%})")
+    return regressions, baselines
+
+
+def mean_ci(values) -> tuple[float, float]:
+    """Mean and 95% confidence half-width of a sample (half-width 0 below two values)."""
+    arr = np.asarray([v for v in values if v is not None], dtype=float)
+    arr = arr[np.isfinite(arr)]
+    if arr.size == 0:
+        return float("nan"), float("nan")
+    if arr.size < 2:
+        return float(arr[0]), 0.0
+    return float(arr.mean()), t95(arr.size - 1) * float(arr.std(ddof=1)) / float(np.sqrt(arr.size))
+
+
+def linear_trend(x, y) -> tuple[float, float]:
+    """Least-squares slope of ``y`` over ``x`` and its 95% confidence half-width.
+
+    Non-finite points are dropped; fewer than three points or no spread in
+    ``x`` gives ``(nan, nan)``.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    ok = np.isfinite(x) & np.isfinite(y)
+    x, y = x[ok], y[ok]
+    if x.size < 3:
+        return float("nan"), float("nan")
+    dx = x - x.mean()
+    sxx = float(dx @ dx)
+    if sxx == 0:
+        return float("nan"), float("nan")
+    slope = float(dx @ (y - y.mean())) / sxx
+    residuals = y - y.mean() - slope * dx
+    stderr = float(np.sqrt((residuals @ residuals) / (x.size - 2) / sxx))
+    return slope, t95(x.size - 2) * stderr
@@ -0,0 +1,214 @@
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from smoke_test_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Column order of /d/wakeup_sources when the header line is missing
+KERNEL_COLUMNS = (
+    "active_count", "event_count", "wakeup_count", "expire_count", "active_since",
+    "total_time", "max_time", "last_change", "prevent_suspend_time",
+)
+# Monotonic counters that can be diffed; the rest are point-in-time values
+_CUMULATIVE = ("active_count", "event_count", "wakeup_count", "expire_count",
+               "total_time", "prevent_suspend_time")
+
+# One round-trip: uptime, kernel wakeup sources and framework wakelocks
+SNAPSHOT_CMD = (
+    "cat /proc/uptime; "
+    "echo '==wakeup_sources=='; "
+    "cat /d/wakeup_sources 2>/dev/null || cat /sys/kernel/debug/wakeup_sources 2>/dev/null; "
+    "echo '==power=='; "
+    "dumpsys power | grep -E '_WAKE_LOCK|ref count='"
+)
+
+
+@dataclass
+class WakeupSnapshot:
+    """Kernel wakeup sources and framework wakelocks at one point in time.
+
+    ``counters`` maps each /d/wakeup_sources column to an int64 array aligned
+    with ``names`` (times in ms). A snapshot returned by :meth:`diff` holds
+    per-source deltas over the window instead of absolute values.
+    """
+
+    names: list[str] = field(default_factory=list)
+    counters: dict[str, np.ndarray] = field(default_factory=dict)
+    wakelocks: list[dict] = field(default_factory=list)
+    uptime: float | None = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.counters.get(name, np.zeros(len(self.names), dtype=np.int64))
+
+    @classmethod
+    def capture(cls, adb) -> "WakeupSnapshot":
+        result = adb.shell(SNAPSHOT_CMD)
+        out = result.stdout if hasattr(result, "stdout") else str(result)
+        sections = _split_sections(out)
+        uptime = None
+        head = sections.get("", "").split()
+        if head:
+            try:
+                uptime = float(head[0])
+            except ValueError:
+                pass
+        return cls.parse(sections.get("wakeup_sources", ""), sections.get("power", ""), uptime)
+
+    @classmethod
+    def parse(cls, sources_text: str, power_text: str = "", uptime: float | None = None) -> "WakeupSnapshot":
+        """Parse /d/wakeup_sources text and ``dumpsys power`` wakelock lines."""
+        columns = list(KERNEL_COLUMNS)
+        names: list[str] = []
+        rows: list[list[int]] = []
+        for line in sources_text.splitlines():
+            if not line.strip():
+                continue
+            if line.startswith("name"):
+                columns = line.split()[1:] or columns
+                continue
+            # Names may contain spaces; the numeric columns never do
+            parts = line.rsplit(None, len(columns))
+            if len(parts) != len(columns) + 1:
+                continue
+            try:
+                values = [int(v) for v in parts[1:]]
+            except ValueError:
+                continue
+            names.append(parts[0].strip())
+            rows.append(values)
+
+        data = np.array(rows, dtype=np.int64).reshape(len(rows), len(columns))
+        counters = {col: data[:, i] for i, col in enumerate(columns)}
+        return cls(names=names, counters=counters,
+                   wakelocks=parse_framework_wakelocks(power_text), uptime=uptime)
+
+    def diff(self, earlier: "WakeupSnapshot") -> "WakeupSnapshot":
+        """Per-source change from ``earlier`` to this snapshot.
+
+        Sources new since ``earlier`` count from zero; a counter that went
+        backwards (source re-registered) counts from zero too. Framework
+        wakelocks are the ones held at the end of the window.
+        """
+        index = {name: i for i, name in enumerate(earlier.names)}
+        pos = np.array([index.get(n, -1) for n in self.names], dtype=np.int64)
+        known = pos >= 0
+        counters = {}
+        for col, after in self.counters.items():
+            if col not in _CUMULATIVE:
+                counters[col] = after.copy()
+                continue
+            before = np.zeros_like(after)
+            if col in earlier.counters and known.any():
+                before[known] = earlier.counters[col][pos[known]]
+            delta = after - before
+            counters[col] = np.where(delta < 0, after, delta)
+        uptime = None
+        if self.uptime is not None and earlier.uptime is not None:
+            uptime = round(self.uptime - earlier.uptime, 2)
+        return WakeupSnapshot(names=list(self.names), counters=counters,
+                              wakelocks=list(self.wakelocks), uptime=uptime)
+
+    def top(self, n: int = 5, by: str = "total_time") -> list[dict]:
+        """Top ``n`` sources with a non-zero ``by`` value, largest first."""
+        values = self.column(by)
+        order = np.argsort(-values, kind="stable")[:n]
+        return [
+            {
+                "name": self.names[i],
+                "total_time": int(self.column("total_time")[i]),
+                "wakeup_count": int(self.column("wakeup_count")[i]),
+                "active_count": int(self.column("active_count")[i]),
+                "prevent_suspend_time": int(self.column("prevent_suspend_time")[i]),
+            }
+            for i in order if values[i] > 0
+        ]
+
+    def summary(self, n: int = 5) -> dict:
+        """Top blockers by active time and by wakeup count, plus held wakelocks."""
+        return {
+            "window_s": self.uptime,
+            "top_active_time": self.top(n, by="total_time"),
+            "top_wakeups": self.top(n, by="wakeup_count"),
+            "wakelocks": self.wakelocks[:n],
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "uptime": self.uptime,
+            "columns": list(self.counters),
+            "sources": {name: [int(self.counters[c][i]) for c in self.counters]
+                        for i, name in enumerate(self.names)},
+            "wakelocks": self.wakelocks,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WakeupSnapshot":
+        columns = data.get("columns", list(KERNEL_COLUMNS))
+        sources = data.get("sources", {})
+        values = np.array(list(sources.values()), dtype=np.int64).reshape(len(sources), len(columns))
+        return cls(names=list(sources), counters={c: values[:, i] for i, c in enumerate(columns)},
+                   wakelocks=data.get("wakelocks", []), uptime=data.get("uptime"))
+
+    def save(self, path: Path | str) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=1, ensure_ascii=False))
+        return path
+
+
+def parse_framework_wakelocks(text: str) -> list[dict]:
+    """``*_WAKE_LOCK 'tag' ... (uid=... )`` lines from ``dumpsys power``."""
+    wakelocks = []
+    for line in text.splitlines():
+        line = line.strip()
+        m = re.match(r"([A-Z_]+)_WAKE_LOCK\b", line)
+        if not m:
+            continue
+        tag_m = re.search(r"'([^']+)'", line)
+        uid_m = re.search(r"uid=(\d+)", line)
+        wakelocks.append({
+            "type": m.group(1),
+            "tag": tag_m.group(1) if tag_m else line[:50],
+            "uid": uid_m.group(1) if uid_m else "?",
+            "raw": line,
+        })
+    return wakelocks
+
+
+def format_delta(delta: WakeupSnapshot, n: int = 5) -> str:
+    """Human-readable top-N blockers of a diffed snapshot for test messages."""
+    lines = []
+    if delta.wakelocks:
+        lines.append("Framework wakelocks held:")
+        lines.extend(f"  [{w['type']}] {w['tag']} (uid={w['uid']})" for w in delta.wakelocks[:n])
+    window = f" over {delta.uptime:.0f}s" if delta.uptime is not None else ""
+    by_time = delta.top(n, by="total_time")
+    if by_time:
+        lines.append(f"Top kernel wakeup sources{window} (by active time):")
+        lines.extend(f"  {s['name']}: {s['total_time']}ms ({s['wakeup_count']} wakeups)" for s in by_time)
+    by_wakeups = delta.top(n, by="wakeup_count")
+    if by_wakeups:
+        lines.append(f"Top kernel wakeup sources{window} (by wakeup count):")
+        lines.extend(f"  {s['name']}: {s['wakeup_count']} wakeups ({s['total_time']}ms)" for s in by_wakeups)
+    return "\n".join(lines) if lines else "No wakelock data available"
+
+
+def _split_sections(text: str) -> dict[str, str]:
+    sections: dict[str, list[str]] = {"": []}
+    current = ""
+    for line in text.splitlines():
+        m = re.fullmatch(r"==(\w+)==", line.strip())
+        if m:
+            current = m.group(1)
+            sections[current] = []
+        else:
+            sections[current].append(line)
+    return {k: "\n".join(v) for k, v in sections.items()}
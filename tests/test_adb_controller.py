@@ -59,6 +59,35 @@ def test_screencap(mock_run, adb, tmp_path):
     mock_run.assert_called_once()
 
 
+@patch("smoke_test_ai.drivers.adb_controller.subprocess.run")
+def test_exec_out_returns_raw_bytes(mock_run, adb):
+    mock_run.return_value = MagicMock(returncode=0, stdout=b"\xff\xd8\r\n", stderr=b"")
+    assert adb.exec_out("cat /sdcard/a.jpg") == b"\xff\xd8\r\n"
+    cmd = mock_run.call_args[0][0]
+    assert cmd[-2:] == ["exec-out", "cat /sdcard/a.jpg"]
+    assert "text" not in mock_run.call_args.kwargs
+    mock_run.return_value = MagicMock(returncode=1, stdout=b"No such file", stderr=b"")
+    assert adb.exec_out("cat /missing") == b""
+
+
+@patch("smoke_test_ai.drivers.adb_controller.subprocess.run")
+def test_push_cached_skips_matching_hash(mock_run, adb, tmp_path):
+    import hashlib
+    tool = tmp_path / "fio-arm64"
+    tool.write_bytes(b"\x7fELF fio")
+    digest = hashlib.sha256(b"\x7fELF fio").hexdigest()
+    mock_run.return_value = MagicMock(returncode=0, stdout=f"{digest}  /data/local/tmp/fio\n", stderr="")
+    assert adb.push_cached(tool, "/data/local/tmp/fio") is True
+    assert mock_run.call_count == 1  # hash check only
+
+    mock_run.reset_mock()
+    mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+    assert adb.push_cached(tool, "/data/local/tmp/fio") is True
+    cmds = [c[0][0] for c in mock_run.call_args_list]
+    assert cmds[1][-3:] == ["push", str(tool), "/data/local/tmp/fio"]
+    assert cmds[2][-1] == "chmod 755 /data/local/tmp/fio"
+
+
 @patch("smoke_test_ai.drivers.adb_controller.subprocess.run")
 def test_install_apk(mock_run, adb):
     mock_run.return_value = MagicMock(returncode=0, stdout="Success", stderr="")
@@ -150,14 +179,39 @@ def test_connect_wifi_enables_first(mock_run, mock_sleep, adb):
         MagicMock(returncode=0, stdout="Wi-Fi is disabled\n", stderr=""),
         # enable_wifi: check → already enabled
         MagicMock(returncode=0, stdout="Wi-Fi is enabled\n", stderr=""),
-        # connect-network command
-        MagicMock(returncode=0, stdout="", stderr=""),
-        # is_wifi_connected: dumpsys wifi
-        MagicMock(returncode=0, stdout="Wi-Fi is enabled\n", stderr=""),
-        # is_wifi_connected: ip route
-        MagicMock(returncode=0, stdout="default via 192.168.1.1 dev wlan0\n", stderr=""),
+        # connect-network + milestone polling in one device shell
+        MagicMock(returncode=0, stdout="associated 100.62\nip 101.05\nstart 100.00\n", stderr=""),
     ]
     assert adb.connect_wifi("TestSSID", "pass123") is True
+    script = mock_run.call_args_list[2][0][0][-1]
+    assert script.index('cmd wifi connect-network "TestSSID" wpa2 "pass123"') < script.index("while")
+    mock_sleep.assert_not_called()
+
+
+@patch("smoke_test_ai.drivers.adb_controller.subprocess.run")
+def test_wait_wifi_milestones_relative_to_start(mock_run, adb):
+    mock_run.return_value = MagicMock(
+        returncode=0, stdout="associated 50.31\nip 50.90\nvalidated 52.15\nstart 50.00\n", stderr="")
+    assert adb.wait_wifi_milestones("svc wifi enable", until="validated") == {
+        "associated": 0.31, "ip": 0.9, "validated": 2.15}
+    script = mock_run.call_args[0][0][-1]
+    assert "dumpsys connectivity" in script
+    assert "sleep 0.1" in script
+    mock_run.return_value = MagicMock(returncode=0, stdout="associated 50.31\nstart 50.00\n", stderr="")
+    assert adb.wait_wifi_milestones(until="ip") == {"associated": 0.31}
+    assert "dumpsys connectivity" not in mock_run.call_args[0][0][-1]
+
+
+@patch("smoke_test_ai.drivers.adb_controller.subprocess.run")
+def test_connect_wifi_retries_until_ip(mock_run, adb):
+    mock_run.side_effect = [
+        MagicMock(returncode=0, stdout="Wi-Fi is enabled\n", stderr=""),   # subsystem ready
+        MagicMock(returncode=0, stdout="Wi-Fi is enabled\n", stderr=""),   # already enabled
+        MagicMock(returncode=0, stdout="associated 10.5\nstart 10.0\n", stderr=""),  # no IP in time
+        MagicMock(returncode=0, stdout="associated 30.4\nip 30.8\nstart 30.0\n", stderr=""),
+    ]
+    assert adb.connect_wifi("TestSSID", "", retries=2) is True
+    assert "open" in mock_run.call_args_list[2][0][0][-1]
 
 
 @patch("smoke_test_ai.drivers.adb_controller.time.sleep")
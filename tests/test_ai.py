@@ -37,6 +37,12 @@ class TestLlmClient:
         result = client.chat_vision("What do you see?", fake_image)
         assert "completed" in result
 
+    def test_image_encoded_at_configured_quality(self):
+        img = np.random.default_rng(0).integers(0, 256, (200, 200, 3)).astype(np.uint8)
+        high = LlmClient(vision_model="v")._image_to_base64(img)
+        low = LlmClient(vision_model="v", jpeg_quality=60)._image_to_base64(img)
+        assert len(low) < len(high)
+
 class TestVisualAnalyzer:
     @patch("smoke_test_ai.ai.llm_client.httpx.Client")
     def test_analyze_setup_wizard(self, mock_client_cls):
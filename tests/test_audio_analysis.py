@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from smoke_test_ai.utils.audio_analysis import (
+    analyze_loopback, analyze_tones, find_marker, make_stimulus, read_wav, write_wav,
+)
+
+RATE = 48000
+
+
+def _recording(stimulus, delay=0.3, gain=0.3, noise=0.001, seed=0):
+    """Stimulus as heard by the mic: delayed, attenuated, with background noise."""
+    rng = np.random.default_rng(seed)
+    rec = np.concatenate([np.zeros(int(delay * RATE)), gain * stimulus.samples, np.zeros(RATE // 10)])
+    return rec + noise * rng.standard_normal(len(rec))
+
+
+def test_wav_round_trip(tmp_path):
+    stim = make_stimulus(sample_rate=RATE)
+    path = write_wav(tmp_path / "s.wav", stim.samples, RATE)
+    samples, rate = read_wav(path.read_bytes())
+    assert rate == RATE
+    assert len(samples) == len(stim.samples)
+    assert np.max(np.abs(samples - stim.samples)) < 1e-4
+
+
+def test_read_wav_mixes_stereo_to_mono(tmp_path):
+    import wave
+    pcm = np.array([[1000, 3000], [-2000, 0]], dtype="<i2")
+    with wave.open(str(tmp_path / "st.wav"), "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(pcm.tobytes())
+    samples, _ = read_wav((tmp_path / "st.wav").read_bytes())
+    assert samples == pytest.approx([2000 / 32768, -1000 / 32768])
+
+
+def test_find_marker_locates_delayed_chirp():
+    stim = make_stimulus(sample_rate=RATE)
+    lag, score = find_marker(_recording(stim, delay=0.25), stim.marker)
+    assert lag == int(0.25 * RATE) + stim.marker_start
+    assert score > 0.9
+
+
+def test_analyze_tones_measures_thd():
+    t = np.arange(RATE) / RATE
+    clean = np.sin(2 * np.pi * 1000 * t)
+    distorted = clean + 0.1 * np.sin(2 * np.pi * 3000 * t)
+    assert analyze_tones(clean, RATE, [1000])["tones"][0]["thd_pct"] < 0.1
+    assert analyze_tones(distorted, RATE, [1000])["tones"][0]["thd_pct"] == pytest.approx(10, abs=0.5)
+
+
+def test_clean_loopback_passes_with_latency():
+    stim = make_stimulus(sample_rate=RATE)
+    report = analyze_loopback(_recording(stim, delay=0.62), RATE, stim, play_offset=0.5)
+    assert report.passed, report.reasons
+    assert report.metrics["latency_ms"] == pytest.approx(120, abs=1)
+    assert report.metrics["snr_db"] > 30
+    assert [t["freq"] for t in report.metrics["tones"]] == list(stim.tones)
+
+
+def test_missing_tone_fails():
+    heard = make_stimulus(tones=(440, 1000), sample_rate=RATE)  # speaker dropped 3150 Hz
+    expected = make_stimulus(sample_rate=RATE)
+    report = analyze_loopback(_recording(heard), RATE, expected)
+    assert not report.passed
+    assert any("3150 Hz tone missing" in r for r in report.reasons)
+
+
+def test_clipped_speaker_fails_thd():
+    stim = make_stimulus(tones=(1000,), sample_rate=RATE)
+    rec = np.clip(4 * _recording(stim, gain=1.0), -0.5, 0.5)
+    report = analyze_loopback(rec, RATE, stim)
+    assert not report.passed
+    assert "THD" in report.reasons[0]
+
+
+def test_silence_and_noise_fail():
+    stim = make_stimulus(sample_rate=RATE)
+    rng = np.random.default_rng(1)
+    silent = analyze_loopback(np.zeros(2 * RATE), RATE, stim)
+    assert "silent recording" in silent.reasons[0]
+    noise = analyze_loopback(0.01 * rng.standard_normal(2 * RATE), RATE, stim)
+    assert "stimulus not found" in noise.reasons[0]
+
+
+def test_recording_at_lower_rate_is_analysed():
+    stim = make_stimulus(sample_rate=RATE)
+    rec = _recording(stim, delay=0.5)[::3]
+    report = analyze_loopback(rec, RATE // 3, stim, play_offset=0.5)
+    assert report.passed, report.reasons
+    assert abs(report.metrics["latency_ms"]) < 1
@@ -0,0 +1,43 @@
+import http.client
+
+from smoke_test_ai.utils.bench_server import ThroughputServer
+
+
+def _conn(server):
+    return http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+
+
+def test_ping_and_download_over_keepalive():
+    with ThroughputServer() as server:
+        conn = _conn(server)
+        conn.request("GET", "/ping")
+        resp = conn.getresponse()
+        assert resp.status == 204
+        resp.read()
+        conn.request("GET", "/download?bytes=200000")  # same connection
+        resp = conn.getresponse()
+        assert resp.status == 200
+        assert len(resp.read()) == 200000
+        conn.request("GET", "/nope")
+        assert conn.getresponse().status == 404
+
+
+def test_upload_counts_chunked_and_sized_bodies():
+    with ThroughputServer() as server:
+        conn = _conn(server)
+        conn.request("PUT", "/upload", body=iter([b"a" * 70000, b"b" * 5]),
+                     headers={"Transfer-Encoding": "chunked"}, encode_chunked=True)
+        assert conn.getresponse().status == 200
+        conn.close()
+        conn = _conn(server)
+        conn.request("POST", "/upload", body=b"x" * 1000)
+        assert conn.getresponse().status == 200
+        assert server.bytes_received == 71005
+
+
+def test_stop_releases_port():
+    server = ThroughputServer().start()
+    port = server.port
+    server.stop()
+    with ThroughputServer(port=port) as again:
+        assert again.port == port
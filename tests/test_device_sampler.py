@@ -0,0 +1,63 @@
+import subprocess
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from smoke_test_ai.utils.device_sampler import DeviceSampler, sysfs_labels, sysfs_values
+
+
+SAMPLES = (
+    "#zones|cpu-usr battery\n"
+    "100.00|45000 30000 |1804800 |0 \n"
+    "100.50|52000 x |1804800 |1 \n"
+    "101.00|61000 31000 |\n"      # truncated line (sampler killed mid-write)
+)
+
+
+class TestDeviceSampler:
+    def test_parse(self):
+        s = DeviceSampler.parse(SAMPLES, ["temp", "freq", "cooling"])
+        assert len(s) == 2
+        assert s.t.tolist() == [0.0, 0.5]
+        assert s.header["zones"] == ["cpu-usr", "battery"]
+        temp = s.column("temp")
+        assert temp[0].tolist() == [45000, 30000]
+        assert np.isnan(temp[1, 1])
+        assert s.column("missing").shape == (2, 0)
+
+    def test_start_and_collect(self):
+        adb = MagicMock()
+        adb.shell.side_effect = [
+            MagicMock(stdout=""),               # write script
+            MagicMock(stdout="4321\n"),         # nohup ... & echo $!
+            MagicMock(stdout=""),               # kill
+            MagicMock(stdout=SAMPLES),          # cat samples
+            MagicMock(stdout=""),               # rm
+        ]
+        sampler = DeviceSampler(adb, "thermal", {"temp": "x", "freq": "y", "cooling": "z"}, interval=0.5)
+        sampler.start()
+        assert sampler.pid == "4321"
+        samples = sampler.collect()
+        assert len(samples) == 2
+        cmds = [c.args[0] for c in adb.shell.call_args_list]
+        assert cmds[0].startswith("cat > /data/local/tmp/thermal.sh <<'EOF'")
+        assert cmds[2] == "kill 4321 2>/dev/null"
+        assert cmds[3] == "cat /data/local/tmp/thermal.samples 2>/dev/null"
+
+    def test_script_runs_in_posix_sh(self, tmp_path):
+        for i, (name, temp) in enumerate([("cpu usr", "45000"), ("battery", None)]):
+            zone = tmp_path / f"tz{i}"
+            zone.mkdir()
+            (zone / "type").write_text(name + "\n")
+            if temp:
+                (zone / "temp").write_text(temp + "\n")
+        glob = f"{tmp_path}/tz*"
+        sampler = DeviceSampler(None, "t", {"temp": sysfs_values(glob, "temp")}, interval=0.1,
+                                duration=1, header={"zones": sysfs_labels(glob, "type")})
+        sampler.data_path = str(tmp_path / "out")
+        subprocess.run(["sh", "-c", sampler.script()], timeout=10, check=True)
+        samples = DeviceSampler.parse((tmp_path / "out").read_text(), ["temp"])
+        assert samples.header["zones"] == ["cpu_usr", "battery"]
+        assert len(samples) >= 1
+        assert samples.column("temp")[0, 0] == 45000
+        assert np.isnan(samples.column("temp")[0, 1])
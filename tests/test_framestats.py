@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from smoke_test_ai.utils.framestats import FrameTable, frame_metrics, parse_framestats
+
+COLUMNS = ("Flags,FrameTimelineVsyncId,IntendedVsync,Vsync,InputEventId,HandleInputStart,AnimationStart,"
+           "PerformTraversalsStart,DrawStart,FrameDeadline,FrameInterval,FrameStartTime,SyncQueued,SyncStart,"
+           "IssueDrawCommandsStart,SwapBuffers,FrameCompleted,DequeueBufferDuration,QueueBufferDuration,"
+           "GpuCompleted,SwapBuffersCompleted,DisplayPresentTime,")
+PERIOD = 16_666_667
+
+
+def dump(frames, deadline=True) -> str:
+    """framestats text for ``(flags, start_vsync_index, missed_vsyncs, frame_ms)`` tuples."""
+    columns = COLUMNS if deadline else COLUMNS.replace("FrameDeadline,", "")
+    names = [c for c in columns.split(",") if c]
+    lines = ["Applications Graphics Acceleration Info:", "Window: com.example/.Main", "",
+             "---PROFILEDATA---", columns]
+    for flags, index, missed, ms in frames:
+        intended = 1_000_000_000 + index * PERIOD
+        row = dict.fromkeys(names, 0)
+        row.update(Flags=flags, IntendedVsync=intended, Vsync=intended + missed * PERIOD,
+                   FrameDeadline=intended + PERIOD, FrameCompleted=intended + int(ms * 1e6))
+        lines.append(",".join(str(row[n]) for n in names) + ",")
+    lines += ["---PROFILEDATA---", "", "View hierarchy:"]
+    return "\n".join(lines)
+
+
+def test_parse_framestats_sorted_rows():
+    table = parse_framestats(dump([(0, 2, 0, 10), (1, 0, 0, 40), (0, 1, 0, 12)]))
+    assert len(table) == 3
+    assert table.columns[0] == "Flags" and "FrameCompleted" in table.columns
+    assert list(np.diff(table.column("IntendedVsync"))) == [PERIOD, PERIOD]
+    assert list(table.column("Flags")) == [1, 0, 0]
+
+
+def test_parse_framestats_ignores_text_outside_profiledata():
+    assert len(parse_framestats("Total frames rendered: 10\nJanky frames: 1 (10.00%)\n")) == 0
+
+
+def test_merge_deduplicates_overlapping_dumps():
+    first = parse_framestats(dump([(0, i, 0, 10) for i in range(0, 120)]))
+    second = parse_framestats(dump([(0, i, 0, 10) for i in range(60, 180)]))
+    merged = first.merge(second)
+    assert len(merged) == 180
+    assert FrameTable().merge(first) is first
+
+
+def test_frame_metrics_deadline_jank_and_missed_vsync():
+    frames = [(0, i, 0, 12) for i in range(90)]
+    frames += [(0, 90 + i, 2, 40) for i in range(10)]     # late frames, each 2 vsyncs behind
+    frames.append((1, 200, 0, 80))                         # first-draw frame: ignored
+    m = frame_metrics(parse_framestats(dump(frames)))
+    assert m["frames"] == 100
+    assert m["refresh_hz"] == pytest.approx(60, abs=0.1)
+    assert m["jank_frames"] == 10
+    assert m["jank_pct"] == 10.0
+    assert m["missed_vsync"] == 20
+    assert m["frame_ms"]["p50"] == pytest.approx(12)
+    assert m["frame_ms"]["p99"] == pytest.approx(40)
+
+
+def test_frame_metrics_without_deadline_uses_vsync_period():
+    frames = [(0, i, 0, 12) for i in range(45)] + [(0, 45 + i, 0, 20) for i in range(5)]
+    m = frame_metrics(parse_framestats(dump(frames, deadline=False)), refresh_hz=120)
+    assert m["refresh_hz"] == 120
+    assert m["jank_frames"] == 50   # every frame exceeds the 8.3 ms period at 120 Hz
+    m = frame_metrics(parse_framestats(dump(frames, deadline=False)))
+    assert m["jank_frames"] == 5
+
+
+def test_frame_table_save(tmp_path):
+    table = parse_framestats(dump([(0, 0, 0, 10)]))
+    path = table.save(tmp_path / "out" / "frames.csv")
+    header, row = path.read_text().splitlines()
+    assert header.startswith("Flags,FrameTimelineVsyncId,IntendedVsync")
+    assert row.split(",")[2] == "1000000000"
@@ -0,0 +1,90 @@
+import json
+
+from smoke_test_ai.core.history import RunHistory
+from smoke_test_ai.core.test_runner import TestResult, TestStatus
+
+
+def _results(**durations):
+    return [TestResult(id=tid, name=tid, status=TestStatus.PASS, duration=d)
+            for tid, d in durations.items()]
+
+
+class TestRunHistory:
+    def test_load_missing_file_returns_empty(self, tmp_path):
+        assert RunHistory(tmp_path, "Product-A").load() == []
+
+    def test_record_run_appends_entry(self, tmp_path):
+        history = RunHistory(tmp_path, "Product-A")
+        history.record_run(_results(boot=1.5), serial="SN1", suite_name="Basic")
+        runs = history.load()
+        assert len(runs) == 1
+        assert runs[0]["serial"] == "SN1"
+        assert runs[0]["tests"]["boot"] == {"status": "PASS", "duration": 1.5}
+
+    def test_record_run_trims_to_max_runs(self, tmp_path):
+        history = RunHistory(tmp_path, "Product-A", max_runs=3)
+        for i in range(5):
+            history.record_run(_results(boot=float(i)))
+        runs = history.load()
+        assert len(runs) == 3
+        assert runs[-1]["tests"]["boot"]["duration"] == 4.0
+
+    def test_test_durations_median_ignores_skip(self, tmp_path):
+        history = RunHistory(tmp_path, "Product-A")
+        for d in (1.0, 3.0, 2.0):
+            history.record_run(_results(cam=d))
+        history.record_run([TestResult(id="cam", name="cam", status=TestStatus.SKIP, duration=0.0)])
+        assert history.test_durations() == {"cam": 2.0}
+
+    def test_last_run_by_serial(self, tmp_path):
+        history = RunHistory(tmp_path, "Product-A")
+        history.record_run(_results(a=1.0), serial="SN1")
+        history.record_run(_results(a=2.0), serial="SN2")
+        assert history.last_run("SN1")["tests"]["a"]["duration"] == 1.0
+        assert history.last_run()["serial"] == "SN2"
+        assert history.last_run("SN3") is None
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        (tmp_path / "Product-A.json").write_text("{not json")
+        assert RunHistory(tmp_path, "Product-A").load() == []
+
+    def test_file_is_json(self, tmp_path):
+        history = RunHistory(tmp_path, "Product-A")
+        history.record_run(_results(a=1.0))
+        assert "runs" in json.loads((tmp_path / "Product-A.json").read_text())
+
+    def test_flaky_recorded_with_attempts(self, tmp_path):
+        history = RunHistory(tmp_path, "Product-A")
+        flaky = TestResult(id="wifi", name="wifi", status=TestStatus.FLAKY, duration=3.0, attempts=2)
+        history.record_run([flaky])
+        history.record_run([flaky])
+        history.record_run(_results(wifi=1.0))
+        assert history.load()[0]["tests"]["wifi"] == {"status": "FLAKY", "duration": 3.0, "attempts": 2}
+        assert history.flaky_counts() == {"wifi": 2}
+
+    def test_failure_rates(self, tmp_path):
+        history = RunHistory(tmp_path, "Product-A")
+        for status in (TestStatus.PASS, TestStatus.FAIL, TestStatus.FLAKY, TestStatus.SKIP):
+            history.record_run([TestResult(id="a", name="a", status=status)])
+        assert history.failure_rates() == {"a": 0.5}
+
+    def test_metrics_recorded_and_metric_history(self, tmp_path):
+        history = RunHistory(tmp_path, "Product-A")
+        for total in (20.0, 21.0):
+            history.record_run([TestResult(id="boot", name="boot", status=TestStatus.PASS,
+                                           metrics={"total": total})])
+        history.record_run(_results(boot=1.0))
+        assert history.metric_history("boot") == [{"total": 20.0}, {"total": 21.0}]
+        assert history.metric_history("boot", window=1) == [{"total": 21.0}]
+
+    def test_metric_baseline(self, tmp_path):
+        history = RunHistory(tmp_path, "Product-A")
+        assert history.metric_baseline("cam", "launch_ms") is None
+        for p50 in (400, 500, 900):
+            history.record_run([TestResult(id="cam", name="cam", status=TestStatus.PASS,
+                                           metrics={"launch_ms": {"p50": p50},
+                                                    "phases": {"kernel": {"p50": p50 / 100}}})])
+        assert history.metric_baseline("cam", "launch_ms") == 500
+        assert history.metric_baseline("cam", "launch_ms", window=2) == 700
+        assert history.metric_baseline("cam", "phases.kernel") == 5.0
+        assert history.metric_baseline("cam", "launch_ms", stat="p95") is None
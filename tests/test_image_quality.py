@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from smoke_test_ai.utils.image_quality import (
+    AMBIGUOUS, FAIL, PASS, assess_image, downscale, image_metrics,
+)
+
+
+def _scene(h=1200, w=1600):
+    """Textured mid-tone scene with hard edges, like an ordinary photo."""
+    rng = np.random.default_rng(1)
+    base = cv2.GaussianBlur(rng.integers(0, 256, (h // 10, w // 10, 3), dtype=np.uint8), (0, 0), 3)
+    img = cv2.resize(base, (w, h), interpolation=cv2.INTER_CUBIC)
+    for x in range(0, w, 100):
+        cv2.line(img, (x, 0), (x, h - 1), (20, 30, 200), 5)
+    cv2.rectangle(img, (w // 5, h // 4), (w // 2, h // 2), (240, 240, 240), -1)
+    return img
+
+
+def test_downscale_keeps_aspect_and_small_images():
+    small = downscale(np.zeros((1200, 1600, 3), np.uint8), 512)
+    assert small.shape == (384, 512, 3)
+    tiny = np.zeros((100, 80, 3), np.uint8)
+    assert downscale(tiny, 512) is tiny
+
+
+def test_metrics_on_downscaled_copy():
+    m = image_metrics(_scene())
+    assert (m["width"], m["height"]) == (512, 384)
+    assert m["p1"] <= m["p50"] <= m["p99"]
+    assert m["dynamic_range"] == m["p99"] - m["p1"]
+
+
+def test_good_photo_passes():
+    report = assess_image(_scene())
+    assert report.verdict == PASS
+    assert report.reasons == []
+
+
+@pytest.mark.parametrize("value,reason", [(0, "too dark"), (255, "too bright")])
+def test_black_and_white_frames_fail(value, reason):
+    report = assess_image(np.full((480, 640, 3), value, np.uint8))
+    assert report.verdict == FAIL
+    assert any(reason in r for r in report.reasons)
+    assert any("clipped" in r for r in report.reasons)
+
+
+def test_uniform_grey_frame_fails():
+    report = assess_image(np.full((480, 640, 3), 128, np.uint8))
+    assert report.verdict == FAIL
+    assert any("uniform frame" in r for r in report.reasons)
+
+
+def test_blurred_photo_fails_on_sharpness():
+    report = assess_image(cv2.GaussianBlur(_scene(), (0, 0), 12))
+    assert report.verdict == FAIL
+    assert any("no detail" in r for r in report.reasons)
+
+
+def test_colour_cast_fails():
+    img = _scene()
+    img[..., 0] = 0
+    img[..., 1] = 0
+    report = assess_image(img)
+    assert report.verdict == FAIL
+    assert any("colour cast" in r for r in report.reasons)
+
+
+def test_underexposed_but_detailed_is_ambiguous():
+    dim = (_scene().astype(np.float32) * 0.2).astype(np.uint8)
+    report = assess_image(dim)
+    assert report.verdict == AMBIGUOUS
+    assert any("exposure" in r for r in report.reasons)
+
+
+def test_thresholds_override_defaults():
+    dim = (_scene().astype(np.float32) * 0.2).astype(np.uint8)
+    relaxed = {"pass_mean_low": 10, "pass_dynamic_range": 20, "pass_sharpness": 5}
+    assert assess_image(dim, relaxed).verdict == PASS
+    assert assess_image(_scene(), {"fail_mean_low": 200}).verdict == FAIL
+
+
+def test_grayscale_input():
+    gray = cv2.cvtColor(_scene(), cv2.COLOR_BGR2GRAY)
+    assert assess_image(gray).verdict == PASS
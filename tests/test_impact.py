@@ -0,0 +1,57 @@
+from smoke_test_ai.core.impact import (
+    collect_components, changed_components, impacted_categories, select_impacted,
+)
+
+
+def _suite(*tests):
+    return {"test_suite": {"name": "S", "tests": list(tests)}}
+
+
+class TestCollectComponents:
+    def test_sources(self):
+        device_info = {"fw_wwan": "SWIX12C_03", "fw_touch": "", "model": "T70"}
+        validation = [{"property": "Kernel", "actual": "5.4.233"}, {"property": "X", "actual": ""}]
+        build_info = {"partitions": {"modem": "abc123"}}
+        assert collect_components(device_info, build_info, validation) == {
+            "fw_wwan": "SWIX12C_03",
+            "Kernel": "5.4.233",
+            "partition:modem": "abc123",
+        }
+
+
+class TestImpactedCategories:
+    def test_changed_components(self):
+        assert changed_components({"a": "1", "b": "2", "c": "3"}, {"a": "1", "b": "1"}) == ["b", "c"]
+
+    def test_modem_maps_to_telephony(self):
+        assert impacted_categories(["fw_wwan"]) == {"Telephony", "Network"}
+
+    def test_camera_partition(self):
+        assert impacted_categories(["partition:camera_hal"]) == {"Camera"}
+
+    def test_fingerprint_ignored(self):
+        assert impacted_categories(["Fingerprint", "Build ID"]) == set()
+
+    def test_kernel_needs_full_suite(self):
+        assert impacted_categories(["fw_touch", "Kernel"]) is None
+
+    def test_unmapped_component_needs_full_suite(self):
+        assert impacted_categories(["Mystery Blob"]) is None
+
+    def test_custom_rules_first(self):
+        rules = [(r"imx586", ["Camera"])]
+        assert impacted_categories(["partition:imx586"], rules=rules) == {"Camera"}
+
+
+class TestSelectImpacted:
+    def test_keeps_categories_core_mandatory_and_dependencies(self):
+        suite = _suite(
+            {"id": "boot", "category": "Boot"},
+            {"id": "sim", "category": "System"},
+            {"id": "call", "category": "Telephony", "depends_on": "sim"},
+            {"id": "cam", "category": "Camera"},
+            {"id": "gate", "category": "Display", "mandatory": True},
+        )
+        cfg, summary = select_impacted(suite, {"Telephony"}, ["Boot"])
+        assert [t["id"] for t in cfg["test_suite"]["tests"]] == ["boot", "sim", "call", "gate"]
+        assert summary["dropped"] == ["cam"]
@@ -0,0 +1,71 @@
+from unittest.mock import MagicMock
+
+from smoke_test_ai.utils.meminfo import MemorySnapshot
+
+DUMPSYS = """Applications Memory Usage (in Kilobytes):
+Uptime: 81234 Realtime: 81234
+
+Total RSS by process:
+    402,112K: system (pid 1021)
+    251,004K: com.android.systemui (pid 1500 / activities)
+    180,220K: com.android.launcher3 (pid 2100 / activities)
+    120,500K: zygote64 (pid 640)
+     60,000K: zygote (pid 641)
+
+Total PSS by process:
+    260,480K: system (pid 1021)
+    150,528K: com.android.systemui (pid 1500 / activities)
+     90,112K: com.android.launcher3 (pid 2100 / activities)
+     35,840K: zygote64 (pid 640)
+      8,192K: zygote (pid 641)
+
+Total PSS by OOM adjustment:
+    260,480K: System
+    150,528K: Persistent
+
+Total RAM: 2,936,012K (status normal)
+ Free RAM: 1,012,345K (  400,000K cached pss +   500,000K cached kernel +   112,345K free)
+ Used RAM: 1,740,800K (1,200,000K used pss +   540,800K kernel)
+ Lost RAM:   102,400K
+     ZRAM:    50,000K physical used for   150,000K in swap (1,048,576K total swap)
+"""
+PROC = """MemTotal:        2936012 kB
+MemFree:          112345 kB
+MemAvailable:    1048576 kB
+Cached:           600000 kB
+SwapTotal:       1048576 kB
+"""
+
+
+def test_parse_totals_processes_and_proc():
+    snap = MemorySnapshot.parse(DUMPSYS, PROC)
+    assert snap.totals == {"total_ram": 2936012, "free_ram": 1012345, "used_ram": 1740800, "lost_ram": 102400}
+    assert snap.pss["system"] == 260480
+    assert snap.rss["com.android.systemui"] == 251004
+    assert "System" not in snap.pss  # OOM adjustment section is not a process list
+    assert snap.proc["MemAvailable"] == 1048576
+
+
+def test_process_lookup_falls_back_to_candidates():
+    snap = MemorySnapshot.parse(DUMPSYS.replace("zygote64", "zygote_x"), PROC)
+    assert snap.process(("zygote64", "zygote")) == ("zygote", 8192, 60000)
+    assert snap.process("surfaceflinger") == (None, None, None)
+
+
+def test_table_in_mb():
+    table = MemorySnapshot.parse(DUMPSYS, PROC).table(
+        {"system_server": ("system",), "launcher": ("com.android.launcher3",), "absent": ("nope",)})
+    assert table["ram"] == {"total_mb": 2867.2, "free_mb": 988.6, "used_mb": 1700.0,
+                            "lost_mb": 100.0, "available_mb": 1024.0}
+    assert table["processes"] == {
+        "system_server": {"process": "system", "pss_mb": 254.4, "rss_mb": 392.7},
+        "launcher": {"process": "com.android.launcher3", "pss_mb": 88.0, "rss_mb": 176.0},
+    }
+
+
+def test_capture_splits_sections():
+    adb = MagicMock()
+    adb.shell.return_value = MagicMock(stdout=DUMPSYS + "==proc_meminfo==\n" + PROC)
+    snap = MemorySnapshot.capture(adb)
+    assert snap.totals["used_ram"] == 1740800
+    assert snap.proc["MemTotal"] == 2936012
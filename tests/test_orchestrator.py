@@ -364,6 +364,79 @@ class TestOrchestratorRun:
             orch.run(serial="FAKE", is_factory_reset=True)
             mock_adb_inst.unlock_keyguard.assert_called_once_with(pin="0000")
 
+    @patch("smoke_test_ai.core.orchestrator.time.sleep")
+    @patch("smoke_test_ai.core.orchestrator.AdbController")
+    def test_run_report_false_skips_reports(self, MockAdb, mock_sleep, settings, device_config):
+        """Shards call run(report=False) — the merged report is written once by the caller."""
+        orch = Orchestrator(settings=settings, device_config=device_config)
+        MockAdb.return_value = self._mock_adb()
+
+        with patch.object(orch, "_generate_reports") as mock_reports, \
+             patch.object(orch, "_pre_test_setup"):
+            orch.run(serial="FAKE", report=False)
+            mock_reports.assert_not_called()
+            assert orch._device_info["model"] == "Test"
+
+    def test_record_history_writes_run(self, settings, device_config, tmp_path):
+        from smoke_test_ai.core.test_runner import TestResult, TestStatus
+        settings["history"] = {"dir": str(tmp_path)}
+        orch = Orchestrator(settings=settings, device_config=device_config)
+        results = [TestResult(id="boot", name="Boot", status=TestStatus.PASS, duration=1.0)]
+        orch._record_history(results, "FAKE", {"test_suite": {"name": "Basic"}})
+        run = orch._get_history().last_run("FAKE")
+        assert run["suite"] == "Basic"
+        assert run["tests"]["boot"]["status"] == "PASS"
+
+    def test_record_history_disabled(self, settings, device_config, tmp_path):
+        from smoke_test_ai.core.test_runner import TestResult, TestStatus
+        settings["history"] = {"dir": str(tmp_path), "enabled": False}
+        orch = Orchestrator(settings=settings, device_config=device_config)
+        orch._record_history([TestResult(id="a", name="a", status=TestStatus.PASS)], "FAKE", None)
+        assert orch._get_history().load() == []
+
+    def test_apply_time_budget_uses_history(self, settings, device_config, tmp_path):
+        from smoke_test_ai.core.test_runner import TestResult, TestStatus
+        settings["history"] = {"dir": str(tmp_path)}
+        settings["selection"] = {"category_weights": {"Boot": 2.0}}
+        orch = Orchestrator(settings=settings, device_config=device_config)
+        orch._get_history().record_run([
+            TestResult(id="a", name="a", status=TestStatus.PASS, duration=30.0),
+            TestResult(id="b", name="b", status=TestStatus.FAIL, duration=30.0),
+        ])
+        suite = {"test_suite": {"name": "S", "tests": [
+            {"id": "a", "name": "a", "type": "adb_shell"},
+            {"id": "b", "name": "b", "type": "adb_shell"},
+        ]}}
+        cfg, selection = orch._apply_time_budget(suite, 40, {})
+        assert [t["id"] for t in cfg["test_suite"]["tests"]] == ["b"]
+        assert selection["dropped"] == ["a"]
+
+
+    def _impact_suite(self):
+        return {"test_suite": {"name": "S", "tests": [
+            {"id": "boot", "name": "boot", "category": "Boot"},
+            {"id": "call", "name": "call", "category": "Telephony"},
+            {"id": "cam", "name": "cam", "category": "Camera"},
+        ]}}
+
+    def test_build_impact_without_previous_run_is_full(self, settings, device_config, tmp_path):
+        settings["history"] = {"dir": str(tmp_path)}
+        orch = Orchestrator(settings=settings, device_config=device_config)
+        cfg, info = orch._apply_build_impact(self._impact_suite(), "FAKE", {"fw_wwan": "2"})
+        assert len(cfg["test_suite"]["tests"]) == 3
+        assert info["full_suite"]
+
+    def test_build_impact_selects_changed_categories(self, settings, device_config, tmp_path):
+        from smoke_test_ai.core.test_runner import TestResult, TestStatus
+        settings["history"] = {"dir": str(tmp_path)}
+        orch = Orchestrator(settings=settings, device_config=device_config)
+        orch._record_history([TestResult(id="boot", name="boot", status=TestStatus.PASS)], "FAKE", None,
+                             extra={"components": {"fw_wwan": "1", "fw_touch": "A"}})
+        cfg, info = orch._apply_build_impact(self._impact_suite(), "FAKE", {"fw_wwan": "2", "fw_touch": "A"})
+        assert [t["id"] for t in cfg["test_suite"]["tests"]] == ["boot", "call"]
+        assert info["changed"] == ["fw_wwan"]
+        assert not info["full_suite"]
+
 
 class TestAdaptivePipeline:
     """Tests for build_type / keep_data / is_factory_reset decision logic."""
@@ -1,4 +1,6 @@
 import pytest
+import time
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 from smoke_test_ai.plugins.base import TestPlugin, PluginContext
 from smoke_test_ai.core.test_runner import TestResult, TestStatus
@@ -65,10 +67,8 @@ class TestCameraPlugin:
             ok,                                                     # force-stop
             MagicMock(stdout="Starting: Intent\n", returncode=0),  # am start
             ok,                                                     # KEYCODE_CAMERA
-            ok,                                                     # KEYCODE_VOLUME_DOWN
-            MagicMock(stdout="/sdcard/DCIM/Camera/IMG_new.jpg\n"),  # find (path1)
+            MagicMock(stdout="/sdcard/DCIM/Camera/IMG_new.jpg|1234567|1767225600|100.00|100.80|101.05\n"),  # media watch
             ok,                                                     # rm marker
-            MagicMock(stdout="1234567\n", returncode=0),           # stat size
             ok,                                                     # finally: force-stop
         ]
         tc = {
@@ -81,6 +81,10 @@ class TestCameraPlugin:
         assert result.status == TestStatus.PASS
         assert "IMG_new.jpg" in result.message
         assert "1234567" in result.message
+        assert result.metrics["file_written_s"] == 0.8
+        # Only the dedicated camera key was needed
+        keys = [c.args[0] for c in adb.shell.call_args_list if "keyevent" in c.args[0]]
+        assert "input keyevent KEYCODE_VOLUME_DOWN" not in keys
 
     def test_capture_photo_no_new_file(self, camera_plugin, plugin_context):
         adb = plugin_context.adb
@@ -95,9 +99,9 @@ class TestCameraPlugin:
             ok,                                                     # force-stop
             MagicMock(stdout="Starting: Intent\n", returncode=0),  # am start
             ok,                                                     # KEYCODE_CAMERA
+            empty,                                                  # media watch (timeout)
             ok,                                                     # KEYCODE_VOLUME_DOWN
-            empty, empty, empty,                                    # find (3 dirs, 1st attempt)
-            empty, empty, empty,                                    # find (3 dirs, retry)
+            empty,                                                  # media watch (timeout)
             ok,                                                     # rm marker
             ok,                                                     # finally: force-stop
         ]
@@ -110,6 +114,27 @@ class TestCameraPlugin:
             result = camera_plugin.execute(tc, plugin_context)
         assert result.status == TestStatus.FAIL
 
+    def test_capture_photo_zero_bytes(self, camera_plugin, plugin_context):
+        adb = plugin_context.adb
+        ok = MagicMock(stdout="", returncode=0)
+        empty_file = MagicMock(stdout="/sdcard/DCIM/Camera/IMG_bad.jpg|0|1767225600|100.00|100.50|100.50\n")
+        adb.shell.side_effect = [
+            ok, ok, ok, ok, ok, ok,                                 # mkdir, marker, wake, keyguard, dialogs, force-stop
+            MagicMock(stdout="Starting: Intent\n", returncode=0),  # am start
+            ok,                                                     # KEYCODE_CAMERA
+            empty_file,                                             # media watch (stayed empty)
+            ok,                                                     # KEYCODE_VOLUME_DOWN
+            empty_file,                                             # media watch (stayed empty)
+            ok,                                                     # rm marker
+            ok,                                                     # finally: force-stop
+        ]
+        tc = {"id": "cam1", "name": "Camera", "type": "camera", "action": "capture_photo",
+              "params": {"camera": "back", "wait_seconds": 0}}
+        with patch("smoke_test_ai.plugins.camera.time.sleep"):
+            result = camera_plugin.execute(tc, plugin_context)
+        assert result.status == TestStatus.FAIL
+        assert result.message == "Photo /sdcard/DCIM/Camera/IMG_bad.jpg has zero bytes"
+
     def test_unknown_action_errors(self, camera_plugin, plugin_context):
         tc = {
             "id": "cam1", "name": "Camera", "type": "camera",
@@ -149,10 +174,10 @@ class TestCameraPlugin:
             ok,                                                     # force-stop
             MagicMock(stdout="Starting: Intent\n", returncode=0),  # am start
             ok,                                                     # KEYCODE_CAMERA
+            ok,                                                     # media watch (timeout)
             ok,                                                     # KEYCODE_VOLUME_DOWN
-            MagicMock(stdout="/sdcard/DCIM/Camera/IMG_front.jpg\n"),  # find (path1)
+            MagicMock(stdout="/sdcard/DCIM/Camera/IMG_front.jpg|2048000|1767225600|50.0|51.5|51.75\n"),
             ok,                                                     # rm marker
-            MagicMock(stdout="2048000\n", returncode=0),           # stat size
             ok,                                                     # finally: force-stop
         ]
         tc = {
@@ -178,10 +203,8 @@ class TestCameraPlugin:
             ok,                                                     # force-stop
             MagicMock(stdout="Starting: Intent\n", returncode=0),  # am start
             ok,                                                     # KEYCODE_CAMERA
-            ok,                                                     # KEYCODE_VOLUME_DOWN
-            MagicMock(stdout="/sdcard/DCIM/Camera/IMG_new.jpg\n"),  # find (path1)
+            MagicMock(stdout="/sdcard/DCIM/Camera/IMG_new.jpg|5000|1767225600|10.0|10.5|10.75\n"),
             ok,                                                     # rm marker
-            MagicMock(stdout="5000\n", returncode=0),              # stat size
             ok,                                                     # finally: force-stop
         ]
 
@@ -206,12 +229,7 @@ class TestCameraPlugin:
         adb = MagicMock()
         adb.shell.side_effect = self._capture_shell_mocks()
 
-        from pathlib import Path
-
-        def fake_pull(remote, local):
-            Path(local).write_bytes(b"\xff\xd8fake-jpeg-data")
-
-        adb.pull = fake_pull
+        adb.exec_out.return_value = b"\xff\xd8fake-jpeg-data"
         ctx = PluginContext(
             adb=adb, settings={}, device_capabilities={},
             visual_analyzer=analyzer,
@@ -223,10 +241,11 @@ class TestCameraPlugin:
         }
         with patch("smoke_test_ai.plugins.camera.cv2") as mock_cv2, \
              patch("smoke_test_ai.plugins.camera.time.sleep"):
-            mock_cv2.imread.return_value = MagicMock()
+            mock_cv2.imdecode.return_value = self._photo("dim")
             result = camera_plugin.execute(tc, ctx)
         assert result.status == TestStatus.PASS
         assert "Verified" in result.message
+        analyzer.analyze_test_screenshot.assert_called_once()
 
     def test_capture_and_verify_llm_fail(self, camera_plugin):
         """capture_and_verify with LLM returning fail."""
@@ -235,12 +254,7 @@ class TestCameraPlugin:
         adb = MagicMock()
         adb.shell.side_effect = self._capture_shell_mocks()
 
-        from pathlib import Path
-
-        def fake_pull(remote, local):
-            Path(local).write_bytes(b"\xff\xd8fake-jpeg-data")
-
-        adb.pull = fake_pull
+        adb.exec_out.return_value = b"\xff\xd8fake-jpeg-data"
         ctx = PluginContext(
             adb=adb, settings={}, device_capabilities={},
             visual_analyzer=analyzer,
@@ -252,11 +266,116 @@ class TestCameraPlugin:
         }
         with patch("smoke_test_ai.plugins.camera.cv2") as mock_cv2, \
              patch("smoke_test_ai.plugins.camera.time.sleep"):
-            mock_cv2.imread.return_value = MagicMock()
+            mock_cv2.imdecode.return_value = self._photo("dim")
             result = camera_plugin.execute(tc, ctx)
         assert result.status == TestStatus.FAIL
         assert "LLM rejected" in result.message
 
+    @staticmethod
+    def _photo(kind):
+        """Synthetic BGR photo: clear-cut good, black, or dim (ambiguous for the prefilter)."""
+        import numpy as np
+        rng = np.random.default_rng(0)
+        if kind == "black":
+            return np.zeros((120, 160, 3), dtype=np.uint8)
+        if kind == "dim":
+            return rng.integers(15, 55, (120, 160, 3)).astype(np.uint8)
+        return rng.integers(30, 220, (120, 160, 3)).astype(np.uint8)
+
+    def _verify_ctx(self, settings=None):
+        analyzer = MagicMock()
+        analyzer.analyze_test_screenshot.return_value = {"pass": True, "reason": "llm ok"}
+        adb = MagicMock()
+        adb.shell.side_effect = self._capture_shell_mocks()
+        adb.exec_out.return_value = b"\xff\xd8"
+        ctx = PluginContext(adb=adb, settings=settings or {}, device_capabilities={},
+                            visual_analyzer=analyzer)
+        return ctx, analyzer
+
+    def _run_verify(self, camera_plugin, ctx, photo, **params):
+        tc = {"id": "cvq", "name": "Verify Quality", "type": "camera",
+              "action": "capture_and_verify",
+              "params": {"camera": "back", "wait_seconds": 0, **params}}
+        with patch("smoke_test_ai.plugins.camera.cv2") as mock_cv2, \
+             patch("smoke_test_ai.plugins.camera.time.sleep"):
+            mock_cv2.imdecode.return_value = self._photo(photo)
+            return camera_plugin.execute(tc, ctx)
+
+    def test_capture_and_verify_prefilter_pass_skips_llm(self, camera_plugin):
+        ctx, analyzer = self._verify_ctx()
+        result = self._run_verify(camera_plugin, ctx, "good")
+        assert result.status == TestStatus.PASS
+        assert "host quality check" in result.message
+        assert result.metrics["quality"]["sharpness"] > 60
+        analyzer.analyze_test_screenshot.assert_not_called()
+
+    def test_capture_and_verify_prefilter_black_fails_without_llm(self, camera_plugin):
+        ctx, analyzer = self._verify_ctx()
+        result = self._run_verify(camera_plugin, ctx, "black")
+        assert result.status == TestStatus.FAIL
+        assert "too dark" in result.message
+        analyzer.analyze_test_screenshot.assert_not_called()
+
+    def test_capture_and_verify_device_thresholds(self, camera_plugin):
+        """Device YAML camera.quality thresholds apply; test params override them."""
+        settings = {"device": {"camera": {"quality": {"pass_mean_low": 20, "pass_dynamic_range": 20}}}}
+        ctx, analyzer = self._verify_ctx(settings)
+        result = self._run_verify(camera_plugin, ctx, "dim")
+        assert result.status == TestStatus.PASS
+        analyzer.analyze_test_screenshot.assert_not_called()
+
+        ctx, analyzer = self._verify_ctx(settings)
+        result = self._run_verify(camera_plugin, ctx, "good", quality=False)
+        assert result.message == "Verified: llm ok"
+        analyzer.analyze_test_screenshot.assert_called_once()
+
+    @staticmethod
+    def _jpeg(h, w):
+        import cv2
+        import numpy as np
+        img = np.random.default_rng(2).integers(30, 220, (h, w, 3)).astype(np.uint8)
+        return cv2.imencode(".jpg", img)[1].tobytes()
+
+    def test_fetch_photo_streams_and_decodes_reduced(self, camera_plugin):
+        adb = MagicMock()
+        adb.exec_out.return_value = self._jpeg(3000, 4000)
+        image, data = CameraPlugin._fetch_photo(adb, "/sdcard/DCIM/Camera/IMG 1.jpg", 1024)
+        assert image.shape == (750, 1000, 3)  # 1/4 scaled decode, already under 1024
+        assert data == adb.exec_out.return_value
+        assert adb.exec_out.call_args.args[0] == "cat '/sdcard/DCIM/Camera/IMG 1.jpg'"
+
+    def test_fetch_photo_small_original_not_over_reduced(self, camera_plugin):
+        adb = MagicMock()
+        adb.exec_out.return_value = self._jpeg(480, 640)
+        image, _ = CameraPlugin._fetch_photo(adb, "/sdcard/x.jpg", 1024)
+        assert image.shape == (480, 640, 3)
+
+    def test_fetch_photo_unreadable(self, camera_plugin):
+        adb = MagicMock()
+        adb.exec_out.return_value = b""
+        assert CameraPlugin._fetch_photo(adb, "/sdcard/x.jpg") == (None, b"")
+        adb.exec_out.return_value = b"not a jpeg"
+        image, data = CameraPlugin._fetch_photo(adb, "/sdcard/x.jpg")
+        assert image is None and data == b"not a jpeg"
+
+    def test_original_kept_only_on_failure(self, camera_plugin, tmp_path):
+        settings = {"reporting": {"output_dir": str(tmp_path)}}
+        ctx, _ = self._verify_ctx(settings)
+        ctx.adb.exec_out.return_value = b"\xff\xd8original"
+        result = self._run_verify(camera_plugin, ctx, "black")
+        assert result.status == TestStatus.FAIL
+        kept = tmp_path / "artifacts" / "cvq_IMG_new.jpg"
+        assert result.metrics["artifacts"] == [str(kept)]
+        assert kept.read_bytes() == b"\xff\xd8original"
+
+        ctx, _ = self._verify_ctx(settings)
+        ctx.adb.shell.side_effect = self._capture_shell_mocks()
+        kept.unlink()
+        result = self._run_verify(camera_plugin, ctx, "good")
+        assert result.status == TestStatus.PASS
+        assert "artifacts" not in result.metrics
+        assert not kept.exists()
+
     def test_verify_latest_photo_no_analyzer(self, camera_plugin):
         """verify_latest_photo without visual_analyzer returns SKIP."""
         adb = MagicMock()
@@ -337,6 +456,86 @@ class TestTelephonyPlugin:
         peer_snippet.sendSms.assert_called_once_with("+886912345678", "smoke-test-inbound")
         dut_snippet.waitForSms.assert_called_once_with(10000)
 
+    def test_sms_latency_tracks_delivery_and_loss(self, telephony_plugin):
+        dut, peer = MagicMock(), MagicMock()
+        sent = []
+        peer.sendSms.side_effect = lambda number, body: sent.append(body)
+
+        def lost():
+            raise RuntimeError("SMS timeout")
+
+        replies = iter([
+            lambda: {"MessageBody": "unrelated promo"},   # re-armed, keeps waiting
+            lambda: {"MessageBody": sent[-1]},
+            lost,  # #2 never arrives
+            lambda: {"MessageBody": sent[-1]},
+        ])
+        dut.waitForSms.side_effect = lambda ms: next(replies)()
+        ctx = PluginContext(adb=MagicMock(), settings={"device": {"phone_number": "+886912345678"}},
+                            device_capabilities={}, snippet=dut, peer_snippet=peer)
+        tc = {"id": "sms3", "name": "SMS latency", "type": "telephony", "action": "sms_latency",
+              "params": {"count": 3, "body": "lat", "max_loss": 0.5}}
+        with patch("smoke_test_ai.plugins.telephony.time.sleep"):
+            result = telephony_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS, result.message
+        assert sent == ["lat #1/3", "lat #2/3", "lat #3/3"]
+        assert result.metrics["received"] == 2
+        assert result.metrics["lost"] == [2]
+        assert result.metrics["latency_s"]["n"] == 2
+        assert "1/3 SMS lost" in result.message
+        assert dut.asyncWaitForSms.call_count == 4
+
+        tc["params"]["max_loss"] = 0.0
+        replies = iter([lost] * 3)
+        with patch("smoke_test_ai.plugins.telephony.time.sleep"):
+            result = telephony_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert "nothing measured" in result.message
+
+    def test_call_setup_latency_hangs_up_on_ringing(self, telephony_plugin):
+        dut, peer = MagicMock(), MagicMock()
+        state = {"dut": 0, "peer": 0, "polls": 0}
+
+        def dut_state():
+            state["polls"] += 1
+            if state["polls"] == 2:       # dialing shows up on the second poll
+                state["dut"] = 2
+            return state["dut"]
+
+        def peer_state():
+            if state["dut"] == 2:
+                state["peer"] = 1
+            return state["peer"]
+
+        def shell(cmd, **kwargs):
+            if "KEYCODE_ENDCALL" in cmd:
+                state.update(dut=0, peer=0, polls=0)
+            return MagicMock(stdout="")
+
+        dut.getTelephonyCallState.side_effect = dut_state
+        peer.getTelephonyCallState.side_effect = peer_state
+        adb = MagicMock()
+        adb.shell.side_effect = shell
+        ctx = PluginContext(adb=adb, settings={"device": {"peer_phone_number": "+886900000001"}},
+                            device_capabilities={}, snippet=dut, peer_snippet=peer)
+        tc = {"id": "call2", "name": "Call setup", "type": "telephony", "action": "call_setup_latency",
+              "params": {"count": 2, "thresholds": {"ringing_s": 10}}}
+        with patch("smoke_test_ai.plugins.telephony.time.sleep"):
+            result = telephony_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS, result.message
+        assert result.metrics["dial_s"]["n"] == 2
+        assert result.metrics["ringing_s"]["n"] == 2
+        assert "active_s" not in result.metrics
+        cmds = [c.args[0] for c in adb.shell.call_args_list]
+        assert sum("tel:+886900000001" in c for c in cmds) == 2
+        assert sum("KEYCODE_ENDCALL" in c for c in cmds) == 2
+
+    def test_call_setup_latency_requires_peer(self, telephony_plugin):
+        ctx = PluginContext(adb=MagicMock(), settings={}, device_capabilities={}, snippet=MagicMock())
+        tc = {"id": "call2", "name": "Call setup", "type": "telephony", "action": "call_setup_latency"}
+        result = telephony_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.SKIP
+
     def test_receive_sms_no_phone_number(self, telephony_plugin):
         ctx = PluginContext(
             adb=MagicMock(), settings={}, device_capabilities={},
@@ -581,6 +780,92 @@ class TestWifiPlugin:
         assert result.status == TestStatus.FAIL
         assert "Target" in result.message
 
+    @staticmethod
+    def _scan_ctx():
+        snippet = MagicMock()
+        snippet.wifiScanAndGetResults.return_value = [
+            {"SSID": "Lab", "BSSID": "aa:00", "level": -70, "frequency": 2437, "capabilities": "[WPA2-PSK]"},
+            {"SSID": "Lab", "BSSID": "aa:01", "level": -52, "frequency": 5180, "capabilities": "[WPA2-PSK]"},
+            {"SSID": "Guest", "BSSID": "bb:00", "level": -85, "frequency": 2412, "capabilities": "[ESS]"},
+            {"SSID": "", "BSSID": "cc:00", "level": -60, "frequency": 5955, "capabilities": "[SAE]"},
+        ]
+        return PluginContext(adb=MagicMock(), settings={}, device_capabilities={}, snippet=snippet), snippet
+
+    def test_scan_cache_shared_across_actions(self, wifi_plugin):
+        ctx, snippet = self._scan_ctx()
+        tests = [
+            {"id": "w1", "name": "Scan", "type": "wifi", "action": "scan"},
+            {"id": "w2", "name": "SSID", "type": "wifi", "action": "scan_for_ssid",
+             "params": {"expected_ssid": "Guest"}},
+            {"id": "w6", "name": "RSSI", "type": "wifi", "action": "ap_rssi",
+             "params": {"ssid": "Lab", "min_rssi": -60}},
+            {"id": "w7", "name": "5G", "type": "wifi", "action": "band_check", "params": {"band": "5GHz"}},
+        ]
+        results = [wifi_plugin.execute(tc, ctx) for tc in tests]
+        assert [r.status for r in results] == [TestStatus.PASS] * 4
+        snippet.wifiScanAndGetResults.assert_called_once()
+        assert results[2].metrics["ap"]["bssid"] == "aa:01"
+        assert "-52 dBm @ 5180 MHz" in results[2].message
+        assert results[3].metrics["band_ap_count"] == 1
+
+    def test_scan_cache_force_rescan_and_expiry(self, wifi_plugin):
+        ctx, snippet = self._scan_ctx()
+        scan = {"id": "w1", "name": "Scan", "type": "wifi", "action": "scan"}
+        wifi_plugin.execute(scan, ctx)
+        wifi_plugin.execute({**scan, "params": {"force_rescan": True}}, ctx)
+        assert snippet.wifiScanAndGetResults.call_count == 2
+        with patch("smoke_test_ai.plugins.wifi.time.monotonic", return_value=time.monotonic() + 60):
+            wifi_plugin.execute(scan, ctx)
+        assert snippet.wifiScanAndGetResults.call_count == 3
+        with patch("smoke_test_ai.plugins.wifi.time.sleep"):
+            wifi_plugin.execute({"id": "w3", "name": "Toggle", "type": "wifi", "action": "toggle"}, ctx)
+        wifi_plugin.execute(scan, ctx)
+        assert snippet.wifiScanAndGetResults.call_count == 4
+
+    def test_ap_rssi_and_band_failures(self, wifi_plugin):
+        ctx, _ = self._scan_ctx()
+        weak = wifi_plugin.execute({"id": "w6", "name": "RSSI", "type": "wifi", "action": "ap_rssi",
+                                    "params": {"ssid": "Guest", "min_rssi": -75}}, ctx)
+        assert weak.status == TestStatus.FAIL
+        assert "below -75 dBm" in weak.message
+        band = wifi_plugin.execute({"id": "w7", "name": "6G", "type": "wifi", "action": "band_check",
+                                    "params": {"band": "6GHz", "ssid": "Lab"}}, ctx)
+        assert band.status == TestStatus.FAIL
+        assert "No 'Lab' AP seen on 6GHz" in band.message
+
+    def test_connect_benchmark_summarizes_milestones(self, wifi_plugin):
+        adb = MagicMock()
+        adb.wait_wifi_milestones.side_effect = [
+            {"associated": 0.8, "ip": 1.2, "validated": 2.0},
+            {"associated": 0.9, "ip": 1.4, "validated": 2.4},
+            {"associated": 0.7, "ip": 1.0, "validated": 1.8},
+        ]
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "w8", "name": "Connect KPI", "type": "wifi", "action": "connect_benchmark",
+              "params": {"iterations": 3, "thresholds": {"validated_s": 5.0}}}
+        result = wifi_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS, result.message
+        assert result.metrics["ip_s"]["p50"] == 1.2
+        assert result.metrics["validated_s"]["n"] == 3
+        adb.wait_wifi_milestones.assert_called_with("svc wifi enable", until="validated", timeout=30)
+        assert adb.shell.call_args_list[0].args[0].startswith("svc wifi disable;")
+        assert adb.shell.call_args_list[-1].args[0] == "svc wifi enable"
+
+    def test_connect_benchmark_missed_and_slow(self, wifi_plugin):
+        adb = MagicMock()
+        adb.wait_wifi_milestones.side_effect = [
+            {"associated": 0.8, "ip": 6.0},
+            {"associated": 0.9},  # DHCP never completed
+        ]
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "w8", "name": "Connect KPI", "type": "wifi", "action": "connect_benchmark",
+              "params": {"iterations": 2, "until": "ip", "thresholds": {"ip_s": 3.0}}}
+        result = wifi_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert "'ip' not reached in iteration(s) [2]" in result.message
+        assert "ip_s p95 6.00 s > 3.0 s" in result.message
+        assert result.metrics["missed_iterations"] == [2]
+
     def test_toggle_pass(self, wifi_plugin):
         snippet = MagicMock()
         snippet.wifiIsEnabled.return_value = True
@@ -818,6 +1103,67 @@ class TestBluetoothPlugin:
         assert result.status == TestStatus.PASS
         assert "not supported" in result.message
 
+    @staticmethod
+    def _stream_ctx(adverts):
+        """Snippet whose scan handler yields ``adverts`` then times out."""
+        def event(address, rssi, ts, name=""):
+            ev = MagicMock()
+            ev.data = {"callbackType": 1, "result": {
+                "Device": {"Address": address, "Name": name}, "Rssi": rssi, "TimestampNanos": ts}}
+            return ev
+        handler = MagicMock()
+        handler.callback_id = "2-0"
+        pending = [event(*a) for a in adverts]
+
+        def wait_and_get(name, timeout):
+            if not pending:
+                raise TimeoutError("idle")
+            return pending.pop(0)
+
+        handler.waitAndGet.side_effect = wait_and_get
+        snippet = MagicMock()
+        snippet.bleStartScan.return_value = handler
+        ctx = PluginContext(adb=MagicMock(), settings={}, device_capabilities={}, snippet=snippet)
+        return ctx, snippet, handler
+
+    def test_ble_scan_stream_dedupes_and_stops_on_target(self, bt_plugin):
+        ctx, snippet, handler = self._stream_ctx([
+            ("aa:aa", -70, 1_000_000_000),
+            ("bb:bb", -50, 1_010_000_000, "Tag"),
+            ("aa:aa", -60, 1_100_000_000),
+            ("aa:aa", -80, 1_200_000_000),
+            ("cc:cc", -40, 1_300_000_000, "Beacon"),
+            ("dd:dd", -40, 1_400_000_000),
+        ])
+        tc = {"id": "bt8", "name": "BLE target", "type": "bluetooth", "action": "ble_scan",
+              "params": {"scan_duration": 30, "target_name": "Beacon"}}
+        result = bt_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS
+        assert result.metrics["devices"] == 3
+        assert result.metrics["adverts"] == 5
+        assert result.metrics["early_exit"] is True
+        aa = next(d for d in result.metrics["top_devices"] if d["address"] == "AA:AA")
+        assert (aa["adverts"], aa["rssi_min"], aa["rssi_mean"], aa["rssi_max"]) == (3, -80, -70.0, -60)
+        assert aa["adv_interval_ms"] == 100.0
+        assert result.metrics["target"]["address"] == "CC:CC"
+        assert handler.waitAndGet.call_count == 5  # did not wait for the rest of the 30 s
+        snippet.bleStopScan.assert_called_once_with("2-0")
+
+    def test_ble_scan_stream_min_devices_and_missing_target(self, bt_plugin):
+        ctx, _, _ = self._stream_ctx([("aa:aa", -70, 1), ("bb:bb", -60, 2), ("aa:aa", -65, 3)])
+        tc = {"id": "bt8", "name": "BLE", "type": "bluetooth", "action": "ble_scan",
+              "params": {"scan_duration": 30, "min_devices": 2}}
+        result = bt_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS
+        assert result.metrics["adverts"] == 2
+
+        ctx, _, _ = self._stream_ctx([("aa:aa", -70, 1)])
+        tc["params"] = {"scan_duration": 0.05, "target_address": "ff:ff"}
+        result = bt_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert "FF:FF not seen" in result.message
+        assert result.metrics["devices"] == 1
+
     def test_execute_dispatches_ble_scan(self, bt_plugin):
         snippet = MagicMock()
         handler = MagicMock()
@@ -968,6 +1314,64 @@ class TestAudioPlugin:
         assert result.status == TestStatus.PASS
         assert "Speaker" in result.message
 
+    def _loopback_adb(self, tmp_path, delay=0.6, gain=0.3, missing=""):
+        """Fake device that 'records' the pushed stimulus delayed by ``delay`` seconds."""
+        import numpy as np
+        from smoke_test_ai.utils.audio_analysis import read_wav, write_wav
+        adb = MagicMock()
+        adb.shell.return_value = MagicMock(stdout=missing)
+        played = {}
+
+        def push(local, remote):
+            played["samples"], played["rate"] = read_wav(Path(local).read_bytes())
+
+        def exec_out(cmd, timeout=30):
+            rate = played["rate"]
+            rng = np.random.default_rng(0)
+            rec = np.concatenate([np.zeros(int(delay * rate)), gain * played["samples"]])
+            rec = rec + 0.001 * rng.standard_normal(len(rec))
+            return write_wav(tmp_path / "rec.wav", rec, rate).read_bytes()
+
+        adb.push.side_effect = push
+        adb.exec_out.side_effect = exec_out
+        return adb
+
+    def test_loopback_pass(self, audio_plugin, tmp_path):
+        adb = self._loopback_adb(tmp_path)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "a6", "name": "Loopback", "type": "audio", "action": "loopback",
+              "params": {"play_delay": 0.5}}
+        result = audio_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS, result.message
+        assert result.metrics["latency_ms"] == pytest.approx(100, abs=1)
+        assert len(result.metrics["tones"]) == 3
+        script = [c.args[0] for c in adb.shell.call_args_list if c.args[0].startswith("sh -c")][0]
+        assert "tinycap" in script and "sleep 0.5" in script and "tinyplay" in script
+        assert "rm -f" in adb.shell.call_args_list[-1].args[0]
+
+    def test_loopback_silent_mic_fails_and_keeps_recording(self, audio_plugin, tmp_path):
+        adb = self._loopback_adb(tmp_path, gain=0.0)
+        adb.exec_out.side_effect = None
+        from smoke_test_ai.utils.audio_analysis import write_wav
+        import numpy as np
+        adb.exec_out.return_value = write_wav(tmp_path / "quiet.wav", np.zeros(48000), 48000).read_bytes()
+        ctx = PluginContext(adb=adb, settings={"reporting": {"output_dir": str(tmp_path / "out")}},
+                            device_capabilities={})
+        tc = {"id": "a6", "name": "Loopback", "type": "audio", "action": "loopback"}
+        result = audio_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert "silent recording" in result.message
+        assert (tmp_path / "out" / "artifacts" / "a6_loopback.wav").exists()
+
+    def test_loopback_skips_without_tinyalsa(self, audio_plugin, tmp_path):
+        adb = self._loopback_adb(tmp_path, missing="missing:tinycap\n")
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "a6", "name": "Loopback", "type": "audio", "action": "loopback"}
+        result = audio_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.SKIP
+        assert "tinycap" in result.message
+        adb.push.assert_not_called()
+
     def test_execute_dispatches_play_and_check(self, audio_plugin):
         snippet = MagicMock()
         snippet.isMusicActive.return_value = True
@@ -1147,6 +1551,80 @@ class TestNetworkPlugin:
         assert result.status == TestStatus.ERROR
         assert "Unknown" in result.message
 
+    @staticmethod
+    def _throughput_adb(download="", upload="", rtt=""):
+        adb = MagicMock()
+
+        def shell(cmd, timeout=30):
+            if cmd.startswith("command -v"):
+                return MagicMock(stdout="/system/bin/curl\n")
+            if "/download" in cmd:
+                return MagicMock(stdout=download)
+            if "/upload" in cmd:
+                return MagicMock(stdout=upload)
+            if "/ping" in cmd:
+                return MagicMock(stdout=rtt)
+            return MagicMock(stdout="")
+
+        adb.shell.side_effect = shell
+        return adb
+
+    def test_throughput_reverse_aggregates_streams(self, net_plugin):
+        adb = self._throughput_adb(
+            download="dl 62500000 10.0\ndl 62500000 9.8\n",       # 2 x 50 Mbps over 10 s
+            upload="ul 25000000 10.0\nul 12500000 10.0\n",
+            rtt="".join(f"rtt 0.00{i}\n" for i in range(1, 10)),
+        )
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "n3", "name": "Throughput", "type": "network", "action": "throughput",
+              "params": {"streams": 2, "device_port": 18080}}
+        with patch("smoke_test_ai.plugins.network.ThroughputServer") as server_cls:
+            server_cls.return_value.port = 40000
+            result = net_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS
+        assert result.metrics["download_mbps"] == 100.0
+        assert result.metrics["upload_mbps"] == 30.0
+        assert result.metrics["latency_ms"]["p50"] == pytest.approx(5.0)
+        server_cls.assert_called_once_with(host="127.0.0.1", port=0)
+        adb.reverse.assert_called_once_with(18080, 40000)
+        adb.reverse_remove.assert_called_once_with(18080)
+        server_cls.return_value.stop.assert_called_once()
+        dl_cmd = [c.args[0] for c in adb.shell.call_args_list if "/download" in c.args[0]][0]
+        assert dl_cmd.count("http://127.0.0.1:18080/download") == 2
+
+    def test_throughput_thresholds_fail(self, net_plugin):
+        adb = self._throughput_adb(download="dl 1250000 10.0\n", upload="ul 1250000 10.0\n",
+                                   rtt="rtt 0.050\nrtt 0.300\n")
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "n3", "name": "Throughput", "type": "network", "action": "throughput",
+              "params": {"mode": "lan", "server_host": "192.168.1.10",
+                         "thresholds": {"min_download_mbps": 50, "max_latency_p99_ms": 100}}}
+        with patch("smoke_test_ai.plugins.network.ThroughputServer") as server_cls:
+            server_cls.return_value.port = 40000
+            result = net_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert "download 1.0 Mbps < 50 Mbps" in result.message
+        assert "latency p99" in result.message
+        server_cls.assert_called_once_with(host="0.0.0.0", port=0)
+        adb.reverse.assert_not_called()
+
+    def test_throughput_unreachable_server_fails(self, net_plugin):
+        adb = self._throughput_adb()
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "n3", "name": "Throughput", "type": "network", "action": "throughput"}
+        with patch("smoke_test_ai.plugins.network.ThroughputServer") as server_cls:
+            server_cls.return_value.port = 40000
+            result = net_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert "could not reach" in result.message
+
+    def test_throughput_lan_requires_server_host(self, net_plugin, plugin_context):
+        tc = {"id": "n3", "name": "Throughput", "type": "network", "action": "throughput",
+              "params": {"mode": "lan"}}
+        result = net_plugin.execute(tc, plugin_context)
+        assert result.status == TestStatus.ERROR
+        assert "server_host" in result.message
+
 
 class TestChargingPlugin:
     @pytest.fixture
@@ -1241,6 +1719,187 @@ class TestChargingPlugin:
             result = charging_plugin.execute(tc, ctx)
         assert result.status == TestStatus.FAIL
 
+    @staticmethod
+    def _ramp_trace(recovers: bool = True) -> str:
+        """20 Hz sampler log: unplug at 1.1s, replug at 6.3s, charging at 6.8s, 3s ramp to 1500mA."""
+        lines = ["#supplies|battery usb wireless"]
+        for i in range(int(26 / 0.05)):
+            t = i * 0.05
+            if t < 1.1:
+                online, status, current = 1, 2, 500
+            elif t < 6.3:
+                online, status, current = 0, 3, -300
+            elif t < 6.8 or not recovers:
+                online, status, current = 1, 3, -200
+            else:
+                online, status, current = 1, 2, min(1500, (t - 6.8) / 3 * 1500) + (i % 3) * 10
+            lines.append(f"{100 + t:.2f}|{int(current * 1000)} |4200000 |{status}|x {online} 0 ")
+        return "\n".join(lines)
+
+    def _run_ramp(self, charging_plugin, trace: str, params: dict | None = None):
+        adb = MagicMock()
+        usb_power = MagicMock()
+
+        def shell(cmd):
+            if cmd == "dumpsys battery":
+                return MagicMock(stdout="  AC powered: false\n  USB powered: true\n  status: 2\n")
+            if cmd.startswith("nohup"):
+                return MagicMock(stdout="4321\n")
+            if cmd.startswith("cat /data/local/tmp/charge_ramp.samples"):
+                return MagicMock(stdout=trace)
+            return MagicMock(stdout="500000")
+
+        adb.shell.side_effect = shell
+        adb.wait_for_device.return_value = True
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={}, usb_power=usb_power)
+        tc = {"id": "chg_ramp", "name": "Charge ramp", "type": "charging", "action": "charge_ramp",
+              "params": {"off_duration": 5, **(params or {})}}
+        # monotonic: sampler start, power off, power on, after reconnect
+        with patch("smoke_test_ai.plugins.charging.time.sleep"), \
+             patch("smoke_test_ai.plugins.charging.time.monotonic", side_effect=[0.0, 1.0, 6.0, 8.0]):
+            result = charging_plugin.execute(tc, ctx)
+        return result, adb, usb_power
+
+    def test_charge_ramp_pass(self, charging_plugin):
+        """Ramp timings are measured from the trace, re-anchored on the unplug edge."""
+        result, adb, usb_power = self._run_ramp(charging_plugin, self._ramp_trace())
+        assert result.status == TestStatus.PASS, result.message
+        m = result.metrics
+        assert m["power_on_s"] == pytest.approx(6.1, abs=0.01)
+        assert m["online_s"] == pytest.approx(0.2, abs=0.06)
+        assert m["detect_s"] == pytest.approx(0.7, abs=0.06)
+        assert m["steady_s"] == pytest.approx(3.4, abs=0.2)
+        assert m["steady_ma"] == pytest.approx(1510, abs=15)
+        assert m["steady_mv"] == 4200
+        assert m["sample_hz"] == pytest.approx(20, abs=0.5)
+        usb_power.power_off.assert_called_once()
+        usb_power.power_on.assert_called_once()
+        cmds = [c.args[0] for c in adb.shell.call_args_list]
+        assert any(c.startswith("kill 4321") for c in cmds)
+
+    def test_charge_ramp_slow_steady_fails(self, charging_plugin):
+        result, _, _ = self._run_ramp(charging_plugin, self._ramp_trace(), {"max_steady_s": 2})
+        assert result.status == TestStatus.FAIL
+        assert "steady current after" in result.message
+
+    def test_charge_ramp_not_detected(self, charging_plugin):
+        result, _, _ = self._run_ramp(charging_plugin, self._ramp_trace(recovers=False))
+        assert result.status == TestStatus.FAIL
+        assert "charging not detected" in result.message
+        assert result.metrics["online_s"] is not None
+        assert result.metrics["steady_s"] is None
+
+    def test_charge_ramp_no_usb_power(self, charging_plugin):
+        ctx = PluginContext(adb=MagicMock(), settings={}, device_capabilities={})
+        tc = {"id": "chg_ramp", "name": "Charge ramp", "type": "charging", "action": "charge_ramp"}
+        assert charging_plugin.execute(tc, ctx).status == TestStatus.SKIP
+
+    @staticmethod
+    def _drain_trace(mah_per_h: float, counter: bool = True, reconnect: int = 0) -> str:
+        """5 s samples over 10 min; charge counter falls at ``mah_per_h`` with ±1 mAh gauge noise.
+
+        ``reconnect`` appends samples taken after USB power is back: supply
+        online, charging current and a rising counter.
+        """
+        lines = []
+        for i in range(121):
+            t = i * 5
+            charge = 3_000_000 - mah_per_h * 1000 * t / 3600 + (i % 2) * 1000 if counter else 3_000_000
+            current = mah_per_h * 1000 + (i % 3 - 1) * 5000
+            lines.append(f"{500 + t}|{int(charge)} |{int(-current)} |{300 + i % 4} |{80 - i // 60} |0 ")
+        for k in range(1, reconnect + 1):
+            charge = 3_000_000 - mah_per_h * 1000 * 600 / 3600 + k * 20_000
+            lines.append(f"{1100 + k * 5}|{int(charge)} |1500000 |{305} |{79} |1 ")
+        return "\n".join(lines)
+
+    def _run_drain(self, charging_plugin, traces: dict, params: dict, history=None, ls_out="video.mp4"):
+        adb = MagicMock()
+        usb_power = MagicMock()
+
+        def shell(cmd):
+            if cmd.startswith("nohup"):
+                return MagicMock(stdout="777\n")
+            if cmd.startswith("cat /data/local/tmp/drain_"):
+                name = cmd.split("drain_", 1)[1].split(".samples")[0]
+                return MagicMock(stdout=traces[name])
+            if cmd == "settings get system screen_off_timeout":
+                return MagicMock(stdout="30000\n")
+            if cmd.startswith("ls "):
+                return MagicMock(stdout=ls_out)
+            return MagicMock(stdout="")
+
+        adb.shell.side_effect = shell
+        adb.wait_for_device.return_value = True
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={}, usb_power=usb_power,
+                            history=history)
+        tc = {"id": "drain", "name": "Drain", "type": "charging", "action": "drain", "params": params}
+        with patch("smoke_test_ai.plugins.charging.time.sleep") as sleep:
+            result = charging_plugin.execute(tc, ctx)
+        return result, adb, usb_power, sleep
+
+    def test_drain_pass_per_scenario(self, charging_plugin):
+        traces = {"screen_off_idle": self._drain_trace(12), "screen_on_idle": self._drain_trace(240)}
+        result, adb, usb_power, sleep = self._run_drain(
+            charging_plugin, traces,
+            {"scenarios": ["screen_off_idle", "screen_on_idle"], "duration": 600,
+             "max_mah_per_h": {"screen_off_idle": 20, "screen_on_idle": 300}})
+        assert result.status == TestStatus.PASS, result.message
+        off = result.metrics["scenarios"]["screen_off_idle"]
+        on = result.metrics["scenarios"]["screen_on_idle"]
+        assert off["method"] == "charge_counter"
+        assert off["mah_per_h"] == pytest.approx(12, abs=1)
+        assert 0 < off["ci95_mah_per_h"] < 3
+        assert on["mah_per_h"] == pytest.approx(240, abs=1)
+        assert on["temp_c"]["max"] == pytest.approx(30.3)
+        assert on["level_drop"] == 2
+        assert usb_power.power_off.call_count == 2
+        assert usb_power.power_on.call_count == 2
+        sleep.assert_any_call(600)
+        cmds = [c.args[0] for c in adb.shell.call_args_list]
+        assert "input keyevent KEYCODE_SLEEP" in cmds
+        assert "settings put system screen_off_timeout 720000" in cmds
+        assert cmds[-1] == "settings put system screen_off_timeout 30000"
+
+    def test_drain_ignores_samples_after_reconnect(self, charging_plugin):
+        traces = {"screen_off_idle": self._drain_trace(30, reconnect=2)}
+        result, _, _, _ = self._run_drain(charging_plugin, traces, {"duration": 600})
+        off = result.metrics["scenarios"]["screen_off_idle"]
+        assert off["mah_per_h"] == pytest.approx(30, abs=1)
+        assert off["current_ma"]["max"] < 100
+        # Without an online column the window is still cut at the USB-off duration
+        from smoke_test_ai.utils.device_sampler import DeviceSampler
+        samples = DeviceSampler.parse(self._drain_trace(30, reconnect=2).replace("|0 ", "| ").replace("|1 ", "| "),
+                                      ["charge", "current", "temp", "level", "online"])
+        assert charging_plugin._drain_metrics(samples, settle=30, end=600)["mah_per_h"] == pytest.approx(30, abs=1)
+        assert charging_plugin._drain_metrics(samples, settle=30)["mah_per_h"] < 25
+
+    def test_drain_current_fallback_and_threshold(self, charging_plugin):
+        traces = {"screen_off_idle": self._drain_trace(40, counter=False)}
+        result, _, _, _ = self._run_drain(charging_plugin, traces, {"max_mah_per_h": {"screen_off_idle": 20}})
+        assert result.status == TestStatus.FAIL
+        assert result.metrics["scenarios"]["screen_off_idle"]["method"] == "current_now"
+        assert "screen_off_idle mah_per_h 40.0 mAh/h > 20 mAh/h" in result.message
+
+    def test_drain_history_regression(self, charging_plugin):
+        history = MagicMock()
+        history.metric_baseline.side_effect = lambda tid, name, stat, window: (
+            10.0 if (name, stat) == ("scenarios.screen_off_idle", "mah_per_h") else None)
+        traces = {"screen_off_idle": self._drain_trace(15)}
+        result, _, _, _ = self._run_drain(charging_plugin, traces, {}, history=history)
+        assert result.status == TestStatus.FAIL
+        assert "vs baseline 10.0 mAh/h" in result.message
+        assert result.metrics["baseline_mah_per_h"] == {"screen_off_idle": 10.0}
+
+    def test_drain_video_missing_and_unknown_scenario(self, charging_plugin):
+        result, _, usb_power, _ = self._run_drain(
+            charging_plugin, {}, {"scenarios": ["video_loop"]},
+            ls_out="ls: /sdcard/Movies/drain_loop.mp4: No such file or directory")
+        assert result.status == TestStatus.FAIL
+        assert "not found on device" in result.message
+        usb_power.power_off.assert_not_called()
+        result, _, _, _ = self._run_drain(charging_plugin, {}, {"scenarios": ["gaming"]})
+        assert result.status == TestStatus.ERROR
+
 
 class TestSuspendPlugin:
     @pytest.fixture
@@ -1288,12 +1947,16 @@ class TestSuspendPlugin:
             MagicMock(stdout=""),
             # 3. screen off (KEYCODE_POWER)
             MagicMock(stdout=""),
+            # 3b. wakeup source snapshot
+            MagicMock(stdout=""),
             # 4. wake keyevent
             MagicMock(stdout=""),
             # 5. screen state check
             MagicMock(stdout="mScreenState=ON"),
             # 6. final stats read
             MagicMock(stdout="aosd\n\tCount                    :44\ncxsd\n\tCount                    :19\nddr \n\tCount                    :19\n"),
+            # 6b. wakeup source snapshot
+            MagicMock(stdout=""),
             # 7. airplane mode disable
             MagicMock(stdout=""),
             # 7b. NFC enable
@@ -1317,13 +1980,15 @@ class TestSuspendPlugin:
             MagicMock(stdout=""),                              # airplane on
             MagicMock(stdout=""),                              # NFC disable
             MagicMock(stdout=""),                              # screen off
+            MagicMock(stdout=self._wakeup_snapshot(100, "usb\t50\t50\t2\t0\t0\t5000\t100\t0\t0")),
             MagicMock(stdout=""),                              # wake
             MagicMock(stdout="mScreenState=ON"),               # screen on
             MagicMock(stdout="aosd:3, cxsd:3, ddr:3"),        # same stats!
+            MagicMock(stdout=self._wakeup_snapshot(
+                101, "usb\t80\t80\t9\t0\t0\t95000\t100\t0\t0",
+                "PARTIAL_WAKE_LOCK 'bad_wl' (uid=1000)")),
             MagicMock(stdout=""),                              # airplane off
             MagicMock(stdout=""),                              # NFC enable
-            MagicMock(stdout="PARTIAL_WAKE_LOCK 'bad_wl' (uid=1000)"),  # wakelock diag
-            MagicMock(stdout="name\tactive\nusb\t50\t50\t0\t0\t0\t5000\t100\t0\t0"),  # kernel sources
         ]
         ctx = PluginContext(adb=adb, settings={}, device_capabilities={}, usb_power=usb_power)
         with patch("smoke_test_ai.plugins.suspend.time.sleep"):
@@ -1331,6 +1996,10 @@ class TestSuspendPlugin:
         assert result.status == TestStatus.FAIL
         assert "Deep sleep not entered" in result.message
         assert "Wakelock Diagnosis" in result.message
+        assert "bad_wl" in result.message
+        assert "usb: 90000ms (7 wakeups)" in result.message
+        top = result.metrics["wakeup_sources"]["top_active_time"][0]
+        assert top["name"] == "usb" and top["total_time"] == 90000
 
     def test_screen_not_wake(self, suspend_plugin):
         """Screen doesn't wake after resume → FAIL."""
@@ -1342,9 +2011,11 @@ class TestSuspendPlugin:
             MagicMock(stdout=""),                              # airplane on
             MagicMock(stdout=""),                              # NFC disable
             MagicMock(stdout=""),                              # screen off
+            MagicMock(stdout=""),                              # wakeup snapshot
             MagicMock(stdout=""),                              # wake
             MagicMock(stdout="mScreenState=OFF"),              # screen still off!
             MagicMock(stdout="aosd\n\tCount                    :10\ncxsd\n\tCount                    :10\nddr \n\tCount                    :10\n"),
+            MagicMock(stdout=""),                              # wakeup snapshot
             MagicMock(stdout=""),                              # airplane off
             MagicMock(stdout=""),                              # NFC enable
         ]
@@ -1364,6 +2035,7 @@ class TestSuspendPlugin:
             MagicMock(stdout=""),                              # airplane on
             MagicMock(stdout=""),                              # NFC disable
             MagicMock(stdout=""),                              # screen off
+            MagicMock(stdout=""),                              # wakeup snapshot
         ]
         ctx = PluginContext(adb=adb, settings={}, device_capabilities={}, usb_power=usb_power)
         with patch("smoke_test_ai.plugins.suspend.time.sleep"):
@@ -1371,6 +2043,82 @@ class TestSuspendPlugin:
         assert result.status == TestStatus.FAIL
         assert "not found via ADB" in result.message
 
+    @staticmethod
+    def _wakeup_snapshot(uptime, sources="", power=""):
+        return (f"{uptime}.00 50.00\n==wakeup_sources==\n"
+                "name\tactive_count\tevent_count\twakeup_count\texpire_count\tactive_since"
+                "\ttotal_time\tmax_time\tlast_change\tprevent_suspend_time\n"
+                f"{sources}\n==power==\n{power}")
+
+    def _adaptive_adb(self, stats_sequence):
+        """ADB mock returning successive soc_sleep stats; other commands return screen ON."""
+        adb = MagicMock()
+        adb.wait_for_device.return_value = True
+        stats = iter(stats_sequence)
+
+        def shell(cmd):
+            if "soc_sleep" in cmd:
+                return MagicMock(stdout=next(stats))
+            if "mScreenState" in cmd:
+                return MagicMock(stdout="mScreenState=ON")
+            if "wakeup_sources" in cmd:
+                return MagicMock(stdout=self._wakeup_snapshot(
+                    100, power="PARTIAL_WAKE_LOCK 'bad_wl' (uid=1000)"))
+            return MagicMock(stdout="")
+        adb.shell.side_effect = shell
+        return adb
+
+    def test_adaptive_deep_sleep_early_exit(self, suspend_plugin, tmp_path):
+        """Healthy build: first short window already shows deep sleep → PASS, one probe."""
+        adb = self._adaptive_adb(["aosd:3, cxsd:3, ddr:3", "aosd:5, cxsd:4, ddr:4"])
+        usb_power = MagicMock()
+        tc = self._make_tc(params={"adaptive": True, "initial_window": 10,
+                                   "suspend_duration": 120, "adb_timeout": 5})
+        settings = {"reporting": {"output_dir": str(tmp_path)}}
+        ctx = PluginContext(adb=adb, settings=settings, device_capabilities={}, usb_power=usb_power)
+        with patch("smoke_test_ai.plugins.suspend.time.sleep") as sleep:
+            result = suspend_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS
+        assert "1 probe(s)" in result.message
+        assert result.metrics["suspended_s"] == 10
+        assert result.metrics["probes"][0]["entered"] is True
+        assert sorted(p.name for p in (tmp_path / "artifacts").iterdir()) == [
+            "suspend_test_wakeup_sources_after.json", "suspend_test_wakeup_sources_before.json"]
+        usb_power.power_off.assert_called_once()
+        sleep.assert_any_call(10)
+
+    def test_adaptive_deep_sleep_doubles_window(self, suspend_plugin):
+        """No deep sleep in the first probes → window doubles, diagnosis per failed probe."""
+        same = "aosd:3, cxsd:3, ddr:3"
+        adb = self._adaptive_adb([same, same, same, "aosd:4, cxsd:3, ddr:3"])
+        usb_power = MagicMock()
+        tc = self._make_tc(params={"adaptive": True, "initial_window": 10,
+                                   "suspend_duration": 120, "adb_timeout": 5})
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={}, usb_power=usb_power)
+        with patch("smoke_test_ai.plugins.suspend.time.sleep"):
+            result = suspend_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS
+        probes = result.metrics["probes"]
+        assert [p["window_s"] for p in probes] == [10, 20, 40]
+        assert "bad_wl" in probes[0]["diagnosis"]
+        assert "diagnosis" not in probes[-1]
+        assert usb_power.power_off.call_count == 3
+        adb.shell.assert_any_call("input keyevent KEYCODE_SLEEP")
+
+    def test_adaptive_deep_sleep_fails_at_max_window(self, suspend_plugin):
+        """Window capped at suspend_duration; still no deep sleep → FAIL with diagnosis."""
+        same = "aosd:3, cxsd:3, ddr:3"
+        adb = self._adaptive_adb([same] * 4)
+        tc = self._make_tc(params={"adaptive": True, "initial_window": 10,
+                                   "suspend_duration": 30, "adb_timeout": 5})
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={}, usb_power=MagicMock())
+        with patch("smoke_test_ai.plugins.suspend.time.sleep"):
+            result = suspend_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert [p["window_s"] for p in result.metrics["probes"]] == [10, 20, 30]
+        assert "Deep sleep not entered in any probe (10s, 20s, 30s)" in result.message
+        assert "Wakelock Diagnosis" in result.message
+
     def test_parse_sleep_stats_colon_format(self, suspend_plugin):
         from smoke_test_ai.plugins.suspend import SuspendPlugin
         adb = MagicMock()
@@ -1454,6 +2202,230 @@ class TestSuspendPlugin:
             result = suspend_plugin.execute(tc, ctx)
         assert result.status == TestStatus.FAIL
 
+    BOOT_TIMING = (
+        "==events==\n"
+        "03-01 10:00:05.000  512  512 I boot_progress_start: 6000\n"
+        "03-01 10:00:09.000  900  900 I boot_progress_system_run: 9500\n"
+        "03-01 10:00:15.000  900  900 I boot_progress_enable_screen: 16000\n"
+        "==boottime==\n"
+        "[ro.boottime.init]: [1500000000]\n"
+        "[ro.boottime.zygote]: [5800000000]\n"
+        "==bootloader==\n"
+        "1BLL:100,1BLE:900,SW:5000,KL:0,KD:500\n"
+        "==dmesg==\n"
+        "[    1.498765] init: init first stage started!\n"
+        "==bootstat==\n"
+        "boot_complete                            20\n"
+    )
+
+    def _boot_adb(self, iterations, completed="1 20.00 80.00"):
+        adb = MagicMock()
+        adb.is_connected.return_value = False
+        adb.wait_for_device.return_value = True
+        adb.shell.side_effect = [
+            MagicMock(stdout=""),
+            MagicMock(stdout=completed),
+            MagicMock(stdout=self.BOOT_TIMING),
+        ] * iterations
+        return adb
+
+    def test_boot_phases_parsed(self, suspend_plugin):
+        from smoke_test_ai.plugins.suspend import SuspendPlugin
+        data = SuspendPlugin._parse_boot_timing(self.BOOT_TIMING)
+        phases = SuspendPlugin._boot_phases(data, completed_at=20.0)
+        assert phases == {
+            "bootloader": 1.5, "kernel": 1.5, "init": 4.3, "zygote": 3.7,
+            "system_server": 6.5, "boot_completed": 4.0, "total": 21.5,
+        }
+
+    def test_boot_phases_fallbacks(self, suspend_plugin):
+        from smoke_test_ai.plugins.suspend import SuspendPlugin
+        data = SuspendPlugin._parse_boot_timing(
+            "==events==\nI boot_progress_start: 6000\n"
+            "==dmesg==\n[    1.250000] init: init first stage started!\n"
+            "==bootstat==\nboottime.bootloader.total  2000\n"
+        )
+        phases = SuspendPlugin._boot_phases(data, completed_at=20.0)
+        assert phases["bootloader"] == 2.0
+        assert phases["kernel"] == 1.25
+        assert phases["init"] == 4.75
+        assert "system_server" not in phases
+
+    def test_boot_benchmark_pass_with_metrics(self, suspend_plugin):
+        adb = self._boot_adb(2)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "boot_bench", "name": "Boot", "action": "boot_benchmark",
+              "params": {"iterations": 2, "thresholds": {"kernel": 2.0, "total": 30}}}
+        with patch("smoke_test_ai.plugins.suspend.time.sleep"):
+            result = suspend_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS
+        assert result.metrics["iterations"] == 2
+        assert result.metrics["phases"]["system_server"]["p95"] == 6.5
+        assert len(result.metrics["samples"]) == 2
+
+    def test_boot_benchmark_phase_threshold_fail(self, suspend_plugin):
+        adb = self._boot_adb(1)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "boot_bench", "name": "Boot", "action": "boot_benchmark",
+              "params": {"iterations": 1, "thresholds": {"system_server": 5.0}}}
+        with patch("smoke_test_ai.plugins.suspend.time.sleep"):
+            result = suspend_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert "system_server p95 6.50s > 5.0s" in result.message
+
+    @pytest.mark.filterwarnings("error::RuntimeWarning")  # a zone without plausible samples must not warn
+    def test_thermal_timeseries_metrics(self, suspend_plugin):
+        from smoke_test_ai.plugins.suspend import SuspendPlugin
+        from smoke_test_ai.utils.device_sampler import DeviceSampler
+        text = (
+            "#zones|cpu-usr battery pm-bcl-lvl0\n"
+            "#policies|policy0 policy4\n"
+            "#cooling|cpu-isolate thermal-cpufreq-4\n"
+            "10.0|40000 30000 -273000 |1804800 2400000 |0 0 |-500000\n"
+            "10.5|55000 31000 -273000 |1804800 2400000 |0 0 |-900000\n"
+            "11.0|70000 32000 -273000 |1804800 1200000 |0 3 |-1000000\n"
+            "11.5|68000 33000 -273000 |1804800 1200000 |0 3 |-800000\n"
+        )
+        samples = DeviceSampler.parse(text, ["temp", "freq", "cooling", "current"])
+        m = SuspendPlugin._thermal_timeseries_metrics(samples)
+        assert m["samples"] == 4
+        assert m["throttling_onset_s"] == 1.0
+        assert m["throttling_devices"] == ["thermal-cpufreq-4"]
+        assert m["peak_temps_c"] == {"cpu-usr": 70.0, "battery": 33.0}
+        assert m["freq_residency"]["policy4"]["residency"] == {"2400": 0.5, "1200": 0.5}
+        assert m["freq_residency"]["policy0"]["max_mhz"] == 1804.8
+        assert m["battery_current_ma"]["min"] == -1000.0
+
+    def test_thermal_timeseries_no_throttling(self, suspend_plugin):
+        from smoke_test_ai.plugins.suspend import SuspendPlugin
+        from smoke_test_ai.utils.device_sampler import DeviceSampler
+        samples = DeviceSampler.parse("1.0|40000 |1000000 |0 |x\n", ["temp", "freq", "cooling", "current"])
+        m = SuspendPlugin._thermal_timeseries_metrics(samples)
+        assert m["throttling_onset_s"] is None
+        assert "battery_current_ma" not in m
+
+    def test_boot_benchmark_device_lost(self, suspend_plugin):
+        adb = self._boot_adb(1)
+        adb.wait_for_device.return_value = False
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "boot_bench", "name": "Boot", "action": "boot_benchmark",
+              "params": {"iterations": 1, "boot_timeout": 5}}
+        with patch("smoke_test_ai.plugins.suspend.time.sleep"):
+            result = suspend_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert "Iteration 1" in result.message
+
+
+class TestCameraLatency:
+    @pytest.fixture
+    def camera_plugin(self):
+        return CameraPlugin()
+
+    def _adb(self, launch_out, shutter_delays=(0.4,), shot_gap=0.6):
+        """Fake device: am start -W output, and one new photo per shutter trigger."""
+        adb = MagicMock()
+        state = {"n": 0, "clock": 100.0}
+
+        def shell(cmd, timeout=30):
+            if cmd.startswith("am start -W"):
+                return MagicMock(stdout=launch_out(cmd))
+            if "KEYCODE_CAMERA" in cmd and "/proc/uptime" in cmd:
+                n = state["n"]
+                state["n"] += 1
+                if n < len(shutter_delays):
+                    delay = shutter_delays[n]
+                else:
+                    delay = shot_gap
+                if delay is None:
+                    return MagicMock(stdout="")
+                t0 = state["clock"]
+                state["clock"] += delay
+                ta = state["clock"]
+                return MagicMock(stdout=f"/sdcard/DCIM/Camera/IMG_{n}.jpg|3000000|1767225600|"
+                                        f"{t0:.2f}|{ta:.2f}|{ta + 0.25:.2f}\n")
+            return MagicMock(stdout="")
+        adb.shell.side_effect = shell
+        return adb
+
+    def _tc(self, **params):
+        return {"id": "cam_lat", "name": "Camera latency", "type": "camera",
+                "action": "camera_latency",
+                "params": {"iterations": 3, "shots": 4, **params}}
+
+    @staticmethod
+    def _snapcam(cmd):
+        if "snapcam" in cmd:
+            return "Status: ok\nLaunchState: COLD\nTotalTime: 850\nWaitTime: 870\nComplete\n"
+        return "Error: Activity class does not exist"
+
+    def test_latency_pass(self, camera_plugin):
+        adb = self._adb(self._snapcam, shutter_delays=(0.4, 0.5, 0.6), shot_gap=0.7)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        with patch("smoke_test_ai.plugins.camera.time.sleep"):
+            result = camera_plugin.execute(self._tc(), ctx)
+        assert result.status == TestStatus.PASS
+        m = result.metrics
+        assert m["component"].startswith("org.codeaurora.snapcam")
+        assert m["launch_ms"]["n"] == 3 and m["launch_ms"]["p50"] == 850
+        assert m["shutter_to_file_ms"]["p50"] == 500
+        assert m["shot_to_shot_ms"]["n"] == 3
+        assert m["shot_to_shot_ms"]["p50"] == pytest.approx(700, abs=1)
+        # later shutters exclude earlier photos so each wait sees only the new file
+        watch_cmds = [c.args[0] for c in adb.shell.call_args_list if "/proc/uptime" in c.args[0]]
+        assert "! -path /sdcard/DCIM/Camera/IMG_0.jpg" in watch_cmds[1]
+        # captured photos cleaned up
+        assert any("rm -f" in c.args[0] and "IMG_6.jpg" in c.args[0] for c in adb.shell.call_args_list)
+
+    def test_latency_falls_back_to_camera2(self, camera_plugin):
+        def launch(cmd):
+            if "camera2" in cmd:
+                return "Status: ok\nTotalTime: 640\n"
+            return "Error: Activity class {org.codeaurora.snapcam/...} does not exist."
+        adb = self._adb(launch)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        with patch("smoke_test_ai.plugins.camera.time.sleep"):
+            result = camera_plugin.execute(self._tc(iterations=2, shots=0), ctx)
+        assert result.metrics["component"].startswith("com.android.camera2")
+        assert result.metrics["launch_ms"]["p50"] == 640
+        snapcam_launches = [c for c in adb.shell.call_args_list
+                            if c.args[0].startswith("am start -W") and "snapcam" in c.args[0]]
+        assert len(snapcam_launches) == 1  # working launcher remembered
+
+    def test_latency_no_launcher_skips(self, camera_plugin):
+        adb = self._adb(lambda cmd: "Error: Activity class does not exist")
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        with patch("smoke_test_ai.plugins.camera.time.sleep"):
+            result = camera_plugin.execute(self._tc(), ctx)
+        assert result.status == TestStatus.SKIP
+
+    def test_latency_threshold_exceeded(self, camera_plugin):
+        adb = self._adb(self._snapcam)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        with patch("smoke_test_ai.plugins.camera.time.sleep"):
+            result = camera_plugin.execute(self._tc(thresholds={"launch_ms": 800}), ctx)
+        assert result.status == TestStatus.FAIL
+        assert "launch_ms p95 850 ms > 800 ms" in result.message
+
+    def test_latency_history_regression(self, camera_plugin):
+        history = MagicMock()
+        history.metric_baseline.side_effect = lambda tid, name, stat, window: (
+            500 if name == "launch_ms" else None)
+        adb = self._adb(self._snapcam)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={}, history=history)
+        with patch("smoke_test_ai.plugins.camera.time.sleep"):
+            result = camera_plugin.execute(self._tc(), ctx)
+        assert result.status == TestStatus.FAIL
+        assert "launch_ms p50 850 ms vs baseline 500 ms (+70%)" in result.message
+        assert result.metrics["baseline_p50"] == {"launch_ms": 500}
+
+    def test_latency_no_photo_fails(self, camera_plugin):
+        adb = self._adb(self._snapcam, shutter_delays=(None, None, None), shot_gap=None)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        with patch("smoke_test_ai.plugins.camera.time.sleep"):
+            result = camera_plugin.execute(self._tc(), ctx)
+        assert result.status == TestStatus.FAIL
+        assert "No photo written" in result.message
+
 
 class TestCameraRecordVideo:
     @pytest.fixture
@@ -1471,9 +2443,8 @@ class TestCameraRecordVideo:
             MagicMock(stdout=""),                     # am start video
             MagicMock(stdout=""),                     # camera key start
             MagicMock(stdout=""),                     # camera key stop
-            MagicMock(stdout="/sdcard/DCIM/Camera/VID_001.mp4"),  # find
+            MagicMock(stdout="/sdcard/DCIM/Camera/VID_001.mp4|5242880|1767225600|5.0|5.2|5.45"),  # media watch
             MagicMock(stdout=""),                     # rm marker
-            MagicMock(stdout="5242880"),              # stat size (5MB)
             MagicMock(stdout=""),                     # force-stop cleanup
         ]
         ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
@@ -1484,6 +2455,32 @@ class TestCameraRecordVideo:
         assert result.status == TestStatus.PASS
         assert "5242880 bytes" in result.message
 
+    def test_wait_for_new_media_script_and_parse(self):
+        """One device-side loop per wait; output parsed into size/mtime/latencies."""
+        adb = MagicMock()
+        adb.shell.return_value = MagicMock(
+            stdout="/sdcard/DCIM/Camera/VID 2.mp4|77|1767225600|12.50|13.10|13.35\n")
+        media = CameraPlugin._wait_for_new_media(
+            adb, "/sdcard/.m", ("/sdcard/DCIM", "/sdcard/Movies"), ("mp4", "3gp"), 4, maxdepth=2)
+        assert media == {"path": "/sdcard/DCIM/Camera/VID 2.mp4", "size": 77, "mtime": 1767225600,
+                         "appeared_s": 0.6, "stable_s": 0.85, "appeared_at": 13.1}
+        script = adb.shell.call_args.args[0]
+        assert "-newer /sdcard/.m" in script and "-maxdepth 2" in script
+        assert "-name '*.mp4' -o -name '*.3gp'" in script
+        assert "! -name '.*'" in script  # MediaStore .pending-* files ignored
+        assert "$i -lt 16" in script    # 4s / 0.25s polls
+        assert adb.shell.call_args.kwargs["timeout"] >= 4
+
+    def test_wait_for_new_media_timeout(self):
+        adb = MagicMock()
+        adb.shell.return_value = MagicMock(stdout="")
+        assert CameraPlugin._wait_for_new_media(adb, "/m", ("/d",), ("jpg",), 1) is None
+        # A file that appeared but stayed empty is reported after the loop with size 0
+        assert '[ "${ps:-0}" -eq 0 ]' in adb.shell.call_args.args[0]
+        adb.shell.return_value = MagicMock(stdout="/d/a.jpg|0|1767225600|5.00|5.25|5.25\n")
+        media = CameraPlugin._wait_for_new_media(adb, "/m", ("/d",), ("jpg",), 1)
+        assert media["size"] == 0 and media["path"] == "/d/a.jpg"
+
     def test_record_video_no_file(self, camera_plugin):
         """No video file found after recording → FAIL."""
         adb = MagicMock()
@@ -1494,3 +2491,374 @@ class TestCameraRecordVideo:
         with patch("smoke_test_ai.plugins.camera.time.sleep"):
             result = camera_plugin.execute(tc, ctx)
         assert result.status == TestStatus.FAIL
+
+
+class TestPerfPlugin:
+    @pytest.fixture
+    def perf_plugin(self):
+        from smoke_test_ai.plugins.perf import PerfPlugin
+        return PerfPlugin()
+
+    def test_unknown_action(self, perf_plugin):
+        ctx = PluginContext(adb=MagicMock(), settings={}, device_capabilities={})
+        result = perf_plugin.execute({"id": "p", "name": "P", "action": "nope"}, ctx)
+        assert result.status == TestStatus.ERROR
+
+    @staticmethod
+    def _launch_adb(root: bool = True, installed=("com.android.settings",), warm_state="WARM"):
+        """Cold launches take 800+10*n ms, warm ones 200+n ms; the first of each is a slow outlier."""
+        adb = MagicMock()
+        counts = {"cold": 0, "warm": 0}
+        state = {"mode": "cold"}
+
+        def shell(cmd):
+            if cmd.startswith("sh -c 'id -u'"):
+                return MagicMock(stdout="0\n" if root else "2000\n")
+            if cmd.startswith("su 0"):
+                return MagicMock(stdout="")
+            if cmd == "settings get global always_finish_activities":
+                return MagicMock(stdout="0\n")
+            if cmd.startswith("cmd package resolve-activity"):
+                pkg = cmd.split()[-1]
+                if pkg in installed:
+                    return MagicMock(stdout=f"priority=0 preferredOrder=0\n{pkg}/.Main\n")
+                return MagicMock(stdout="No activity found\n")
+            if cmd.startswith("am force-stop"):
+                state["mode"] = "cold"
+            elif cmd == "input keyevent KEYCODE_HOME":
+                state["mode"] = "warm"
+            elif cmd.startswith("am start -W"):
+                mode = state["mode"]
+                n = counts[mode]
+                counts[mode] += 1
+                total = 5000 if n == 0 else (800 + 10 * n if mode == "cold" else 200 + n)
+                state_name = "COLD" if mode == "cold" else warm_state
+                return MagicMock(stdout=f"Status: ok\nLaunchState: {state_name}\n"
+                                        f"TotalTime: {total}\nWaitTime: {total + 5}\nComplete\n")
+            return MagicMock(stdout="")
+
+        adb.shell.side_effect = shell
+        return adb
+
+    def test_app_launch_cold_warm(self, perf_plugin):
+        adb = self._launch_adb()
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "launch", "name": "Launch", "type": "perf", "action": "app_launch",
+              "params": {"packages": ["com.android.settings"], "iterations": 5, "warmup": 1,
+                         "thresholds": {"com.android.settings": {"cold_total_ms": 1000, "warm_total_ms": 300}}}}
+        with patch("smoke_test_ai.plugins.perf.time.sleep"):
+            result = perf_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS, result.message
+        app = result.metrics["apps"]["com_android_settings"]
+        assert app["component"] == "com.android.settings/.Main"
+        assert app["samples"]["cold_total_ms"] == [810, 820, 830, 840, 850]  # warmup outlier dropped
+        assert app["cold_total_ms"]["p50"] == 830
+        assert app["cold_total_ms"]["p90"] == pytest.approx(846)
+        assert app["cold_total_ms"]["stddev"] == pytest.approx(15.811, abs=1e-3)
+        assert app["warm_wait_ms"]["p50"] == 208
+        assert app["launch_states"] == {"cold:COLD": 5, "warm:WARM": 5}
+        assert result.metrics["drop_caches"] is True
+        cmds = [c.args[0] for c in adb.shell.call_args_list]
+        assert cmds.count("sh -c 'sync; echo 3 > /proc/sys/vm/drop_caches'") == 6
+        # "Don't keep activities" makes HOME destroy the activity → real warm starts
+        assert cmds.index("settings put global always_finish_activities 1") < cmds.index(
+            "input keyevent KEYCODE_HOME")
+        assert cmds[-1] == "settings put global always_finish_activities 0"
+
+    def test_app_launch_hot_starts_are_not_counted_as_warm(self, perf_plugin):
+        adb = self._launch_adb(warm_state="HOT")
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "launch", "name": "Launch", "type": "perf", "action": "app_launch",
+              "params": {"packages": ["com.android.settings"], "iterations": 5}}
+        with patch("smoke_test_ai.plugins.perf.time.sleep"):
+            result = perf_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert "com.android.settings: 5 warm launch(es) reported HOT" in result.message
+        app = result.metrics["apps"]["com_android_settings"]
+        assert app["samples"]["warm_total_ms"] == []
+        assert "warm_total_ms" not in app
+        assert app["cold_total_ms"]["n"] == 5
+
+    def test_app_launch_threshold_and_history(self, perf_plugin):
+        adb = self._launch_adb(root=False)
+        history = MagicMock()
+        history.metric_baseline.side_effect = lambda tid, name, stat, window: (
+            150.0 if name == "apps.settings.warm_total_ms" else None)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={}, history=history)
+        tc = {"id": "launch", "name": "Launch", "type": "perf", "action": "app_launch",
+              "params": {"packages": [{"package": "com.android.settings", "name": "settings",
+                                       "thresholds": {"cold_total_ms": 820}}],
+                         "iterations": 5}}
+        with patch("smoke_test_ai.plugins.perf.time.sleep"):
+            result = perf_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert "com.android.settings cold_total_ms p90 846 ms > 820 ms" in result.message
+        assert "warm_total_ms p50 203 ms vs baseline 150 ms" in result.message
+        assert result.metrics["drop_caches"] is False
+        cmds = [c.args[0] for c in adb.shell.call_args_list]
+        assert not any("drop_caches" in c for c in cmds)
+
+    def test_app_launch_missing_package_skips(self, perf_plugin):
+        adb = self._launch_adb(installed=())
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "launch", "name": "Launch", "type": "perf", "action": "app_launch",
+              "params": {"packages": ["com.example.absent"]}}
+        with patch("smoke_test_ai.plugins.perf.time.sleep"):
+            result = perf_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.SKIP
+        assert result.metrics["missing"] == ["com.example.absent"]
+
+    @staticmethod
+    def _framestats(start: int, count: int, slow_every: int = 0) -> str:
+        """Minimal framestats dump of ``count`` 60 Hz frames; every ``slow_every``-th one misses its deadline."""
+        period = 16_666_667
+        lines = ["---PROFILEDATA---", "Flags,IntendedVsync,Vsync,FrameDeadline,FrameCompleted,"]
+        for i in range(start, start + count):
+            intended = 10**9 + i * period
+            ms = 30 if slow_every and i % slow_every == 0 else 8
+            lines.append(f"0,{intended},{intended},{intended + period},{intended + ms * 10**6},")
+        lines.append("---PROFILEDATA---")
+        return "\n".join(lines)
+
+    def _run_jank(self, perf_plugin, slow_every: int, params: dict, settings=None):
+        adb = MagicMock()
+        dumps = iter(range(10))
+
+        def shell(cmd):
+            if cmd == "wm size":
+                return MagicMock(stdout="Physical size: 1080x2400\nOverride size: 720x1600\n")
+            if cmd.startswith("cmd package resolve-activity"):
+                return MagicMock(stdout="com.android.settings/.Settings\n")
+            if cmd.startswith("am start -W"):
+                return MagicMock(stdout="Status: ok\nTotalTime: 300\n")
+            if cmd.endswith("framestats"):
+                n = next(dumps)
+                return MagicMock(stdout=self._framestats(n * 60, 120, slow_every))  # overlapping windows
+            return MagicMock(stdout="")
+
+        adb.shell.side_effect = shell
+        ctx = PluginContext(adb=adb, settings=settings or {}, device_capabilities={})
+        tc = {"id": "jank", "name": "Jank", "type": "perf", "action": "jank",
+              "params": {"package": "com.android.settings", "swipes": 4, **params}}
+        with patch("smoke_test_ai.plugins.perf.time.sleep"):
+            result = perf_plugin.execute(tc, ctx)
+        return result, adb
+
+    def test_jank_smooth_scroll(self, perf_plugin, tmp_path):
+        result, adb = self._run_jank(perf_plugin, 0, {"max_jank_pct": 5, "thresholds": {"frame_ms": 16}},
+                                     settings={"reporting": {"output_dir": str(tmp_path)}})
+        assert result.status == TestStatus.PASS, result.message
+        m = result.metrics
+        assert m["frames"] == 300   # 4 dumps of 120 frames, each overlapping the previous by 60
+        assert m["jank_pct"] == 0.0
+        assert m["refresh_hz"] == pytest.approx(60, abs=0.1)
+        assert m["frame_ms"]["p90"] == pytest.approx(8)
+        assert Path(m["artifacts"][0]).name == "jank_framestats.csv"
+        assert len(Path(m["artifacts"][0]).read_text().splitlines()) == 301
+        cmds = [c.args[0] for c in adb.shell.call_args_list]
+        assert "dumpsys gfxinfo com.android.settings reset" in cmds
+        swipes = [c for c in cmds if c.startswith("input swipe")]
+        assert swipes == ["input swipe 360 1200 360 400 100"] * 2 + ["input swipe 360 400 360 1200 100"] * 2
+
+    def test_jank_over_limit_fails(self, perf_plugin):
+        result, _ = self._run_jank(perf_plugin, 10, {"max_jank_pct": 5, "max_missed_vsync": 100})
+        assert result.status == TestStatus.FAIL
+        assert result.metrics["jank_pct"] == 10.0
+        assert result.message.startswith("UI jank: jank 10.0% > 5%")
+
+    def test_jank_too_few_frames(self, perf_plugin):
+        result, _ = self._run_jank(perf_plugin, 0, {"min_frames": 1000})
+        assert result.status == TestStatus.FAIL
+        assert "frames rendered" in result.message
+
+    @staticmethod
+    def _meminfo(system_kb: int, used_kb: int = 1_740_800) -> str:
+        return (
+            "Total PSS by process:\n"
+            f"    {system_kb:,}K: system (pid 1021)\n"
+            "    150,528K: com.android.systemui (pid 1500 / activities)\n"
+            "     90,112K: com.android.launcher3 (pid 2100 / activities)\n"
+            "     35,840K: zygote64 (pid 640)\n"
+            "\n"
+            "Total RAM: 2,936,012K (status normal)\n"
+            " Free RAM: 1,012,345K (  400,000K cached pss)\n"
+            f" Used RAM: {used_kb:,}K (1,200,000K used pss)\n"
+            " Lost RAM:   102,400K\n"
+            "==proc_meminfo==\n"
+            "MemAvailable:    1048576 kB\n"
+        )
+
+    def _memory_adb(self, dumps):
+        adb = MagicMock()
+        dumps = iter(dumps)
+
+        def shell(cmd):
+            if cmd.startswith("cmd package resolve-activity"):
+                return MagicMock(stdout="priority=0\ncom.android.launcher3/.Launcher\n")
+            if cmd.startswith("dumpsys meminfo"):
+                return MagicMock(stdout=next(dumps))
+            return MagicMock(stdout="")
+
+        adb.shell.side_effect = shell
+        return adb
+
+    def test_memory_snapshot_pass(self, perf_plugin):
+        adb = self._memory_adb([self._meminfo(262_144)])
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "mem_boot", "name": "Mem", "type": "perf", "action": "memory",
+              "params": {"max_pss_mb": {"system_server": 400}, "max_used_ram_mb": 2000}}
+        with patch("smoke_test_ai.plugins.perf.time.sleep"):
+            result = perf_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS, result.message
+        procs = result.metrics["processes"]
+        assert procs["system_server"] == {"process": "system", "pss_mb": 256.0, "rss_mb": None}
+        assert procs["launcher"]["process"] == "com.android.launcher3"
+        assert procs["zygote"]["pss_mb"] == 35.0
+        assert result.metrics["ram"]["used_mb"] == 1700.0
+        assert result.metrics["proc_meminfo_kb"]["MemAvailable"] == 1048576
+
+    def test_memory_history_regression_and_threshold(self, perf_plugin):
+        adb = self._memory_adb([self._meminfo(512_000, used_kb=2_200_000)])
+        history = MagicMock()
+        history.metric_baseline.side_effect = lambda tid, name, stat, window: {
+            ("processes.system_server", "pss_mb"): 400.0, ("ram", "used_mb"): 1700.0}.get((name, stat))
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={}, history=history)
+        tc = {"id": "mem", "name": "Mem", "type": "perf", "action": "memory",
+              "params": {"max_pss_mb": {"system_server": 450}}}
+        with patch("smoke_test_ai.plugins.perf.time.sleep"):
+            result = perf_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        assert "system_server pss_mb 500 MB > 450 MB" in result.message
+        assert "system_server pss_mb 500 MB vs baseline 400 MB (+25%)" in result.message
+        assert "ram used_mb 2148 MB vs baseline 1700 MB" in result.message
+        assert result.metrics["baseline"] == {"ram.used_mb": 1700.0, "system_server.pss_mb": 400.0}
+
+    def test_memory_leak_check_against_earlier_snapshot(self, perf_plugin):
+        adb = self._memory_adb([self._meminfo(262_144), self._meminfo(262_144 + 80 * 1024)])
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        boot = {"id": "mem_boot", "name": "Mem boot", "type": "perf", "action": "memory"}
+        after = {"id": "mem_after", "name": "Mem after", "type": "perf", "action": "memory",
+                 "params": {"leak_check": "mem_boot", "max_growth_mb": {"system_server": 50}}}
+        with patch("smoke_test_ai.plugins.perf.time.sleep"):
+            assert perf_plugin.execute(boot, ctx).status == TestStatus.PASS
+            result = perf_plugin.execute(after, ctx)
+        assert result.status == TestStatus.FAIL
+        assert result.metrics["pss_growth_mb"]["system_server"] == 80.0
+        assert result.metrics["pss_growth_mb"]["systemui"] == 0.0
+        assert "system_server PSS grew 80 MB since 'mem_boot' (> 50 MB)" in result.message
+
+    def test_memory_leak_check_without_reference(self, perf_plugin):
+        adb = self._memory_adb([self._meminfo(262_144)])
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "mem_after", "name": "Mem", "type": "perf", "action": "memory",
+              "params": {"leak_check": "mem_boot"}}
+        with patch("smoke_test_ai.plugins.perf.time.sleep"):
+            result = perf_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.SKIP
+        assert "Leak check skipped" in result.message
+        assert "no snapshot" in result.metrics["leak_check"]
+
+    @staticmethod
+    def _fio_json(direction: str, bw_kib: int, iops: float, p99_ns: int) -> str:
+        import json
+        stats = {"bw": bw_kib, "iops": iops,
+                 "clat_ns": {"percentile": {"50.000000": p99_ns // 4, "90.000000": p99_ns // 2,
+                                            "99.000000": p99_ns, "99.900000": p99_ns * 2}}}
+        return "fio: warning: direct I/O\n" + json.dumps({"jobs": [{"jobname": "x", direction: stats}]})
+
+    def _storage_adb(self, fio_out: dict | None = None, dd_seconds=(1.0, 0.5), free_kb=8_000_000, root=True,
+                     direct=True):
+        adb = MagicMock()
+        adb.push_cached.return_value = True
+
+        def shell(cmd, timeout=30):
+            if cmd.startswith("df -k"):
+                return MagicMock(stdout=f"Filesystem 1K-blocks Used Available Use% Mounted on\n"
+                                        f"/dev/block/dm-5 20000000 1000 {free_kb} 1% /data\n")
+            if cmd.startswith("/data/local/tmp/fio"):
+                name = cmd.split("--name=")[1].split()[0]
+                return MagicMock(stdout=fio_out[name])
+            if cmd.startswith("sh -c 'id -u'"):
+                return MagicMock(stdout="0\n" if root else "2000\n")
+            if "flag=direct" in cmd and not direct:
+                return MagicMock(stdout="dd: bad oflag 'direct'\n")
+            if cmd.startswith("dd if=/dev/zero"):
+                return MagicMock(stdout=f"256+0 records in\n256+0 records out\n"
+                                        f"268435456 bytes (256 M) copied, {dd_seconds[0]} s, 256 M/s\n")
+            if cmd.startswith("dd if=/data"):
+                return MagicMock(stdout=f"268435456 bytes (256 M) copied, {dd_seconds[1]} s, 512 M/s\n")
+            return MagicMock(stdout="")
+
+        adb.shell.side_effect = shell
+        return adb
+
+    def test_storage_io_fio(self, perf_plugin, tmp_path):
+        fio = tmp_path / "fio-arm64"
+        fio.write_bytes(b"fio")
+        outputs = {
+            "seq_write": self._fio_json("write", 300_000, 293.0, 8_000_000),
+            "seq_read": self._fio_json("read", 800_000, 781.0, 4_000_000),
+            "rand_read": self._fio_json("read", 40_000, 10_000.0, 400_000),
+            "rand_write": self._fio_json("write", 20_000, 5_000.0, 30_000_000),
+        }
+        adb = self._storage_adb(outputs)
+        history = MagicMock()
+        history.metric_baseline.side_effect = lambda tid, name, stat, window=10: (
+            1200.0 if (name, stat) == ("jobs.seq_read", "mb_s") else None)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={}, history=history)
+        tc = {"id": "io", "name": "IO", "type": "perf", "action": "storage_io",
+              "params": {"fio": str(fio), "min_mb_s": {"seq_write": 200}, "min_iops": {"rand_read": 5000},
+                         "max_lat_p99_ms": {"rand_write": 20}}}
+        result = perf_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.FAIL
+        jobs = result.metrics["jobs"]
+        assert result.metrics["engine"] == "fio"
+        assert jobs["seq_read"]["mb_s"] == pytest.approx(819.2)
+        assert jobs["rand_read"]["iops"] == 10000.0
+        assert jobs["rand_write"]["lat_ms"] == {"p50": 7.5, "p90": 15.0, "p99": 30.0, "p99.9": 60.0}
+        assert "rand_write p99 30.00 ms > 20 ms" in result.message
+        assert "seq_read mb_s 819.2 vs baseline 1200.0 (-32%)" in result.message
+        assert "seq_write mb_s" not in result.message and "rand_read iops" not in result.message
+        assert result.metrics["baseline"] == {"seq_read.mb_s": 1200.0}
+        adb.push_cached.assert_called_once_with(fio, "/data/local/tmp/fio")
+        cmds = [c.args[0] for c in adb.shell.call_args_list]
+        assert any("--rw=randwrite --bs=4k --direct=1" in c for c in cmds)
+        assert cmds[-1] == "rm -f /data/local/tmp/smoke_io.bin"
+
+    def test_storage_io_dd_fallback(self, perf_plugin, tmp_path):
+        adb = self._storage_adb(root=False)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "io", "name": "IO", "type": "perf", "action": "storage_io",
+              "params": {"fio": str(tmp_path / "missing"), "iterations": 2, "min_mb_s": {"seq_read": 100}}}
+        result = perf_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS, result.message
+        jobs = result.metrics["jobs"]
+        assert result.metrics["engine"] == "dd"
+        assert jobs["seq_write"]["mb_s"] == pytest.approx(268.4)
+        assert jobs["seq_read"] == {"mb_s": 536.9, "runs_mb_s": [536.9, 536.9], "direct": True}
+        cmds = [c.args[0] for c in adb.shell.call_args_list]
+        assert any("oflag=direct conv=fsync" in c for c in cmds)
+        assert any(c.startswith("dd if=/data") and "iflag=direct" in c for c in cmds)
+        adb.push_cached.assert_not_called()
+
+    def test_storage_io_dd_page_cache_read_unmeasured(self, perf_plugin, tmp_path):
+        adb = self._storage_adb(root=False, direct=False, dd_seconds=(1.0, 0.01))
+        history = MagicMock()
+        history.metric_baseline.return_value = 5000.0
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={}, history=history)
+        tc = {"id": "io", "name": "IO", "type": "perf", "action": "storage_io",
+              "params": {"fio": str(tmp_path / "missing"), "iterations": 2,
+                         "min_mb_s": {"seq_read": 30000}, "history_tolerance": 1.0}}
+        result = perf_plugin.execute(tc, ctx)
+        assert result.status == TestStatus.PASS, result.message
+        assert "unmeasured" in result.metrics["jobs"]["seq_read"]
+        assert "seq_read unmeasured" in result.message
+        assert "seq_read.mb_s" not in result.metrics["baseline"]
+        cmds = [c.args[0] for c in adb.shell.call_args_list]
+        assert not any(c.startswith("dd if=/data") for c in cmds)
+
+    def test_storage_io_low_free_space_skips(self, perf_plugin):
+        adb = self._storage_adb(free_kb=100_000)
+        ctx = PluginContext(adb=adb, settings={}, device_capabilities={})
+        tc = {"id": "io", "name": "IO", "type": "perf", "action": "storage_io"}
+        assert perf_plugin.execute(tc, ctx).status == TestStatus.SKIP
@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+from smoke_test_ai.core.retry import RetryPolicy
+
+
+class TestRetryPolicy:
+    def test_legacy_retry_keys_keep_fixed_delay(self):
+        policy = RetryPolicy.from_test_case({"retry": 3, "retry_delay": 2})
+        assert policy.max_attempts == 3
+        assert [policy.delay(i) for i in range(2)] == [2, 2]
+        assert policy.retry_on == ("FAIL",)
+
+    def test_no_retry_by_default(self):
+        policy = RetryPolicy.from_test_case({})
+        assert not policy.should_retry("FAIL", "", 0)
+
+    def test_policy_block_defaults(self):
+        policy = RetryPolicy.from_test_case({"retry_policy": {}})
+        assert policy.max_attempts == 3
+        assert policy.retry_on == ("FAIL", "ERROR")
+        assert policy.health_check
+
+    def test_suite_default_merged_under_test_block(self):
+        policy = RetryPolicy.from_test_case(
+            {"retry_policy": {"max_attempts": 5}}, suite_default={"base_delay": 4, "max_attempts": 2})
+        assert policy.max_attempts == 5
+        assert policy.base_delay == 4
+
+    def test_legacy_retry_overrides_suite_default(self):
+        policy = RetryPolicy.from_test_case({"retry": 2}, suite_default={"max_attempts": 5})
+        assert policy.max_attempts == 2
+
+    def test_backoff_capped(self):
+        policy = RetryPolicy(base_delay=1, multiplier=2, max_delay=5)
+        assert [policy.delay(i) for i in range(5)] == [1, 2, 4, 5, 5]
+
+    def test_jitter_reduces_delay(self):
+        policy = RetryPolicy(base_delay=10, jitter=0.5)
+        with patch("smoke_test_ai.core.retry.random.uniform", return_value=0.5) as uniform:
+            assert policy.delay(0) == 5.0
+            uniform.assert_called_once_with(0.5, 1.0)
+
+    def test_error_retried_only_when_transient(self):
+        policy = RetryPolicy(max_attempts=3, retry_on=("FAIL", "ERROR"))
+        assert policy.should_retry("ERROR", "adb: device offline", 0)
+        assert not policy.should_retry("ERROR", "Unknown test type: foo", 0)
+        assert not policy.should_retry("ERROR", "device offline", 2)
+        assert not policy.should_retry("PASS", "", 0)
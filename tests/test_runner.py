@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from smoke_test_ai.core.test_runner import TestRunner, TestResult, TestStatus
 
 @pytest.fixture
@@ -119,7 +119,9 @@ class TestTestRunner:
         tc = {"id": "r", "name": "Retry", "type": "adb_shell", "command": "cmd",
               "expected_contains": "ok", "retry": 2, "retry_delay": 0}
         result = runner.run_test(tc)
-        assert result.status == TestStatus.PASS
+        assert result.status == TestStatus.FLAKY
+        assert result.passed
+        assert result.attempts == 2
         assert mock_adb.shell.call_count == 2
 
     def test_no_retry_on_error(self, mock_adb):
@@ -140,6 +142,87 @@ class TestTestRunner:
         assert result.status == TestStatus.FAIL
         assert mock_adb.shell.call_count == 3
 
+    # --- retry_policy: backoff, retry-on-ERROR, health probe ---
+    @patch("smoke_test_ai.core.test_runner.time.sleep")
+    def test_retry_policy_retries_transient_error(self, mock_sleep, mock_adb):
+        mock_adb.shell.side_effect = [
+            Exception("error: device offline"),
+            MagicMock(returncode=0, stdout="1\n", stderr=""),   # health probe boot_completed
+            MagicMock(returncode=0, stdout="ok\n", stderr=""),
+        ]
+        mock_adb.is_connected.return_value = True
+        runner = TestRunner(adb=mock_adb)
+        tc = {"id": "r", "name": "Retry", "type": "adb_shell", "command": "cmd",
+              "expected_contains": "ok", "retry_policy": {"base_delay": 1, "jitter": 0}}
+        result = runner.run_test(tc)
+        assert result.status == TestStatus.FLAKY
+        assert "attempt 2/3" in result.message
+        mock_sleep.assert_called_once_with(1.0)
+
+    @patch("smoke_test_ai.core.test_runner.time.sleep")
+    def test_retry_policy_no_retry_on_non_transient_error(self, mock_sleep, mock_adb):
+        mock_adb.shell.side_effect = Exception("KeyError: 'command'")
+        runner = TestRunner(adb=mock_adb)
+        tc = {"id": "r", "name": "Retry", "type": "adb_shell", "command": "cmd",
+              "expected_contains": "ok", "retry_policy": {}}
+        result = runner.run_test(tc)
+        assert result.status == TestStatus.ERROR
+        assert mock_adb.shell.call_count == 1
+
+    @patch("smoke_test_ai.core.test_runner.time.sleep")
+    def test_retry_policy_exponential_backoff(self, mock_sleep, mock_adb):
+        mock_adb.shell.return_value = MagicMock(returncode=0, stdout="bad\n", stderr="")
+        runner = TestRunner(adb=mock_adb)
+        tc = {"id": "r", "name": "Retry", "type": "adb_shell", "command": "cmd",
+              "expected_contains": "ok",
+              "retry_policy": {"max_attempts": 4, "base_delay": 0.5, "jitter": 0, "health_check": False}}
+        result = runner.run_test(tc)
+        assert result.status == TestStatus.FAIL
+        assert result.attempts == 4
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0, 2.0]
+
+    @patch("smoke_test_ai.core.test_runner.time.sleep")
+    def test_retry_aborted_when_device_unhealthy(self, mock_sleep, mock_adb):
+        mock_adb.shell.return_value = MagicMock(returncode=0, stdout="bad\n", stderr="")
+        mock_adb.is_connected.return_value = False
+        mock_adb.wait_for_device.return_value = False
+        runner = TestRunner(adb=mock_adb)
+        tc = {"id": "r", "name": "Retry", "type": "adb_shell", "command": "cmd",
+              "expected_contains": "ok", "retry_policy": {"jitter": 0}}
+        result = runner.run_test(tc)
+        assert result.status == TestStatus.FAIL
+        assert "device unhealthy" in result.message
+        assert mock_adb.shell.call_count == 1
+
+    def test_suite_retry_policy_applies_to_tests(self, mock_adb):
+        mock_adb.shell.side_effect = [
+            MagicMock(returncode=0, stdout="bad\n", stderr=""),
+            MagicMock(returncode=0, stdout="ok\n", stderr=""),
+        ]
+        runner = TestRunner(adb=mock_adb)
+        suite = {"test_suite": {"name": "S", "retry_policy": {"base_delay": 0, "health_check": False},
+                                "tests": [{"id": "t", "name": "T", "type": "adb_shell",
+                                           "command": "cmd", "expected_contains": "ok"}]}}
+        results = runner.run_suite(suite)
+        assert results[0].status == TestStatus.FLAKY
+
+    def test_flaky_dependency_satisfies_depends_on(self, mock_adb):
+        mock_adb.shell.side_effect = [
+            MagicMock(returncode=0, stdout="bad\n", stderr=""),
+            MagicMock(returncode=0, stdout="ok\n", stderr=""),
+            MagicMock(returncode=0, stdout="ok\n", stderr=""),
+        ]
+        runner = TestRunner(adb=mock_adb)
+        suite = {"test_suite": {"name": "S", "tests": [
+            {"id": "a", "name": "A", "type": "adb_shell", "command": "cmd",
+             "expected_contains": "ok", "retry": 2},
+            {"id": "b", "name": "B", "type": "adb_shell", "command": "cmd",
+             "expected_contains": "ok", "depends_on": "a"},
+        ]}}
+        results = runner.run_suite(suite)
+        assert results[0].status == TestStatus.FLAKY
+        assert results[1].status == TestStatus.PASS
+
     # --- B4: depends_on ---
     def test_depends_on_skip(self, mock_adb):
         mock_adb.shell.return_value = MagicMock(returncode=0, stdout="no match\n", stderr="")
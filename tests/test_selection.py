@@ -0,0 +1,79 @@
+import pytest
+
+from smoke_test_ai.core.selection import parse_duration, select_for_budget
+
+
+def _suite(*tests):
+    return {"test_suite": {"name": "S", "tests": list(tests)}}
+
+
+def _tc(tid, category="Other", **extra):
+    return {"id": tid, "name": tid, "type": "adb_shell", "category": category, **extra}
+
+
+def _ids(cfg):
+    return [tc["id"] for tc in cfg["test_suite"]["tests"]]
+
+
+class TestParseDuration:
+    @pytest.mark.parametrize("text,expected", [
+        ("5m", 300), ("90s", 90), ("1h30m", 5400), ("300", 300), ("1.5m", 90), (120, 120),
+    ])
+    def test_valid(self, text, expected):
+        assert parse_duration(text) == expected
+
+    @pytest.mark.parametrize("text", ["", "abc", "5x", "m"])
+    def test_invalid(self, text):
+        with pytest.raises(ValueError):
+            parse_duration(text)
+
+
+class TestSelectForBudget:
+    def test_prefers_high_failure_rate_per_second(self):
+        suite = _suite(_tc("a"), _tc("b"), _tc("c"))
+        cfg, summary = select_for_budget(
+            suite, budget=20,
+            durations={"a": 10, "b": 10, "c": 10},
+            failure_rates={"a": 0.0, "b": 0.5, "c": 0.2},
+        )
+        assert _ids(cfg) == ["b", "c"]
+        assert summary["dropped"] == ["a"]
+        assert summary["estimated"] == 20
+
+    def test_keeps_original_order(self):
+        suite = _suite(_tc("a"), _tc("b"))
+        cfg, _ = select_for_budget(suite, budget=100, durations={"a": 1, "b": 1},
+                                   failure_rates={"a": 0.0, "b": 1.0})
+        assert _ids(cfg) == ["a", "b"]
+
+    def test_mandatory_always_included(self):
+        suite = _suite(_tc("boot", mandatory=True), _tc("x"))
+        cfg, _ = select_for_budget(suite, budget=5, durations={"boot": 30, "x": 1},
+                                   failure_rates={"x": 1.0})
+        assert _ids(cfg) == ["boot"]
+
+    def test_category_weights(self):
+        suite = _suite(_tc("tel", "Telephony"), _tc("disp", "Display"))
+        cfg, _ = select_for_budget(suite, budget=10, durations={"tel": 10, "disp": 10},
+                                   category_weights={"Telephony": 3.0})
+        assert _ids(cfg) == ["tel"]
+
+    def test_dependency_chain_selected_together(self):
+        suite = _suite(_tc("wifi_on"), _tc("wifi_scan", depends_on="wifi_on"), _tc("other"))
+        cfg, _ = select_for_budget(
+            suite, budget=20,
+            durations={"wifi_on": 5, "wifi_scan": 5, "other": 15},
+            failure_rates={"wifi_on": 0.0, "wifi_scan": 1.0, "other": 0.1},
+        )
+        assert _ids(cfg) == ["wifi_on", "wifi_scan"]
+
+    def test_unsupported_requires_dropped(self):
+        suite = _suite(_tc("sms", requires={"device_capability": "has_sim"}), _tc("a"))
+        cfg, summary = select_for_budget(suite, budget=100, capabilities={"has_sim": False})
+        assert _ids(cfg) == ["a"]
+        assert summary["unsupported"] == ["sms"]
+
+    def test_unknown_duration_uses_estimate(self):
+        suite = _suite(_tc("slow", type="suspend", params={"suspend_duration": 60}), _tc("fast"))
+        cfg, _ = select_for_budget(suite, budget=30)
+        assert _ids(cfg) == ["fast"]
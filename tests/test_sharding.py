@@ -0,0 +1,131 @@
+import pytest
+from pathlib import Path
+
+from smoke_test_ai.core.sharding import (
+    estimate_duration, merge_suites, plan_shards, merge_shard_results, shard_suite,
+)
+from smoke_test_ai.core.test_runner import TestResult, TestStatus
+
+
+def _suite(*tests):
+    return {"test_suite": {"name": "S", "timeout": 60, "tests": list(tests)}}
+
+
+def _tc(tid, **kw):
+    return {"id": tid, "name": tid, "type": "adb_shell", **kw}
+
+
+class TestEstimateDuration:
+    def test_history_wins(self):
+        assert estimate_duration(_tc("a"), {"a": 42.0}) == 42.0
+
+    def test_type_default(self):
+        assert estimate_duration(_tc("a")) == 1.0
+
+    def test_sleep_params_added(self):
+        tc = {"id": "s", "name": "s", "type": "suspend", "params": {"suspend_duration": 120}}
+        assert estimate_duration(tc) == 130.0
+
+
+class TestMergeSuites:
+    def test_concatenates_and_dedupes(self):
+        a = _suite(_tc("x"), _tc("y"))
+        b = {"test_suite": {"name": "B", "timeout": 30, "tests": [_tc("y"), _tc("z")]}}
+        merged = merge_suites([a, b])
+        assert [t["id"] for t in merged["test_suite"]["tests"]] == ["x", "y", "z"]
+        assert merged["test_suite"]["name"] == "S + B"
+        assert merged["test_suite"]["timeout"] == 90
+
+
+class TestPlanShards:
+    def test_balanced_by_duration(self):
+        suite = _suite(_tc("a"), _tc("b"), _tc("c"), _tc("d"))
+        durations = {"a": 10.0, "b": 10.0, "c": 5.0, "d": 5.0}
+        shards = plan_shards(suite, ["SN1", "SN2"], durations=durations)
+        assert sorted(s.estimated for s in shards) == [15.0, 15.0]
+
+    def test_depends_on_chain_stays_together(self):
+        suite = _suite(_tc("wifi"), _tc("scan", depends_on="wifi"),
+                       _tc("ssid", depends_on="scan"), _tc("other"))
+        shards = plan_shards(suite, ["SN1", "SN2"], durations={"other": 100.0})
+        chain = {"wifi", "scan", "ssid"}
+        holders = [s for s in shards if chain & {t["id"] for t in s.tests}]
+        assert len(holders) == 1
+        assert [t["id"] for t in holders[0].tests] == ["wifi", "scan", "ssid"]
+
+    def test_requires_capability_respected(self):
+        suite = _suite(_tc("sms", requires={"device_capability": "has_sim"}), _tc("a"), _tc("b"))
+        caps = {"SN1": {"has_sim": False}, "SN2": {"has_sim": True}}
+        shards = plan_shards(suite, ["SN1", "SN2"], capabilities=caps,
+                             durations={"sms": 1.0, "a": 50.0, "b": 50.0})
+        sim_shard = next(s for s in shards if any(t["id"] == "sms" for t in s.tests))
+        assert sim_shard.serial == "SN2"
+
+    def test_requires_unavailable_everywhere_still_placed(self):
+        suite = _suite(_tc("dp", requires={"device_capability": "has_dp_output"}))
+        shards = plan_shards(suite, ["SN1", "SN2"])
+        assert sum(len(s.tests) for s in shards) == 1
+
+    def test_preserves_suite_order_within_shard(self):
+        suite = _suite(*[_tc(f"t{i}") for i in range(6)])
+        durations = {f"t{i}": float(i + 1) for i in range(6)}
+        for shard in plan_shards(suite, ["SN1", "SN2"], durations=durations):
+            ids = [t["id"] for t in shard.tests]
+            assert ids == sorted(ids)
+
+    def test_no_serials_raises(self):
+        with pytest.raises(ValueError):
+            plan_shards(_suite(_tc("a")), [])
+
+
+class TestMergeShardResults:
+    def test_original_order_and_missing_error(self):
+        suite = _suite(_tc("a"), _tc("b"), _tc("c"))
+        shard_results = [
+            [TestResult(id="c", name="c", status=TestStatus.PASS)],
+            [TestResult(id="a", name="a", status=TestStatus.FAIL)],
+        ]
+        merged = merge_shard_results(suite, shard_results)
+        assert [r.id for r in merged] == ["a", "b", "c"]
+        assert merged[1].status == TestStatus.ERROR
+
+    def test_shard_suite_keeps_metadata(self):
+        suite = _suite(_tc("a"), _tc("b"))
+        shard = plan_shards(suite, ["SN1"])[0]
+        cfg = shard_suite(suite, shard)
+        assert cfg["test_suite"]["name"] == "S"
+        assert len(cfg["test_suite"]["tests"]) == 2
+
+
+class TestRunShardedBugreports:
+    def test_shards_write_distinct_bugreport_paths(self, tmp_path):
+        """Shards share one device config, so bugreports must be keyed by serial."""
+        from unittest.mock import MagicMock, patch
+        from smoke_test_ai.core.orchestrator import Orchestrator
+        from smoke_test_ai.core.sharding import run_sharded
+
+        captured = {}
+
+        def fake_run(self, serial=None, suite_config=None, **kwargs):
+            adb = MagicMock(serial=serial)
+            adb.bugreport.side_effect = lambda path: Path(path + ".zip").write_bytes(b"PK")
+            adb.shell.return_value = MagicMock(stdout="")
+            captured[serial] = self._capture_bugreport_and_analyze(adb)["bugreport_path"]
+            return [TestResult(id=tc["id"], name=tc["name"], status=TestStatus.PASS)
+                    for tc in suite_config["test_suite"]["tests"]]
+
+        settings = {"output_dir": str(tmp_path)}
+        device_config = {"device": {"name": "Product-A"}}
+        history = MagicMock()
+        history.test_durations.return_value = {}
+        with patch.object(Orchestrator, "run", fake_run), \
+             patch.object(Orchestrator, "_get_history", return_value=history), \
+             patch.object(Orchestrator, "_generate_reports"):
+            results = run_sharded(settings, device_config, _suite(_tc("a"), _tc("b")),
+                                  ["SN1", "192.168.1.5:5555"])
+
+        assert len(results) == 2
+        assert captured == {
+            "SN1": str(tmp_path / "Product-A_SN1_bugreport.zip"),
+            "192.168.1.5:5555": str(tmp_path / "Product-A_192.168.1.5_5555_bugreport.zip"),
+        }
@@ -0,0 +1,111 @@
+import pytest
+
+from smoke_test_ai.core.suite_compiler import (
+    SuiteValidationError, load_suite_file, validate_suite,
+)
+from smoke_test_ai.utils.config import load_test_suite
+
+
+def _suite(*tests, **extra):
+    return {"test_suite": {"name": "S", "tests": list(tests), **extra}}
+
+
+VALID_YAML = """test_suite:
+  name: Basic
+  tests:
+    - id: t1
+      name: Test1
+      type: adb_shell
+      command: "echo ${SMOKE_TEST_VAR}"
+      expected_pattern: "^ok$"
+"""
+
+
+class TestValidateSuite:
+    def test_shipped_suites_are_valid(self, config_dir):
+        for path in sorted((config_dir / "test_suites").glob("*.yaml")):
+            load_suite_file(path)
+
+    def test_shipped_leak_checks_depend_on_their_reference(self, config_dir):
+        # Sharding and selection only keep tests together through depends_on
+        for path in sorted((config_dir / "test_suites").glob("*.yaml")):
+            for tc in load_suite_file(path)["test_suite"]["tests"]:
+                ref = tc.get("params", {}).get("leak_check")
+                if ref:
+                    assert tc.get("depends_on") == ref, f"{path.name}: {tc['id']}"
+
+    def test_missing_test_suite(self):
+        with pytest.raises(SuiteValidationError, match="test_suite"):
+            validate_suite({"tests": []})
+
+    def test_collects_all_errors(self):
+        suite = _suite(
+            {"id": "a", "name": "A", "type": "adb_check", "command": "x"},
+            {"id": "a", "name": "A2", "type": "adb_shell", "command": "x"},
+            {"id": "b", "name": "B", "type": "nope"},
+            {"id": "c", "name": "C", "type": "wifi"},
+            {"id": "d", "name": "D", "type": "adb_shell", "command": "x", "expected_pattern": "(["},
+            {"id": "e", "name": "E", "type": "adb_shell", "command": "x", "depends_on": "zzz"},
+        )
+        with pytest.raises(SuiteValidationError) as exc:
+            validate_suite(suite)
+        errors = "\n".join(exc.value.errors)
+        assert "requires 'expected'" in errors
+        assert "duplicate id" in errors
+        assert "unknown type 'nope'" in errors
+        assert "requires 'action'" in errors
+        assert "invalid expected_pattern" in errors
+        assert "depends_on 'zzz'" in errors
+        assert len(exc.value.errors) == 6
+
+    def test_depends_on_must_be_earlier(self):
+        suite = _suite(
+            {"id": "b", "name": "B", "type": "adb_shell", "command": "x", "depends_on": "a"},
+            {"id": "a", "name": "A", "type": "adb_shell", "command": "x"},
+        )
+        with pytest.raises(SuiteValidationError, match="earlier"):
+            validate_suite(suite)
+
+    def test_unknown_retry_policy_key(self):
+        suite = _suite({"id": "a", "name": "A", "type": "adb_shell", "command": "x",
+                        "retry_policy": {"max_attempt": 3}})
+        with pytest.raises(SuiteValidationError, match="max_attempt"):
+            validate_suite(suite)
+
+
+class TestLoadSuiteFile:
+    def test_cache_reused_and_env_expanded_after(self, tmp_path, monkeypatch):
+        path = tmp_path / "basic.yaml"
+        path.write_text(VALID_YAML)
+        cache = tmp_path / "cache"
+        monkeypatch.setenv("SMOKE_TEST_VAR", "secret")
+
+        first = load_test_suite(path, cache_dir=cache)
+        assert first["test_suite"]["tests"][0]["command"] == "echo secret"
+        cached = list(cache.glob("basic-*.json"))
+        assert len(cached) == 1
+        assert "secret" not in cached[0].read_text()
+
+        monkeypatch.setenv("SMOKE_TEST_VAR", "other")
+        second = load_test_suite(path, cache_dir=cache)
+        assert second["test_suite"]["tests"][0]["command"] == "echo other"
+
+    def test_cache_invalidated_on_content_change(self, tmp_path):
+        path = tmp_path / "basic.yaml"
+        path.write_text(VALID_YAML)
+        cache = tmp_path / "cache"
+        load_suite_file(path, cache_dir=cache)
+        path.write_text(VALID_YAML.replace("Basic", "Changed"))
+        assert load_suite_file(path, cache_dir=cache)["test_suite"]["name"] == "Changed"
+        assert len(list(cache.glob("basic-*.json"))) == 2
+
+    def test_malformed_suite_fails_at_load(self, tmp_path):
+        path = tmp_path / "bad.yaml"
+        path.write_text("test_suite:\n  name: Bad\n  tests:\n    - id: t1\n      type: adb_check\n")
+        with pytest.raises(SuiteValidationError):
+            load_test_suite(path, cache_dir=tmp_path / "cache")
+        assert not (tmp_path / "cache").exists()
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_suite_file(tmp_path / "missing.yaml")
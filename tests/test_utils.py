@@ -25,3 +25,52 @@ def test_load_test_suite(tmp_path):
     assert suite["test_suite"]["name"] == "Basic"
     assert len(suite["test_suite"]["tests"]) == 1
     assert suite["test_suite"]["tests"][0]["id"] == "t1"
+
+def test_summarize_percentiles():
+    from smoke_test_ai.utils.stats import summarize
+    s = summarize([1.0, 2.0, 3.0, 4.0, None])
+    assert s["n"] == 4
+    assert s["p50"] == 2.5
+    assert s["max"] == 4.0
+    assert summarize([]) == {"n": 0}
+
+
+def test_exceeded_thresholds():
+    from smoke_test_ai.utils.stats import exceeded_thresholds
+    summary = {"a": {"p95": 1.5}, "b": {"p95": 0.5}}
+    assert exceeded_thresholds(summary, {"a": 1, "b": 1, "c": 1}) == ["a p95 1.50 > 1"]
+    assert exceeded_thresholds(summary, {"a": 1}, unit=" ms", fmt=".0f") == ["a p95 2 ms > 1 ms"]
+
+
+def test_history_regressions():
+    from unittest.mock import MagicMock
+    from smoke_test_ai.utils.stats import history_regressions
+    summary = {"launch": {"p50": 130.0}, "shot": {"p50": 100.0}, "new": {"p50": 5.0}}
+    history = MagicMock()
+    history.metric_baseline.side_effect = lambda tid, name, stat, window: {
+        "m.launch": 100.0, "m.shot": 95.0}.get(name)
+    regressions, baselines = history_regressions(summary, history, "t", 0.2, prefix="m.")
+    assert regressions == ["launch p50 130.00 vs baseline 100.00 (+30%)"]
+    assert baselines == {"launch": 100.0, "shot": 95.0}
+    assert history_regressions(summary, None, "t") == ([], {})
+
+
+def test_mean_ci():
+    from smoke_test_ai.utils.stats import mean_ci
+    mean, ci = mean_ci([10, 12, 14, None])
+    assert mean == pytest.approx(12)
+    assert ci == pytest.approx(4.303 * 2 / 3 ** 0.5, rel=1e-3)
+    assert mean_ci([5]) == (5.0, 0.0)
+
+
+def test_linear_trend():
+    import numpy as np
+    from smoke_test_ai.utils.stats import linear_trend
+    x = np.arange(20, dtype=float)
+    slope, ci = linear_trend(x, 100 - 2.5 * x)
+    assert slope == pytest.approx(-2.5)
+    assert ci == pytest.approx(0, abs=1e-9)
+    noisy = 100 - 2.5 * x + np.tile([0.5, -0.5], 10)
+    slope, ci = linear_trend(x, noisy)
+    assert slope - ci < -2.5 < slope + ci
+    assert np.isnan(linear_trend([1, 1, 1], [1, 2, 3])[0])
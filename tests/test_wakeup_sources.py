@@ -0,0 +1,99 @@
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from smoke_test_ai.utils.wakeup_sources import (
+    WakeupSnapshot, format_delta, parse_framework_wakelocks, _split_sections,
+)
+
+HEADER = ("name\t\tactive_count\tevent_count\twakeup_count\texpire_count\tactive_since"
+          "\ttotal_time\tmax_time\tlast_change\tprevent_suspend_time\n")
+
+BEFORE = HEADER + (
+    "qcom_rx_wakelock\t10\t10\t2\t0\t0\t500\t100\t1000\t0\n"
+    "[timerfd]\t40\t40\t40\t0\t0\t80\t5\t1000\t0\n"
+    "PowerManagerService.WakeLocks\t3\t3\t0\t0\t0\t2000\t900\t1000\t0\n"
+)
+AFTER = HEADER + (
+    "qcom_rx_wakelock\t30\t30\t12\t0\t0\t45500\t9000\t9000\t100\n"
+    "[timerfd]\t95\t95\t95\t0\t0\t120\t5\t9000\t0\n"
+    "PowerManagerService.WakeLocks\t3\t3\t0\t0\t0\t2000\t900\t1000\t0\n"
+    "eventpoll wlan\t4\t4\t4\t0\t0\t300\t100\t9000\t0\n"
+)
+POWER = (
+    "  PARTIAL_WAKE_LOCK              'NlpWakeLock' ACQ=-1s (uid=10123 pid=4567)\n"
+    "  SCREEN_BRIGHT_WAKE_LOCK        'WindowManager' ON_AFTER_RELEASE (uid=1000)\n"
+    "  PowerManagerService.WakeLocks: ref count=1\n"
+)
+
+
+class TestWakeupSnapshot:
+    def test_parse_columns_and_names(self):
+        snap = WakeupSnapshot.parse(AFTER)
+        assert snap.names[-1] == "eventpoll wlan"
+        assert len(snap) == 4
+        assert snap.column("total_time").tolist() == [45500, 120, 2000, 300]
+        assert snap.column("prevent_suspend_time")[0] == 100
+
+    def test_parse_without_header_uses_default_columns(self):
+        snap = WakeupSnapshot.parse("usb\t50\t50\t3\t0\t0\t5000\t100\t0\t7\n")
+        assert snap.column("wakeup_count")[0] == 3
+        assert snap.column("prevent_suspend_time")[0] == 7
+
+    def test_parse_empty(self):
+        snap = WakeupSnapshot.parse("")
+        assert len(snap) == 0
+        assert snap.top() == []
+
+    def test_framework_wakelocks(self):
+        wl = parse_framework_wakelocks(POWER)
+        assert [(w["type"], w["tag"], w["uid"]) for w in wl] == [
+            ("PARTIAL", "NlpWakeLock", "10123"), ("SCREEN_BRIGHT", "WindowManager", "1000")]
+
+    def test_diff_and_top(self):
+        before = WakeupSnapshot.parse(BEFORE, uptime=100.0)
+        after = WakeupSnapshot.parse(AFTER, POWER, uptime=160.5)
+        delta = after.diff(before)
+        assert delta.uptime == 60.5
+        assert delta.column("total_time").tolist() == [45000, 40, 0, 300]
+        assert delta.column("last_change")[0] == 9000  # point-in-time, not diffed
+        assert [s["name"] for s in delta.top(2)] == ["qcom_rx_wakelock", "eventpoll wlan"]
+        assert [s["name"] for s in delta.top(2, by="wakeup_count")] == ["[timerfd]", "qcom_rx_wakelock"]
+        # unchanged sources never appear
+        assert "PowerManagerService.WakeLocks" not in [s["name"] for s in delta.top(10)]
+
+    def test_diff_counter_reset_counts_from_zero(self):
+        before = WakeupSnapshot.parse(HEADER + "x\t100\t100\t9\t0\t0\t9000\t10\t0\t0\n")
+        after = WakeupSnapshot.parse(HEADER + "x\t2\t2\t1\t0\t0\t50\t10\t0\t0\n")
+        assert after.diff(before).column("total_time")[0] == 50
+
+    def test_format_delta(self):
+        delta = WakeupSnapshot.parse(AFTER, POWER, 160.0).diff(WakeupSnapshot.parse(BEFORE, uptime=100.0))
+        text = format_delta(delta, n=1)
+        assert "[PARTIAL] NlpWakeLock (uid=10123)" in text
+        assert "over 60s (by active time):\n  qcom_rx_wakelock: 45000ms (10 wakeups)" in text
+        assert "[timerfd]: 55 wakeups" in text
+        assert format_delta(WakeupSnapshot()) == "No wakelock data available"
+
+    def test_save_round_trip(self, tmp_path):
+        snap = WakeupSnapshot.parse(AFTER, POWER, uptime=12.5)
+        path = snap.save(tmp_path / "a" / "snap.json")
+        loaded = WakeupSnapshot.from_dict(json.loads(path.read_text()))
+        assert loaded.names == snap.names
+        assert loaded.uptime == 12.5
+        assert np.array_equal(loaded.column("total_time"), snap.column("total_time"))
+        assert loaded.wakelocks == snap.wakelocks
+
+    def test_capture_single_round_trip(self):
+        adb = MagicMock()
+        adb.shell.return_value = MagicMock(
+            stdout=f"321.50 100.00\n==wakeup_sources==\n{AFTER}==power==\n{POWER}")
+        snap = WakeupSnapshot.capture(adb)
+        adb.shell.assert_called_once()
+        assert snap.uptime == 321.5
+        assert len(snap) == 4 and len(snap.wakelocks) == 2
+
+    def test_split_sections(self):
+        sections = _split_sections("1 2\n==a==\nx\ny\n==b==\n")
+        assert sections == {"": "1 2", "a": "x\ny", "b": ""}